@@ -52,6 +52,10 @@ class PromptStrategy(str, Enum):
     COT_MOA_PROPOSER_IMAGE = "chain-of-thought-mixture-of-agents-proposer-image"
     COT_MOA_AGG = "chain-of-thought-mixture-of-agents-aggregation"
 
+    # Batched Prompt Strategies (multiple input records per prompt)
+    COT_BOOL_BATCH = "chain-of-thought-bool-batch"
+    COT_QA_BATCH = "chain-of-thought-question-batch"
+
     def is_image_prompt(self):
         return "image" in self.value
 
@@ -73,10 +77,37 @@ class PromptStrategy(str, Enum):
     def is_moa_aggregator_prompt(self):
         return "mixture-of-agents-aggregation" in self.value
 
+    def is_batch_prompt(self):
+        return "batch" in self.value
+
+
+class PromptLayout(str, Enum):
+    """
+    PromptLayout describes how a Generator arranges the static (per-operator) and dynamic (per-record)
+    content of its prompts.
+
+    INTERLEAVED templates the per-record context into the middle of the instructions. STATIC_PREFIX places
+    all static content (the system prompt, job instruction, example, field descriptions, and filter condition)
+    before the per-record context, thus every prompt issued by an operator shares a long common prefix which
+    providers can serve from their prompt cache at a discounted price.
+    """
+    INTERLEAVED = "interleaved"
+    STATIC_PREFIX = "static-prefix"
+
 
 class AggFunc(str, Enum):
+    """
+    The aggregation functions supported by aggregate operators. In addition to these, approximate quantiles
+    may be computed with functions of the form "approx_p<percentile>" (e.g. "approx_p90" or "approx_p99.9").
+    """
     COUNT = "count"
     AVERAGE = "average"
+    SUM = "sum"
+    MIN = "min"
+    MAX = "max"
+    COUNT_DISTINCT = "count_distinct"
+    APPROX_COUNT_DISTINCT = "approx_count_distinct"
+    APPROX_MEDIAN = "approx_median"
 
 
 class Cardinality(str, Enum):
@@ -105,16 +136,79 @@ HTML_EXTENSIONS = [".html", ".htm"]
 # the number of seconds the parallel execution will sleep for while waiting for futures to complete
 PARALLEL_EXECUTION_SLEEP_INTERVAL_SECS = 0.3
 
+# the number of records per chunk in which spilled aggregate inputs are written to (and read back from) disk
+SPILL_CHUNK_SIZE = 4096
+
+# the number of records which are folded into an aggregate's partial state by a single worker task
+PARTIAL_AGGREGATION_CHUNK_SIZE = 1024
+
+# the number of index bits (i.e. log2 of the number of registers) of the HyperLogLog sketches used by
+# approximate count-distinct aggregates; the relative standard error is roughly 1.04 / sqrt(2 ** precision)
+HLL_PRECISION = 12
+
+# the compression of the t-digest sketches used by approximate quantile aggregates; larger values keep
+# more centroids (and thus give more accurate quantiles) at the cost of more memory
+TDIGEST_COMPRESSION = 100
+
+# settings for prefetching scans, which read the items ahead of the item being scanned on a dedicated I/O
+# thread pool: the number of items read ahead, the number of I/O threads, and the number of items per read
+DEFAULT_SCAN_PREFETCH_WINDOW = 32
+DEFAULT_SCAN_IO_WORKERS = 4
+SCAN_IO_BATCH_SIZE = 8
+
+# settings for the process pool which parses documents (e.g. PDFs and HTML) for the directory readers: the
+# number of worker processes (None uses one per CPU; 0 parses documents in the calling thread instead) and
+# the number of seconds after which parsing a single file is abandoned
+DEFAULT_PARSER_WORKERS = None
+DEFAULT_PARSE_TIMEOUT_SECS = 120.0
+
+# settings for limit-aware execution, which only scans as many source records ahead of a limit as are expected
+# to produce the records it still needs: the estimated selectivity of the operators upstream of the limit is
+# weighted like this many observed source records, and the number of records in flight is padded by this factor
+LIMIT_SELECTIVITY_PRIOR_WEIGHT = 10
+LIMIT_READ_AHEAD_FACTOR = 1.5
+
+# the default maximum number of source records which a streaming execution has scanned but not yet yielded
+# all of the outputs for; this bounds the records (and out-of-order outputs) which it holds in memory
+DEFAULT_STREAMING_WINDOW = 64
+
+# the number of seconds between samples of the process' memory usage during execution
+MEMORY_USAGE_SAMPLE_INTERVAL_SECS = 0.1
+
+# connection pool settings for the HTTP clients shared by all generators
+DEFAULT_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS = 100
+DEFAULT_HTTP_KEEPALIVE_EXPIRY_SECS = 60.0
+
+# the default number of in-flight calls per operator in the asyncio-based execution strategy
+DEFAULT_MAX_CONCURRENCY_PER_OP = 32
+
+# the number of seconds the asyncio-based execution strategy waits for a batched operator's batch
+# to fill up before it executes the (partial) batch
+BATCH_FLUSH_INTERVAL_SECS = 0.05
+
+# settings for the per-model rate limit controllers; the concurrency limit for each model starts at
+# the maximum, is halved whenever the provider rate-limits a request, and grows back additively
+DEFAULT_LLM_MAX_CONCURRENCY = 64
+
+# settings for the batch execution strategy, which runs each operator's LLM calls through the provider's
+# Batch API; batched requests are completed within the completion window at a discount to the synchronous API
+BATCH_API_ENDPOINT = "/v1/chat/completions"
+BATCH_API_COMPLETION_WINDOW = "24h"
+BATCH_API_COST_DISCOUNT = 0.5
+DEFAULT_BATCH_POLL_INTERVAL_SECS = 30.0
+
 # default PDF parser
 DEFAULT_PDF_PROCESSOR = "pypdf"
 
 # character limit for various IDs
 MAX_ID_CHARS = 10
 
-# retry LLM executions 2^x * (multiplier) for up to 10 seconds and at most 4 times
+# retry LLM executions with a random (jittered) wait of up to 2^x * (multiplier) seconds,
+# capped at 10 seconds per wait, and make at most 4 attempts
 RETRY_MULTIPLIER = 2
 RETRY_MAX_SECS = 10
-RETRY_MAX_ATTEMPTS = 1
+RETRY_MAX_ATTEMPTS = 4
 
 # maximum number of rows to display in a table
 MAX_ROWS = 5
@@ -131,6 +225,30 @@ def log_attempt_number(retry_state):
 # Palimpzest root directory
 PZ_DIR = os.path.join(os.path.expanduser("~"), ".palimpzest")
 
+# default location of the (optional) on-disk LLM response cache
+DEFAULT_LLM_CACHE_PATH = os.path.join(PZ_DIR, "llm_cache.sqlite")
+
+# maximum number of LLM responses kept in the (optional) on-disk response cache before LRU eviction
+DEFAULT_LLM_CACHE_MAX_ENTRIES = 100_000
+
+# default location (and size bound) of the (optional) on-disk cache of the physical plans chosen by the optimizer
+DEFAULT_PLAN_CACHE_PATH = os.path.join(PZ_DIR, "plan_cache.sqlite")
+DEFAULT_PLAN_CACHE_MAX_ENTRIES = 10_000
+
+# default directory (and size bound) of the on-disk cache of the field values parsed by the file readers
+DEFAULT_PARSED_DOC_CACHE_DIR = os.path.join(PZ_DIR, "parsed_doc_cache")
+DEFAULT_PARSED_DOC_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# default directory (and size bound) of the on-disk cache of the records materialized by previous executions
+DEFAULT_MATERIALIZATION_CACHE_DIR = os.path.join(PZ_DIR, "materialization_cache")
+DEFAULT_MATERIALIZATION_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# default directory of the manifests of the source files (and their outputs) processed by incremental executions
+DEFAULT_MANIFEST_DIR = os.path.join(PZ_DIR, "manifests")
+
+# default number of seconds between the checkpoints written by a checkpointed (pipelined parallel) execution
+DEFAULT_CHECKPOINT_INTERVAL_SECS = 60.0
+
 # Assume 500 MB/sec for local SSD scan time
 LOCAL_SCAN_TIME_PER_KB = 1 / (float(500) * 1024)
 
@@ -158,6 +276,10 @@ NAIVE_EST_NUM_INPUT_TOKENS = 1000
 # a naive estimate for the number of output tokens processed per record
 NAIVE_EST_NUM_OUTPUT_TOKENS = 100
 
+# a naive estimate for the number of input tokens in the fixed part of a prompt (i.e. the instructions
+# and few-shot example); this is paid once per LLM call and is thus amortized by batched operators
+NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS = 400
+
 # a naive estimate for the number of groups returned by a group by
 NAIVE_EST_NUM_GROUPS = 3
 
@@ -196,6 +318,10 @@ LOG_LLM_OUTPUT = False
 # Cost is presented in terms of USD / token for input tokens and USD / token for
 # generated tokens.
 #
+# Rate limits are presented in requests per minute and (input + output) tokens per minute;
+# None means the provider does not impose a limit. These are conservative defaults for a
+# (low-tier) account and can be overridden via QueryProcessorConfig.model_rate_limits.
+#
 # Time is presented in seconds per output token. I grabbed some semi-recent estimates
 # from the internet for this quick POC, but we can and should do more to model these
 # values more precisely:
@@ -211,6 +337,9 @@ LLAMA3_8B_MODEL_CARD = {
     "overall": 71.0,
     ##### Code #####
     "code": 64.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 600,
+    "tokens_per_minute": None,
 }
 LLAMA3_11B_V_MODEL_CARD = {
     ##### Cost in USD #####
@@ -220,6 +349,9 @@ LLAMA3_11B_V_MODEL_CARD = {
     "seconds_per_output_token": 0.0061,
     ##### Agg. Benchmark #####
     "overall": 71.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 600,
+    "tokens_per_minute": None,
 }
 MIXTRAL_8X_7B_MODEL_CARD = {
     ##### Cost in USD #####
@@ -231,48 +363,71 @@ MIXTRAL_8X_7B_MODEL_CARD = {
     "overall": 63.0,
     ##### Code #####
     "code": 40.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 600,
+    "tokens_per_minute": None,
 }
 GPT_4o_MODEL_CARD = {
     ##### Cost in USD #####
     "usd_per_input_token": 2.5 / 1E6,
     "usd_per_output_token": 10.0 / 1E6,
+    "usd_per_cached_input_token": 1.25 / 1E6,
+    "min_cached_input_tokens": 1024,  # prompts shorter than this are not cached by the provider
     ##### Time #####
     "seconds_per_output_token": 0.0079,
     ##### Agg. Benchmark #####
     "overall": 89.0,
     ##### Code #####
     "code": 90.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 5000,
+    "tokens_per_minute": 450_000,
 }
 GPT_4o_V_MODEL_CARD = {
     # NOTE: it is unclear if the same ($ / token) costs can be applied, or if we have to calculate this ourselves
     ##### Cost in USD #####
     "usd_per_input_token": 2.5 / 1E6,
     "usd_per_output_token": 10.0 / 1E6,
+    "usd_per_cached_input_token": 1.25 / 1E6,
+    "min_cached_input_tokens": 1024,  # prompts shorter than this are not cached by the provider
     ##### Time #####
     "seconds_per_output_token": 0.0079,
     ##### Agg. Benchmark #####
     "overall": 89.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 5000,
+    "tokens_per_minute": 450_000,
 }
 GPT_4o_MINI_MODEL_CARD = {
     ##### Cost in USD #####
     "usd_per_input_token": 0.15 / 1E6,
     "usd_per_output_token": 0.6 / 1E6,
+    "usd_per_cached_input_token": 0.075 / 1E6,
+    "min_cached_input_tokens": 1024,  # prompts shorter than this are not cached by the provider
     ##### Time #####
     "seconds_per_output_token": 0.0098,
     ##### Agg. Benchmark #####
     "overall": 82.0,
     ##### Code #####
     "code": 86.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 5000,
+    "tokens_per_minute": 2_000_000,
 }
 GPT_4o_MINI_V_MODEL_CARD = {
     # NOTE: it is unclear if the same ($ / token) costs can be applied, or if we have to calculate this ourselves
     ##### Cost in USD #####
     "usd_per_input_token": 0.15 / 1E6,
     "usd_per_output_token": 0.6 / 1E6,
+    "usd_per_cached_input_token": 0.075 / 1E6,
+    "min_cached_input_tokens": 1024,  # prompts shorter than this are not cached by the provider
     ##### Time #####
     "seconds_per_output_token": 0.0098,
     ##### Agg. Benchmark #####
     "overall": 82.0,
+    ##### Rate Limits #####
+    "requests_per_minute": 5000,
+    "tokens_per_minute": 2_000_000,
 }
 
 
@@ -19,6 +19,10 @@ class GenerationStats:
     # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
     total_input_tokens: float = 0.0
 
+    # the number of input tokens (out of total_input_tokens) which the provider served from its prompt cache
+    # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
+    total_cached_input_tokens: float = 0.0
+
     # the total number of output tokens processed by this operator; None if this operation did not use an LLM
     # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
     total_output_tokens: float = 0.0
@@ -38,16 +42,31 @@ class GenerationStats:
     # (if applicable) the time (in seconds) spent executing a call to a function
     fn_call_duration_secs: float = 0.0
 
+    # (if applicable) the number of LLM calls which were served from / missed in the LLM response cache
+    # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
+    cache_hits: float = 0.0
+    cache_misses: float = 0.0
+
+    # (if applicable) the number of times an LLM call was retried (e.g. after being rate-limited) and the time
+    # (in seconds) spent waiting on the rate limiter and in retry backoff
+    num_retries: float = 0.0
+    throttle_duration_secs: float = 0.0
+
     def __iadd__(self, other: GenerationStats) -> GenerationStats:
         # self.raw_answers.extend(other.raw_answers)
         for dataclass_field in [
             "total_input_tokens",
+            "total_cached_input_tokens",
             "total_output_tokens",
             "total_input_cost",
             "total_output_cost",
             "cost_per_record",
             "llm_call_duration_secs",
             "fn_call_duration_secs",
+            "cache_hits",
+            "cache_misses",
+            "num_retries",
+            "throttle_duration_secs",
         ]:
             setattr(self, dataclass_field, getattr(self, dataclass_field) + getattr(other, dataclass_field))
         return self
@@ -57,12 +76,17 @@ class GenerationStats:
             field: getattr(self, field) + getattr(other, field)
             for field in [
                 "total_input_tokens",
+                "total_cached_input_tokens",
                 "total_output_tokens",
                 "total_input_cost",
                 "total_output_cost",
                 "llm_call_duration_secs",
                 "fn_call_duration_secs",
                 "cost_per_record",
+                "cache_hits",
+                "cache_misses",
+                "num_retries",
+                "throttle_duration_secs",
             ]
         }
         # dct['raw_answers'] = self.raw_answers + other.raw_answers
@@ -77,12 +101,17 @@ class GenerationStats:
             quotient = float(quotient)
         for dataclass_field in [
             "total_input_tokens",
+            "total_cached_input_tokens",
             "total_output_tokens",
             "total_input_cost",
             "total_output_cost",
             "cost_per_record",
             "llm_call_duration_secs",
             "fn_call_duration_secs",
+            "cache_hits",
+            "cache_misses",
+            "num_retries",
+            "throttle_duration_secs",
         ]:
             setattr(self, dataclass_field, getattr(self, dataclass_field) / quotient)
         return self
@@ -96,12 +125,17 @@ class GenerationStats:
             field: getattr(self, field) / quotient
             for field in [
                 "total_input_tokens",
+                "total_cached_input_tokens",
                 "total_output_tokens",
                 "total_input_cost",
                 "total_output_cost",
                 "llm_call_duration_secs",
                 "fn_call_duration_secs",
                 "cost_per_record",
+                "cache_hits",
+                "cache_misses",
+                "num_retries",
+                "throttle_duration_secs",
             ]
         }
         dct["model_name"] = self.model_name
@@ -175,6 +209,10 @@ class RecordOpStats:
     # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
     total_input_tokens: float = 0.0
 
+    # the number of input tokens (out of total_input_tokens) which the provider served from its prompt cache
+    # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
+    total_cached_input_tokens: float = 0.0
+
     # the total number of output tokens processed by this operator; None if this operation did not use an LLM
     # typed as a float because GenerationStats may be amortized (i.e. divided) across a number of output records
     total_output_tokens: float = 0.0
@@ -198,6 +236,9 @@ class RecordOpStats:
     # (if applicable) the time (in seconds) spent executing a UDF or calling an external api
     fn_call_duration_secs: float = 0.0
 
+    # (if applicable) the time (in seconds) a scan spent waiting for its item to be read by the datareader
+    io_blocked_time: float = 0.0
+
     # (if applicable) a boolean indicating whether this is the statistics captured from a failed convert operation
     failed_convert: bool | None = None
 
@@ -235,6 +276,13 @@ class OperatorStats:
     # an OPTIONAL dictionary with more detailed information about this operation;
     op_details: dict[str, Any] = field(default_factory=dict)
 
+    # the number of input records (and bytes on disk) which were spilled to disk before being processed
+    num_spilled_records: int = 0
+    num_spilled_bytes: int = 0
+
+    # the total time (in seconds) a scan spent waiting for its items to be read by the datareader
+    total_io_blocked_time: float = 0.0
+
     def add_record_op_stats(
         self,
         record_op_stats_lst: RecordOpStats | list[RecordOpStats],
@@ -252,12 +300,16 @@ class OperatorStats:
             self.record_op_stats_lst.append(record_op_stats)
             self.total_op_time += record_op_stats.time_per_record
             self.total_op_cost += record_op_stats.cost_per_record
+            self.total_io_blocked_time += record_op_stats.io_blocked_time
 
     def __iadd__(self, op_stats: OperatorStats):
         """NOTE: we assume the execution layer guarantees these op_stats belong to the same operator."""
         self.total_op_time += op_stats.total_op_time
         self.total_op_cost += op_stats.total_op_cost
         self.record_op_stats_lst.extend(op_stats.record_op_stats_lst)
+        self.num_spilled_records += op_stats.num_spilled_records
+        self.num_spilled_bytes += op_stats.num_spilled_bytes
+        self.total_io_blocked_time += op_stats.total_io_blocked_time
         return self
 
     def to_json(self):
@@ -268,6 +320,9 @@ class OperatorStats:
             "total_op_cost": self.total_op_cost,
             "record_op_stats_lst": [record_op_stats.to_json() for record_op_stats in self.record_op_stats_lst],
             "op_details": self.op_details,
+            "num_spilled_records": self.num_spilled_records,
+            "num_spilled_bytes": self.num_spilled_bytes,
+            "total_io_blocked_time": self.total_io_blocked_time,
         }
 
 
@@ -292,6 +347,9 @@ class PlanStats:
     # total cost for plan
     total_plan_cost: float = 0.0
 
+    # time from the start of a streaming execution until its first output record(s) were yielded
+    time_to_first_result: float | None = None
+
     def __iadd__(self, plan_stats: PlanStats):
         """
         NOTE: we assume the execution layer guarantees:
@@ -315,6 +373,8 @@ class PlanStats:
     def __str__(self):
         stats = f"Total_plan_time={self.total_plan_time} \n"
         stats += f"Total_plan_cost={self.total_plan_cost} \n"
+        if self.time_to_first_result is not None:
+            stats += f"Time_to_first_result={self.time_to_first_result} \n"
         for idx, op_stats in enumerate(self.operator_stats.values()):
             stats += f"{idx}. {op_stats.op_name} time={op_stats.total_op_time} cost={op_stats.total_op_cost} \n"
         return stats
@@ -326,6 +386,7 @@ class PlanStats:
             "operator_stats": {op_id: op_stats.to_json() for op_id, op_stats in self.operator_stats.items()},
             "total_plan_time": self.total_plan_time,
             "total_plan_cost": self.total_plan_cost,
+            "time_to_first_result": self.time_to_first_result,
         }
 
 
@@ -353,6 +414,9 @@ class ExecutionStats:
     # dictionary of plan strings; useful for printing executed plans in demos
     plan_strs: dict[str, str] = field(default_factory=dict)
 
+    # peak memory usage (resident set size in MB) of the process during execution
+    peak_memory_usage_mb: float = 0.0
+
     def to_json(self):
         return {
             "execution_id": self.execution_id,
@@ -361,6 +425,7 @@ class ExecutionStats:
             "total_execution_time": self.total_execution_time,
             "total_execution_cost": self.total_execution_cost,
             "plan_strs": self.plan_strs,
+            "peak_memory_usage_mb": self.peak_memory_usage_mb,
         }
 
 
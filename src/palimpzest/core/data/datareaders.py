@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import os
+import pickle
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from io import BytesIO
 
 import modal
 import pandas as pd
-from bs4 import BeautifulSoup
 from papermage import Document
 
 from palimpzest import constants
+from palimpzest.core.data.document_cache import get_parsed_document_cache
 from palimpzest.core.lib.schemas import (
     DefaultSchema,
     File,
@@ -22,6 +25,7 @@ from palimpzest.core.lib.schemas import (
     WebPage,
     XLSFile,
 )
+from palimpzest.tools.parsing import get_parser_pool, html_to_text_with_links, parse_html
 from palimpzest.tools.pdfparser import get_text_from_pdf
 
 
@@ -35,6 +39,9 @@ class DataReader(ABC):
 
     - `__len__()`: which returns the number of elements in the data source
     - `__getitem__(idx: int)`: which takes in an `idx` and returns the element at that index
+
+    Subclasses may also override `get_batch(indices: list[int])` if they can read several items at once
+    more efficiently than one at a time (e.g. with a single request to a remote store).
     """
 
     def __init__(self, schema: type[Schema] | list[dict]) -> None:
@@ -61,6 +68,15 @@ class DataReader(ABC):
     def serialize(self) -> dict:
         return {"schema": self._schema.json_schema()}
 
+    def get_fingerprint(self) -> str | None:
+        """
+        Returns a fingerprint of the items in the data reader which changes whenever its items change. The records
+        which a previous execution computed from the items are only re-used (see MaterializationCache) while the
+        fingerprint is unchanged. By default, this returns None (i.e. computed records are never re-used), as an
+        arbitrary data reader cannot tell whether its items have changed.
+        """
+        return None
+
     @abstractmethod
     def __len__(self) -> int:
         """Returns the number of items in the data reader."""
@@ -85,6 +101,19 @@ class DataReader(ABC):
         """
         pass
 
+    def get_batch(self, indices: list[int]) -> list[dict]:
+        """
+        Returns the items from the data reader at the given indices. By default, each item is read with
+        `__getitem__`; prefetching scans read their items with this method on a dedicated I/O thread pool.
+
+        Args:
+            indices (list[int]): The indices of the items to return
+
+        Returns:
+            list[dict]: The items at the given indices (in the same order as the indices)
+        """
+        return [self[idx] for idx in indices]
+
 
 # Second level of abstraction
 class DirectoryReader(DataReader):
@@ -121,6 +150,27 @@ class DirectoryReader(DataReader):
     def __len__(self) -> int:
         return len(self.filepaths)
 
+    def get_fingerprint(self) -> str:
+        # a file is assumed to be unchanged as long as its size and modification time are unchanged
+        files = [[os.path.basename(filepath), *_get_file_stat(filepath)] for filepath in self.filepaths]
+        fingerprint = {"reader": self.__class__.__name__, "parser_options": self.get_parser_options(), "files": files}
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_parser_options(self) -> dict:
+        """Returns the options which (along with its type) determine the field values this reader parses from a file."""
+        return {}
+
+    def _get_parsed_fields(self, filepath: str, parse: Callable[[], dict]) -> dict:
+        """
+        Returns the field values which `parse` parses from the file at `filepath`. If the process-wide
+        ParsedDocumentCache is enabled, the field values are read from (or added to) the cache.
+        """
+        cache = get_parsed_document_cache()
+        if cache is None:
+            return parse()
+
+        return cache.get_or_parse(filepath, self.__class__.__name__, self.get_parser_options(), parse)
+
 
 class FileReader(DataReader):
     """FileReader returns a single dictionary with the filename and contents of a local file (in bytes)."""
@@ -145,6 +195,10 @@ class FileReader(DataReader):
     def __len__(self) -> int:
         return 1
 
+    def get_fingerprint(self) -> str:
+        fingerprint = {"reader": self.__class__.__name__, "file": [self.filepath, *_get_file_stat(self.filepath)]}
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
     def __getitem__(self, idx: int) -> dict:
         """
         Returns a dictionary with the filename and contents of the file.
@@ -195,6 +249,13 @@ class MemoryReader(DataReader):
     def __len__(self) -> int:
         return len(self.vals)
 
+    def get_fingerprint(self) -> str | None:
+        # the values are fingerprinted by their pickled bytes; values which cannot be pickled are not fingerprinted
+        try:
+            return hashlib.sha256(pickle.dumps(self.vals)).hexdigest()
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
     def __getitem__(self, idx: int) -> dict:
         """
         Returns a dictionary with the value(s) for the element at the specified `idx` in `vals`.
@@ -231,6 +292,74 @@ class MemoryReader(DataReader):
         return item
 
 
+class MaterializedResultReader(DataReader):
+    """
+    MaterializedResultReader returns the field values of the records which a previous execution computed for
+    (a prefix of) a plan, as read from the MaterializationCache. The Optimizer scans it in place of the operators
+    which computed the records. Incremental executions also use it to scan the outputs which they merged from
+    their SourceManifest.
+    """
+
+    def __init__(self, cache_id: str | None, items: list[dict], schema: Schema) -> None:
+        """
+        Constructor for the `MaterializedResultReader` class.
+
+        Args:
+            cache_id (str | None): The id of the cached records in the MaterializationCache, or None if the
+                records were not read from the cache (in which case they are not cached again)
+            items (list[dict]): The field values of each cached record
+            schema (Schema): The schema of the records output by the (prefix of the) plan
+        """
+        super().__init__(schema)
+        self.cache_id = cache_id
+        self.items = items
+
+    def serialize(self) -> dict:
+        return {
+            "schema": self.schema.json_schema(),
+            "cache_id": self.cache_id,
+            "source_type": "materialized",
+        }
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.items[idx]
+
+
+class SubsetReader(DataReader):
+    """
+    SubsetReader returns the items of another DataReader at a subset of its indices (e.g. the new or changed
+    files of a DirectoryReader which an incremental execution processes). The item at index `idx` of the
+    SubsetReader is the item at index `indices[idx]` of the underlying reader.
+    """
+
+    def __init__(self, reader: DataReader, indices: list[int]) -> None:
+        """
+        Constructor for the `SubsetReader` class.
+
+        Args:
+            reader (DataReader): The underlying data reader
+            indices (list[int]): The indices of the underlying reader's items which this reader returns
+        """
+        super().__init__(reader.schema)
+        self.reader = reader
+        self.indices = indices
+
+    def serialize(self) -> dict:
+        return {**self.reader.serialize(), "indices": self.indices}
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.reader[self.indices[idx]]
+
+    def get_batch(self, indices: list[int]) -> list[dict]:
+        return self.reader.get_batch([self.indices[idx] for idx in indices])
+
+
 # Third level of abstraction
 class HTMLFileDirectoryReader(DirectoryReader):
     """
@@ -248,20 +377,16 @@ class HTMLFileDirectoryReader(DirectoryReader):
         assert all([filename.endswith(tuple(constants.HTML_EXTENSIONS)) for filename in self.filepaths])
 
     def _html_to_text_with_links(self, html: str) -> str:
-        # Parse the HTML content
-        soup = BeautifulSoup(html, "html.parser")
+        return html_to_text_with_links(html)
 
-        # Find all hyperlink tags
-        for a in soup.find_all("a"):
-            # Check if the hyperlink tag has an 'href' attribute
-            if a.has_attr("href"):
-                # Replace the hyperlink with its text and URL in parentheses
-                a.replace_with(f"{a.text} ({a['href']})")
+    def get_parser_options(self) -> dict:
+        return {"max_html_rows": constants.MAX_HTML_ROWS}
 
-        # Extract text from the modified HTML
-        text = soup.get_text(separator="\n", strip=True)
+    def _parse_html_file(self, filepath: str) -> dict:
+        with open(filepath) as f:
+            html, text = get_parser_pool().parse(parse_html, f.read())
 
-        return text
+        return {"html": html, "text": text}
 
     def __getitem__(self, idx: int) -> dict:
         """
@@ -285,16 +410,15 @@ class HTMLFileDirectoryReader(DirectoryReader):
         item = {}
         filepath = self.filepaths[idx]
         item["filename"] = os.path.basename(filepath)
-        with open(filepath) as f:
-            text_content = f.read()
-
-        html = text_content
-        tokens = html.split()[: constants.MAX_HTML_ROWS]
-        item["html"] = " ".join(tokens)
 
-        stripped_html = self._html_to_text_with_links(text_content)
-        tokens = stripped_html.split()[: constants.MAX_HTML_ROWS]
-        item["text"] = " ".join(tokens)
+        # parse the HTML in the parser pool; if parsing times out, the file is returned without its text
+        try:
+            item.update(self._get_parsed_fields(filepath, lambda: self._parse_html_file(filepath)))
+        except TimeoutError as e:
+            print(f"Error parsing {filepath}: {e}")
+            with open(filepath) as f:
+                item["html"] = " ".join(f.read().split()[: constants.MAX_HTML_ROWS])
+            item["text"] = ""
 
         return item
 
@@ -334,10 +458,11 @@ class ImageFileDirectoryReader(DirectoryReader):
         """
         filepath = self.filepaths[idx]
         filename = os.path.basename(filepath)
-        with open(filepath, "rb") as f:
-            contents = base64.b64encode(f.read())
+        def encode_image() -> dict:
+            with open(filepath, "rb") as f:
+                return {"contents": base64.b64encode(f.read())}
 
-        return {"filename": filename, "contents": contents}
+        return {"filename": filename, **self._get_parsed_fields(filepath, encode_image)}
 
 
 class PDFFileDirectoryReader(DirectoryReader):
@@ -366,6 +491,31 @@ class PDFFileDirectoryReader(DirectoryReader):
         self.pdfprocessor = pdfprocessor
         self.file_cache_dir = file_cache_dir
 
+    def get_parser_options(self) -> dict:
+        return {"pdfprocessor": self.pdfprocessor}
+
+    def _parse_pdf(self, pdf_filename: str, pdf_bytes: bytes) -> dict:
+        if self.pdfprocessor == "modal":
+            print("handling PDF processing remotely")
+            remote_func = modal.Function.lookup("palimpzest.tools", "processPapermagePdf")
+        else:
+            remote_func = None
+
+        # generate text_content from PDF
+        if remote_func is not None:
+            doc_json_str = remote_func.remote([pdf_bytes])
+            docdict = json.loads(doc_json_str[0])
+            doc = Document.from_json(docdict)
+            text_content = ""
+            for p in doc.pages:
+                text_content += p.text
+        else:
+            text_content = get_parser_pool().parse(
+                get_text_from_pdf, pdf_filename, pdf_bytes, pdfprocessor=self.pdfprocessor, file_cache_dir=self.file_cache_dir
+            )
+
+        return {"text_contents": text_content}
+
     def __getitem__(self, idx: int) -> dict:
         """
         Returns a dictionary with the filename, raw PDF content, and parsed text content of the PDF file at the
@@ -390,22 +540,13 @@ class PDFFileDirectoryReader(DirectoryReader):
         with open(filepath, "rb") as f:
             pdf_bytes = f.read()
 
-        if self.pdfprocessor == "modal":
-            print("handling PDF processing remotely")
-            remote_func = modal.Function.lookup("palimpzest.tools", "processPapermagePdf")
-        else:
-            remote_func = None
-
-        # generate text_content from PDF
-        if remote_func is not None:
-            doc_json_str = remote_func.remote([pdf_bytes])
-            docdict = json.loads(doc_json_str[0])
-            doc = Document.from_json(docdict)
+        # parse the PDF (in the parser pool, unless it is processed remotely); if parsing times out,
+        # the file is returned without its text
+        try:
+            text_content = self._get_parsed_fields(filepath, lambda: self._parse_pdf(pdf_filename, pdf_bytes))["text_contents"]
+        except TimeoutError as e:
+            print(f"Error parsing {filepath}: {e}")
             text_content = ""
-            for p in doc.pages:
-                text_content += p.text
-        else:
-            text_content = get_text_from_pdf(pdf_filename, pdf_bytes, pdfprocessor=self.pdfprocessor, file_cache_dir=self.file_cache_dir)
 
         # construct and return item
         return {"filename": pdf_filename, "contents": pdf_bytes, "text_contents": text_content}
@@ -487,11 +628,14 @@ class XLSFileDirectoryReader(DirectoryReader):
         with open(filepath, "rb") as f:
             contents = f.read()
 
-        xls = pd.ExcelFile(BytesIO(contents), engine="openpyxl")
+        def parse_xls() -> dict:
+            xls = pd.ExcelFile(BytesIO(contents), engine="openpyxl")
+            return {"sheet_names": xls.sheet_names, "number_sheets": len(xls.sheet_names)}
 
-        return {
-            "filename": filename,
-            "contents": contents,
-            "sheet_names": xls.sheet_names,
-            "number_sheets": len(xls.sheet_names),
-        }
+        return {"filename": filename, "contents": contents, **self._get_parsed_fields(filepath, parse_xls)}
+
+
+def _get_file_stat(filepath: str) -> tuple[int, int]:
+    """Returns the size and modification time (in nanoseconds) of the file."""
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,119 @@
+"""
+This file contains the on-disk cache for the field values which the file readers parse from their files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from collections.abc import Callable
+
+from palimpzest.constants import DEFAULT_PARSED_DOC_CACHE_DIR, DEFAULT_PARSED_DOC_CACHE_MAX_BYTES
+from palimpzest.core.data.sqlite_lru_store import SqliteLRUStore
+
+# the number of bytes read at a time when hashing a file
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(filepath: str) -> str:
+    """Return the sha256 hash of the file's contents, which is read in chunks."""
+    sha256 = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+class ParsedDocumentCache(SqliteLRUStore):
+    """
+    A persistent, content-addressed cache mapping (the hash of a file's contents, the type of the reader which
+    parsed it, and the reader's parser options) to the field values which the reader parsed from the file.
+    Thus, identical files are parsed once, and a file is parsed again if its contents or the parser change.
+
+    To avoid re-hashing unchanged files, the cache also stores each file's content hash along with its path,
+    modification time, and size; a file is only hashed again once one of these changes.
+
+    The cache is backed by a single SQLite file in `cache_dir` and is bounded to `max_bytes` bytes of (pickled)
+    field values; once this bound is exceeded, the least recently used entries are evicted. The cache may be
+    shared across threads (e.g. by the I/O threads of prefetching scans).
+    """
+    def __init__(self, cache_dir: str = DEFAULT_PARSED_DOC_CACHE_DIR, max_bytes: int = DEFAULT_PARSED_DOC_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.num_files_hashed = 0
+        super().__init__(os.path.join(cache_dir, "parsed_documents.sqlite"), max_bytes=max_bytes)
+
+    def _create_tables(self) -> None:
+        super()._create_tables()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, content_hash TEXT)"
+        )
+
+    def get_key(self, filepath: str, reader_type: str, parser_options: dict) -> str:
+        """Compute the key for the field values which a reader of the given type (and options) parses from the file."""
+        options = json.dumps(parser_options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{self.get_content_hash(filepath)}:{reader_type}:{options}".encode()).hexdigest()
+
+    def get_content_hash(self, filepath: str) -> str:
+        """Return the hash of the file's contents; the file is only read if it changed since it was last hashed."""
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns, size, content_hash FROM fingerprints WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return row[2]
+
+        content_hash = hash_file(path)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (path, mtime_ns, size, content_hash) VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, content_hash),
+            )
+            self.num_files_hashed += 1
+
+        return content_hash
+
+    def get(self, key: str) -> dict | None:
+        """Return the field values for the given key, or None if the key is not cached."""
+        return self._get_value(key, pickle.loads)
+
+    def put(self, key: str, field_values: dict) -> None:
+        """Insert (or replace) the field values for the given key and evict the LRU entries beyond max_bytes."""
+        self._put_value(key, pickle.dumps(field_values))
+
+    def get_or_parse(self, filepath: str, reader_type: str, parser_options: dict, parse: Callable[[], dict]) -> dict:
+        """Return the cached field values for the file, or parse (and cache) them if they are not cached."""
+        key = self.get_key(filepath, reader_type, parser_options)
+        field_values = self.get(key)
+        if field_values is None:
+            field_values = parse()
+            self.put(key, field_values)
+
+        return field_values
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        with self._lock:
+            return {**stats, "num_files_hashed": self.num_files_hashed}
+
+    def clear(self) -> None:
+        super().clear()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM fingerprints")
+        self.num_files_hashed = 0
+
+
+# the process-wide parsed document cache used by all file readers; None means caching is disabled
+_PARSED_DOCUMENT_CACHE: ParsedDocumentCache | None = None
+
+
+def get_parsed_document_cache() -> ParsedDocumentCache | None:
+    return _PARSED_DOCUMENT_CACHE
+
+
+def set_parsed_document_cache(cache: ParsedDocumentCache | None) -> None:
+    global _PARSED_DOCUMENT_CACHE
+    _PARSED_DOCUMENT_CACHE = cache
@@ -0,0 +1,124 @@
+"""
+This file contains the manifest of the source files (and of their outputs) which incremental executions have processed.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from palimpzest.constants import DEFAULT_MANIFEST_DIR
+
+
+@dataclass
+class ManifestEntry:
+    """The fingerprint of a source file and the outputs which an incremental execution computed for it."""
+    filepath: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+    # the field values of the records which the plan's per-record operators output for the file
+    outputs: list[dict]
+
+    # the partial state of the plan's first aggregate over the outputs (if the aggregate supports partial
+    # aggregation and its state can be pickled), along with the number of records folded into it
+    partial_state: Any = None
+    num_partial_records: int = 0
+
+
+class SourceManifest:
+    """
+    A persistent manifest of the source files which incremental executions of a plan have processed. For each
+    plan (identified by a key which is computed from its source directory and operators) and file, the manifest
+    stores the file's size, modification time, and content hash, along with the outputs which the plan computed
+    for the file; thus, a subsequent execution of the plan only needs to process the files which are new or
+    whose contents changed. The manifest is backed by a single SQLite file in `manifest_dir`.
+    """
+    def __init__(self, manifest_dir: str = DEFAULT_MANIFEST_DIR):
+        self.manifest_dir = manifest_dir
+
+        # create the manifest directory (if necessary) and the manifest table
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        self.path = os.path.join(self.manifest_dir, "manifest.sqlite")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "plan_key TEXT, filepath TEXT, size INTEGER, mtime_ns INTEGER, content_hash TEXT, outputs BLOB, "
+                "partial_state BLOB, num_partial_records INTEGER, PRIMARY KEY (plan_key, filepath))"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_entries(self, plan_key: str) -> dict[str, ManifestEntry]:
+        """Return a mapping from the path of each file in the plan's manifest to its entry."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filepath, size, mtime_ns, content_hash, outputs, partial_state, num_partial_records "
+                "FROM entries WHERE plan_key = ?",
+                (plan_key,),
+            ).fetchall()
+
+        return {
+            filepath: ManifestEntry(
+                filepath=filepath,
+                size=size,
+                mtime_ns=mtime_ns,
+                content_hash=content_hash,
+                outputs=pickle.loads(outputs),
+                partial_state=None if partial_state is None else pickle.loads(partial_state),
+                num_partial_records=num_partial_records,
+            )
+            for filepath, size, mtime_ns, content_hash, outputs, partial_state, num_partial_records in rows
+        }
+
+    def update(self, plan_key: str, entries: list[ManifestEntry], deleted_filepaths: list[str]) -> None:
+        """Insert (or replace) the entries and remove the entries of the deleted files in a single transaction."""
+        rows = []
+        for entry in entries:
+            # the partial state is an optimization; if it cannot be pickled, the aggregate is recomputed from the outputs
+            try:
+                partial_state = None if entry.partial_state is None else pickle.dumps(entry.partial_state)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                partial_state = None
+            rows.append((
+                plan_key,
+                entry.filepath,
+                entry.size,
+                entry.mtime_ns,
+                entry.content_hash,
+                pickle.dumps(entry.outputs),
+                partial_state,
+                entry.num_partial_records if partial_state is not None else 0,
+            ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (plan_key, filepath, size, mtime_ns, content_hash, outputs, "
+                "partial_state, num_partial_records) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "DELETE FROM entries WHERE plan_key = ? AND filepath = ?",
+                [(plan_key, filepath) for filepath in deleted_filepaths],
+            )
+
+    def clear(self, plan_key: str | None = None) -> None:
+        """Remove the entries of the given plan (or of every plan if plan_key is None)."""
+        with self._lock, self._conn:
+            if plan_key is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE plan_key = ?", (plan_key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,115 @@
+"""
+This file contains the on-disk cache for the records which executions compute for (prefixes of) plans.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+
+from palimpzest.constants import DEFAULT_MATERIALIZATION_CACHE_DIR, DEFAULT_MATERIALIZATION_CACHE_MAX_BYTES
+from palimpzest.core.data.datareaders import DataReader, MaterializedResultReader
+from palimpzest.core.data.sqlite_lru_store import SqliteLRUStore
+from palimpzest.core.elements.records import DataRecord
+
+
+class MaterializationCache(SqliteLRUStore):
+    """
+    A persistent cache of the records which were output by each operator of a plan in a previous execution.
+
+    The output of an operator is keyed by its lineage: the fingerprint of the plan's DataReader (see
+    DataReader.get_fingerprint()) followed by the `target_cache_id` of each operator up to (and including)
+    it, in the order in which they were executed. An operator's target_cache_id is the universal identifier
+    of the Dataset it computes, thus two executions share a cache id only if they applied the same operations
+    (in the same order) to the same data. The Optimizer replaces the longest prefix of a plan whose output is
+    cached with a CacheScan of its records (see get_cache_id() and get_source_cache_id()).
+
+    An execution buffers the records output by each operator with append_cache() and writes them to the cache
+    with close_cache() once it has finished; thus, the outputs of executions which fail (or are stopped early)
+    are never cached. The cache is backed by a single SQLite file in `cache_dir` and is bounded to `max_bytes`
+    bytes of (pickled) field values; once this bound is exceeded, the least recently used results are evicted.
+    """
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_MATERIALIZATION_CACHE_DIR,
+        max_bytes: int = DEFAULT_MATERIALIZATION_CACHE_MAX_BYTES,
+    ):
+        self.cache_dir = cache_dir
+
+        # the (source_idx, field values) of the records buffered for each cache id
+        self._buffers: dict[str, list[tuple[int, dict]]] = {}
+
+        super().__init__(os.path.join(cache_dir, "materialized_results.sqlite"), max_bytes=max_bytes)
+
+    @staticmethod
+    def get_source_cache_id(datareader: DataReader) -> str | None:
+        """Return the cache id of the records scanned from the DataReader, or None if its items cannot be fingerprinted."""
+        # the records read from the cache continue the lineage of the operators which computed them
+        if isinstance(datareader, MaterializedResultReader):
+            return datareader.cache_id
+
+        fingerprint = datareader.get_fingerprint()
+        if fingerprint is None:
+            return None
+
+        return hashlib.sha256(f"{datareader.__class__.__name__}:{fingerprint}".encode()).hexdigest()
+
+    @staticmethod
+    def get_cache_id(input_cache_id: str, target_cache_id: str) -> str:
+        """Return the cache id of the records output by applying the operator with the target_cache_id to the input records."""
+        return hashlib.sha256(f"{input_cache_id}:{target_cache_id}".encode()).hexdigest()
+
+    def open_cache(self, cache_id: str) -> None:
+        """Discard any records which were buffered for the cache id (e.g. by an execution which failed)."""
+        with self._lock:
+            self._buffers.pop(cache_id, None)
+
+    def append_cache(self, cache_id: str, records: list[DataRecord]) -> None:
+        """Buffer the records (which are not filtered out) which an operator output for the cache id."""
+        with self._lock:
+            buffer = self._buffers.setdefault(cache_id, [])
+            for record in records:
+                if getattr(record, "passed_operator", True):
+                    buffer.append((record.source_idx, record.field_values))
+
+    def close_cache(self, cache_id: str) -> None:
+        """
+        Write the records buffered for the cache id to the cache, in the order of their source records. Nothing
+        is written if no records were buffered (i.e. the operator did not run), or if the records cannot be pickled
+        or exceed max_bytes.
+        """
+        with self._lock:
+            buffer = self._buffers.pop(cache_id, None)
+        if buffer is None:
+            return
+
+        # sort the records by their source records, as parallel executions output records out of order
+        items = [field_values for _, field_values in sorted(buffer, key=lambda item: item[0])]
+        try:
+            blob = pickle.dumps(items)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+
+        self._put_value(cache_id, blob)
+
+    def get_cached_result(self, cache_id: str) -> list[dict] | None:
+        """Return the field values of the records cached for the cache id, or None if no records are cached for it."""
+        return self._get_value(cache_id, pickle.loads)
+
+    def clear(self) -> None:
+        super().clear()
+        with self._lock:
+            self._buffers = {}
+
+
+# the process-wide materialization cache used by the Optimizer and the execution strategies; None means caching is disabled
+_MATERIALIZATION_CACHE: MaterializationCache | None = None
+
+
+def get_materialization_cache() -> MaterializationCache | None:
+    return _MATERIALIZATION_CACHE
+
+
+def set_materialization_cache(cache: MaterializationCache | None) -> None:
+    global _MATERIALIZATION_CACHE
+    _MATERIALIZATION_CACHE = cache
@@ -0,0 +1,146 @@
+"""
+This file contains the SQLite-backed LRU store on which PZ's on-disk caches are built.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SqliteLRUStore:
+    """
+    A persistent store mapping string keys to (encoded) values, backed by a single SQLite file at `path`.
+
+    The store is bounded to `max_entries` entries and/or `max_bytes` bytes of values (a bound of None is not
+    enforced); once a bound is exceeded, the least recently used entries are evicted. The store keeps count of
+    the hits and misses of its lookups and may be shared across threads. Subclasses encode their values as
+    bytes, and may create (and clear) tables of their own by extending _create_tables() and clear().
+    """
+    def __init__(self, path: str, max_entries: int | None = None, max_bytes: int | None = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._last_access = 0.0
+
+        # create the parent directory (if necessary) and the store's tables
+        if os.path.dirname(self.path) != "":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._create_tables()
+            self._num_entries, self._num_bytes, self._last_access = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(num_bytes), 0), COALESCE(MAX(last_access), 0) FROM entries"
+            ).fetchone()
+
+    def _create_tables(self) -> None:
+        """Create the store's tables (if they do not exist). Requires the lock."""
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, num_bytes INTEGER, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+
+    def __len__(self) -> int:
+        return self._num_entries
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    @property
+    def num_bytes(self) -> int:
+        return self._num_bytes
+
+    def _get_access_time(self) -> float:
+        """Return the current time, made strictly increasing so that accesses are ordered for LRU eviction. Requires the lock."""
+        self._last_access = max(time.time(), self._last_access + 1e-6)
+        return self._last_access
+
+    def _get_value(self, key: str, decode: Callable[[bytes], T]) -> T | None:
+        """
+        Return the decoded value for the given key, or None if the key is not stored. Values which cannot be
+        decoded (e.g. because a class they reference has changed) are treated as a miss.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                # update the entry's access time so that LRU eviction sees it as recently used
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (self._get_access_time(), key))
+
+        value = None
+        if row is not None:
+            try:
+                value = decode(row[0])
+            except Exception:
+                value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return value
+
+    def _put_value(self, key: str, value: bytes) -> bool:
+        """
+        Insert (or replace) the encoded value for the given key and evict the LRU entries beyond the store's
+        bounds. Returns False (and stores nothing) if the value alone exceeds max_bytes.
+        """
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return False
+
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT num_bytes FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, num_bytes, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), self._get_access_time()),
+            )
+            self._num_entries += 0 if row is not None else 1
+            self._num_bytes += len(value) - (row[0] if row is not None else 0)
+            self._evict()
+
+        return True
+
+    def _is_over_bounds(self, num_entries: int, num_bytes: int) -> bool:
+        return (
+            (self.max_entries is not None and num_entries > self.max_entries)
+            or (self.max_bytes is not None and num_bytes > self.max_bytes)
+        )
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries until the store is within its bounds. Requires the lock."""
+        if not self._is_over_bounds(self._num_entries, self._num_bytes):
+            return
+
+        keys_to_evict, num_bytes_to_evict = [], 0
+        for key, num_bytes in self._conn.execute("SELECT key, num_bytes FROM entries ORDER BY last_access ASC"):
+            if not self._is_over_bounds(self._num_entries - len(keys_to_evict), self._num_bytes - num_bytes_to_evict):
+                break
+            keys_to_evict.append(key)
+            num_bytes_to_evict += num_bytes
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys_to_evict])
+        self._num_entries -= len(keys_to_evict)
+        self._num_bytes -= num_bytes_to_evict
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "num_bytes": self._num_bytes}
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+        self._num_entries, self._num_bytes, self.hits, self.misses = 0, 0, 0, 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
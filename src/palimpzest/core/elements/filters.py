@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import Any, Callable
 
+from palimpzest.utils.hash_helpers import hash_callable
+
 
 #############################
 # Filters that can be applied against a particular Schema
 #############################
-# TODO: think through a way to give filter functions fixed strings that could not be affected by a copy
-#       potentially changing the address of a function; I don't think this happens today, but it's worth safeguarding against
 class Filter:
     """A filter that can be applied to a Set"""
 
@@ -15,18 +15,23 @@ class Filter:
         self.filter_condition = filter_condition
         self.filter_fn = filter_fn
 
+        # str(filter_fn) embeds the function's memory address; the filter function is identified by a stable hash instead
+        self.filter_fn_id = None if filter_fn is None else hash_callable(filter_fn)
+
     def serialize(self) -> dict[str, Any]:
-        return {"filter_condition": self.filter_condition, "filter_fn": str(self.filter_fn)}
+        return {"filter_condition": self.filter_condition, "filter_fn": self.filter_fn_id}
 
     def get_filter_str(self) -> str:
-        return self.filter_condition if self.filter_condition is not None else str(self.filter_fn)
+        if self.filter_condition is not None or self.filter_fn is None:
+            return str(self.filter_condition)
+        return f"{getattr(self.filter_fn, '__qualname__', type(self.filter_fn).__name__)}@{self.filter_fn_id}"
 
     def __repr__(self) -> str:
         return "Filter(" + self.get_filter_str() + ")"
 
     def __hash__(self) -> int:
         # custom hash function
-        return hash(self.filter_condition) if self.filter_condition is not None else hash(str(self.filter_fn))
+        return hash(self.filter_condition) if self.filter_condition is not None else hash(self.filter_fn_id)
 
     def __eq__(self, other) -> bool:
         # __eq__ should be defined for consistency with __hash__
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+import sys
 from collections.abc import Generator
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from palimpzest.core.data.dataclasses import ExecutionStats, PlanStats, RecordOpStats
@@ -11,9 +13,33 @@ from palimpzest.core.lib.fields import Field
 from palimpzest.core.lib.schemas import Schema
 from palimpzest.utils.hash_helpers import hash_for_id
 
+# sentinel for the values of fields which have not been set on a DataRecord
+_UNSET = object()
+
 
 class DataRecord:
-    """A DataRecord is a single record of data matching some Schema."""
+    """
+    A DataRecord is a single record of data matching some Schema.
+
+    To keep records compact, the values of the schema's fields are stored in a list which is indexed by the
+    schema's (shared) field offset table, and the field types are shared by reference with the schema.
+    Values for fields which are not in the schema are kept in a separate dictionary.
+    """
+
+    __slots__ = (
+        "schema",
+        "_field_offsets",
+        "_values",
+        "_extra_values",
+        "source_idx",
+        "parent_id",
+        "cardinality_idx",
+        "passed_operator",
+        "id",
+    )
+
+    # attributes of the record (rather than fields of its schema) which may be set on a record
+    _RECORD_ATTRS = frozenset(["schema", "source_idx", "parent_id", "cardinality_idx", "passed_operator", "id"])
 
     def __init__(
         self,
@@ -25,26 +51,27 @@ class DataRecord:
         # check that source_idx is provided
         assert source_idx is not None, "Every DataRecord must be constructed with a source_idx"
 
+        # NOTE: we set slots with object.__setattr__() to bypass the field routing in DataRecord.__setattr__()
         # schema for the data record
-        self.schema = schema
-
-        # mapping from field names to Field objects; effectively a mapping from a field name to its type        
-        self.field_types: dict[str, Field] = schema.field_map()
+        object.__setattr__(self, "schema", schema)
 
-        # mapping from field names to their values
-        self.field_values: dict[str, Any] = {}
+        # the values of the schema's fields (indexed by the schema's field offsets) and of any other fields
+        field_offsets = schema._field_offsets
+        object.__setattr__(self, "_field_offsets", field_offsets)
+        object.__setattr__(self, "_values", [_UNSET] * len(field_offsets))
+        object.__setattr__(self, "_extra_values", None)
 
         # the index in the DataReader from which this DataRecord is derived
-        self.source_idx = source_idx
+        object.__setattr__(self, "source_idx", source_idx)
 
         # the id of the parent record(s) from which this DataRecord is derived
-        self.parent_id = parent_id
+        object.__setattr__(self, "parent_id", parent_id)
 
         # store the cardinality index
-        self.cardinality_idx = cardinality_idx
+        object.__setattr__(self, "cardinality_idx", cardinality_idx)
 
         # indicator variable which may be flipped by filter operations to signal when a record has been filtered out
-        self.passed_operator = True
+        object.__setattr__(self, "passed_operator", True)
 
         # NOTE: Record ids are hashed based on:
         # 0. their schema (keys)
@@ -65,27 +92,51 @@ class DataRecord:
         )
         # TODO(Jun): build-in id should has a special name, the current self.id is too general which would conflict with user defined schema too easily.
         # the options: built_in_id, generated_id
-        self.id = hash_for_id(id_str)
+        object.__setattr__(self, "id", hash_for_id(id_str))
 
 
     def __setattr__(self, name: str, value: Any, /) -> None:
-        if name in ["schema", "field_types", "field_values", "source_idx", "parent_id", "cardinality_idx", "passed_operator", "id"]:
-            super().__setattr__(name, value)
+        if name in self._RECORD_ATTRS:
+            object.__setattr__(self, name, value)
+            return
+
+        offset = self._field_offsets.get(name)
+        if offset is not None:
+            self._values[offset] = value
+        elif self._extra_values is None:
+            object.__setattr__(self, "_extra_values", {name: value})
         else:
-            self.field_values[name] = value
+            self._extra_values[name] = value
 
 
     def __getattr__(self, name: str) -> Any:
-        if name == "field_values":
-            pass
-        elif name in self.field_values:
-            return self.field_values[name]
-        else:
-            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        # this is only called if the attribute is not a (set) slot or a method; we must not look up fields for
+        # slots and dunder attributes, which may be requested before the slots are set (e.g. when unpickling)
+        if not name.startswith("__") and name not in DataRecord.__slots__:
+            value = self._get_field_value(name)
+            if value is not _UNSET:
+                return value
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+
+    def __getstate__(self) -> dict:
+        # the field offsets are a (non-picklable) view of the schema's field offset table
+        return {slot: getattr(self, slot) for slot in DataRecord.__slots__ if slot != "_field_offsets"}
+
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+        object.__setattr__(self, "_field_offsets", state["schema"]._field_offsets)
 
 
     def __getitem__(self, field: str) -> Any:
-        return self.__getattr__(field)
+        value = self._get_field_value(field)
+        if value is _UNSET:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{field}'")
+
+        return value
 
 
     def __setitem__(self, field: str, value: Any) -> None:
@@ -111,15 +162,65 @@ class DataRecord:
 
 
     def __iter__(self):
-        yield from self.field_values.items()
+        yield from self._iter_field_items()
+
+
+    def _get_field_value(self, field_name: str) -> Any:
+        """Return the value of the field (or _UNSET if the field has not been set)."""
+        offset = self._field_offsets.get(field_name)
+        if offset is not None:
+            return self._values[offset]
+
+        return _UNSET if self._extra_values is None else self._extra_values.get(field_name, _UNSET)
+
+
+    def _iter_field_items(self) -> Generator[tuple[str, Any], None, None]:
+        """Yield the (name, value) of each field which has been set (in the order of the schema's fields)."""
+        values = self._values
+        for field_name, offset in self._field_offsets.items():
+            value = values[offset]
+            if value is not _UNSET:
+                yield field_name, value
+
+        if self._extra_values is not None:
+            yield from self._extra_values.items()
+
+
+    @property
+    def field_values(self) -> dict[str, Any]:
+        """A mapping from the name of each field which has been set to its value."""
+        return dict(self._iter_field_items())
+
+
+    @property
+    def field_types(self) -> dict[str, Field]:
+        """A mapping from field names to Field objects; effectively a mapping from a field name to its type."""
+        return self.schema.field_map()
 
 
     def get_field_names(self):
-        return list(self.field_values.keys())
+        return [field_name for field_name, _ in self._iter_field_items()]
 
 
     def get_field_type(self, field_name: str) -> Field:
-        return self.field_types[field_name]
+        return self.schema._field_table[field_name]
+
+
+    def get_size_in_bytes(self) -> int:
+        """
+        Estimate the number of bytes held by this record. Field values which are lists, tuples, or dicts
+        (e.g. the images of an ImageFile) are measured one level deep; values shared with other records
+        (e.g. a parent record's contents) are counted in full.
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(self._values)
+        for _, value in self._iter_field_items():
+            size += sys.getsizeof(value)
+            if isinstance(value, (list, tuple)):
+                size += sum(sys.getsizeof(item) for item in value)
+            elif isinstance(value, dict):
+                size += sum(sys.getsizeof(item) for item in value.values())
+
+        return size
 
 
     def copy(self, include_bytes: bool = True, project_cols: list[str] | None = None):
@@ -135,9 +236,8 @@ class DataRecord:
         copy_field_names = project_cols if project_cols is not None else self.get_field_names()
         copy_field_names = [field.split(".")[-1] for field in copy_field_names]
 
-        # copy field types and values from the parent
+        # copy field values from the parent; the field types are shared through the schema
         for field_name in copy_field_names:
-            field_type = self.get_field_type(field_name)
             field_value = self[field_name]
             if (
                 not include_bytes
@@ -146,8 +246,7 @@ class DataRecord:
             ):
                 continue
 
-            # set field and value
-            new_dr.field_types[field_name] = field_type
+            # set field value
             new_dr[field_name] = field_value
 
         return new_dr
@@ -177,18 +276,17 @@ class DataRecord:
             cardinality_idx=cardinality_idx,
         )
 
-        # get the set of fields and field descriptions to copy from the parent record
-        copy_field_names = project_cols if project_cols is not None else parent_record.get_field_names()
-        copy_field_names = [field.split(".")[-1] for field in copy_field_names]
-
-        # copy fields from the parent
-        for field_name in copy_field_names:
-            new_dr.field_types[field_name] = parent_record.get_field_type(field_name)
-            new_dr[field_name] = parent_record[field_name]
+        # copy field values from the parent; the field types are shared through the new schema
+        if project_cols is None:
+            for field_name, field_value in parent_record._iter_field_items():
+                new_dr[field_name] = field_value
+        else:
+            for field in project_cols:
+                field_name = field.split(".")[-1]
+                new_dr[field_name] = parent_record[field_name]
 
         return new_dr
 
-
     @staticmethod
     def from_agg_parents(
         schema: Schema,
@@ -213,6 +311,23 @@ class DataRecord:
         pass
 
 
+    @staticmethod
+    def get_column(records: list[DataRecord], field_name: str) -> list[Any]:
+        """
+        Return the value of the field on each of the records, reading each value through its record's field offset
+        table rather than through attribute access. Raises an AttributeError if the field is not set on every record.
+        """
+        values = [
+            record._values[offset] if (offset := record._field_offsets.get(field_name)) is not None
+            else record._get_field_value(field_name)
+            for record in records
+        ]
+        if any(value is _UNSET for value in values):
+            raise AttributeError(f"DataRecord has no attribute '{field_name}'")
+
+        return values
+
+
     @staticmethod
     def from_df(df: pd.DataFrame, schema: Schema | None = None) -> list[DataRecord]:
         """Create a list of DataRecords from a pandas DataFrame
@@ -231,12 +346,10 @@ class DataRecord:
         if schema is None:
             schema = Schema.from_df(df)
 
-        field_map = schema.field_map()
         for source_idx, row in df.iterrows():
-            row_dict = row.to_dict()
             record = DataRecord(schema=schema, source_idx=source_idx)
-            record.field_values = row_dict
-            record.field_types = {field_name: field_map[field_name] for field_name in row_dict}
+            for field_name, field_value in row.to_dict().items():
+                record[field_name] = field_value
             records.append(record)
 
         return records
@@ -266,9 +379,11 @@ class DataRecord:
 
     def to_dict(self, include_bytes: bool = True, project_cols: list[str] | None = None):
         """Return a dictionary representation of this DataRecord"""
-        # TODO(chjun): In case of numpy types, the json.dumps will fail. Convert to native types.
-        # Better ways to handle this.
-        dct = pd.Series(self.field_values).to_dict()
+        # NOTE: numpy scalars are converted to native types, as json.dumps would fail on them
+        dct = {
+            field_name: field_value.item() if isinstance(field_value, np.generic) else field_value
+            for field_name, field_value in self._iter_field_items()
+        }
 
         if project_cols is not None and len(project_cols) > 0:
             project_field_names = set(field.split(".")[-1] for field in project_cols)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from types import MappingProxyType
 from typing import Any as TypingAny
 
 import pandas as pd
@@ -22,15 +23,72 @@ from palimpzest.utils.field_helpers import construct_field_type
 
 class SchemaMetaclass(type):
     """
-    This is a metaclass for our Schema class.
+    This is a metaclass for our Schema class. It builds the (ordered) table of the schema's fields and
+    its description once when the class is created, so that field introspection does not need to call
+    dir() and getattr() on the class.
     """
 
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        cls._build_field_table()
+
+    def __setattr__(cls, name: str, value: TypingAny) -> None:
+        type.__setattr__(cls, name, value)
+
+        # schemas should be immutable after their creation; however, if a field is (re-)assigned we rebuild
+        # the field table of the schema and its subclasses
+        if isinstance(value, Field) or name in cls._field_table:
+            cls._build_field_table()
+
+    def __delattr__(cls, name: str) -> None:
+        type.__delattr__(cls, name)
+        if name in cls._field_table:
+            cls._build_field_table()
+
+    def _build_field_table(cls) -> None:
+        """
+        Build the immutable mapping from field names to Fields (ordered by field name, i.e. the order of
+        dir(cls)) and the description of the schema which is returned by get_desc(). This also builds
+        the mapping from field names to their offsets in a DataRecord's values, which orders the fields
+        by their declaration (base class fields first).
+        """
+        field_table = {
+            attr: getattr(cls, attr)
+            for attr in dir(cls)
+            if not attr.startswith("__") and isinstance(getattr(cls, attr), Field)
+        }
+        desc = {field_name: hash(field) for field_name, field in field_table.items()}
+        desc["__class__"] = cls.__name__
+
+        declared_field_names = {}
+        for klass in reversed(cls.__mro__):
+            for attr in vars(klass):
+                if attr in field_table:
+                    declared_field_names[attr] = None
+        field_offsets = {field_name: offset for offset, field_name in enumerate(declared_field_names)}
+
+        type.__setattr__(cls, "_field_table", MappingProxyType(field_table))
+        type.__setattr__(cls, "_field_offsets", MappingProxyType(field_offsets))
+        type.__setattr__(cls, "_schema_desc", json.dumps(desc, sort_keys=True))
+
+        for subclass in type.__subclasses__(cls):
+            subclass._build_field_table()
+
     def __eq__(cls, other) -> bool:
         """
         Equality function for the Schema which checks that the ordered fields and class names are the same.
         """
         return cls.get_desc() == other.get_desc()
 
+    def __hash__(cls) -> int:
+        return hash(cls.get_desc())
+
+
+# dynamic schemas created by Schema.union(), Schema.project(), and Schema.add_fields(), keyed by the id(s) of
+# the schema(s) they were created from and their arguments; each entry holds a reference to the schema(s) it
+# was created from so that their ids cannot be re-used while the entry exists
+_DYNAMIC_SCHEMAS: dict[tuple, tuple[tuple, type[Schema]]] = {}
+
 
 class Schema(metaclass=SchemaMetaclass):
     """
@@ -73,11 +131,7 @@ class Schema(metaclass=SchemaMetaclass):
     @classmethod
     def get_desc(cls) -> str:
         """Return a description of the schema"""
-        fields = cls.field_names()
-        d = {k: hash(getattr(cls, k)) for k in fields}
-        d["__class__"] = cls.class_name()
-
-        return json.dumps(d, sort_keys=True)
+        return cls._schema_desc
 
     @classmethod
     def field_names(cls, unique=False, id="") -> list[str]:
@@ -86,11 +140,11 @@ class Schema(metaclass=SchemaMetaclass):
         class name should be prefixed to the field name for unique identification. The `id` argument is
         used to provide a unique identifier for the class name.
         """
-        attributes = dir(cls)
-        attributes = [attr for attr in attributes if not attr.startswith("__")]
-        prefix = f"{cls.__name__}.{id}." if unique else ""
-        fields = [prefix + attr for attr in attributes if isinstance(getattr(cls, attr), Field)]
-        return fields
+        if not unique:
+            return list(cls._field_table)
+
+        prefix = f"{cls.__name__}.{id}."
+        return [prefix + field_name for field_name in cls._field_table]
 
     @classmethod
     def field_desc_map(cls, unique=False, id="") -> dict[str, str]:
@@ -99,13 +153,8 @@ class Schema(metaclass=SchemaMetaclass):
         class name should be prefixed to the field name for unique identification. The `id` argument is
         used to provide a unique identifier for the class name.
         """
-        attributes = dir(cls)
-        attributes = [attr for attr in attributes if not attr.startswith("__")]
         prefix = f"{cls.__name__}.{id}." if unique else ""
-        field_desc_map = {
-            prefix + attr: getattr(cls, attr)._desc for attr in attributes if isinstance(getattr(cls, attr), Field)
-        }
-        return field_desc_map
+        return {prefix + field_name: field._desc for field_name, field in cls._field_table.items()}
 
     @classmethod
     def field_map(cls, unique=False, id="") -> dict[str, Field]:
@@ -114,11 +163,11 @@ class Schema(metaclass=SchemaMetaclass):
         class name should be prefixed to the field name for unique identification. The `id` argument is used to
         provide a unique identifier for the class name.
         """
-        attributes = dir(cls)
-        attributes = [attr for attr in attributes if not attr.startswith("__")]
-        prefix = f"{cls.__name__}.{id}." if unique else ""
-        field_map = {prefix + attr: getattr(cls, attr) for attr in attributes if isinstance(getattr(cls, attr), Field)}
-        return field_map
+        if not unique:
+            return dict(cls._field_table)
+
+        prefix = f"{cls.__name__}.{id}."
+        return {prefix + field_name: field for field_name, field in cls._field_table.items()}
 
     @classmethod
     def json_schema(cls) -> dict[str, TypingAny]:
@@ -149,6 +198,10 @@ class Schema(metaclass=SchemaMetaclass):
     @classmethod
     def union(cls, other_schema: Schema, keep_duplicates: bool = False) -> Schema:
         """Return the union of this schema with the other_schema"""
+        key = ("union", id(cls), id(other_schema), keep_duplicates)
+        if key in _DYNAMIC_SCHEMAS:
+            return _DYNAMIC_SCHEMAS[key][1]
+
         # construct the new schema name
         schema_name = cls.class_name()
         other_schema_name = other_schema.class_name()
@@ -206,11 +259,18 @@ class Schema(metaclass=SchemaMetaclass):
         new_schema_name = f"Schema[{sorted(new_field_names)}]"
 
         # Create the class dynamically
-        return type(new_schema_name, (Schema,), attributes)
+        new_schema = type(new_schema_name, (Schema,), attributes)
+        _DYNAMIC_SCHEMAS[key] = ((cls, other_schema), new_schema)
+
+        return new_schema
 
     @classmethod
     def project(cls, project_cols: list[str]) -> Schema:
         """Return a projection of this schema with only the project_cols"""
+        key = ("project", id(cls), tuple(project_cols))
+        if key in _DYNAMIC_SCHEMAS:
+            return _DYNAMIC_SCHEMAS[key][1]
+
         # construct the new schema name
         schema_name = cls.class_name()
 
@@ -238,7 +298,10 @@ class Schema(metaclass=SchemaMetaclass):
         new_schema_name = f"Schema[{sorted(new_field_names)}]"
 
         # Create the class dynamically
-        return type(new_schema_name, (Schema,), attributes)
+        new_schema = type(new_schema_name, (Schema,), attributes)
+        _DYNAMIC_SCHEMAS[key] = ((cls,), new_schema)
+
+        return new_schema
 
     @staticmethod
     def from_df(df: pd.DataFrame) -> Schema:
@@ -293,6 +356,10 @@ class Schema(metaclass=SchemaMetaclass):
             assert "desc" in field, "fields must contain a 'desc' key"
             assert "type" in field, "fields must contain a 'type' key"
 
+        key = ("add_fields", id(cls), tuple((field["name"], field["desc"], field["type"]) for field in fields))
+        if key in _DYNAMIC_SCHEMAS:
+            return _DYNAMIC_SCHEMAS[key][1]
+
         # build up field names, descriptions, and types
         new_field_names = [field["name"] for field in fields]
         new_field_objs = [
@@ -309,7 +376,10 @@ class Schema(metaclass=SchemaMetaclass):
         new_output_schema = type(f"{cls.__name__}Extended", (Schema,), attributes)
 
         # return the union of this new schema with the cls
-        return cls.union(new_output_schema)
+        new_schema = cls.union(new_output_schema)
+        _DYNAMIC_SCHEMAS[key] = ((cls,), new_schema)
+
+        return new_schema
 
     @classmethod
     def class_name(cls) -> str:
@@ -0,0 +1,133 @@
+"""This file contains prompts for batched filter and convert operations, which process multiple input records in a single prompt."""
+
+### BASE PROMPTS ###
+COT_BOOL_BATCH_BASE_SYSTEM_PROMPT = """You are a helpful assistant whose job is to {job_instruction}.
+You will be presented with a numbered list of contexts and a filter condition. For each context, output TRUE if the context satisfies the filter condition, and FALSE otherwise.
+
+{output_format_instruction} Finish your response with a newline character followed by ---
+
+An example is shown below:
+---
+INPUT FIELDS:
+{example_input_fields}
+
+CONTEXTS:
+{example_context}
+
+FILTER CONDITION: {example_filter_condition}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: {example_reasoning}
+
+ANSWER:
+{example_answer}
+---
+"""
+
+COT_BOOL_BATCH_BASE_USER_PROMPT = """You are a helpful assistant whose job is to {job_instruction}.
+You will be presented with a numbered list of contexts and a filter condition. For each context, output TRUE if the context satisfies the filter condition, and FALSE otherwise.
+
+{output_format_instruction} Finish your response with a newline character followed by ---
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+CONTEXTS:
+{context}
+
+FILTER CONDITION: {filter_condition}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
+
+COT_QA_BATCH_BASE_SYSTEM_PROMPT = """You are a helpful assistant whose job is to {job_instruction}.
+You will be presented with a numbered list of contexts and a set of output fields to generate. Your task is to generate one JSON object for each context which fills in the output fields with the correct values for that context.
+You will be provided with a description of each input field and each output field. All of the fields in each output JSON object can be derived using information from its context.
+
+{output_format_instruction} Finish your response with a newline character followed by ---
+
+An example is shown below:
+---
+INPUT FIELDS:
+{example_input_fields}
+
+OUTPUT FIELDS:
+{example_output_fields}
+
+CONTEXTS:
+{example_context}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: {example_reasoning}
+
+ANSWER:
+{example_answer}
+---
+"""
+
+COT_QA_BATCH_BASE_USER_PROMPT = """You are a helpful assistant whose job is to {job_instruction}.
+You will be presented with a numbered list of contexts and a set of output fields to generate. Your task is to generate one JSON object for each context which fills in the output fields with the correct values for that context.
+You will be provided with a description of each input field and each output field. All of the fields in each output JSON object can be derived using information from its context.
+
+{output_format_instruction} Finish your response with a newline character followed by ---
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+OUTPUT FIELDS:
+{output_fields_desc}
+
+CONTEXTS:
+{context}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
+
+
+### TEMPLATE INPUTS ###
+COT_BOOL_BATCH_JOB_INSTRUCTION = """answer a TRUE / FALSE question for each of several contexts"""
+COT_QA_BATCH_JOB_INSTRUCTION = """generate a JSON object for each of several contexts"""
+
+COT_BOOL_BATCH_EXAMPLE_INPUT_FIELDS = """- text: a short passage of text"""
+COT_QA_BATCH_EXAMPLE_INPUT_FIELDS = """- text: a text passage describing a scientist
+- birthday: the scientist's birthday"""
+
+COT_QA_BATCH_EXAMPLE_OUTPUT_FIELDS = """- name: the name of the scientist
+- birth_year: the year the scientist was born"""
+
+COT_BOOL_BATCH_EXAMPLE_CONTEXT = """[0]
+{{
+  "text": "The quick brown fox jumps over the lazy dog."
+}}
+[1]
+{{
+  "text": "The stock market closed higher on Tuesday."
+}}"""
+COT_QA_BATCH_EXAMPLE_CONTEXT = """[0]
+{{
+  "text": "Augusta Ada King, Countess of Lovelace, also known as Ada Lovelace, was an English mathematician and writer chiefly known for her work on Charles Babbage's proposed mechanical general-purpose computer, the Analytical Engine.",
+  "birthday": "December 10, 1815"
+}}
+[1]
+{{
+  "text": "Alan Mathison Turing was an English mathematician and computer scientist who formalised the concepts of algorithm and computation with the Turing machine.",
+  "birthday": "June 23, 1912"
+}}"""
+
+COT_BOOL_BATCH_EXAMPLE_FILTER_CONDITION = "the text mentions an animal"
+
+COT_BOOL_BATCH_EXAMPLE_REASONING = """context 0 mentions the words "fox" and "dog" which are animals, therefore its answer is TRUE. Context 1 is about the stock market and does not mention any animals, therefore its answer is FALSE."""
+COT_QA_BATCH_EXAMPLE_REASONING = """context 0 mentions the scientist's name as "Augusta Ada King, Countess of Lovelace, also known as Ada Lovelace" and the scientist's birthday as "December 10, 1815", therefore its name is "Augusta Ada King" and its birth year is 1815. Context 1 mentions the scientist's name as "Alan Mathison Turing" and the scientist's birthday as "June 23, 1912", therefore its name is "Alan Turing" and its birth year is 1912."""
+
+COT_BOOL_BATCH_EXAMPLE_ANSWER = """[
+  {{"idx": 0, "passed_operator": true}},
+  {{"idx": 1, "passed_operator": false}}
+]"""
+COT_QA_BATCH_EXAMPLE_ANSWER = """[
+  {{"idx": 0, "name": "Augusta Ada King", "birth_year": 1815}},
+  {{"idx": 1, "name": "Alan Turing", "birth_year": 1912}}
+]"""
@@ -0,0 +1,53 @@
+"""
+This file contains the compiled prompts which the PromptFactory renders its templates into. A compiled prompt
+pre-renders all of the fields of its templates which are fixed for an operator (e.g. the instructions, the
+example, and the output field descriptions) so that only the per-record fields are substituted for each record.
+"""
+from string import Formatter
+
+_FORMATTER = Formatter()
+
+
+class CompiledTemplate:
+    """
+    A prompt template whose static fields have already been rendered. The template is stored as a list of
+    (literal text, dynamic field) segments followed by a literal tail, thus rendering it is a single join
+    instead of a call to str.format() on the full template.
+    """
+    def __init__(self, template: str, static_kwargs: dict, dynamic_fields: tuple[str, ...]):
+        self.segments: list[tuple[str, str, str, str | None]] = []
+        literal = ""
+        for literal_text, field_name, format_spec, conversion in _FORMATTER.parse(template):
+            literal += literal_text
+            if field_name is None:
+                continue
+
+            if field_name in dynamic_fields:
+                self.segments.append((literal, field_name, format_spec, conversion))
+                literal = ""
+            else:
+                value = _FORMATTER.convert_field(static_kwargs[field_name], conversion)
+                literal += _FORMATTER.format_field(value, format_spec)
+
+        self.tail = literal
+
+    def render(self, dynamic_kwargs: dict) -> str:
+        parts = []
+        for literal, field_name, format_spec, conversion in self.segments:
+            value = _FORMATTER.convert_field(dynamic_kwargs[field_name], conversion)
+            parts.append(literal)
+            parts.append(_FORMATTER.format_field(value, format_spec))
+        parts.append(self.tail)
+
+        return "".join(parts)
+
+
+class CompiledPrompt:
+    """
+    The compiled system prompt (if the prompt strategy uses one) and user prompt(s) for an operator.
+    Image, critique, and refinement prompts have two user prompts which enclose the image messages
+    (or the original messages); all other prompts have a single user prompt.
+    """
+    def __init__(self, system_template: CompiledTemplate | None, user_templates: list[CompiledTemplate]):
+        self.system_template = system_template
+        self.user_templates = user_templates
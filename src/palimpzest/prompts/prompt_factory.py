@@ -8,11 +8,31 @@ from palimpzest.constants import (
     TOKENS_PER_CHARACTER,
     Cardinality,
     Model,
+    PromptLayout,
     PromptStrategy,
 )
 from palimpzest.core.elements.records import DataRecord
 from palimpzest.core.lib.fields import BytesField, ImageBase64Field, ImageFilepathField, ImageURLField
 from palimpzest.core.lib.schemas import Schema
+from palimpzest.prompts.batch_prompts import (
+    COT_BOOL_BATCH_BASE_SYSTEM_PROMPT,
+    COT_BOOL_BATCH_BASE_USER_PROMPT,
+    COT_BOOL_BATCH_EXAMPLE_ANSWER,
+    COT_BOOL_BATCH_EXAMPLE_CONTEXT,
+    COT_BOOL_BATCH_EXAMPLE_FILTER_CONDITION,
+    COT_BOOL_BATCH_EXAMPLE_INPUT_FIELDS,
+    COT_BOOL_BATCH_EXAMPLE_REASONING,
+    COT_BOOL_BATCH_JOB_INSTRUCTION,
+    COT_QA_BATCH_BASE_SYSTEM_PROMPT,
+    COT_QA_BATCH_BASE_USER_PROMPT,
+    COT_QA_BATCH_EXAMPLE_ANSWER,
+    COT_QA_BATCH_EXAMPLE_CONTEXT,
+    COT_QA_BATCH_EXAMPLE_INPUT_FIELDS,
+    COT_QA_BATCH_EXAMPLE_OUTPUT_FIELDS,
+    COT_QA_BATCH_EXAMPLE_REASONING,
+    COT_QA_BATCH_JOB_INSTRUCTION,
+)
+from palimpzest.prompts.compiled_prompt import CompiledPrompt, CompiledTemplate
 from palimpzest.prompts.convert_prompts import (
     COT_QA_BASE_SYSTEM_PROMPT,
     COT_QA_BASE_USER_PROMPT,
@@ -74,9 +94,24 @@ from palimpzest.prompts.moa_proposer_convert_prompts import (
     COT_MOA_PROPOSER_IMAGE_JOB_INSTRUCTION,
     COT_MOA_PROPOSER_JOB_INSTRUCTION,
 )
+from palimpzest.prompts.static_prefix_prompts import (
+    COT_BOOL_BATCH_STATIC_PREFIX_TASK_PROMPT,
+    COT_BOOL_BATCH_STATIC_PREFIX_USER_PROMPT,
+    COT_BOOL_STATIC_PREFIX_TASK_PROMPT,
+    COT_BOOL_STATIC_PREFIX_USER_PROMPT,
+    COT_MOA_AGG_STATIC_PREFIX_TASK_PROMPT,
+    COT_MOA_AGG_STATIC_PREFIX_USER_PROMPT,
+    COT_MOA_PROPOSER_STATIC_PREFIX_USER_PROMPT,
+    COT_QA_BATCH_STATIC_PREFIX_TASK_PROMPT,
+    COT_QA_BATCH_STATIC_PREFIX_USER_PROMPT,
+    COT_QA_STATIC_PREFIX_TASK_PROMPT,
+    COT_QA_STATIC_PREFIX_USER_PROMPT,
+)
 from palimpzest.prompts.util_phrases import (
+    BOOL_BATCH_OUTPUT_FORMAT_INSTRUCTION,
     ONE_TO_MANY_OUTPUT_FORMAT_INSTRUCTION,
     ONE_TO_ONE_OUTPUT_FORMAT_INSTRUCTION,
+    QA_BATCH_OUTPUT_FORMAT_INSTRUCTION,
 )
 
 
@@ -93,6 +128,8 @@ class PromptFactory:
         PromptStrategy.COT_QA_IMAGE_REFINE: None,
         PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_BASE_SYSTEM_PROMPT,
         PromptStrategy.COT_MOA_AGG: COT_MOA_AGG_BASE_SYSTEM_PROMPT,
+        PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_BASE_SYSTEM_PROMPT,
+        PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_BASE_SYSTEM_PROMPT,
     }
     BASE_USER_PROMPT_MAP = {
         PromptStrategy.COT_BOOL: COT_BOOL_BASE_USER_PROMPT,
@@ -105,24 +142,81 @@ class PromptFactory:
         PromptStrategy.COT_QA_IMAGE_REFINE: BASE_REFINEMENT_PROMPT,
         PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_BASE_USER_PROMPT,
         PromptStrategy.COT_MOA_AGG: COT_MOA_AGG_BASE_USER_PROMPT,
+        PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_BASE_USER_PROMPT,
+        PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_BASE_USER_PROMPT,
+    }
+
+    # the static-prefix layout appends the task prompt to the system prompt and uses a user prompt which
+    # only contains per-record content; critique and refinement prompts are always interleaved
+    STATIC_PREFIX_TASK_PROMPT_MAP = {
+        PromptStrategy.COT_BOOL: COT_BOOL_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_BOOL_IMAGE: COT_BOOL_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_QA: COT_QA_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_QA_IMAGE: COT_QA_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_MOA_PROPOSER: COT_QA_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_MOA_AGG: COT_MOA_AGG_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_STATIC_PREFIX_TASK_PROMPT,
+        PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_STATIC_PREFIX_TASK_PROMPT,
+    }
+    STATIC_PREFIX_USER_PROMPT_MAP = {
+        PromptStrategy.COT_BOOL: COT_BOOL_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_BOOL_IMAGE: COT_BOOL_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_QA: COT_QA_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_QA_IMAGE: COT_QA_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_MOA_AGG: COT_MOA_AGG_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_STATIC_PREFIX_USER_PROMPT,
+        PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_STATIC_PREFIX_USER_PROMPT,
     }
 
-    def __init__(self, prompt_strategy: PromptStrategy, model: Model, cardinality: Cardinality) -> None:
+    # the format kwargs which (may) change with every record; all other format kwargs are fixed for an operator
+    DYNAMIC_FORMAT_KWARGS = ("context", "input_fields_desc", "original_output", "critique_output", "model_responses")
+
+    def __init__(
+        self,
+        prompt_strategy: PromptStrategy,
+        model: Model,
+        cardinality: Cardinality,
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
+    ) -> None:
         self.prompt_strategy = prompt_strategy
         self.model = model
         self.cardinality = cardinality
+        self.prompt_layout = prompt_layout
 
-    def _get_context(self, candidate: DataRecord, input_fields: list[str]) -> str:
+        # compiled prompts (and their output schemas) keyed by the operator-level inputs which determine their static content
+        self._compiled_prompts: dict[tuple, tuple[Schema | None, CompiledPrompt]] = {}
+
+    def _uses_static_prefix(self) -> bool:
+        """Returns True if the prompts are laid out with all static content before the per-record content."""
+        return self.prompt_layout == PromptLayout.STATIC_PREFIX and self.prompt_strategy in self.STATIC_PREFIX_USER_PROMPT_MAP
+
+    def _get_context(
+        self,
+        candidate: DataRecord | list[DataRecord],
+        input_fields: list[str],
+        context_tokens_limit: float = MIXTRAL_LLAMA_CONTEXT_TOKENS_LIMIT,
+    ) -> str:
         """
-        Returns the context for the prompt.
+        Returns the context for the prompt. For batch prompts, the context of each input record
+        is prefixed with its index in the batch (e.g. "[0]") so that the answers can be mapped back.
 
         Args:
-            candidate (DataRecord): The input record.
+            candidate (DataRecord | list[DataRecord]): The input record (or records for batch prompts).
             input_fields (list[str]): The input fields.
+            context_tokens_limit (float): The number of tokens the context may take up for MIXTRAL and LLAMA3 models.
 
         Returns:
             str: The context.
         """
+        # split the context window evenly across the records in a batch
+        if isinstance(candidate, list):
+            record_tokens_limit = context_tokens_limit / len(candidate)
+            return "\n".join([
+                f"[{idx}]\n{self._get_context(record, input_fields, record_tokens_limit)}"
+                for idx, record in enumerate(candidate)
+            ])
+
         # get context from input record (project_cols will be None if not provided in kwargs)
         context: dict = candidate.to_dict(include_bytes=False, project_cols=input_fields)
 
@@ -139,7 +233,7 @@ class PromptFactory:
 
             # sort fields by length and progressively strip from the longest field until it is short enough;
             # NOTE: MIXTRAL_LLAMA_CONTEXT_TOKENS_LIMIT is a rough estimate which leaves room for the rest of the prompt text
-            while total_context_len * TOKENS_PER_CHARACTER > MIXTRAL_LLAMA_CONTEXT_TOKENS_LIMIT:
+            while total_context_len * TOKENS_PER_CHARACTER > context_tokens_limit:
                 # sort fields by length
                 field_lengths = [(field, len(value)) for field, value in context.items()]
                 sorted_fields = sorted(field_lengths, key=lambda item: item[1], reverse=True)
@@ -148,7 +242,7 @@ class PromptFactory:
                 longest_field_name, longest_field_length = sorted_fields[0]
 
                 # trim the field
-                context_factor =  MIXTRAL_LLAMA_CONTEXT_TOKENS_LIMIT / (total_context_len * TOKENS_PER_CHARACTER)
+                context_factor =  context_tokens_limit / (total_context_len * TOKENS_PER_CHARACTER)
                 keep_frac_idx = int(longest_field_length * context_factor)
                 context[longest_field_name] = context[longest_field_name][:keep_frac_idx]
 
@@ -157,34 +251,40 @@ class PromptFactory:
         
         return json.dumps(context, indent=2)
 
-    def _get_input_fields(self, candidate: DataRecord, **kwargs) -> list[str]:
+    def _get_input_fields(self, candidate: DataRecord | list[DataRecord], **kwargs) -> list[str]:
         """
         The list of input fields to be templated into the prompt(s).
         If the user provides a list of "project_cols" in kwargs, then this list will be returned.
         Otherwise, this function returns the list of all field names in the candidate record.
 
         Args:
-            candidate (DataRecord): The input record.
+            candidate (DataRecord | list[DataRecord]): The input record (or records for batch prompts).
             kwargs: The keyword arguments provided by the user.
 
         Returns:
             list[str]: The list of input field names.
         """
-        return kwargs.get("project_cols", candidate.get_field_names())
+        # all records in a batch share the same schema
+        record = candidate[0] if isinstance(candidate, list) else candidate
+        return kwargs.get("project_cols", record.get_field_names())
 
-    def _get_input_fields_desc(self, candidate: DataRecord, input_fields: list[str]) -> str:
+    def _get_input_fields_desc(self, candidate: DataRecord | list[DataRecord], input_fields: list[str]) -> str:
         """
         Returns a multi-line description of each input field for the prompt.
 
         Args:
+            candidate (DataRecord | list[DataRecord]): The input record (or records for batch prompts).
             input_fields (list[str]): The input fields.
 
         Returns:
             str: The input fields description.
         """
+        # all records in a batch share the same schema
+        record = candidate[0] if isinstance(candidate, list) else candidate
+
         input_fields_desc = ""
         for field_name in input_fields:
-            input_fields_desc += f"- {field_name}: {candidate.get_field_type(field_name)._desc}\n"
+            input_fields_desc += f"- {field_name}: {record.get_field_type(field_name)._desc}\n"
 
         return input_fields_desc[:-1]
 
@@ -276,11 +376,17 @@ class PromptFactory:
 
     def _get_output_format_instruction(self) -> str:
         """
-        Returns the output format instruction based on the cardinality.
+        Returns the output format instruction based on the cardinality (or the batch prompt strategy).
 
         Returns:
             str: The output format instruction.
         """
+        if self.prompt_strategy == PromptStrategy.COT_BOOL_BATCH:
+            return BOOL_BATCH_OUTPUT_FORMAT_INSTRUCTION
+
+        elif self.prompt_strategy == PromptStrategy.COT_QA_BATCH:
+            return QA_BATCH_OUTPUT_FORMAT_INSTRUCTION
+
         return (
             ONE_TO_ONE_OUTPUT_FORMAT_INSTRUCTION
             if self.cardinality == Cardinality.ONE_TO_ONE
@@ -301,6 +407,8 @@ class PromptFactory:
             PromptStrategy.COT_QA_IMAGE: COT_QA_IMAGE_JOB_INSTRUCTION,
             PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_JOB_INSTRUCTION,
             PromptStrategy.COT_MOA_PROPOSER_IMAGE: COT_MOA_PROPOSER_IMAGE_JOB_INSTRUCTION,
+            PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_JOB_INSTRUCTION,
+            PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_JOB_INSTRUCTION,
         }
         return prompt_strategy_to_job_instruction.get(self.prompt_strategy)
 
@@ -367,6 +475,8 @@ class PromptFactory:
             PromptStrategy.COT_QA_IMAGE: COT_QA_IMAGE_EXAMPLE_INPUT_FIELDS,
             PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_EXAMPLE_INPUT_FIELDS,
             PromptStrategy.COT_MOA_PROPOSER_IMAGE: COT_MOA_PROPOSER_IMAGE_EXAMPLE_INPUT_FIELDS,
+            PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_EXAMPLE_INPUT_FIELDS,
+            PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_EXAMPLE_INPUT_FIELDS,
         }
 
         return prompt_strategy_to_example_input_fields.get(self.prompt_strategy)
@@ -383,6 +493,7 @@ class PromptFactory:
             PromptStrategy.COT_QA_IMAGE: COT_QA_IMAGE_EXAMPLE_OUTPUT_FIELDS,
             PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_EXAMPLE_OUTPUT_FIELDS,
             PromptStrategy.COT_MOA_PROPOSER_IMAGE: COT_MOA_PROPOSER_IMAGE_EXAMPLE_OUTPUT_FIELDS,
+            PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_EXAMPLE_OUTPUT_FIELDS,
         }
 
         return prompt_strategy_to_example_output_fields.get(self.prompt_strategy)
@@ -401,6 +512,8 @@ class PromptFactory:
             PromptStrategy.COT_QA_IMAGE: COT_QA_IMAGE_EXAMPLE_CONTEXT,
             PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_EXAMPLE_CONTEXT,
             PromptStrategy.COT_MOA_PROPOSER_IMAGE: COT_MOA_PROPOSER_IMAGE_EXAMPLE_CONTEXT,
+            PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_EXAMPLE_CONTEXT,
+            PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_EXAMPLE_CONTEXT,
         }
 
         return prompt_strategy_to_example_context.get(self.prompt_strategy)
@@ -431,6 +544,7 @@ class PromptFactory:
         prompt_strategy_to_example_filter_condition = {
             PromptStrategy.COT_BOOL: COT_BOOL_EXAMPLE_FILTER_CONDITION,
             PromptStrategy.COT_BOOL_IMAGE: COT_BOOL_IMAGE_EXAMPLE_FILTER_CONDITION,
+            PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_EXAMPLE_FILTER_CONDITION,
         }
 
         return prompt_strategy_to_example_filter_condition.get(self.prompt_strategy)
@@ -447,6 +561,8 @@ class PromptFactory:
             PromptStrategy.COT_BOOL_IMAGE: COT_BOOL_IMAGE_EXAMPLE_REASONING,
             PromptStrategy.COT_QA: COT_QA_EXAMPLE_REASONING,
             PromptStrategy.COT_QA_IMAGE: COT_QA_IMAGE_EXAMPLE_REASONING,
+            PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_EXAMPLE_REASONING,
+            PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_EXAMPLE_REASONING,
         }
 
         return prompt_strategy_to_example_reasoning.get(self.prompt_strategy)
@@ -463,36 +579,27 @@ class PromptFactory:
             PromptStrategy.COT_QA_IMAGE: COT_QA_IMAGE_EXAMPLE_ANSWER,
             PromptStrategy.COT_MOA_PROPOSER: COT_MOA_PROPOSER_EXAMPLE_ANSWER,
             PromptStrategy.COT_MOA_PROPOSER_IMAGE: COT_MOA_PROPOSER_IMAGE_EXAMPLE_ANSWER,
+            PromptStrategy.COT_BOOL_BATCH: COT_BOOL_BATCH_EXAMPLE_ANSWER,
+            PromptStrategy.COT_QA_BATCH: COT_QA_BATCH_EXAMPLE_ANSWER,
         }
 
         return prompt_strategy_to_example_answer.get(self.prompt_strategy)
 
-    def _get_all_format_kwargs(self, candidate: DataRecord, input_fields: list[str], output_fields: list[str], **kwargs) -> dict:
+    def _get_static_format_kwargs(self, output_fields: list[str], **kwargs) -> dict:
         """
-        Returns a dictionary containing all the format kwargs for templating the prompts.
-        
+        Returns a dictionary containing the format kwargs which are fixed for an operator, i.e. the
+        kwargs which depend on the prompt strategy, the output fields, and the filter condition.
+
         Args:
-            candidate (DataRecord): The input record.
-            input_fields (list[str]): The input fields.
             output_fields (list[str]): The output fields.
             kwargs: The keyword arguments provided by the user.
-        
+
         Returns:
-            dict: The dictionary containing all the format kwargs.
+            dict: The dictionary containing the static format kwargs.
         """
-        # get format kwargs which depend on the input data
-        input_format_kwargs = {
-            "context": self._get_context(candidate, input_fields),
-            "input_fields_desc": self._get_input_fields_desc(candidate, input_fields),
+        return {
             "output_fields_desc": self._get_output_fields_desc(output_fields, **kwargs),
             "filter_condition": self._get_filter_condition(**kwargs),
-            "original_output": self._get_original_output(**kwargs),
-            "critique_output": self._get_critique_output(**kwargs),
-            "model_responses": self._get_model_responses(**kwargs),
-        }
-
-        # get format kwargs which depend on the prompt strategy
-        prompt_strategy_format_kwargs = {
             "output_format_instruction": self._get_output_format_instruction(),
             "job_instruction": self._get_job_instruction(),
             "critique_criteria": self._get_critique_criteria(),
@@ -507,8 +614,25 @@ class PromptFactory:
             "example_answer": self._get_example_answer(),
         }
 
-        # return all format kwargs
-        return {**input_format_kwargs, **prompt_strategy_format_kwargs}
+    def _get_dynamic_format_kwargs(self, candidate: DataRecord | list[DataRecord], input_fields: list[str], **kwargs) -> dict:
+        """
+        Returns a dictionary containing the format kwargs which depend on the input record(s).
+
+        Args:
+            candidate (DataRecord | list[DataRecord]): The input record (or records for batch prompts).
+            input_fields (list[str]): The input fields.
+            kwargs: The keyword arguments provided by the user.
+
+        Returns:
+            dict: The dictionary containing the dynamic format kwargs.
+        """
+        return {
+            "context": self._get_context(candidate, input_fields),
+            "input_fields_desc": self._get_input_fields_desc(candidate, input_fields),
+            "original_output": self._get_original_output(**kwargs),
+            "critique_output": self._get_critique_output(**kwargs),
+            "model_responses": self._get_model_responses(**kwargs),
+        }
 
     def _create_image_messages(self, candidate: DataRecord, input_fields: list[str]) -> list[dict]:
         """
@@ -559,13 +683,13 @@ class PromptFactory:
 
         return image_messages
 
-    def _get_system_prompt(self, **format_kwargs) -> str | None:
+    def _get_system_prompt_template(self) -> str | None:
         """
-        Returns the fully templated system prompt for the given prompt strategy.
+        Returns the system prompt template for the given prompt strategy.
         Returns None if the prompt strategy does not use a system prompt.
 
         Returns:
-            str | None: The fully templated system prompt (or None if the prompt strategy
+            str | None: The system prompt template (or None if the prompt strategy
                 does not use a system prompt).
         """
         base_prompt: str = self.BASE_SYSTEM_PROMPT_MAP.get(self.prompt_strategy)
@@ -574,56 +698,116 @@ class PromptFactory:
         if base_prompt is None:
             return base_prompt
 
-        return base_prompt.format(**format_kwargs)
+        # for the static-prefix layout, the static content of the task follows the system prompt
+        if self._uses_static_prefix():
+            base_prompt += self.STATIC_PREFIX_TASK_PROMPT_MAP[self.prompt_strategy]
 
-    def _get_user_messages(self, candidate: DataRecord, input_fields: list[str], **kwargs) -> str:
+        return base_prompt
+
+    def _get_user_prompt_templates(self) -> list[str]:
         """
-        Returns a list of messages for the chat payload based on the prompt strategy.
+        Returns the user prompt template(s) for the given prompt strategy. Image, critique, and refinement
+        prompts are split into the templates which precede and follow the image (or original) messages.
+
+        Returns:
+            list[str]: The user prompt template(s).
+        """
+        # get the base prompt template
+        base_prompt = (
+            self.STATIC_PREFIX_USER_PROMPT_MAP[self.prompt_strategy]
+            if self._uses_static_prefix()
+            else self.BASE_USER_PROMPT_MAP.get(self.prompt_strategy)
+        )
+
+        if self.prompt_strategy.is_critic_prompt() or self.prompt_strategy.is_refine_prompt():
+            return base_prompt.split("<<original-prompt-placeholder>>\n")
+
+        elif self.prompt_strategy.is_image_prompt():
+            return base_prompt.split("<<image-placeholder>>\n")
+
+        return [base_prompt.replace("<<image-placeholder>>", "")]
+
+    def _compile_prompt(self, output_fields: list[str], **kwargs) -> CompiledPrompt:
+        """
+        Compiles the system and user prompt templates by rendering their static format kwargs.
+
+        Args:
+            output_fields (list[str]): The output fields.
+            kwargs: The keyword arguments provided by the user.
+
+        Returns:
+            CompiledPrompt: The compiled prompt.
+        """
+        static_format_kwargs = self._get_static_format_kwargs(output_fields, **kwargs)
+        system_prompt = self._get_system_prompt_template()
+        system_template = (
+            None
+            if system_prompt is None
+            else CompiledTemplate(system_prompt, static_format_kwargs, self.DYNAMIC_FORMAT_KWARGS)
+        )
+        user_templates = [
+            CompiledTemplate(user_prompt, static_format_kwargs, self.DYNAMIC_FORMAT_KWARGS)
+            for user_prompt in self._get_user_prompt_templates()
+        ]
+
+        return CompiledPrompt(system_template, user_templates)
+
+    def _get_compiled_prompt(self, input_fields: list[str], output_fields: list[str], **kwargs) -> CompiledPrompt:
+        """
+        Returns the compiled prompt for the operator-level inputs, compiling it on the first request.
+        The prompt strategy, model, and cardinality are fixed for the PromptFactory, thus the cache key
+        only needs to contain the output schema, the input and output fields, and the filter condition.
 
         Args:
-            candidate (DataRecord): The input record.
             input_fields (list[str]): The input fields.
             output_fields (list[str]): The output fields.
-            kwargs: The formatting kwargs and some keyword arguments provided by the user.
+            kwargs: The keyword arguments provided by the user.
 
         Returns:
-            Tuple[str, str | None]: The fully templated start and end of the user prompt.
-                The second element will be None for text prompts.
+            CompiledPrompt: The compiled prompt.
         """
-        # get the base prompt template
-        base_prompt = self.BASE_USER_PROMPT_MAP.get(self.prompt_strategy)
+        # NOTE: schemas are not hashable, thus we key on the id of the output schema; the cache entry holds
+        #       a reference to the schema so that its id cannot be re-used while the entry exists
+        output_schema = kwargs.get("output_schema")
+        key = (id(output_schema), tuple(input_fields), tuple(output_fields), kwargs.get("filter_condition"))
+        if key not in self._compiled_prompts:
+            self._compiled_prompts[key] = (output_schema, self._compile_prompt(output_fields, **kwargs))
 
-        # get any image messages for the chat payload (will be an empty list if this is not an image prompt)
-        image_messages = (
-            self._create_image_messages(candidate, input_fields)
-            if self.prompt_strategy.is_image_prompt()
-            else []
-        )
+        return self._compiled_prompts[key][1]
+
+    def _get_user_messages(
+        self, compiled_prompt: CompiledPrompt, candidate: DataRecord, input_fields: list[str], dynamic_format_kwargs: dict, **kwargs
+    ) -> list[dict]:
+        """
+        Returns a list of messages for the chat payload based on the prompt strategy.
 
+        Args:
+            compiled_prompt (CompiledPrompt): The compiled prompt.
+            candidate (DataRecord): The input record.
+            input_fields (list[str]): The input fields.
+            dynamic_format_kwargs (dict): The format kwargs which depend on the input record(s).
+            kwargs: The keyword arguments provided by the user.
+
+        Returns:
+            list[dict]: The user messages for the chat payload.
+        """
         # get any original messages for critique and refinement operations
         original_messages = kwargs.get("original_messages")
         if self.prompt_strategy.is_critic_prompt() or self.prompt_strategy.is_refine_prompt():
             assert original_messages is not None, "Original messages must be provided for critique and refinement operations."
 
         # construct the user messages based on the prompt strategy
-        user_messages = []
+        user_messages = [
+            {"role": "user", "type": "text", "content": user_template.render(dynamic_format_kwargs)}
+            for user_template in compiled_prompt.user_templates
+        ]
         if self.prompt_strategy.is_critic_prompt() or self.prompt_strategy.is_refine_prompt():
             # NOTE: if this critic / refinement prompt is processing images, those images will
             #       be part of the `original_messages` and will show up in the final chat payload
-            base_prompt_start, base_prompt_end = base_prompt.split("<<original-prompt-placeholder>>\n")
-            user_messages.append({"role": "user", "type": "text", "content": base_prompt_start.format(**kwargs)})
-            user_messages.extend(original_messages)
-            user_messages.append({"role": "user", "type": "text", "content": base_prompt_end.format(**kwargs)})
+            user_messages[1:1] = original_messages
 
         elif self.prompt_strategy.is_image_prompt():
-            base_prompt_start, base_prompt_end = base_prompt.split("<<image-placeholder>>\n")
-            user_messages.append({"role": "user", "type": "text", "content": base_prompt_start.format(**kwargs)})
-            user_messages.extend(image_messages)
-            user_messages.append({"role": "user", "type": "text", "content": base_prompt_end.format(**kwargs)})
-
-        else:
-            base_prompt = base_prompt.replace("<<image-placeholder>>", "")
-            user_messages.append({"role": "user", "type": "text", "content": base_prompt.format(**kwargs)})
+            user_messages[1:1] = self._create_image_messages(candidate, input_fields)
 
         return user_messages
 
@@ -683,7 +867,7 @@ class PromptFactory:
 
         return messages
 
-    def create_messages(self, candidate: DataRecord, output_fields: list[str], **kwargs) -> list[dict]:
+    def create_messages(self, candidate: DataRecord | list[DataRecord], output_fields: list[str], **kwargs) -> list[dict]:
         """
         Creates the messages for the chat payload based on the prompt strategy.
         
@@ -695,18 +879,21 @@ class PromptFactory:
         }
 
         Args:
-            candidate (DataRecord): The input record.
+            candidate (DataRecord | list[DataRecord]): The input record (or records for batch prompts).
             output_fields (list[str]): The output fields.
             kwargs: The keyword arguments provided by the user.
 
         Returns:
             list[dict]: The messages for the chat payload.
         """
+        assert isinstance(candidate, list) == self.prompt_strategy.is_batch_prompt(), "Batch prompts (and only batch prompts) must be given a list of records."
+
         # compute the set of input fields
         input_fields = self._get_input_fields(candidate, **kwargs)
 
         # if the user provides a prompt, we process that prompt into messages and return them
         if "prompt" in kwargs:
+            assert not self.prompt_strategy.is_batch_prompt(), "Custom prompts are not supported for batch prompts."
             messages = []
             if "system_prompt" in kwargs:
                 messages.append({"role": "system", "type": "text", "content": kwargs["system_prompt"]})
@@ -716,17 +903,17 @@ class PromptFactory:
         # initialize messages
         messages = []
 
-        # compute the full dictionary of format kwargs and add to kwargs
-        format_kwargs = self._get_all_format_kwargs(candidate, input_fields, output_fields, **kwargs)
-        kwargs = {**kwargs, **format_kwargs}
+        # get the compiled prompt and the format kwargs which depend on the input record(s)
+        compiled_prompt = self._get_compiled_prompt(input_fields, output_fields, **kwargs)
+        dynamic_format_kwargs = self._get_dynamic_format_kwargs(candidate, input_fields, **kwargs)
 
         # generate system message (if applicable)
-        system_prompt = self._get_system_prompt(**kwargs)
-        if system_prompt is not None:
+        if compiled_prompt.system_template is not None:
+            system_prompt = compiled_prompt.system_template.render(dynamic_format_kwargs)
             messages.append({"role": "system", "type": "text", "content": system_prompt})
 
         # generate user messages and add to messages
-        user_messages = self._get_user_messages(candidate, input_fields, **kwargs)
+        user_messages = self._get_user_messages(compiled_prompt, candidate, input_fields, dynamic_format_kwargs, **kwargs)
         messages.extend(user_messages)
 
         return messages
@@ -0,0 +1,97 @@
+"""
+This file contains the prompts for the static-prefix prompt layout. The task prompts contain all of the
+(per-operator) static content which is appended to the system prompt, while the user prompts only contain
+the (per-record) content, thus every prompt issued by an operator shares the same prefix.
+"""
+
+### TASK PROMPTS ###
+COT_BOOL_STATIC_PREFIX_TASK_PROMPT = """
+You will now be presented with a context. Determine whether it satisfies the following filter condition.
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+FILTER CONDITION: {filter_condition}
+"""
+
+COT_QA_STATIC_PREFIX_TASK_PROMPT = """
+You will now be presented with a context. Generate the following output fields for it.
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+OUTPUT FIELDS:
+{output_fields_desc}
+"""
+
+COT_MOA_AGG_STATIC_PREFIX_TASK_PROMPT = """
+You will now be presented with one or more model responses. Synthesize them into the following output fields.
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+OUTPUT FIELDS:
+{output_fields_desc}
+"""
+
+COT_BOOL_BATCH_STATIC_PREFIX_TASK_PROMPT = """
+You will now be presented with a numbered list of contexts. Determine whether each of them satisfies the following filter condition.
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+FILTER CONDITION: {filter_condition}
+"""
+
+COT_QA_BATCH_STATIC_PREFIX_TASK_PROMPT = """
+You will now be presented with a numbered list of contexts. Generate the following output fields for each of them.
+---
+INPUT FIELDS:
+{input_fields_desc}
+
+OUTPUT FIELDS:
+{output_fields_desc}
+"""
+
+
+### USER PROMPTS ###
+COT_BOOL_STATIC_PREFIX_USER_PROMPT = """CONTEXT:
+{context}
+<<image-placeholder>>
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
+
+COT_QA_STATIC_PREFIX_USER_PROMPT = """CONTEXT:
+{context}
+<<image-placeholder>>
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
+
+COT_MOA_PROPOSER_STATIC_PREFIX_USER_PROMPT = """CONTEXT:
+{context}
+<<image-placeholder>>
+Let's think step-by-step in order to answer the question.
+
+ANSWER: """
+
+COT_MOA_AGG_STATIC_PREFIX_USER_PROMPT = """{model_responses}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
+
+COT_BOOL_BATCH_STATIC_PREFIX_USER_PROMPT = """CONTEXTS:
+{context}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
+
+COT_QA_BATCH_STATIC_PREFIX_USER_PROMPT = """CONTEXTS:
+{context}
+
+Let's think step-by-step in order to answer the question.
+
+REASONING: """
@@ -3,6 +3,8 @@
 ### FORMATTING INSTRUCTIONS ###
 ONE_TO_ONE_OUTPUT_FORMAT_INSTRUCTION = "Remember, your answer must be a valid JSON dictionary. The dictionary should only have the specified output fields."
 ONE_TO_MANY_OUTPUT_FORMAT_INSTRUCTION = "Remember, your answer must be a valid JSON list of dictionaries. The list may contain one or more dictionaries, and each dictionary should only have the specified output fields."
+BOOL_BATCH_OUTPUT_FORMAT_INSTRUCTION = "Remember, your answer must be a valid JSON list with one dictionary per context. Each dictionary must have an \"idx\" key with the number of its context and a \"passed_operator\" key whose value is true or false."
+QA_BATCH_OUTPUT_FORMAT_INSTRUCTION = "Remember, your answer must be a valid JSON list with one dictionary per context. Each dictionary must have an \"idx\" key with the number of its context, and it should otherwise only have the specified output fields."
 
 ### REASONING INSTRUCTION FOR IMAGE PROMPTS ###
 COT_REASONING_INSTRUCTION = """Let's think step-by-step in order to answer the question.
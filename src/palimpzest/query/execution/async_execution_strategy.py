@@ -0,0 +1,228 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from palimpzest.constants import BATCH_FLUSH_INTERVAL_SECS, DEFAULT_MAX_CONCURRENCY_PER_OP
+from palimpzest.core.data.dataclasses import OperatorStats, PlanStats
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.query.execution.execution_strategy import ExecutionStrategy
+from palimpzest.query.generators.clients import get_client_registry
+from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.batched import BatchedLLMOp
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.scan import ScanPhysicalOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+
+
+class MicroBatcher:
+    """
+    Collects the records submitted to a batched operator by concurrent coroutines and executes them in
+    batches of (up to) `batch_size`. A partial batch is executed once `flush_interval_secs` have passed
+    since its first record was submitted.
+    """
+    def __init__(self, operator: BatchedLLMOp, semaphore: asyncio.Semaphore, flush_interval_secs: float = BATCH_FLUSH_INTERVAL_SECS):
+        self.operator = operator
+        self.semaphore = semaphore
+        self.flush_interval_secs = flush_interval_secs
+        self.pending: list[tuple[DataRecord, asyncio.Future]] = []
+        self.flush_handle: asyncio.TimerHandle | None = None
+
+        # hold references to the batch tasks so that they are not garbage collected while running
+        self.tasks: set[asyncio.Task] = set()
+
+    async def submit(self, candidate: DataRecord) -> DataRecordSet:
+        """Add the candidate to the next batch and return its record set once the batch has been executed."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((candidate, future))
+
+        if len(self.pending) >= self.operator.batch_size:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.flush_interval_secs, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Execute the pending records as a batch."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        batch, self.pending = self.pending, []
+        if len(batch) > 0:
+            task = asyncio.create_task(self._execute_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _execute_batch(self, batch: list[tuple[DataRecord, asyncio.Future]]) -> None:
+        try:
+            async with self.semaphore:
+                record_sets = await self.operator.abatch_call([candidate for candidate, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), record_set in zip(batch, record_sets):
+            future.set_result(record_set)
+
+
+class PipelinedAsyncExecutionStrategy(ExecutionStrategy):
+    """
+    A pipelined execution strategy which drives the plan on an asyncio event loop.
+
+    Each source record is pushed through the plan by a coroutine, and each operator may have at most
+    `max_concurrency_per_op` calls in flight at once. LLM operators await their (async) generators
+    directly, thus many LLM calls can be outstanding without dedicating a thread to each of them;
+    all other operators are run on worker threads via PhysicalOperator.acall(). Records bound for a
+    batched operator are collected by a MicroBatcher and executed in batches.
+    """
+
+    def __init__(self, *args, max_concurrency_per_op: int = DEFAULT_MAX_CONCURRENCY_PER_OP, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_concurrency_per_op = max_concurrency_per_op
+
+    def execute_plan(self, plan: PhysicalPlan, num_samples: int | float = float("inf"), plan_workers: int = 1):
+        """Initialize the stats and the execute the plan."""
+        if self.verbose:
+            print("----------------------")
+            print(f"PLAN[{plan.plan_id}] (n={num_samples}):")
+            print(plan)
+            print("---")
+
+        # asyncio.run() cannot be called from a thread which is already running an event loop
+        # (e.g. inside of a Jupyter notebook); in that case we run the plan on a separate thread
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._run_plan(plan, num_samples))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._run_plan(plan, num_samples)).result()
+
+    async def _run_plan(self, plan: PhysicalPlan, num_samples: int | float):
+        # the async clients created on this event loop cannot be used once asyncio.run() returns,
+        # thus we close their connection pools before the loop ends
+        try:
+            return await self._execute_plan(plan, num_samples)
+        finally:
+            await get_client_registry().aclose_loop_clients()
+
+    async def _execute_plan(self, plan: PhysicalPlan, num_samples: int | float):
+        plan_start_time = time.time()
+
+        # initialize plan stats and operator stats
+        plan_stats = PlanStats(plan_id=plan.plan_id, plan_str=str(plan))
+        for op in plan.operators:
+            op_id = op.get_op_id()
+            op_name = op.op_name()
+            op_details = {k: str(v) for k, v in op.get_id_params().items()}
+            plan_stats.operator_stats[op_id] = OperatorStats(op_id=op_id, op_name=op_name, op_details=op_details)
+
+        # get handle to scan operator and pre-compute its size
+        source_operator = plan.operators[0]
+        assert isinstance(source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
+        datareader_len = len(source_operator.datareader)
+
+        # get the ids under which the output of each operator is cached (if caching is allowed)
+        cache_ids = self._open_materialization_caches(plan, num_samples)
+
+        # bound the number of in-flight calls for each operator
+        op_id_to_semaphore = {op.get_op_id(): asyncio.Semaphore(self.max_concurrency_per_op) for op in plan.operators}
+
+        # collect the records for each batched operator into batches
+        op_id_to_batcher = {
+            op.get_op_id(): MicroBatcher(op, op_id_to_semaphore[op.get_op_id()])
+            for op in plan.operators
+            if isinstance(op, BatchedLLMOp)
+        }
+
+        # keep track of the number of records which have passed through each limit operator
+        op_id_to_num_limited = {op.get_op_id(): 0 for op in plan.operators if isinstance(op, LimitScanOp)}
+
+        async def run_operator(op_idx: int, op_input: DataRecord | list[DataRecord] | int) -> DataRecordSet:
+            operator = plan.operators[op_idx]
+            op_id = operator.get_op_id()
+            if op_id in op_id_to_batcher:
+                record_set = await op_id_to_batcher[op_id].submit(op_input)
+            else:
+                async with op_id_to_semaphore[op_id]:
+                    record_set = await operator.acall(op_input)
+
+            # update plan stats; this is safe without a lock b/c all coroutines run on the same thread
+            prev_operator = plan.operators[op_idx - 1] if op_idx > 0 else None
+            plan_stats.operator_stats[op_id].add_record_op_stats(
+                record_set.record_op_stats,
+                source_op_id=prev_operator.get_op_id() if prev_operator is not None else None,
+                plan_id=plan.plan_id,
+            )
+            return record_set
+
+        async def process(op_idx: int, op_input: DataRecord | int, end_idx: int) -> list[DataRecord]:
+            """Push op_input through the operators in [op_idx, end_idx) and return the records which survive."""
+            if op_idx == end_idx:
+                return [op_input]
+
+            # drop records once a limit operator has produced its limit
+            operator = plan.operators[op_idx]
+            if isinstance(operator, LimitScanOp):
+                op_id = operator.get_op_id()
+                if op_id_to_num_limited[op_id] >= operator.limit:
+                    return []
+                op_id_to_num_limited[op_id] += 1
+
+            record_set = await run_operator(op_idx, op_input)
+            self._materialize(cache_ids, op_idx, record_set.data_records)
+            records = [record for record in record_set if getattr(record, "passed_operator", True)]
+            results = await asyncio.gather(*[process(op_idx + 1, record, end_idx) for record in records])
+
+            return [record for result in results for record in result]
+
+        def limit_is_reached(end_idx: int) -> bool:
+            return any(
+                op_id_to_num_limited[op.get_op_id()] >= op.limit
+                for op in plan.operators[:end_idx]
+                if isinstance(op, LimitScanOp)
+            )
+
+        # split the plan into segments which are separated by aggregates; the first segment is
+        # executed by a pool of driver coroutines which pull source indices from the scan
+        agg_op_idxs = [idx for idx, op in enumerate(plan.operators) if isinstance(op, AggregateOp)]
+        segment_end_idxs = agg_op_idxs + [len(plan.operators)]
+
+        source_idx_to_records = {}
+        next_scan_idx = self.scan_start_idx
+        end_scan_idx = min(datareader_len, self.scan_start_idx + num_samples)
+
+        async def driver():
+            nonlocal next_scan_idx
+            while next_scan_idx < end_scan_idx and not limit_is_reached(segment_end_idxs[0]):
+                scan_idx = next_scan_idx
+                next_scan_idx += 1
+                source_idx_to_records[scan_idx] = await process(0, scan_idx, segment_end_idxs[0])
+
+        num_drivers = max(1, min(self.max_concurrency_per_op, end_scan_idx - self.scan_start_idx))
+        await asyncio.gather(*[driver() for _ in range(num_drivers)])
+
+        # the scan may have stopped before its last item (e.g. at a limit); release its read-ahead
+        source_operator.close()
+
+        # return the records in the order in which they were scanned
+        records = [record for scan_idx in sorted(source_idx_to_records) for record in source_idx_to_records[scan_idx]]
+
+        # execute the remaining segments; each aggregate runs once all of its upstream records are available
+        for agg_op_idx, end_idx in zip(agg_op_idxs, segment_end_idxs[1:]):
+            record_set = await run_operator(agg_op_idx, records)
+            self._materialize(cache_ids, agg_op_idx, record_set.data_records)
+            results = await asyncio.gather(*[process(agg_op_idx + 1, record, end_idx) for record in record_set])
+            records = [record for result in results for record in result]
+
+        # if caching was allowed, write the records output by each operator to the cache
+        self._close_materialization_caches(cache_ids)
+
+        # finalize plan stats
+        total_plan_time = time.time() - plan_start_time
+        plan_stats.finalize(total_plan_time)
+
+        return records, plan_stats
@@ -0,0 +1,91 @@
+from palimpzest.constants import DEFAULT_BATCH_POLL_INTERVAL_SECS
+from palimpzest.core.data.dataclasses import RecordOpStats
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.query.execution.single_threaded_execution_strategy import SequentialSingleThreadExecutionStrategy
+from palimpzest.query.generators.batch_api import BatchBackend, BatchSession, DeferredCompletion, OpenAIBatchBackend
+from palimpzest.query.operators.batched import BatchedLLMOp
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.physical import PhysicalOperator
+
+
+class BatchExecutionStrategy(SequentialSingleThreadExecutionStrategy):
+    """
+    A single-threaded execution strategy which processes operators sequentially (like the
+    SequentialSingleThreadExecutionStrategy) and runs each operator's LLM calls through a provider Batch API.
+
+    Each operator is executed in rounds. In every round, the operator is invoked on the records whose
+    output is still missing while a BatchSession is active; each LLM call whose payload has not been run yet
+    is recorded by the session and aborts the operator's invocation on that record. The recorded requests
+    are then written to a single batch file, submitted to the `batch_backend`, and polled every
+    `batch_poll_interval_secs` until the batch completes; afterwards the next round serves the responses
+    (matched to the calls by their custom_id) to the operator. Operators which make a single LLM call per
+    record (e.g. filters and bonded converts) thus need exactly one batch, while operators which chain
+    LLM calls (e.g. critics and mixtures-of-agents) need one batch per call in the chain.
+
+    Only the LLM calls of the provider served by the `batch_backend` (by default, OpenAI) are batched; the
+    calls of other providers' models (e.g. Together) are made synchronously and billed at the full price.
+    Re-invoking an operator re-runs its work outside of its Generators, thus LLM calls answered in an earlier
+    round are served from the session and other side effects are memoized with BatchSession.memoize()
+    (e.g. RAGConvert's embedding calls) so that each is performed once.
+
+    Batch jobs trade latency (up to the provider's completion window) for a discount on every LLM call.
+    """
+    def __init__(
+        self,
+        *args,
+        batch_backend: BatchBackend | None = None,
+        batch_poll_interval_secs: float = DEFAULT_BATCH_POLL_INTERVAL_SECS,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.batch_backend = OpenAIBatchBackend() if batch_backend is None else batch_backend
+        self.batch_poll_interval_secs = batch_poll_interval_secs
+
+    def _process_queue(self, operator: PhysicalOperator, queue: list[DataRecord]) -> tuple[list[DataRecord], list[RecordOpStats]]:
+        # limits do not call an LLM and may stop before processing their entire queue
+        if isinstance(operator, LimitScanOp):
+            return super()._process_queue(operator, queue)
+
+        # batched operators are invoked on a batch of records at a time; all other operators on a single record
+        if isinstance(operator, BatchedLLMOp):
+            units = [queue[idx:idx + operator.batch_size] for idx in range(0, len(queue), operator.batch_size)]
+        else:
+            units = [[record] for record in queue]
+
+        def execute_unit(unit: list[DataRecord]) -> list[DataRecordSet]:
+            return operator.batch_call(unit) if isinstance(operator, BatchedLLMOp) else [operator(unit[0])]
+
+        # invoke the operator until every unit has been executed without deferring an LLM call
+        session = BatchSession(self.batch_backend, self.batch_poll_interval_secs)
+        unit_record_sets: list[list[DataRecordSet] | None] = [None] * len(units)
+        pending_unit_idxs = list(range(len(units)))
+        while len(pending_unit_idxs) > 0:
+            deferred_unit_idxs = []
+            with session.activate():
+                for unit_idx in pending_unit_idxs:
+                    try:
+                        unit_record_sets[unit_idx] = execute_unit(units[unit_idx])
+                    except DeferredCompletion:
+                        deferred_unit_idxs.append(unit_idx)
+
+            if len(deferred_unit_idxs) > 0:
+                if not session.has_pending_requests():
+                    raise RuntimeError(f"Operator {operator.op_name()} deferred LLM calls which are already answered by the batch")
+                session.run_pending_requests()
+
+            pending_unit_idxs = deferred_unit_idxs
+
+        if self.verbose:
+            print(
+                f"{operator.op_name()}: ran {session.num_requests} requests in {session.num_batches} batch(es) "
+                f"in {session.wait_duration_secs:.2f}s"
+            )
+
+        # gather the output records and their stats in the order of the processing queue
+        records, record_op_stats = [], []
+        for record_sets in unit_record_sets:
+            for record_set in record_sets:
+                records.extend(record_set.data_records)
+                record_op_stats.extend(record_set.record_op_stats)
+
+        return records, record_op_stats
@@ -0,0 +1,104 @@
+"""
+This file contains the on-disk checkpoints of the progress of (long-running) plan executions.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+from palimpzest.core.data.dataclasses import OperatorStats
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.schemas import Schema
+from palimpzest.query.optimizer.plan import PhysicalPlan
+
+
+class ExecutionCheckpoint:
+    """
+    A checkpoint of the progress of a plan execution, which stores the outputs of each source record whose
+    processing has completed, along with the stats of the plan's operators. Thus, an execution of the plan
+    which resumes from the checkpoint only needs to process the source records which were not completed.
+
+    The checkpoint is a directory (named by the checkpoint's key) of segments. Each segment holds the outputs
+    of the source records which were completed since the previous segment and the operator stats which were
+    collected since then. A segment is written to a temporary file which is fsync'ed and then renamed, thus
+    segments are written atomically: an execution which dies while writing a segment loses (at most) the
+    progress since the previous segment, and the outputs of each source record are stored exactly once.
+    """
+    def __init__(self, checkpoint_dir: str, key: str):
+        self.path = os.path.join(checkpoint_dir, key)
+        os.makedirs(self.path, exist_ok=True)
+        self.num_segments = len(self._get_segment_paths())
+
+    @staticmethod
+    def get_key(plan: PhysicalPlan, scan_start_idx: int, num_samples: int | float) -> str:
+        """Return the key of the checkpoint of the plan's execution, which depends on its operators and source records."""
+        datareader = plan.operators[0].datareader
+        key = {
+            "plan_id": plan.plan_id,
+            "datareader": datareader.serialize(),
+            "fingerprint": datareader.get_fingerprint(),
+            "num_items": len(datareader),
+            "scan_start_idx": scan_start_idx,
+            "num_samples": num_samples,
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _get_segment_paths(self) -> list[str]:
+        # temporary files which were not renamed (i.e. segments which were not fully written) are ignored
+        return sorted(glob.glob(os.path.join(self.path, "*.ckpt")))
+
+    def load(self, schema: Schema) -> tuple[dict[int, list[DataRecord]], dict[str, OperatorStats]]:
+        """Return the outputs of each completed source record (with the given schema) and the stats of each operator."""
+        source_outputs, operator_stats = {}, {}
+        for segment_path in self._get_segment_paths():
+            with open(segment_path, "rb") as f:
+                segment = pickle.load(f)
+
+            for source_idx, outputs in segment["outputs"].items():
+                records = []
+                for field_values in outputs:
+                    record = DataRecord(schema, source_idx=source_idx)
+                    for field, value in field_values.items():
+                        setattr(record, field, value)
+                    records.append(record)
+                source_outputs[source_idx] = records
+
+            for op_id, op_stats in segment["operator_stats"].items():
+                if op_id in operator_stats:
+                    operator_stats[op_id] += op_stats
+                else:
+                    operator_stats[op_id] = op_stats
+
+        return source_outputs, operator_stats
+
+    def write(self, outputs: dict[int, list[dict]], operator_stats: dict[str, OperatorStats]) -> None:
+        """Atomically write a segment with the field values output for each newly completed source record and the new operator stats."""
+        segment_path = os.path.join(self.path, f"{self.num_segments:08d}.ckpt")
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".segment-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"outputs": outputs, "operator_stats": operator_stats}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, segment_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.num_segments += 1
+
+    def clear(self) -> None:
+        """Remove every segment of the checkpoint."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+        self.num_segments = 0
+
+    def delete(self) -> None:
+        """Remove the checkpoint's directory; this is called once the execution has finished."""
+        shutil.rmtree(self.path, ignore_errors=True)
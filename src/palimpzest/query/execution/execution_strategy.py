@@ -1,9 +1,14 @@
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from enum import Enum
 
-from palimpzest.core.data.dataclasses import ExecutionStats, PlanStats
+from palimpzest.core.data.dataclasses import ExecutionStats, OperatorCostEstimates, OperatorStats, PlanStats
+from palimpzest.core.data.materialization_cache import MaterializationCache, get_materialization_cache
 from palimpzest.core.elements.records import DataRecord
+from palimpzest.query.execution.spill import SpillableRecordBuffer
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.optimizer.cost_model import BaseCostModel, CostModel
 from palimpzest.query.optimizer.plan import PhysicalPlan
 
 
@@ -12,9 +17,73 @@ class ExecutionStrategyType(str, Enum):
     SEQUENTIAL = "sequential"
     PIPELINED_SINGLE_THREAD = "pipelined"
     PIPELINED_PARALLEL = "pipelined_parallel"
+    PIPELINED_ASYNC = "pipelined_async"
+    BATCH = "batch"
     AUTO = "auto"
 
 
+class QueueBudget:
+    """
+    Bound on the records buffered in each queue between two physical operators. A queue is full once it
+    holds `max_records` records or `max_bytes` bytes (as estimated by DataRecord.get_size_in_bytes());
+    either bound may be None. Execution strategies throttle the operators upstream of a full queue.
+    """
+    def __init__(self, max_records: int | None = None, max_bytes: int | None = None):
+        if max_records is not None and max_records < 1:
+            raise ValueError(f"max_records must be a positive integer, got {max_records}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be a positive integer, got {max_bytes}")
+
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+
+    def is_bounded(self) -> bool:
+        return self.max_records is not None or self.max_bytes is not None
+
+    def get_size_in_bytes(self, record: DataRecord) -> int:
+        """Return the size of the record; records are only measured if the budget bounds the number of bytes."""
+        return record.get_size_in_bytes() if self.max_bytes is not None else 0
+
+    def is_full(self, num_records: int, num_bytes: int) -> bool:
+        return (
+            self.max_records is not None and num_records >= self.max_records
+            or self.max_bytes is not None and num_bytes >= self.max_bytes
+        )
+
+
+class RecordQueue:
+    """A FIFO queue of the records waiting to be processed by an operator, which is bounded by a QueueBudget."""
+    def __init__(self, budget: QueueBudget):
+        self.budget = budget
+        self.records: deque[DataRecord] = deque()
+        self.sizes: deque[int] = deque()
+        self.num_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def is_full(self) -> bool:
+        return self.budget.is_full(len(self.records), self.num_bytes)
+
+    def append(self, record: DataRecord) -> None:
+        size = self.budget.get_size_in_bytes(record)
+        self.records.append(record)
+        self.sizes.append(size)
+        self.num_bytes += size
+
+    def popleft(self) -> DataRecord:
+        self.num_bytes -= self.sizes.popleft()
+        return self.records.popleft()
+
+    def clear(self) -> None:
+        self.records.clear()
+        self.sizes.clear()
+        self.num_bytes = 0
+
+
 class ExecutionStrategy(ABC):
     """
     Base strategy for executing query plans.
@@ -24,11 +93,20 @@ class ExecutionStrategy(ABC):
                  scan_start_idx: int = 0, 
                  max_workers: int | None = None,
                  nocache: bool = True,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 max_queued_records: int | None = None,
+                 max_queued_bytes: int | None = None,
+                 spill_threshold_bytes: int | None = None,
+                 spill_dir: str | None = None,
+                 cost_model: BaseCostModel | None = None):
         self.scan_start_idx = scan_start_idx
         self.nocache = nocache
         self.verbose = verbose
         self.max_workers = max_workers
+        self.queue_budget = QueueBudget(max_records=max_queued_records, max_bytes=max_queued_bytes)
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.spill_dir = spill_dir
+        self.cost_model = cost_model
         self.execution_stats = []
 
 
@@ -43,6 +121,77 @@ class ExecutionStrategy(ABC):
         pass
 
 
+    def _create_aggregate_buffer(self) -> SpillableRecordBuffer:
+        """Create the buffer for the input records of an aggregate operator."""
+        return SpillableRecordBuffer(spill_threshold_bytes=self.spill_threshold_bytes, spill_dir=self.spill_dir)
+
+
+    def _open_materialization_caches(self, plan: PhysicalPlan, num_samples: int | float) -> list[str | None]:
+        """
+        Return the MaterializationCache id of the output of each operator in the plan, or None for the operators
+        whose output is not materialized. Only executions which process all of the source records materialize
+        their outputs, and the operators upstream of a limit are skipped, as they only process the records which
+        are needed to reach the limit.
+        """
+        cache_ids = [None] * len(plan.operators)
+        cache = get_materialization_cache()
+        if self.nocache or cache is None or num_samples != float("inf") or self.scan_start_idx > 0:
+            return cache_ids
+
+        last_limit_op_idx = max([op_idx for op_idx, op in enumerate(plan.operators) if isinstance(op, LimitScanOp)], default=0)
+        cache_id = MaterializationCache.get_source_cache_id(plan.operators[0].datareader)
+        for op_idx, operator in enumerate(plan.operators[1:], start=1):
+            if cache_id is None or operator.target_cache_id is None:
+                break
+
+            cache_id = MaterializationCache.get_cache_id(cache_id, operator.target_cache_id)
+            if op_idx >= last_limit_op_idx:
+                cache_ids[op_idx] = cache_id
+                cache.open_cache(cache_id)
+
+        return cache_ids
+
+
+    @staticmethod
+    def _materialize(cache_ids: list[str | None], op_idx: int, records: list[DataRecord]) -> None:
+        """Buffer the records output by the operator at op_idx in the MaterializationCache (if its output is materialized)."""
+        cache = get_materialization_cache()
+        if cache is not None and cache_ids[op_idx] is not None:
+            cache.append_cache(cache_ids[op_idx], records)
+
+
+    @staticmethod
+    def _close_materialization_caches(cache_ids: list[str | None]) -> None:
+        """Write the records buffered for each operator to the MaterializationCache once the plan has finished."""
+        cache = get_materialization_cache()
+        for cache_id in cache_ids:
+            if cache is not None and cache_id is not None:
+                cache.close_cache(cache_id)
+
+
+    @staticmethod
+    def estimate_records_per_source(plan: PhysicalPlan, cost_model: BaseCostModel | None = None) -> list[float]:
+        """
+        Return the number of records which the cost model estimates will reach (i.e. be input to) each operator
+        of the plan per source record; e.g. for a scan followed by two filters of selectivity 0.5 and a limit,
+        this is [1.0, 1.0, 0.5, 0.25]. If no cost model is provided, the naive estimates are used.
+        """
+        cost_model = cost_model if cost_model is not None else CostModel()
+        source_op_estimates = OperatorCostEstimates(cardinality=1.0, time_per_record=0.0, cost_per_record=0.0, quality=1.0)
+        records_per_source = [1.0, 1.0]
+        for operator in plan.operators[1:-1]:
+            source_op_estimates = cost_model(operator, source_op_estimates).op_estimates
+            records_per_source.append(source_op_estimates.cardinality)
+
+        return records_per_source[:len(plan.operators)]
+
+
+    @staticmethod
+    def _add_spill_stats(op_stats: OperatorStats, buffer: SpillableRecordBuffer) -> None:
+        op_stats.num_spilled_records += buffer.num_spilled_records
+        op_stats.num_spilled_bytes += buffer.num_spilled_bytes
+
+
     # TODO(chjun): use _create_execution_stats for execution stats setup.
     ## aggregate plan stats
     # aggregate_plan_stats = self.aggregate_plan_stats(plan_stats)
@@ -0,0 +1,218 @@
+"""
+This file contains the executor which incrementally re-executes a plan over a directory of source files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Callable
+
+from palimpzest.core.data.dataclasses import PlanStats
+from palimpzest.core.data.datareaders import DirectoryReader, MaterializedResultReader, SubsetReader
+from palimpzest.core.data.document_cache import hash_file
+from palimpzest.core.data.manifest import ManifestEntry, SourceManifest
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.schemas import Schema
+from palimpzest.query.operators.aggregate import AggregateOp, PartialAggregate
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.scan import CacheScanDataOp, ScanPhysicalOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.utils.hash_helpers import is_cacheable_callable
+
+
+class IncrementalExecutor:
+    """
+    Executes a plan over the files of a DirectoryReader incrementally, by re-using the outputs which previous
+    executions of the plan stored in a SourceManifest.
+
+    The plan is split into its per-record operators (i.e. the operators before its first aggregate) and the
+    rest of the plan. Each file is fingerprinted by its size and modification time (and, if these changed, by
+    the hash of its contents); only the files which are new or whose contents changed are processed by the
+    per-record operators, and their outputs are stored in the manifest. The outputs of the files which were
+    deleted are retracted from the manifest. The outputs of all of the directory's files are then merged in
+    the order of the files. If the first aggregate supports partial aggregation, the manifest also stores its
+    partial state over each file's outputs, and the aggregate is recomputed by merging the partial states;
+    otherwise, it is executed on the merged outputs. Any operators after the first aggregate are executed
+    on its output.
+
+    Plans which do not scan a DirectoryReader, or which contain a limit, are executed in full.
+    """
+    def __init__(
+        self,
+        manifest: SourceManifest,
+        execute_plan: Callable[[PhysicalPlan], tuple[list[DataRecord], PlanStats]],
+        verbose: bool = False,
+    ):
+        self.manifest = manifest
+        self.execute_plan = execute_plan
+        self.verbose = verbose
+
+        # the number of files in each state in the last execution
+        self.stats = {"new": 0, "changed": 0, "unchanged": 0, "deleted": 0}
+
+    @staticmethod
+    def supports_plan(plan: PhysicalPlan) -> bool:
+        # the outputs of operators whose UDFs cannot be identified by their hash (see is_cacheable_callable) are not re-used
+        source_operator = plan.operators[0]
+        udfs = [
+            fn
+            for op in plan.operators
+            for fn in [getattr(op, "udf", None), getattr(getattr(op, "filter_obj", None), "filter_fn", None), getattr(op, "search_func", None)]
+            if fn is not None
+        ]
+        return (
+            isinstance(source_operator, ScanPhysicalOp)
+            and isinstance(source_operator.datareader, DirectoryReader)
+            and not any(isinstance(op, LimitScanOp) for op in plan.operators)
+            and all(is_cacheable_callable(fn) for fn in udfs)
+        )
+
+    @staticmethod
+    def get_plan_key(plan: PhysicalPlan, num_record_ops: int) -> str:
+        """Return the key of the plan's entries in the manifest, which depends on its source and per-record operators."""
+        datareader = plan.operators[0].datareader
+        op_ids = [op.target_cache_id or op.get_logical_op_id() for op in plan.operators[1 : num_record_ops + 2]]
+        key = {
+            "reader": datareader.__class__.__name__,
+            "path": os.path.abspath(datareader.path),
+            "parser_options": datareader.get_parser_options(),
+            "op_ids": op_ids,
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _create_records(schema: Schema, outputs: list[dict], source_idx: int) -> list[DataRecord]:
+        records = []
+        for field_values in outputs:
+            record = DataRecord(schema, source_idx=source_idx)
+            for field, value in field_values.items():
+                setattr(record, field, value)
+            records.append(record)
+
+        return records
+
+    def execute(self, plan: PhysicalPlan) -> tuple[list[DataRecord], list[PlanStats]]:
+        """Execute the plan incrementally and return its output records and the stats of the (sub-)plans which were executed."""
+        if not self.supports_plan(plan):
+            if self.verbose:
+                print("Plan does not scan a DirectoryReader (or contains a limit or a UDF which cannot be hashed); executing it in full")
+            records, plan_stats = self.execute_plan(plan)
+            return records, [plan_stats]
+
+        start_time = time.time()
+        all_plan_stats = []
+
+        # split the plan into the scan, its per-record operators, its first aggregate, and the rest of the plan
+        source_operator, datareader = plan.operators[0], plan.operators[0].datareader
+        agg_op_idx = next((idx for idx, op in enumerate(plan.operators) if isinstance(op, AggregateOp)), len(plan.operators))
+        record_ops = plan.operators[1:agg_op_idx]
+        agg_op = plan.operators[agg_op_idx] if agg_op_idx < len(plan.operators) else None
+        output_schema = plan.operators[agg_op_idx - 1].output_schema
+        plan_key = self.get_plan_key(plan, len(record_ops))
+
+        # compare the directory's files to their fingerprints in the manifest
+        entries = self.manifest.get_entries(plan_key)
+        updated_entries, changed_idxs = {}, []
+        self.stats = {"new": 0, "changed": 0, "unchanged": 0, "deleted": 0}
+        for idx, filepath in enumerate(datareader.filepaths):
+            stat = os.stat(filepath)
+            entry = entries.get(filepath)
+            if entry is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                self.stats["unchanged"] += 1
+                continue
+
+            # a file whose modification time changed is only re-processed if its contents changed
+            content_hash = hash_file(filepath)
+            if entry is not None and entry.content_hash == content_hash:
+                entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                updated_entries[filepath] = entry
+                self.stats["unchanged"] += 1
+                continue
+
+            updated_entries[filepath] = ManifestEntry(filepath, stat.st_size, stat.st_mtime_ns, content_hash, outputs=[])
+            changed_idxs.append(idx)
+            self.stats["new" if entry is None else "changed"] += 1
+
+        deleted_filepaths = sorted(set(entries) - set(datareader.filepaths))
+        self.stats["deleted"] = len(deleted_filepaths)
+        if self.verbose:
+            print(f"Incremental execution: {self.stats}")
+
+        # process the new and changed files with the per-record operators
+        idx_to_records = {idx: [] for idx in changed_idxs}
+        if len(changed_idxs) > 0:
+            scan_op = type(source_operator)(**{**source_operator.get_op_params(), "datareader": SubsetReader(datareader, changed_idxs)})
+            records, plan_stats = self.execute_plan(PhysicalPlan(operators=[scan_op, *record_ops]))
+            all_plan_stats.append(plan_stats)
+
+            # map the records from their index in the subset of files to the index of their file
+            for record in records:
+                record.source_idx = changed_idxs[record.source_idx]
+                idx_to_records[record.source_idx].append(record)
+
+        for idx, records in idx_to_records.items():
+            entry = updated_entries[datareader.filepaths[idx]]
+            entry.outputs = [record.field_values for record in records]
+            if agg_op is not None and agg_op.supports_partial_aggregation():
+                partial = agg_op.fold(agg_op.create_partial(), records)
+                entry.partial_state, entry.num_partial_records = partial.state, partial.num_records
+
+        # store the new outputs and retract the outputs of the deleted files before merging the outputs
+        self.manifest.update(plan_key, list(updated_entries.values()), deleted_filepaths)
+        entries.update(updated_entries)
+
+        # merge the outputs of every file in the directory (in the order of the files)
+        file_entries = [(idx, entries[filepath]) for idx, filepath in enumerate(datareader.filepaths)]
+
+        def get_file_records(idx: int, entry: ManifestEntry) -> list[DataRecord]:
+            records = idx_to_records.get(idx)
+            return records if records is not None else self._create_records(output_schema, entry.outputs, idx)
+
+        if agg_op is None:
+            records = [record for idx, entry in file_entries for record in get_file_records(idx, entry)]
+            return records, self._finalize_plan_stats(plan, all_plan_stats, start_time)
+
+        # recompute the aggregate by merging the partial states of the files
+        rest_ops = plan.operators[agg_op_idx:]
+        if agg_op.supports_partial_aggregation():
+            partial, last_file = agg_op.create_partial(), None
+            for idx, entry in file_entries:
+                if len(entry.outputs) == 0:
+                    continue
+
+                # the outputs of files whose partial state could not be stored are folded again
+                if entry.partial_state is None:
+                    agg_op.fold(partial, get_file_records(idx, entry))
+                else:
+                    file_partial = PartialAggregate(entry.partial_state)
+                    file_partial.num_records = entry.num_partial_records
+                    agg_op.merge(partial, file_partial)
+                last_file = (idx, entry)
+
+            # the aggregate's output(s) are derived from the last input record
+            partial.last_record = None if last_file is None else get_file_records(*last_file)[-1]
+            records = agg_op.finalize(partial).data_records
+            output_schema, rest_ops = agg_op.output_schema, plan.operators[agg_op_idx + 1:]
+        else:
+            records = [record for idx, entry in file_entries for record in get_file_records(idx, entry)]
+
+        # execute the rest of the plan on the merged records
+        if len(rest_ops) > 0:
+            reader = MaterializedResultReader(None, [record.field_values for record in records], output_schema)
+            scan_op = CacheScanDataOp(output_schema=output_schema, datareader=reader)
+            records, plan_stats = self.execute_plan(PhysicalPlan(operators=[scan_op, *rest_ops]))
+            all_plan_stats.append(plan_stats)
+
+        return records, self._finalize_plan_stats(plan, all_plan_stats, start_time)
+
+    @staticmethod
+    def _finalize_plan_stats(plan: PhysicalPlan, all_plan_stats: list[PlanStats], start_time: float) -> list[PlanStats]:
+        # if every file was unchanged, no (sub-)plan was executed
+        if len(all_plan_stats) == 0:
+            plan_stats = PlanStats(plan_id=plan.plan_id, plan_str=str(plan))
+            plan_stats.finalize(time.time() - start_time)
+            all_plan_stats.append(plan_stats)
+
+        return all_plan_stats
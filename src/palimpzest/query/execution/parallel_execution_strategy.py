@@ -1,29 +1,671 @@
+import functools
+import math
 import multiprocessing
+import queue
 import time
-from concurrent.futures import ThreadPoolExecutor, wait
-
-from palimpzest.constants import PARALLEL_EXECUTION_SLEEP_INTERVAL_SECS
+from collections import deque
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from palimpzest.constants import (
+    DEFAULT_CHECKPOINT_INTERVAL_SECS,
+    DEFAULT_STREAMING_WINDOW,
+    LIMIT_READ_AHEAD_FACTOR,
+    LIMIT_SELECTIVITY_PRIOR_WEIGHT,
+    PARTIAL_AGGREGATION_CHUNK_SIZE,
+)
 from palimpzest.core.data.dataclasses import OperatorStats, PlanStats
-from palimpzest.query.execution.execution_strategy import ExecutionStrategy
-from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.query.execution.checkpoint import ExecutionCheckpoint
+from palimpzest.query.execution.execution_strategy import ExecutionStrategy, QueueBudget
+from palimpzest.query.execution.spill import SpillableRecordBuffer
+from palimpzest.query.operators.aggregate import AggregateOp, PartialAggregate
+from palimpzest.query.operators.batched import BatchedLLMOp
 from palimpzest.query.operators.limit import LimitScanOp
 from palimpzest.query.operators.physical import PhysicalOperator
 from palimpzest.query.operators.scan import ScanPhysicalOp
 from palimpzest.query.optimizer.plan import PhysicalPlan
 
 
+class PipelineScheduler:
+    """
+    Event-driven scheduler which executes the operators of a physical plan on a thread pool.
+
+    Every future registers a completion callback which pushes it onto a queue, and the scheduler blocks
+    on that queue rather than polling its futures. Records are submitted to their next operator as soon
+    as they are produced; only the inputs to aggregate and batched operators wait in a per-operator ready
+    queue. Each operator keeps a count of its unfinished upstream operators (the first operator's upstream
+    is the datareader), and an operator is finished once that count is zero and it has no queued or
+    in-flight inputs. Thus, aggregates (and final partial batches) are executed as soon as the operator
+    before them finishes, and limits stop the scan as soon as they have received enough records.
+
+    Aggregates which support partial aggregation fold their inputs into a PartialAggregate as they arrive:
+    every PARTIAL_AGGREGATION_CHUNK_SIZE records are folded into a new partial state by a worker, and the scheduler
+    merges the partial states as the workers complete; the aggregate's output is computed from the merged
+    state once the operator before it finishes. The inputs of any other aggregate are collected in a (possibly
+    spilling) buffer which is created by `create_aggregate_buffer`. The queued and in-flight inputs of every
+    other operator are bounded by the QueueBudget: the scan is paused while any queue is full and resumed
+    once it drains. Records which are already in flight
+    when a queue fills up are still enqueued, thus one-to-many operators may overshoot the budget.
+
+    The scheduler is also limit-aware: the scan is paused while the records in flight upstream of a limit are
+    expected to produce the records which the limit still needs. The expected fraction of records which reach
+    the limit starts at the estimate in `est_records_per_source` (see ExecutionStrategy.estimate_records_per_source)
+    and is refined as records arrive at the limit. Once a limit is reached, the futures upstream of it which have
+    not started yet are cancelled. The scan's read-ahead (see PrefetchingScanDataOp) is bounded by the source records
+    which the scheduler expects to scan, and the scan is closed as soon as the scheduler stops scanning.
+    """
+    def __init__(
+        self,
+        plan: PhysicalPlan,
+        plan_stats: PlanStats,
+        executor: ThreadPoolExecutor,
+        scan_start_idx: int = 0,
+        num_samples: int | float = float("inf"),
+        queue_budget: QueueBudget | None = None,
+        create_aggregate_buffer: Callable[[], SpillableRecordBuffer] = SpillableRecordBuffer,
+        est_records_per_source: list[float] | None = None,
+        materialize: Callable[[int, list[DataRecord]], None] | None = None,
+    ):
+        self.plan = plan
+        self.plan_stats = plan_stats
+        self.executor = executor
+        self.num_samples = num_samples
+        self.queue_budget = queue_budget if queue_budget is not None else QueueBudget()
+        self.materialize = materialize
+
+        # get handle to scan operator and pre-compute its size
+        self.operators = plan.operators
+        self.num_ops = len(self.operators)
+        self.source_operator = self.operators[0]
+        assert isinstance(self.source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
+        self.datareader_len = len(self.source_operator.datareader)
+        self.current_scan_idx = scan_start_idx
+        self.scan_end_idx = min(self.datareader_len, scan_start_idx + num_samples)
+        self.source_records_scanned = 0
+        self.scan_is_stopped = False
+        self.scan_is_paused = False
+
+        # per-operator state, indexed by the operator's position in the plan
+        self.op_ids = [op.get_op_id() for op in self.operators]
+        self.op_id_to_op_idx = {op_id: op_idx for op_idx, op_id in enumerate(self.op_ids)}
+        self.create_aggregate_buffer = create_aggregate_buffer
+        self.partials: list[PartialAggregate | None] = [
+            op.create_partial() if isinstance(op, AggregateOp) and op.supports_partial_aggregation() else None
+            for op in self.operators
+        ]
+        self.ready_queues: list[deque[DataRecord] | SpillableRecordBuffer] = [
+            create_aggregate_buffer() if isinstance(op, AggregateOp) and partial is None else deque()
+            for op, partial in zip(self.operators, self.partials)
+        ]
+        self.num_in_flight = [0] * self.num_ops
+        self.num_unfinished_upstream_ops = [1] * self.num_ops
+        self.is_finished = [False] * self.num_ops
+        self.remaining_limits = [op.limit if isinstance(op, LimitScanOp) else None for op in self.operators]
+        self.num_records_in_flight = [0] * self.num_ops
+
+        # the limits whose inputs are streamed from the scan (i.e. which are not downstream of an aggregate), the
+        # number of records which have arrived at each operator, and the estimated number per source record
+        first_agg_op_idx = next((op_idx for op_idx, op in enumerate(self.operators) if isinstance(op, AggregateOp)), self.num_ops)
+        self.limit_op_idxs = [op_idx for op_idx in range(first_agg_op_idx) if self.remaining_limits[op_idx] is not None]
+        self.num_arrived = [0] * self.num_ops
+        self.est_records_per_source = est_records_per_source if est_records_per_source is not None else [1.0] * self.num_ops
+
+        # the number of records (and bytes) queued or in flight for each operator with a bounded queue;
+        # aggregates consume all of their inputs before producing any output, thus their queues are unbounded
+        self.is_bounded = [
+            self.queue_budget.is_bounded() and op_idx > 0 and not isinstance(op, AggregateOp)
+            for op_idx, op in enumerate(self.operators)
+        ]
+        self.num_queued_records = [0] * self.num_ops
+        self.num_queued_bytes = [0] * self.num_ops
+        self.ready_queue_bytes = [0] * self.num_ops
+        self.future_to_num_bytes: dict[Future, int] = {}
+        self.num_full_queues = 0
+
+        # get limit of final limit operator (if one exists)
+        self.final_limit = self.remaining_limits[-1]
+        self.output_records: list[DataRecord] = []
+
+        # futures which have been submitted but not yet processed (and the operator and input of each), and the
+        # queue of completed futures
+        self.pending_futures: set[Future] = set()
+        self.future_to_input: dict[Future, tuple[int, DataRecord | list[DataRecord] | int]] = {}
+        self.completed_futures: queue.SimpleQueue[Future] = queue.SimpleQueue()
+
+    def run(self) -> list[DataRecord]:
+        """Execute the plan and return its output records."""
+        try:
+            self._scan_next_record()
+            while len(self.pending_futures) > 0:
+                future = self.completed_futures.get()
+                self.pending_futures.discard(future)
+                self._process_future(future)
+
+                # check early stopping condition based on final limit
+                if self.final_limit is not None and len(self.output_records) >= self.final_limit:
+                    for pending_future in self.pending_futures:
+                        pending_future.cancel()
+                    return self.output_records[:self.final_limit]
+
+            return self.output_records
+
+        finally:
+            self.source_operator.close()
+
+    def _submit(self, op_idx: int, fn, op_input: DataRecord | list[DataRecord] | int, num_bytes: int = 0) -> None:
+        future = self.executor.submit(fn, self.operators[op_idx], op_input)
+        self.num_in_flight[op_idx] += 1
+        self.num_records_in_flight[op_idx] += len(op_input) if isinstance(op_input, (list, SpillableRecordBuffer)) else 1
+        self.pending_futures.add(future)
+        self.future_to_input[future] = (op_idx, op_input)
+        if self.is_bounded[op_idx]:
+            self.future_to_num_bytes[future] = num_bytes
+        future.add_done_callback(self.completed_futures.put)
+
+    def _submit_ready_queue(self, op_idx: int) -> None:
+        """Submit all of the records in the operator's ready queue as a single input."""
+        operator, ready_queue = self.operators[op_idx], self.ready_queues[op_idx]
+        if self.partials[op_idx] is not None:
+            self._submit(op_idx, AggregateOp.execute_fold_wrapper, list(ready_queue))
+            ready_queue.clear()
+            return
+
+        if isinstance(operator, AggregateOp):
+            # the aggregate takes ownership of its buffer, which is cleared once the aggregate has finished
+            self._submit(op_idx, PhysicalOperator.execute_op_wrapper, ready_queue)
+            self.ready_queues[op_idx] = self.create_aggregate_buffer()
+            return
+
+        fn = BatchedLLMOp.execute_batch_op_wrapper if isinstance(operator, BatchedLLMOp) else PhysicalOperator.execute_op_wrapper
+        self._submit(op_idx, fn, list(ready_queue), num_bytes=self.ready_queue_bytes[op_idx])
+        ready_queue.clear()
+        self.ready_queue_bytes[op_idx] = 0
+
+    def _queue_is_full(self, op_idx: int) -> bool:
+        return self.queue_budget.is_full(self.num_queued_records[op_idx], self.num_queued_bytes[op_idx])
+
+    def _update_queue(self, op_idx: int, num_records: int, num_bytes: int) -> None:
+        """Add (or, if negative, remove) records to the operator's queue and update the number of full queues."""
+        was_full = self._queue_is_full(op_idx)
+        self.num_queued_records[op_idx] += num_records
+        self.num_queued_bytes[op_idx] += num_bytes
+        self.num_full_queues += int(self._queue_is_full(op_idx)) - int(was_full)
+
+    def _scan_next_record(self) -> None:
+        """Scan the next source record, or mark the datareader as finished if no records may be scanned."""
+        can_scan = (
+            not self.scan_is_stopped
+            and self.source_records_scanned < self.num_samples
+            and self.current_scan_idx < self.datareader_len
+        )
+        num_sources_needed = self._get_num_sources_needed()
+        if can_scan and (self.num_full_queues > 0 or num_sources_needed <= 0):
+            self.scan_is_paused = True
+
+        elif can_scan:
+            # do not read ahead past the source records which are expected to be scanned
+            prefetch_end_idx = self.scan_end_idx
+            if num_sources_needed < float("inf"):
+                prefetch_end_idx = min(prefetch_end_idx, self.current_scan_idx + math.ceil(num_sources_needed))
+            self.source_operator.limit_prefetch(prefetch_end_idx)
+
+            self._submit(0, PhysicalOperator.execute_op_wrapper, self.current_scan_idx)
+            self.current_scan_idx += 1
+
+        # the first scan is always submitted, thus the datareader can only finish once
+        elif self.num_unfinished_upstream_ops[0] > 0:
+            self._upstream_op_finished(0)
+
+    def _get_num_sources_needed(self) -> float:
+        """
+        Estimate the number of source records which must still be scanned for the records in flight upstream of
+        a limit to produce the records it still needs; this is at most zero once any limit is expected to be reached.
+        """
+        num_sources_needed = float("inf")
+        for op_idx in self.limit_op_idxs:
+            remaining_limit = self.remaining_limits[op_idx]
+            if remaining_limit == 0:
+                continue
+
+            # estimate the fraction of the upstream records which reach the limit from the cost model's estimate
+            # and the records which have reached it so far (out of the source records which are no longer in flight)
+            num_upstream_in_flight = sum(self.num_records_in_flight[:op_idx])
+            num_resolved = max(self.source_records_scanned - sum(self.num_records_in_flight[1:op_idx]), 0)
+            est_fraction = (
+                (self.num_arrived[op_idx] + LIMIT_SELECTIVITY_PRIOR_WEIGHT * self.est_records_per_source[op_idx])
+                / (num_resolved + LIMIT_SELECTIVITY_PRIOR_WEIGHT)
+            )
+            if est_fraction > 0:
+                num_sources_needed = min(
+                    num_sources_needed, remaining_limit * LIMIT_READ_AHEAD_FACTOR / est_fraction - num_upstream_in_flight
+                )
+
+        return num_sources_needed
+
+    def _is_past_limit(self, op_idx: int) -> bool:
+        """Return True if records sent to the operator at op_idx are dropped by a limit (at or after it) which has been reached."""
+        return self.remaining_limits[op_idx] == 0 or any(
+            self.remaining_limits[limit_op_idx] == 0 for limit_op_idx in self.limit_op_idxs if limit_op_idx > op_idx
+        )
+
+    def _cancel_upstream_futures(self, op_idx: int) -> None:
+        """Cancel the pending futures (and partial batches) of the operators before op_idx which have not started executing."""
+        for future in list(self.pending_futures):
+            if self.future_to_input[future][0] < op_idx:
+                future.cancel()
+
+        for upstream_op_idx in range(op_idx):
+            if isinstance(self.operators[upstream_op_idx], BatchedLLMOp) and len(self.ready_queues[upstream_op_idx]) > 0:
+                self._drop_ready_queue(upstream_op_idx)
+
+    def _drop_ready_queue(self, op_idx: int) -> None:
+        if self.is_bounded[op_idx]:
+            self._update_queue(op_idx, -len(self.ready_queues[op_idx]), -self.ready_queue_bytes[op_idx])
+        self.ready_queues[op_idx].clear()
+        self.ready_queue_bytes[op_idx] = 0
+
+    def _process_future(self, future: Future) -> None:
+        # get the result; batched operators return one record set per input record, and cancelled futures have none
+        op_idx, op_input = self.future_to_input.pop(future)
+        result = [] if future.cancelled() else future.result()[0]
+        operator = self.operators[op_idx]
+        self.num_in_flight[op_idx] -= 1
+        self.num_records_in_flight[op_idx] -= len(op_input) if isinstance(op_input, (list, SpillableRecordBuffer)) else 1
+
+        # merge the partial state which a worker folded a chunk of an aggregate's input into
+        if isinstance(result, PartialAggregate):
+            operator.merge(self.partials[op_idx], result)
+            self._check_finished(op_idx)
+            return
+
+        record_sets = result if isinstance(result, list) else [result]
+        if self.is_bounded[op_idx]:
+            num_records = len(op_input) if isinstance(op_input, list) else 1
+            self._update_queue(op_idx, -num_records, -self.future_to_num_bytes.pop(future))
+
+        # record how many of an aggregate's inputs were spilled and delete its buffer's segments
+        if isinstance(op_input, SpillableRecordBuffer):
+            ExecutionStrategy._add_spill_stats(self.plan_stats.operator_stats[self.op_ids[op_idx]], op_input)
+            op_input.clear()
+
+        self._emit(op_idx, record_sets)
+
+        # if this operator was a source scan, update the number of source records scanned and scan the next record
+        if op_idx == 0:
+            self.source_records_scanned += len(result)
+            self._scan_next_record()
+
+        # resume the scan once none of the queues are full
+        if self.scan_is_paused and self.num_full_queues == 0:
+            self.scan_is_paused = False
+            self._scan_next_record()
+
+        self._check_finished(op_idx)
+
+    def _emit(self, op_idx: int, record_sets: list[DataRecordSet]) -> None:
+        """Update the plan stats with the operator's output and send its records to the next operator."""
+        for record_set in record_sets:
+            self.plan_stats.operator_stats[self.op_ids[op_idx]].add_record_op_stats(
+                record_set.record_op_stats,
+                source_op_id=self.op_ids[op_idx - 1] if op_idx > 0 else None,
+                plan_id=self.plan.plan_id,
+            )
+
+        # pass the operator's output to the materialization callback (if one was provided)
+        if self.materialize is not None:
+            self.materialize(op_idx, [record for record_set in record_sets for record in record_set])
+
+        # send each record which is not filtered out to the next operator
+        for record_set in record_sets:
+            for record in record_set:
+                if getattr(record, "passed_operator", True):
+                    self._enqueue(op_idx + 1, record)
+
+    def _enqueue(self, op_idx: int, record: DataRecord) -> None:
+        """Submit the record to the operator at op_idx (or add it to the output if op_idx is past the plan)."""
+        if op_idx == self.num_ops:
+            self.output_records.append(record)
+            return
+
+        # drop records which can no longer reach the output; once a limit is reached, stop scanning and cancel
+        # the upstream work which has not started yet, as none of the records upstream of the limit can reach its output
+        remaining_limit = self.remaining_limits[op_idx]
+        self.num_arrived[op_idx] += 1
+        if self._is_past_limit(op_idx):
+            return
+        if remaining_limit is not None:
+            self.remaining_limits[op_idx] = remaining_limit - 1
+            if remaining_limit == 1:
+                self.scan_is_stopped = True
+                self.source_operator.close()
+                self._cancel_upstream_futures(op_idx)
+
+        num_bytes = 0
+        if self.is_bounded[op_idx]:
+            num_bytes = self.queue_budget.get_size_in_bytes(record)
+            self._update_queue(op_idx, 1, num_bytes)
+
+        # submit a batch once it is full, or once the operator's queue is full (as it cannot grow further)
+        operator = self.operators[op_idx]
+        if isinstance(operator, BatchedLLMOp):
+            ready_queue = self.ready_queues[op_idx]
+            ready_queue.append(record)
+            self.ready_queue_bytes[op_idx] += num_bytes
+            if len(ready_queue) == operator.batch_size or self._queue_is_full(op_idx):
+                self._submit_ready_queue(op_idx)
+
+        elif isinstance(operator, AggregateOp):
+            ready_queue = self.ready_queues[op_idx]
+            ready_queue.append(record)
+            if self.partials[op_idx] is not None and len(ready_queue) == PARTIAL_AGGREGATION_CHUNK_SIZE:
+                self._submit_ready_queue(op_idx)
+
+        else:
+            self._submit(op_idx, PhysicalOperator.execute_op_wrapper, record, num_bytes=num_bytes)
+
+    def _upstream_op_finished(self, op_idx: int) -> None:
+        """Decrement the operator's count of unfinished upstream operators and flush its ready queue if none remain."""
+        self.num_unfinished_upstream_ops[op_idx] -= 1
+        if self.num_unfinished_upstream_ops[op_idx] == 0 and len(self.ready_queues[op_idx]) > 0:
+            self._submit_ready_queue(op_idx)
+
+        self._check_finished(op_idx)
+
+    def _check_finished(self, op_idx: int) -> None:
+        """Mark the operator as finished (and notify its downstream operator) if it can produce no more records."""
+        is_finished = (
+            not self.is_finished[op_idx]
+            and self.num_unfinished_upstream_ops[op_idx] == 0
+            and self.num_in_flight[op_idx] == 0
+            and len(self.ready_queues[op_idx]) == 0
+        )
+        if is_finished:
+            # compute the output of an aggregate from its partial state (which now includes all of its inputs)
+            partial = self.partials[op_idx]
+            if partial is not None:
+                self.partials[op_idx] = None
+                self._emit(op_idx, [self.operators[op_idx].finalize(partial)])
+
+            self.is_finished[op_idx] = True
+            if op_idx + 1 < self.num_ops:
+                self._upstream_op_finished(op_idx + 1)
+
+
+class StreamingPipelineScheduler(PipelineScheduler):
+    """
+    PipelineScheduler which yields the plan's output records as they are produced, rather than returning them
+    once the plan has finished. Each yielded list holds the records produced by the futures which completed
+    since the previous list was yielded. As the scheduler is driven by the consumer of its generator, no
+    futures are submitted while the consumer is not pulling records.
+
+    For each source record, the scheduler counts the records derived from it which are in flight or waiting
+    in a ready queue; a source record is complete once that count is zero. If `ordered` is True, the outputs
+    of a source record are only yielded once it and every source record before it are complete (and thus
+    outputs are yielded in the order of the datareader); otherwise, outputs are yielded as soon as they are
+    produced. At most `window` source records may be scanned but not yet completed (or, if ordered, not yet
+    yielded) at once; the scan is paused while the window is full.
+    """
+    def __init__(self, *args, ordered: bool = True, window: int = DEFAULT_STREAMING_WINDOW, **kwargs):
+        super().__init__(*args, **kwargs)
+        assert not any(isinstance(op, AggregateOp) for op in self.operators), "Cannot stream the output of an aggregate"
+        if window < 1:
+            raise ValueError(f"window must be a positive integer, got {window}")
+        self.ordered = ordered
+        self.window = window
+
+        # the number of in-flight (or queued) records derived from each open source record, the outputs which
+        # are waiting to be yielded by an ordered scheduler, and the next source record it will yield outputs for
+        self.source_counts: dict[int, int] = {}
+        self.source_outputs: dict[int, list[DataRecord]] = {}
+        self.next_source_idx = self.current_scan_idx
+
+    def stream(self) -> Generator[list[DataRecord]]:
+        """Execute the plan and yield its output records as they become available."""
+        try:
+            yield from self._stream()
+        finally:
+            # the consumer may stop early, in which case the scan is closed once the generator is closed
+            self.source_operator.close()
+
+    def _stream(self) -> Generator[list[DataRecord]]:
+        num_yielded = 0
+        self._scan_next_record()
+        while len(self.pending_futures) > 0:
+            # process the next future and any others which have already completed
+            futures = [self.completed_futures.get()]
+            while not self.completed_futures.empty():
+                futures.append(self.completed_futures.get())
+            for future in futures:
+                self.pending_futures.discard(future)
+                self._process_future(future)
+
+            records = self._get_ready_records()
+
+            # resume the scan if it was paused by a full window which has since drained
+            if self.scan_is_paused and self.num_full_queues == 0:
+                self.scan_is_paused = False
+                self._scan_next_record()
+
+            # if nothing is in flight, submit any partial batches, as the records waiting in them may be holding the window open
+            if len(self.pending_futures) == 0:
+                for op_idx, operator in enumerate(self.operators):
+                    if isinstance(operator, BatchedLLMOp) and len(self.ready_queues[op_idx]) > 0:
+                        self._submit_ready_queue(op_idx)
+
+            # check early stopping condition based on final limit
+            if self.final_limit is not None and num_yielded + len(records) >= self.final_limit:
+                for pending_future in self.pending_futures:
+                    pending_future.cancel()
+                yield records[:self.final_limit - num_yielded]
+                return
+
+            if len(records) > 0:
+                num_yielded += len(records)
+                yield records
+
+    def _get_ready_records(self) -> list[DataRecord]:
+        """Return (and forget) the output records which may be yielded."""
+        if not self.ordered:
+            records, self.output_records = self.output_records, []
+            return records
+
+        for record in self.output_records:
+            self.source_outputs.setdefault(record.source_idx, []).append(record)
+        self.output_records = []
+
+        # yield the outputs of the complete source records which precede every incomplete source record
+        records = []
+        while self.next_source_idx < self.current_scan_idx and self.source_counts.get(self.next_source_idx, 0) == 0:
+            self.source_counts.pop(self.next_source_idx, None)
+            records.extend(self.source_outputs.pop(self.next_source_idx, []))
+            self.next_source_idx += 1
+
+        return records
+
+    def _num_open_sources(self) -> int:
+        return self.current_scan_idx - self.next_source_idx if self.ordered else len(self.source_counts)
+
+    def _update_source_count(self, source_idx: int, delta: int) -> None:
+        self.source_counts[source_idx] = self.source_counts.get(source_idx, 0) + delta
+        if not self.ordered and self.source_counts[source_idx] == 0:
+            del self.source_counts[source_idx]
+
+    def _scan_next_record(self) -> None:
+        can_scan = (
+            not self.scan_is_stopped
+            and self.source_records_scanned < self.num_samples
+            and self.current_scan_idx < self.datareader_len
+        )
+        if can_scan and self._num_open_sources() >= self.window:
+            self.scan_is_paused = True
+            return
+
+        scan_idx = self.current_scan_idx
+        super()._scan_next_record()
+        if self.current_scan_idx > scan_idx:
+            self._update_source_count(scan_idx, 1)
+
+    def _enqueue(self, op_idx: int, record: DataRecord) -> None:
+        # records which are dropped by a limit which has been reached are not counted
+        if op_idx < self.num_ops and not self._is_past_limit(op_idx):
+            self._update_source_count(record.source_idx, 1)
+        super()._enqueue(op_idx, record)
+
+    def _drop_ready_queue(self, op_idx: int) -> None:
+        for record in self.ready_queues[op_idx]:
+            self._update_source_count(record.source_idx, -1)
+        super()._drop_ready_queue(op_idx)
+
+    def _process_future(self, future: Future) -> None:
+        op_input = self.future_to_input[future][1]
+        super()._process_future(future)
+
+        # the future's inputs are no longer in flight; this happens after their outputs have been enqueued,
+        # thus a source record's count only reaches zero once all of the records derived from it are finished
+        if isinstance(op_input, int):
+            self._update_source_count(op_input, -1)
+        else:
+            for record in op_input if isinstance(op_input, list) else [op_input]:
+                self._update_source_count(record.source_idx, -1)
+
+
+class CheckpointingPipelineScheduler(PipelineScheduler):
+    """
+    Pipeline scheduler which periodically writes the progress of the execution to an ExecutionCheckpoint.
+
+    The plan's per-record operators are the operators before its first aggregate. For each source record, the
+    scheduler counts the records derived from it which are in flight or waiting in the ready queue of a per-record
+    operator; a source record is complete once that count is zero. The outputs of a source record are the records
+    derived from it which reached the end of the per-record operators (i.e. the output of the plan, or the input of
+    its first aggregate). At most once every `checkpoint_interval_secs` seconds, the outputs of the source records
+    which were completed since the previous checkpoint are written to the checkpoint along with the new operator
+    stats; `write_checkpoint` may also be called to save the progress of an execution which failed.
+
+    The outputs in `restored_outputs` (which were loaded from the checkpoint of a previous execution) are sent to
+    the end of the per-record operators, and their source records are not scanned again. The operators after the
+    first aggregate are always executed in full.
+    """
+    def __init__(
+        self,
+        *args,
+        checkpoint: ExecutionCheckpoint,
+        checkpoint_interval_secs: float = DEFAULT_CHECKPOINT_INTERVAL_SECS,
+        restored_outputs: dict[int, list[DataRecord]] | None = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        assert len(self.limit_op_idxs) == 0, "Cannot checkpoint the execution of a plan with a limit before its first aggregate"
+        self.checkpoint = checkpoint
+        self.checkpoint_interval_secs = checkpoint_interval_secs
+        self.restored_outputs = restored_outputs if restored_outputs is not None else {}
+        self.num_record_ops = next((op_idx for op_idx, op in enumerate(self.operators) if isinstance(op, AggregateOp)), self.num_ops)
+
+        # the number of in-flight (or queued) records derived from each open source record, the field values of the
+        # outputs of each open source record, and the outputs of the source records completed since the last checkpoint
+        self.source_counts: dict[int, int] = {}
+        self.source_outputs: dict[int, list[dict]] = {}
+        self.completed_outputs: dict[int, list[dict]] = {}
+
+        # the number of each operator's record op stats which have been written to the checkpoint (or restored from it)
+        self.num_checkpointed_stats = {
+            op_id: len(self.plan_stats.operator_stats[op_id].record_op_stats_lst) for op_id in self.op_ids
+        }
+        self.last_checkpoint_time = time.time()
+
+    def run(self) -> list[DataRecord]:
+        for source_idx in sorted(self.restored_outputs):
+            for record in self.restored_outputs[source_idx]:
+                super()._enqueue(self.num_record_ops, record)
+
+        return super().run()
+
+    def write_checkpoint(self) -> None:
+        """Write the outputs of the source records completed since the last checkpoint (and the new operator stats)."""
+        if len(self.completed_outputs) == 0:
+            return
+
+        operator_stats = {}
+        for op_id, op_stats in self.plan_stats.operator_stats.items():
+            record_op_stats_lst = op_stats.record_op_stats_lst[self.num_checkpointed_stats[op_id]:]
+            self.num_checkpointed_stats[op_id] = len(op_stats.record_op_stats_lst)
+            operator_stats[op_id] = OperatorStats(
+                op_id=op_id,
+                op_name=op_stats.op_name,
+                total_op_time=sum(record_op_stats.time_per_record for record_op_stats in record_op_stats_lst),
+                total_op_cost=sum(record_op_stats.cost_per_record for record_op_stats in record_op_stats_lst),
+                record_op_stats_lst=record_op_stats_lst,
+                op_details=op_stats.op_details,
+                total_io_blocked_time=sum(record_op_stats.io_blocked_time for record_op_stats in record_op_stats_lst),
+            )
+
+        self.checkpoint.write(self.completed_outputs, operator_stats)
+        self.completed_outputs = {}
+        self.last_checkpoint_time = time.time()
+
+    def _update_source_count(self, source_idx: int, delta: int) -> None:
+        self.source_counts[source_idx] = self.source_counts.get(source_idx, 0) + delta
+        if self.source_counts[source_idx] == 0:
+            del self.source_counts[source_idx]
+            self.completed_outputs[source_idx] = self.source_outputs.pop(source_idx, [])
+
+    def _scan_next_record(self) -> None:
+        # skip the source records whose outputs were restored (they count towards the number of samples)
+        while self.current_scan_idx in self.restored_outputs and self.source_records_scanned < self.num_samples:
+            self.current_scan_idx += 1
+            self.source_records_scanned += 1
+
+        scan_idx = self.current_scan_idx
+        super()._scan_next_record()
+        if self.current_scan_idx > scan_idx:
+            self._update_source_count(scan_idx, 1)
+
+    def _enqueue(self, op_idx: int, record: DataRecord) -> None:
+        if op_idx < self.num_record_ops:
+            self._update_source_count(record.source_idx, 1)
+        elif op_idx == self.num_record_ops:
+            self.source_outputs.setdefault(record.source_idx, []).append(record.field_values)
+        super()._enqueue(op_idx, record)
+
+    def _process_future(self, future: Future) -> None:
+        op_idx, op_input = self.future_to_input[future]
+        super()._process_future(future)
+
+        # the future's inputs are no longer in flight; this happens after their outputs have been enqueued,
+        # thus a source record's count only reaches zero once all of the records derived from it are finished
+        if op_idx < self.num_record_ops:
+            if isinstance(op_input, int):
+                self._update_source_count(op_input, -1)
+            else:
+                for record in op_input if isinstance(op_input, list) else [op_input]:
+                    self._update_source_count(record.source_idx, -1)
+
+        if time.time() - self.last_checkpoint_time >= self.checkpoint_interval_secs:
+            self.write_checkpoint()
+
+
 class PipelinedParallelExecutionStrategy(ExecutionStrategy):
     """
     A parallel execution strategy that processes data through a pipeline of operators using thread-based parallelism.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        checkpoint_dir: str | None = None,
+        checkpoint_interval_secs: float = DEFAULT_CHECKPOINT_INTERVAL_SECS,
+        resume: bool = False,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.max_workers = (
             self.get_parallel_max_workers()
             if self.max_workers is None
             else self.max_workers
         )
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_interval_secs = checkpoint_interval_secs
+        self.resume = resume
 
     def get_parallel_max_workers(self):
         # for now, return the number of system CPUs;
@@ -31,10 +673,47 @@ class PipelinedParallelExecutionStrategy(ExecutionStrategy):
         # and whether or not they will encounter rate-limits. If they will, we should
         # set the max workers in a manner that is designed to avoid hitting them.
         # Doing this "right" may require considering their logical, physical plan,
-        # and tier status with LLM providers. It may also be worth dynamically
-        # changing the max_workers in response to 429 errors.
+        # and tier status with LLM providers.
+        # NOTE: workers do not need to back off in response to 429 errors themselves; every LLM call
+        # is gated by its model's RateLimitController, which shrinks that model's concurrency on 429s
         return max(int(0.8 * multiprocessing.cpu_count()), 1)
 
+    def _open_checkpoint(
+        self,
+        plan: PhysicalPlan,
+        plan_stats: PlanStats,
+        num_samples: int | float,
+    ) -> tuple[ExecutionCheckpoint | None, dict[int, list[DataRecord]]]:
+        """
+        Return the checkpoint of the plan's execution (or None if it is not checkpointed) along with the outputs of
+        the source records which a previous execution completed, if this execution resumes from the checkpoint; the
+        operator stats which were stored in the checkpoint are added to the plan stats. Plans with a limit before
+        their first aggregate are not checkpointed, as the restored outputs would not count towards the limit.
+        """
+        if self.checkpoint_dir is None:
+            return None, {}
+
+        num_record_ops = next((op_idx for op_idx, op in enumerate(plan.operators) if isinstance(op, AggregateOp)), len(plan.operators))
+        if any(isinstance(op, LimitScanOp) for op in plan.operators[:num_record_ops]):
+            if self.verbose:
+                print("Plan contains a limit before its first aggregate; executing it without a checkpoint")
+            return None, {}
+
+        checkpoint = ExecutionCheckpoint(self.checkpoint_dir, ExecutionCheckpoint.get_key(plan, self.scan_start_idx, num_samples))
+        if not self.resume:
+            checkpoint.clear()
+            return checkpoint, {}
+
+        restored_outputs, operator_stats = checkpoint.load(plan.operators[num_record_ops - 1].output_schema)
+        for op_id, op_stats in operator_stats.items():
+            if op_id in plan_stats.operator_stats:
+                plan_stats.operator_stats[op_id] += op_stats
+
+        if self.verbose:
+            print(f"Resuming from checkpoint: restored the outputs of {len(restored_outputs)} source records")
+
+        return checkpoint, restored_outputs
+
     def execute_plan(self, plan: PhysicalPlan, num_samples: int | float = float("inf"), plan_workers: int = 1):
         """Initialize the stats and the execute the plan."""
         if self.verbose:
@@ -53,159 +732,59 @@ class PipelinedParallelExecutionStrategy(ExecutionStrategy):
             op_details = {k: str(v) for k, v in op.get_id_params().items()}
             plan_stats.operator_stats[op_id] = OperatorStats(op_id=op_id, op_name=op_name, op_details=op_details)
 
-        # initialize list of output records and intermediate variables
-        output_records = []
-        source_records_scanned = 0
+        # estimate the fraction of the source records which reach each limit, to size how far the scan reads ahead of it
+        est_records_per_source = None
+        if any(isinstance(op, LimitScanOp) for op in plan.operators):
+            est_records_per_source = self.estimate_records_per_source(plan, self.cost_model)
 
-        # initialize data structures to help w/processing DAG
-        processing_queue = []
-        op_id_to_futures_in_flight = {op.get_op_id(): 0 for op in plan.operators}
-        op_id_to_operator = {op.get_op_id(): op for op in plan.operators}
-        op_id_to_prev_operator = {
-            op.get_op_id(): plan.operators[idx - 1] if idx > 0 else None for idx, op in enumerate(plan.operators)
-        }
-        op_id_to_next_operator = {
-            op.get_op_id(): plan.operators[idx + 1] if idx + 1 < len(plan.operators) else None
-            for idx, op in enumerate(plan.operators)
-        }
-        op_id_to_op_idx = {op.get_op_id(): idx for idx, op in enumerate(plan.operators)}
+        # open the checkpoint of the execution (if it is checkpointed) and restore the progress of a previous execution
+        checkpoint, restored_outputs = self._open_checkpoint(plan, plan_stats, num_samples)
 
-        # get handle to scan operator and pre-compute its op_id and size
-        source_operator = plan.operators[0]
-        assert isinstance(source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
-        source_op_id = source_operator.get_op_id()
-        datareader_len = len(source_operator.datareader)
-
-        # get limit of final limit operator (if one exists)
-        final_limit = plan.operators[-1].limit if isinstance(plan.operators[-1], LimitScanOp) else None
+        # get the ids under which the output of each operator is cached (if caching is allowed); an execution which
+        # resumes from a checkpoint does not materialize its outputs, as the restored records are not re-computed
+        cache_ids = (
+            self._open_materialization_caches(plan, num_samples)
+            if len(restored_outputs) == 0
+            else [None] * len(plan.operators)
+        )
 
-        # create thread pool w/max workers
-        futures = []
-        current_scan_idx = self.scan_start_idx
+        # create thread pool w/max workers and execute the plan
         with ThreadPoolExecutor(max_workers=plan_workers) as executor:
-            # create initial (set of) future(s) to read first source record;
-            futures.append(executor.submit(PhysicalOperator.execute_op_wrapper, source_operator, current_scan_idx))
-            op_id_to_futures_in_flight[source_op_id] += 1
-            current_scan_idx += 1
-
-            # iterate until we have processed all operators on all records or come to an early stopping condition
-            while len(futures) > 0:
-                # get the set of futures that have (and have not) finished in the last PARALLEL_EXECUTION_SLEEP_INTERVAL_SECS
-                done_futures, not_done_futures = wait(futures, timeout=PARALLEL_EXECUTION_SLEEP_INTERVAL_SECS)
-
-                # cast not_done_futures from a set to a list so we can append to it
-                not_done_futures = list(not_done_futures)
-
-                # process finished futures, creating new ones as needed
-                new_futures = []
-                for future in done_futures:
-                    # get the result
-                    record_set, operator, _ = future.result()
-                    op_id = operator.get_op_id()
-
-                    # decrement future from mapping of futures in-flight
-                    op_id_to_futures_in_flight[op_id] -= 1
-
-                    # update plan stats
-                    prev_operator = op_id_to_prev_operator[op_id]
-                    plan_stats.operator_stats[op_id].add_record_op_stats(
-                        record_set.record_op_stats,
-                        source_op_id=prev_operator.get_op_id() if prev_operator is not None else None,
-                        plan_id=plan.plan_id,
-                    )
-
-                    # process each record output by the future's operator
-                    for record in record_set:
-                        # skip records which are filtered out
-                        if not getattr(record, "passed_operator", True):
-                            continue
-
-                        # add records (which are not filtered) to the cache, if allowed
-                        if not self.nocache:
-                            # self.datadir.append_cache(operator.target_cache_id, record)
-                            pass
-
-                        # add records to processing queue if there is a next_operator; otherwise add to output_records
-                        next_operator = op_id_to_next_operator[op_id]
-                        if next_operator is not None:
-                            processing_queue.append((next_operator, record))
-                        else:
-                            output_records.append(record)
-
-                    # if this operator was a source scan, update the number of source records scanned
-                    if op_id == source_op_id:
-                        source_records_scanned += len(record_set)
-
-                        # scan next record if we can still draw records from source
-                        if source_records_scanned < num_samples and current_scan_idx < datareader_len:
-                            new_futures.append(executor.submit(PhysicalOperator.execute_op_wrapper, source_operator, current_scan_idx))
-                            op_id_to_futures_in_flight[source_op_id] += 1
-                            current_scan_idx += 1
-
-                    # check early stopping condition based on final limit
-                    if final_limit is not None and len(output_records) >= final_limit:
-                        output_records = output_records[:final_limit]
-                        futures = []
-                        break
-
-                # process all records in the processing queue which are ready to be executed
-                temp_processing_queue = []
-                for operator, candidate in processing_queue:
-                    # if the candidate is not an input to an aggregate, execute it right away
-                    if not isinstance(operator, AggregateOp):
-                        future = executor.submit(PhysicalOperator.execute_op_wrapper, operator, candidate)
-                        new_futures.append(future)
-                        op_id_to_futures_in_flight[operator.get_op_id()] += 1
-
-                    # otherwise, put it back on the queue
-                    else:
-                        temp_processing_queue.append((operator, candidate))
-
-                # any remaining candidates are inputs to aggregate operators; for each aggregate operator
-                # determine if it is ready to execute -- and execute all of its candidates if so
-                processing_queue = []
-                agg_op_ids = set([operator.get_op_id() for operator, _ in temp_processing_queue])
-                for agg_op_id in agg_op_ids:
-                    agg_op_idx = op_id_to_op_idx[agg_op_id]
-
-                    # compute if all upstream operators' processing queues are empty and their in-flight futures are finished
-                    upstream_ops_are_finished = True
-                    for upstream_op_idx in range(agg_op_idx):
-                        upstream_op_id = plan.operators[upstream_op_idx].get_op_id()
-                        upstream_op_id_queue = list(
-                            filter(lambda tup: tup[0].get_op_id() == upstream_op_id, temp_processing_queue)
-                        )
-
-                        upstream_ops_are_finished = (
-                            upstream_ops_are_finished
-                            and len(upstream_op_id_queue) == 0
-                            and op_id_to_futures_in_flight[upstream_op_id] == 0
-                        )
-
-                    # get the subset of candidates for this aggregate operator
-                    candidate_tuples = list(filter(lambda tup: tup[0].get_op_id() == agg_op_id, temp_processing_queue))
-
-                    # execute the operator on the candidates if it's ready
-                    if upstream_ops_are_finished:
-                        operator = op_id_to_operator[agg_op_id]
-                        candidates = list(map(lambda tup: tup[1], candidate_tuples))
-                        future = executor.submit(PhysicalOperator.execute_op_wrapper, operator, candidates)
-                        new_futures.append(future)
-                        op_id_to_futures_in_flight[operator.get_op_id()] += 1
-
-                    # otherwise, add the candidates back to the processing queue
-                    else:
-                        processing_queue.extend(candidate_tuples)
-
-                # update list of futures
-                not_done_futures.extend(new_futures)
-                futures = not_done_futures
-
-        # if caching was allowed, close the cache
-        if not self.nocache:
-            for _ in plan.operators:
-                # self.datadir.close_cache(operator.target_cache_id)
-                pass
+            scheduler_args = (
+                plan,
+                plan_stats,
+                executor,
+                self.scan_start_idx,
+                num_samples,
+                self.queue_budget,
+                self._create_aggregate_buffer,
+                est_records_per_source,
+                functools.partial(self._materialize, cache_ids),
+            )
+            if checkpoint is None:
+                output_records = PipelineScheduler(*scheduler_args).run()
+            else:
+                scheduler = CheckpointingPipelineScheduler(
+                    *scheduler_args,
+                    checkpoint=checkpoint,
+                    checkpoint_interval_secs=self.checkpoint_interval_secs,
+                    restored_outputs=restored_outputs,
+                )
+                try:
+                    output_records = scheduler.run()
+                except BaseException:
+                    # cancel the work which has not started and save the progress made since the last checkpoint
+                    for future in scheduler.pending_futures:
+                        future.cancel()
+                    scheduler.write_checkpoint()
+                    raise
+
+        # the checkpoint is only needed to resume an execution which did not finish
+        if checkpoint is not None:
+            checkpoint.delete()
+
+        # if caching was allowed, write the records output by each operator to the cache
+        self._close_materialization_caches(cache_ids)
 
         # finalize plan stats
         total_plan_time = time.time() - plan_start_time
@@ -1,10 +1,13 @@
 import time
 
-from palimpzest.core.data.dataclasses import OperatorStats, PlanStats
-from palimpzest.query.execution.execution_strategy import ExecutionStrategy
+from palimpzest.core.data.dataclasses import OperatorStats, PlanStats, RecordOpStats
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.query.execution.execution_strategy import ExecutionStrategy, RecordQueue
 from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.batched import BatchedLLMOp
 from palimpzest.query.operators.filter import FilterOp
 from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.physical import PhysicalOperator
 from palimpzest.query.operators.scan import ScanPhysicalOp
 from palimpzest.query.optimizer.plan import PhysicalPlan
 
@@ -22,6 +25,30 @@ class SequentialSingleThreadExecutionStrategy(ExecutionStrategy):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def _process_queue(self, operator: PhysicalOperator, queue: list[DataRecord]) -> tuple[list[DataRecord], list[RecordOpStats]]:
+        """Process the records in an operator's processing queue; return the output records and their stats."""
+        records, record_op_stats = [], []
+
+        # batched operators process the records one batch at a time
+        if isinstance(operator, BatchedLLMOp):
+            for batch_start_idx in range(0, len(queue), operator.batch_size):
+                for record_set in operator.batch_call(queue[batch_start_idx:batch_start_idx + operator.batch_size]):
+                    records.extend(record_set.data_records)
+                    record_op_stats.extend(record_set.record_op_stats)
+
+            return records, record_op_stats
+
+        # otherwise, process the records one at a time
+        for input_record in queue:
+            record_set = operator(input_record)
+            records.extend(record_set.data_records)
+            record_op_stats.extend(record_set.record_op_stats)
+
+            if isinstance(operator, LimitScanOp) and len(records) == operator.limit:
+                break
+
+        return records, record_op_stats
+
     def execute_plan(self, plan: PhysicalPlan, num_samples: int | float = float("inf"), plan_workers: int = 1):
         """Initialize the stats and the execute the plan."""
         if self.verbose:
@@ -49,6 +76,9 @@ class SequentialSingleThreadExecutionStrategy(ExecutionStrategy):
         assert isinstance(source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
         datareader_len = len(source_operator.datareader)
 
+        # get the ids under which the output of each operator is cached (if caching is allowed)
+        cache_ids = self._open_materialization_caches(plan, num_samples)
+
         # initialize processing queues for each operation
         processing_queues = {op.get_op_id(): [] for op in plan.operators if not isinstance(op, ScanPhysicalOp)}
 
@@ -82,15 +112,9 @@ class SequentialSingleThreadExecutionStrategy(ExecutionStrategy):
                 records = record_set.data_records
                 record_op_stats = record_set.record_op_stats
 
-            # otherwise, process the records in the processing queue for this operator one at a time
+            # otherwise, process the records in the processing queue for this operator
             elif len(processing_queues[op_id]) > 0:
-                for input_record in processing_queues[op_id]:
-                    record_set = operator(input_record)
-                    records.extend(record_set.data_records)
-                    record_op_stats.extend(record_set.record_op_stats)
-
-                    if isinstance(operator, LimitScanOp) and len(records) == operator.limit:
-                        break
+                records, record_op_stats = self._process_queue(operator, processing_queues[op_id])
 
             # update plan stats
             plan_stats.operator_stats[op_id].add_record_op_stats(
@@ -100,11 +124,7 @@ class SequentialSingleThreadExecutionStrategy(ExecutionStrategy):
             )
 
             # add records (which are not filtered) to the cache, if allowed
-            if not self.nocache:
-                for record in records:
-                    if getattr(record, "passed_operator", True):
-                        # self.datadir.append_cache(operator.target_cache_id, record)
-                        pass
+            self._materialize(cache_ids, op_idx, records)
 
             # update processing_queues or output_records
             for record in records:
@@ -119,11 +139,8 @@ class SequentialSingleThreadExecutionStrategy(ExecutionStrategy):
             if next_op_id is not None and processing_queues[next_op_id] == []:
                 break
 
-        # if caching was allowed, close the cache
-        if not self.nocache:
-            for _ in plan.operators:
-                # self.datadir.close_cache(operator.target_cache_id)
-                pass
+        # if caching was allowed, write the records output by each operator to the cache
+        self._close_materialization_caches(cache_ids)
 
         # finalize plan stats
         total_plan_time = time.time() - plan_start_time
@@ -178,8 +195,27 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
         assert isinstance(source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
         datareader_len = len(source_operator.datareader)
 
+        # get the ids under which the output of each operator is cached (if caching is allowed)
+        cache_ids = self._open_materialization_caches(plan, num_samples)
+
+        # aggregates which support partial aggregation fold their inputs into a partial state as they arrive,
+        # while the inputs of any other aggregate are buffered until all of them have arrived
+        partials = {
+            op.get_op_id(): op.create_partial()
+            for op in plan.operators
+            if isinstance(op, AggregateOp) and op.supports_partial_aggregation()
+        }
+
         # initialize processing queues for each operation
-        processing_queues = {op.get_op_id(): [] for op in plan.operators if not isinstance(op, ScanPhysicalOp)}
+        processing_queues = {
+            op.get_op_id(): (
+                self._create_aggregate_buffer()
+                if isinstance(op, AggregateOp) and op.get_op_id() not in partials
+                else RecordQueue(self.queue_budget)
+            )
+            for op in plan.operators
+            if not isinstance(op, ScanPhysicalOp)
+        }
 
         # execute the plan until either:
         # 1. all records have been processed, or
@@ -192,6 +228,16 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
                 prev_op_id = plan.operators[op_idx - 1].get_op_id() if op_idx > 1 else None
                 next_op_id = plan.operators[op_idx + 1].get_op_id() if op_idx + 1 < len(plan.operators) else None
 
+                # throttle this operator while the (bounded) queue of the next operator is full; aggregates
+                # must buffer all of their inputs, thus their queues are never considered full
+                next_queue_is_full = (
+                    next_op_id is not None
+                    and not isinstance(plan.operators[op_idx + 1], AggregateOp)
+                    and processing_queues[next_op_id].is_full()
+                )
+                if next_queue_is_full:
+                    continue
+
                 # create empty lists for records and execution stats generated by executing this operator on its next input(s)
                 records, record_op_stats = [], []
 
@@ -209,9 +255,14 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
                     else:
                         continue
 
-                # only invoke aggregate operator(s) once there are no more source records and all
-                # upstream operators' processing queues are empty
+                # fold the inputs of aggregate operator(s) into their partial state as they arrive, and only
+                # compute their output once there are no more source records and all upstream operators'
+                # processing queues are empty
                 elif isinstance(operator, AggregateOp):
+                    if op_id in partials and len(processing_queues[op_id]) > 0:
+                        operator.fold(partials[op_id], processing_queues[op_id])
+                        processing_queues[op_id].clear()
+
                     upstream_ops_are_finished = True
                     for upstream_op_idx in range(op_idx):
                         # scan operators do not have processing queues
@@ -224,15 +275,22 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
                             upstream_ops_are_finished and len(processing_queues[upstream_op_id]) == 0
                         )
 
-                    if not keep_scanning_source_records and upstream_ops_are_finished:
+                    if not keep_scanning_source_records and upstream_ops_are_finished and op_id in partials:
+                        partial = partials.pop(op_id)
+                        record_set = operator.finalize(partial)
+                        records = record_set.data_records
+                        record_op_stats = record_set.record_op_stats
+
+                    elif not keep_scanning_source_records and upstream_ops_are_finished and len(processing_queues[op_id]) > 0:
                         record_set = operator(candidates=processing_queues[op_id])
                         records = record_set.data_records
                         record_op_stats = record_set.record_op_stats
-                        processing_queues[op_id] = []
+                        self._add_spill_stats(plan_stats.operator_stats[op_id], processing_queues[op_id])
+                        processing_queues[op_id].clear()
 
                 # otherwise, process the next record in the processing queue for this operator
                 elif len(processing_queues[op_id]) > 0:
-                    input_record = processing_queues[op_id].pop(0)
+                    input_record = processing_queues[op_id].popleft()
                     record_set = operator(input_record)
                     records = record_set.data_records
                     record_op_stats = record_set.record_op_stats
@@ -247,11 +305,7 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
                     )
 
                     # add records (which are not filtered) to the cache, if allowed
-                    if not self.nocache:
-                        for record in records:
-                            if getattr(record, "passed_operator", True):
-                                # self.datadir.append_cache(operator.target_cache_id, record)
-                                pass
+                    self._materialize(cache_ids, op_idx, records)
 
                     # update processing_queues or output_records
                     for record in records:
@@ -262,8 +316,9 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
                         else:
                             output_records.append(record)
 
-            # update finished_executing based on whether all records have been processed
-            still_processing = any([len(queue) > 0 for queue in processing_queues.values()])
+            # update finished_executing based on whether all records have been processed (and all aggregates
+            # have computed their output from their partial state)
+            still_processing = any([len(queue) > 0 for queue in processing_queues.values()]) or len(partials) > 0
             keep_scanning_source_records = current_scan_idx < datareader_len and source_records_scanned < num_samples
             finished_executing = not keep_scanning_source_records and not still_processing
 
@@ -271,11 +326,11 @@ class PipelinedSingleThreadExecutionStrategy(ExecutionStrategy):
             if isinstance(operator, LimitScanOp):
                 finished_executing = len(output_records) == operator.limit
 
-        # if caching was allowed, close the cache
-        if not self.nocache:
-            for _ in plan.operators:
-                # self.datadir.close_cache(operator.target_cache_id)
-                pass
+        # the scan may have stopped before its last item (e.g. at a limit); release its read-ahead
+        plan.operators[0].close()
+
+        # if caching was allowed, write the records output by each operator to the cache
+        self._close_materialization_caches(cache_ids)
 
         # finalize plan stats
         total_plan_time = time.time() - plan_start_time
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from collections.abc import Iterator
+from itertools import islice
+
+from palimpzest.constants import SPILL_CHUNK_SIZE
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.schemas import Schema
+
+# the attributes of a DataRecord (other than its field values) which are written to a segment
+_RECORD_ATTRS = ("source_idx", "parent_id", "cardinality_idx", "passed_operator", "id")
+
+# the python types which are stored as native arrow columns; all other values are pickled
+_NATIVE_TYPES = (bool, int, float, str, bytes)
+
+
+class SpillableRecordBuffer:
+    """
+    An append-only buffer for the input records of an aggregate operator.
+
+    Records are kept in memory until their (estimated) size reaches `spill_threshold_bytes`, at which
+    point the in-memory records are written to an Arrow IPC segment in `spill_dir`. Iterating over the
+    buffer streams the spilled segments back in chunks of `chunk_size` records (followed by the records
+    which are still in memory), thus an aggregate which makes a single pass over its candidates does not
+    hold all of them in memory at once. If `spill_threshold_bytes` is None the buffer never spills.
+
+    Spilled records are restored with the same schema, attributes, and field values (fields which were
+    not set remain unset); values which arrow cannot represent exactly are pickled.
+    """
+    def __init__(
+        self,
+        spill_threshold_bytes: int | None = None,
+        spill_dir: str | None = None,
+        chunk_size: int = SPILL_CHUNK_SIZE,
+    ):
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.spill_dir = spill_dir
+        self.chunk_size = chunk_size
+
+        # the records held in memory and their estimated size
+        self.records: list[DataRecord] = []
+        self.num_bytes_in_memory = 0
+
+        # the last record is kept in memory, as aggregates use it as the parent of their output(s)
+        self.last_record: DataRecord | None = None
+
+        # the spilled segments as (path, schema, number of records) tuples (in the order of the records)
+        self.segments: list[tuple[str, Schema, int]] = []
+        self.segment_dir: str | None = None
+        self.num_spilled_records = 0
+        self.num_spilled_bytes = 0
+
+    def __len__(self) -> int:
+        return self.num_spilled_records + len(self.records)
+
+    def __iter__(self) -> Iterator[DataRecord]:
+        for path, schema, _ in self.segments:
+            yield from self._read_segment(path, schema)
+        yield from self.records
+
+    def __getitem__(self, idx: int | slice) -> DataRecord | list[DataRecord]:
+        if isinstance(idx, slice):
+            return list(self)[idx]
+
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("SpillableRecordBuffer index out of range")
+
+        # records which are still in memory do not require reading any segments
+        if idx == len(self) - 1:
+            return self.last_record
+        if idx >= self.num_spilled_records:
+            return self.records[idx - self.num_spilled_records]
+
+        for path, schema, num_records in self.segments:
+            if idx < num_records:
+                return next(islice(self._read_segment(path, schema), idx, None))
+            idx -= num_records
+
+    def append(self, record: DataRecord) -> None:
+        self.records.append(record)
+        self.last_record = record
+        if self.spill_threshold_bytes is not None:
+            self.num_bytes_in_memory += record.get_size_in_bytes()
+            if self.num_bytes_in_memory >= self.spill_threshold_bytes:
+                self.spill()
+
+    def spill(self) -> None:
+        """Write the records which are held in memory to (one segment per schema of) consecutive records."""
+        start_idx = 0
+        for end_idx in range(1, len(self.records) + 1):
+            if end_idx == len(self.records) or self.records[end_idx].schema is not self.records[start_idx].schema:
+                self._write_segment(self.records[start_idx:end_idx])
+                start_idx = end_idx
+
+        self.records = []
+        self.num_bytes_in_memory = 0
+
+    def clear(self) -> None:
+        """Remove all records from the buffer and delete its segments."""
+        if self.segment_dir is not None:
+            shutil.rmtree(self.segment_dir, ignore_errors=True)
+
+        self.records = []
+        self.num_bytes_in_memory = 0
+        self.last_record = None
+        self.segments = []
+        self.segment_dir = None
+        self.num_spilled_records = 0
+        self.num_spilled_bytes = 0
+
+    def _write_segment(self, records: list[DataRecord]) -> None:
+        import pyarrow as pa
+        import pyarrow.ipc
+
+        # get the names of the fields which are set on any of the records (in order of first appearance)
+        field_values = [record.field_values for record in records]
+        field_names = list(dict.fromkeys(name for values in field_values for name in values))
+
+        # each column is a (name, values, is_set) tuple, where is_set is None if the values are set on every record
+        columns = [(f"__{attr}", [getattr(record, attr) for record in records], None) for attr in _RECORD_ATTRS]
+        for name in field_names:
+            is_set = [name in values for values in field_values]
+            columns.append((name, [values.get(name) for values in field_values], None if all(is_set) else is_set))
+
+        arrow_fields, arrays = [], []
+        for name, values, is_set in columns:
+            array, is_pickled = _to_arrow_array(pa, values, is_set)
+            arrow_fields.append(pa.field(name, array.type, metadata={"pickled": "1"} if is_pickled else None))
+            arrays.append(array)
+
+        # create the directory for the segments; it is removed when the buffer is cleared (or garbage collected)
+        if self.segment_dir is None:
+            self.segment_dir = tempfile.mkdtemp(prefix="pz-spill-", dir=self.spill_dir)
+            weakref.finalize(self, shutil.rmtree, self.segment_dir, True)
+        path = os.path.join(self.segment_dir, f"segment-{len(self.segments)}.arrow")
+        table = pa.Table.from_arrays(arrays, schema=pa.schema(arrow_fields))
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=self.chunk_size)
+
+        self.segments.append((path, records[0].schema, len(records)))
+        self.num_spilled_records += len(records)
+        self.num_spilled_bytes += os.path.getsize(path)
+
+    def _read_segment(self, path: str, schema: Schema) -> Iterator[DataRecord]:
+        import pyarrow as pa
+        import pyarrow.ipc
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for batch_idx in range(reader.num_record_batches):
+                batch = reader.get_batch(batch_idx)
+                columns = {
+                    field.name: _from_arrow_array(batch.column(col_idx), field.metadata is not None)
+                    for col_idx, field in enumerate(batch.schema)
+                }
+                attr_columns = [columns.pop(f"__{attr}") for attr in _RECORD_ATTRS]
+                for row_idx in range(batch.num_rows):
+                    yield _make_record(schema, [column[row_idx] for column in attr_columns], columns, row_idx)
+
+
+# sentinel for values of fields which are not set on a (spilled) record
+_UNSET = object()
+
+
+def _to_arrow_array(pa, values: list, is_set: list[bool] | None):
+    """
+    Convert a column of values to an arrow array; return the array and whether its values are pickled.
+    Values are stored natively iff they are set on every record and all of the (non-None) values share one
+    of the _NATIVE_TYPES; otherwise each value is pickled and unset values are stored as nulls.
+    """
+    value_types = {type(value) for value in values if value is not None}
+    if is_set is None and len(value_types) == 1 and next(iter(value_types)) in _NATIVE_TYPES:
+        try:
+            return pa.array(values), False
+        except (pa.ArrowInvalid, OverflowError):
+            pass
+
+    is_set = is_set if is_set is not None else [True] * len(values)
+    pickled_values = [pickle.dumps(value) if value_is_set else None for value, value_is_set in zip(values, is_set)]
+    return pa.array(pickled_values, type=pa.binary()), True
+
+
+def _from_arrow_array(array, is_pickled: bool) -> list:
+    values = array.to_pylist()
+    if not is_pickled:
+        return values
+
+    return [_UNSET if value is None else pickle.loads(value) for value in values]
+
+
+def _make_record(schema: Schema, attrs: list, columns: dict[str, list], row_idx: int) -> DataRecord:
+    source_idx, parent_id, cardinality_idx, passed_operator, record_id = attrs
+    record = DataRecord(schema, source_idx=source_idx, parent_id=parent_id, cardinality_idx=cardinality_idx)
+    record.passed_operator = passed_operator
+    record.id = record_id
+    for name, column in columns.items():
+        value = column[row_idx]
+        if value is not _UNSET:
+            record[name] = value
+
+    return record
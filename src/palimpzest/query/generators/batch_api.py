@@ -0,0 +1,282 @@
+"""
+This file contains the provider Batch API backends and the BatchSession which the BatchExecutionStrategy
+uses to defer the LLM calls made by Generators into (offline) batch jobs.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable
+from contextlib import contextmanager
+from typing import Any
+
+from palimpzest.constants import (
+    BATCH_API_COMPLETION_WINDOW,
+    BATCH_API_ENDPOINT,
+    DEFAULT_BATCH_POLL_INTERVAL_SECS,
+    PZ_DIR,
+)
+from palimpzest.query.generators.cache import hash_payload
+from palimpzest.query.generators.clients import get_client_registry
+
+
+class DeferredCompletion(BaseException):  # noqa: N818
+    """
+    Raised by a Generator when its completion has been added to the active BatchSession instead of being
+    generated. This derives from BaseException (rather than Exception) so that it is not swallowed by the
+    error handling of the Generators and operators; the BatchExecutionStrategy catches it and re-executes
+    the operator on the record once the batch containing its request has completed.
+    """
+    def __init__(self, custom_id: str):
+        super().__init__(custom_id)
+        self.custom_id = custom_id
+
+
+def write_batch_file(requests: list[dict], filepath: str) -> None:
+    """Write the batch requests to a JSONL file with one request per line."""
+    with open(filepath, "w") as f:
+        for request in requests:
+            f.write(json.dumps(request) + "\n")
+
+
+def parse_batch_output(output_text: str) -> dict[str, dict]:
+    """
+    Parse the JSONL output of a batch into a mapping from each request's custom_id to its response,
+    i.e. {"status_code": ..., "body": ...}. Requests which failed map to {"status_code": None, "error": ...}.
+    """
+    responses = {}
+    for line in output_text.splitlines():
+        if line.strip() == "":
+            continue
+
+        result = json.loads(line)
+        if result.get("error") is not None or result.get("response") is None:
+            responses[result["custom_id"]] = {"status_code": None, "error": result.get("error")}
+        else:
+            responses[result["custom_id"]] = result["response"]
+
+    return responses
+
+
+class BatchBackend(ABC):
+    """
+    Submits batch files of chat completion requests to a provider and retrieves their responses.
+    Each request is a dict of the form {"custom_id": ..., "method": "POST", "url": ..., "body": chat_payload}.
+    A backend only runs the requests of Generators whose provider matches its `provider`.
+    """
+    provider: str
+
+    @abstractmethod
+    def submit(self, requests: list[dict]) -> str:
+        """Submit the requests as a single batch and return its batch id."""
+        pass
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> bool:
+        """Return True once the batch has finished; raise an exception if the batch failed."""
+        pass
+
+    @abstractmethod
+    def get_results(self, batch_id: str) -> dict[str, dict]:
+        """Return the response for each request in the (finished) batch keyed by its custom_id."""
+        pass
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """
+    Runs batches with the OpenAI Batch API, which completes requests within `completion_window` at
+    (roughly) half the price of the synchronous API.
+    """
+    provider = "openai"
+
+    def __init__(self, api_key: str | None = None, batch_dir: str | None = None, completion_window: str = BATCH_API_COMPLETION_WINDOW):
+        self.api_key = api_key
+        self.batch_dir = os.path.join(PZ_DIR, "batches") if batch_dir is None else batch_dir
+        self.completion_window = completion_window
+
+    def _get_client(self):
+        api_key = os.environ["OPENAI_API_KEY"] if self.api_key is None else self.api_key
+        return get_client_registry().get_client("openai", api_key)
+
+    def submit(self, requests: list[dict]) -> str:
+        # write the batch file and upload it
+        os.makedirs(self.batch_dir, exist_ok=True)
+        filepath = os.path.join(self.batch_dir, f"batch-{uuid.uuid4().hex}.jsonl")
+        write_batch_file(requests, filepath)
+
+        client = self._get_client()
+        with open(filepath, "rb") as f:
+            batch_file = client.files.create(file=f, purpose="batch")
+
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_API_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+
+        return batch.id
+
+    def poll(self, batch_id: str) -> bool:
+        batch = self._get_client().batches.retrieve(batch_id)
+        if batch.status in ["failed", "expired", "cancelled"]:
+            raise RuntimeError(f"Batch {batch_id} did not complete (status: {batch.status})")
+
+        return batch.status == "completed"
+
+    def get_results(self, batch_id: str) -> dict[str, dict]:
+        client = self._get_client()
+        batch = client.batches.retrieve(batch_id)
+
+        # requests which errored are written to a separate error file
+        responses = {}
+        for file_id in [batch.error_file_id, batch.output_file_id]:
+            if file_id is not None:
+                responses.update(parse_batch_output(client.files.content(file_id).text))
+
+        return responses
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    A file-based stand-in for a provider Batch API, e.g. for testing. Each batch is written to an input
+    JSONL file; when the batch is first polled, `respond` is called on the body of each request to produce
+    its (chat completion) response body and the responses are written to an output JSONL file using the
+    same format as the OpenAI Batch API.
+    """
+    def __init__(self, respond: Callable[[dict], dict], batch_dir: str | None = None, provider: str = "openai"):
+        self.respond = respond
+        self.provider = provider
+        self.batch_dir = tempfile.mkdtemp(prefix="pz-batches-") if batch_dir is None else batch_dir
+        self.batch_ids: list[str] = []
+
+    def _get_filepath(self, batch_id: str, suffix: str) -> str:
+        return os.path.join(self.batch_dir, f"{batch_id}_{suffix}.jsonl")
+
+    def submit(self, requests: list[dict]) -> str:
+        os.makedirs(self.batch_dir, exist_ok=True)
+        batch_id = f"batch-{uuid.uuid4().hex}"
+        write_batch_file(requests, self._get_filepath(batch_id, "input"))
+        self.batch_ids.append(batch_id)
+
+        return batch_id
+
+    def poll(self, batch_id: str) -> bool:
+        output_filepath = self._get_filepath(batch_id, "output")
+        if os.path.exists(output_filepath):
+            return True
+
+        with open(self._get_filepath(batch_id, "input")) as f:
+            requests = [json.loads(line) for line in f if line.strip() != ""]
+
+        results = []
+        for request in requests:
+            try:
+                response = {"status_code": 200, "body": self.respond(request["body"])}
+                results.append({"custom_id": request["custom_id"], "response": response, "error": None})
+            except Exception as e:
+                results.append({"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}})
+
+        write_batch_file(results, output_filepath)
+
+        return True
+
+    def get_results(self, batch_id: str) -> dict[str, dict]:
+        with open(self._get_filepath(batch_id, "output")) as f:
+            return parse_batch_output(f.read())
+
+
+class BatchSession:
+    """
+    Collects the chat payloads which Generators defer while the session is active and runs them as batches
+    on the `backend`. Requests are keyed by the hash of their payload, thus identical payloads are only
+    submitted once and the response for a payload is served to every Generator call which requests it.
+
+    Generators whose provider is not served by the backend make their calls synchronously (see serves()).
+    As an operator is re-invoked until none of its calls are deferred, work which it performs outside of
+    its Generators (e.g. embedding calls) should be memoized on the session with memoize().
+    """
+    def __init__(self, backend: BatchBackend, poll_interval_secs: float = DEFAULT_BATCH_POLL_INTERVAL_SECS):
+        self.backend = backend
+        self.poll_interval_secs = poll_interval_secs
+        self.pending_requests: dict[str, dict] = {}
+        self.responses: dict[str, dict] = {}
+        self.memo: dict[Hashable, Any] = {}
+
+        # metrics
+        self.num_batches = 0
+        self.num_requests = 0
+        self.wait_duration_secs = 0.0
+
+    @contextmanager
+    def activate(self):
+        """Make this the active session for Generator calls made within the context (on this thread)."""
+        token = _ACTIVE_BATCH_SESSION.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_BATCH_SESSION.reset(token)
+
+    def serves(self, provider: str | None) -> bool:
+        """Return True if the completions of the given provider's Generators are run in batches by this session."""
+        return provider == self.backend.provider
+
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the value computed for `key` by an earlier invocation of the operator, or compute and store it."""
+        if key not in self.memo:
+            self.memo[key] = compute()
+
+        return self.memo[key]
+
+    def get_response(self, chat_payload: dict) -> dict:
+        """
+        Return the batch response for the chat payload. If the payload has not been run yet, it is added
+        to the pending requests and DeferredCompletion is raised.
+        """
+        custom_id = hash_payload(chat_payload)
+        response = self.responses.get(custom_id)
+        if response is not None:
+            return response
+
+        self.pending_requests[custom_id] = {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_API_ENDPOINT,
+            "body": chat_payload,
+        }
+        raise DeferredCompletion(custom_id)
+
+    def has_pending_requests(self) -> bool:
+        return len(self.pending_requests) > 0
+
+    def run_pending_requests(self) -> None:
+        """Submit the pending requests as a single batch, block until it finishes, and store its responses."""
+        requests = list(self.pending_requests.values())
+        start_time = time.time()
+        batch_id = self.backend.submit(requests)
+        while not self.backend.poll(batch_id):
+            time.sleep(self.poll_interval_secs)
+
+        responses = self.backend.get_results(batch_id)
+        for request in requests:
+            custom_id = request["custom_id"]
+            self.responses[custom_id] = responses.get(
+                custom_id, {"status_code": None, "error": {"message": f"No response for request {custom_id} in batch {batch_id}"}}
+            )
+
+        self.pending_requests = {}
+        self.num_batches += 1
+        self.num_requests += len(requests)
+        self.wait_duration_secs += time.time() - start_time
+
+
+# the BatchSession (if any) which Generator calls on the current thread defer their completions to
+_ACTIVE_BATCH_SESSION: contextvars.ContextVar[BatchSession | None] = contextvars.ContextVar("active_batch_session", default=None)
+
+
+def get_active_batch_session() -> BatchSession | None:
+    return _ACTIVE_BATCH_SESSION.get()
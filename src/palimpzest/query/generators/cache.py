@@ -0,0 +1,50 @@
+"""
+This file contains the on-disk cache for LLM responses which is (optionally) consulted by the Generators.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+
+from palimpzest.constants import DEFAULT_LLM_CACHE_MAX_ENTRIES, DEFAULT_LLM_CACHE_PATH
+from palimpzest.core.data.sqlite_lru_store import SqliteLRUStore
+
+
+def hash_payload(payload: dict) -> str:
+    """Compute a content-addressed key for a chat payload (model, temperature, messages, etc.)."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(SqliteLRUStore):
+    """
+    A persistent, content-addressed cache mapping the hash of a chat payload to the completion text
+    and token usage which the provider returned for that payload.
+
+    The cache is backed by a single SQLite file and is bounded to `max_entries` entries; once this
+    bound is exceeded, the least recently used entries are evicted. The cache may be shared across
+    threads (e.g. by the workers of the PipelinedParallelExecutionStrategy).
+    """
+    def __init__(self, path: str = DEFAULT_LLM_CACHE_PATH, max_entries: int = DEFAULT_LLM_CACHE_MAX_ENTRIES):
+        super().__init__(path, max_entries=max_entries)
+
+    def get(self, key: str) -> tuple[str, dict] | None:
+        """Return the (completion_text, usage) for the given key, or None if the key is not cached."""
+        response = self._get_value(key, json.loads)
+        return None if response is None else (response["completion_text"], response["usage"])
+
+    def put(self, key: str, completion_text: str, usage: dict) -> None:
+        """Insert (or replace) the completion for the given key and evict the LRU entries beyond max_entries."""
+        self._put_value(key, json.dumps({"completion_text": completion_text, "usage": usage}).encode("utf-8"))
+
+
+# the process-wide response cache used by all Generators; None means caching is disabled
+_RESPONSE_CACHE: LLMResponseCache | None = None
+
+
+def get_response_cache() -> LLMResponseCache | None:
+    return _RESPONSE_CACHE
+
+
+def set_response_cache(cache: LLMResponseCache | None) -> None:
+    global _RESPONSE_CACHE
+    _RESPONSE_CACHE = cache
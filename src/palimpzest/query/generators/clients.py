@@ -0,0 +1,187 @@
+"""
+This file contains the process-wide registry of LLM provider clients which is shared by all Generators.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Any
+
+import httpx
+import openai
+import together
+
+from palimpzest.constants import (
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY_SECS,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+
+
+class ClientRegistry:
+    """
+    A thread-safe registry which creates at most one client per (provider, api_key, base_url).
+
+    Each client owns a single HTTP connection pool, thus re-using clients across generator invocations
+    (and across the worker threads of an execution strategy) lets every LLM call after the first use a
+    warm, kept-alive connection instead of paying for a new TLS handshake.
+    """
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_HTTP_KEEPALIVE_EXPIRY_SECS,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.num_clients_created = 0
+        self.num_client_reuses = 0
+        self._clients: dict[tuple[str, str, str | None], Any] = {}
+        self._lock = threading.Lock()
+
+        # async clients' connection pools are bound to the event loop which created them,
+        # thus we keep a separate set of async clients for each (live) event loop
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict] = weakref.WeakKeyDictionary()
+
+    def configure(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+    ) -> None:
+        """
+        Update the connection pool settings. If any setting changes, the registry swaps in a fresh set of
+        clients so that subsequent calls to get_client() create clients with the new settings. The replaced
+        clients may still be serving in-flight requests on other threads, thus they are not closed here;
+        each one closes its connection pool once the last reference to it is released (see _create_client()).
+        Async clients keep their settings until their event loop ends (see aclose_loop_clients()).
+        """
+        new_settings = (
+            self.max_connections if max_connections is None else max_connections,
+            self.max_keepalive_connections if max_keepalive_connections is None else max_keepalive_connections,
+            self.keepalive_expiry if keepalive_expiry is None else keepalive_expiry,
+        )
+        with self._lock:
+            if new_settings != (self.max_connections, self.max_keepalive_connections, self.keepalive_expiry):
+                self._clients = {}
+                self.max_connections, self.max_keepalive_connections, self.keepalive_expiry = new_settings
+
+    def _get_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _create_client(self, provider: str, api_key: str, base_url: str | None) -> Any:
+        limits = self._get_limits()
+        if provider == "openai":
+            http_client = openai.DefaultHttpxClient(limits=limits)
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+        elif provider == "together":
+            http_client = together.DefaultHttpxClient(limits=limits)
+            client = together.Together(api_key=api_key, base_url=base_url, http_client=http_client)
+
+        else:
+            raise Exception(f"Unsupported provider: {provider}")
+
+        # close the connection pool once the client is no longer referenced by the registry or by an in-flight request
+        weakref.finalize(client, http_client.close)
+
+        return client
+
+    def _create_async_client(self, provider: str, api_key: str, base_url: str | None) -> Any:
+        limits = self._get_limits()
+        if provider == "openai":
+            http_client = openai.DefaultAsyncHttpxClient(limits=limits)
+            return openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+        elif provider == "together":
+            http_client = together.DefaultAsyncHttpxClient(limits=limits)
+            return together.AsyncTogether(api_key=api_key, base_url=base_url, http_client=http_client)
+
+        raise Exception(f"Unsupported provider: {provider}")
+
+    def get_client(self, provider: str, api_key: str, base_url: str | None = None) -> Any:
+        """Return the (shared) client for the given provider, api_key, and base_url; creating it if necessary."""
+        key = (provider, api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.num_client_reuses += 1
+                return client
+
+            client = self._create_client(provider, api_key, base_url)
+            self._clients[key] = client
+            self.num_clients_created += 1
+
+        return client
+
+    def get_async_client(self, provider: str, api_key: str, base_url: str | None = None) -> Any:
+        """
+        Return the (shared) async client for the given provider, api_key, and base_url on the running
+        event loop; creating it if necessary. This must be called from within a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        key = (provider, api_key, base_url)
+        with self._lock:
+            loop_clients = self._async_clients.setdefault(loop, {})
+            client = loop_clients.get(key)
+            if client is not None:
+                self.num_client_reuses += 1
+                return client
+
+            client = self._create_async_client(provider, api_key, base_url)
+            loop_clients[key] = client
+            self.num_clients_created += 1
+
+        return client
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "num_clients": len(self._clients),
+                "num_clients_created": self.num_clients_created,
+                "num_client_reuses": self.num_client_reuses,
+            }
+
+    async def aclose_loop_clients(self) -> None:
+        """
+        Close the async clients (and their connection pools) created on the running event loop. This must be
+        awaited before the loop ends (e.g. at the end of the coroutine passed to asyncio.run()), as the clients'
+        connections cannot be closed once their loop has stopped.
+        """
+        with self._lock:
+            loop_clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+
+        for client in loop_clients.values():
+            await client.close()
+
+    def close(self) -> None:
+        """Close all clients (and their connection pools) held by the registry."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            async_clients, self._async_clients = self._async_clients, weakref.WeakKeyDictionary()
+
+        for client in clients.values():
+            client.close()
+
+        # async clients must be closed on their own event loop; the clients of a loop which has already
+        # been closed can no longer be closed and are left to the garbage collector
+        for loop, loop_clients in async_clients.items():
+            for client in loop_clients.values():
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.close(), loop)
+                elif not loop.is_closed():
+                    loop.run_until_complete(client.close())
+
+
+# the process-wide client registry used by all Generators
+_CLIENT_REGISTRY = ClientRegistry()
+
+
+def get_client_registry() -> ClientRegistry:
+    return _CLIENT_REGISTRY
@@ -13,25 +13,35 @@ from copy import deepcopy
 from typing import Any, Generic, TypeVar
 
 from colorama import Fore, Style
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from openai.types.chat.chat_completion import ChatCompletion
-
-# from tenacity import retry, stop_after_attempt, wait_exponential
-from together import Together
+from tenacity import AsyncRetrying, Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from together import AsyncTogether, Together
 from together.types.chat_completions import ChatCompletionResponse
 
 from palimpzest.constants import (
+    BATCH_API_COST_DISCOUNT,
     MODEL_CARDS,
-    # RETRY_MAX_ATTEMPTS,
-    # RETRY_MAX_SECS,
-    # RETRY_MULTIPLIER,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_SECS,
+    RETRY_MULTIPLIER,
     Cardinality,
     Model,
+    PromptLayout,
     PromptStrategy,
 )
 from palimpzest.core.data.dataclasses import GenerationStats
 from palimpzest.core.elements.records import DataRecord
 from palimpzest.prompts import PromptFactory
+from palimpzest.query.generators.batch_api import BatchSession, get_active_batch_session
+from palimpzest.query.generators.cache import get_response_cache, hash_payload
+from palimpzest.query.generators.clients import get_client_registry
+from palimpzest.query.generators.rate_limits import (
+    RateLimitController,
+    get_rate_limit_registry,
+    is_rate_limit_error,
+    is_retryable_error,
+)
 from palimpzest.utils.generation_helpers import get_json_from_answer
 from palimpzest.utils.sandbox import API
 
@@ -41,15 +51,21 @@ ContextType = TypeVar("ContextType")
 InputType = TypeVar("InputType")
 
 
-def generator_factory(model: Model, prompt_strategy: PromptStrategy, cardinality: Cardinality, verbose: bool = False) -> BaseGenerator:
+def generator_factory(
+    model: Model,
+    prompt_strategy: PromptStrategy,
+    cardinality: Cardinality,
+    verbose: bool = False,
+    prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
+) -> BaseGenerator:
     """
     Factory function to return the correct generator based on the model, strategy, and cardinality.
     """
     if model in [Model.GPT_4o, Model.GPT_4o_MINI, Model.GPT_4o_V, Model.GPT_4o_MINI_V]:
-        return OpenAIGenerator(model, prompt_strategy, cardinality, verbose)
+        return OpenAIGenerator(model, prompt_strategy, cardinality, verbose, prompt_layout)
 
     elif model in [Model.MIXTRAL, Model.LLAMA3, Model.LLAMA3_V]:
-        return TogetherGenerator(model, prompt_strategy, cardinality, verbose)
+        return TogetherGenerator(model, prompt_strategy, cardinality, verbose, prompt_layout)
 
     raise Exception(f"Unsupported model: {model}")
 
@@ -69,14 +85,26 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
     """
     Abstract base class for Generators.
     """
-    def __init__(self, model: Model, prompt_strategy: PromptStrategy, cardinality: Cardinality = Cardinality.ONE_TO_ONE, verbose: bool = False, system_role: str = "system"):
+    # the provider whose API the generator calls; a BatchSession only defers the calls of the provider it serves
+    provider: str | None = None
+
+    def __init__(
+        self,
+        model: Model,
+        prompt_strategy: PromptStrategy,
+        cardinality: Cardinality = Cardinality.ONE_TO_ONE,
+        verbose: bool = False,
+        system_role: str = "system",
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
+    ):
         self.model = model
         self.model_name = model.value
         self.cardinality = cardinality
         self.prompt_strategy = prompt_strategy
+        self.prompt_layout = prompt_layout
         self.verbose = verbose
         self.system_role = system_role
-        self.prompt_factory = PromptFactory(prompt_strategy, model, cardinality)
+        self.prompt_factory = PromptFactory(prompt_strategy, model, cardinality, prompt_layout)
         self.messages = None
 
     def get_messages(self) -> list[dict] | None:
@@ -93,6 +121,10 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
         """Generates a completion object using the client (or local model)."""
         pass
 
+    def _get_completion_from_batch_body(self, body: dict, **kwargs) -> Any:
+        """Construct the completion object from the response body returned by the provider's Batch API."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support the Batch API")
+
     @abstractmethod
     def _get_completion_text(self, completion: Any, **kwargs) -> Any:
         """Extract the completion text from the completion object."""
@@ -198,6 +230,10 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
             matches = regex.findall(completion_text)
             answer_text = matches[0].strip() if len(matches) > 0 else completion_text
 
+        # if this is a batch prompt, split the answer into one set of field answers per input record
+        if self.prompt_strategy.is_batch_prompt():
+            return self._parse_batch_answer(answer_text, fields, **kwargs)
+
         # if this is a filter operator, return True if and only if "true" is in the answer text
         # NOTE: we may be able to elimiate this condition by specifying this JSON output in the prompt;
         # however, that would also need to coincide with a change to allow the parse_answer_fn to set "passed_operator"
@@ -223,10 +259,39 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
 
         return field_answers
 
-    def __call__(self, candidate: DataRecord, fields: list[str] | None, **kwargs) -> GenerationOutput:
-        """Take the input record (`candidate`), generate the output `fields`, and return the generated output."""
-        client = self._get_client_or_model()
+    def _parse_batch_answer(self, answer_text: str, fields: list[str], **kwargs) -> list[dict]:
+        """
+        Parse the JSON list answer to a batch prompt into a list with one set of field answers per input record.
+        Each element of the answer is matched to its input record by its "idx" key; records which are missing
+        from the answer keep the empty (i.e. None) answers so that the operator can handle them as failures.
+        """
+        batch_field_answers = self._get_empty_field_answers(fields, **kwargs)
+        for answer_dict in get_json_from_answer(answer_text, self.model, Cardinality.ONE_TO_MANY):
+            idx = answer_dict.get("idx")
+            if not isinstance(idx, int) or not 0 <= idx < len(batch_field_answers):
+                continue
+
+            # filter answers are returned as-is; convert answers are wrapped in a list (as they are for one-to-one converts)
+            if self.prompt_strategy.is_cot_bool_prompt():
+                batch_field_answers[idx] = {"passed_operator": answer_dict.get("passed_operator", False)}
+            else:
+                batch_field_answers[idx] = {
+                    field_name: [answer_dict[field_name]] if field_name in answer_dict else None
+                    for field_name in fields
+                }
+
+        return batch_field_answers
+
+    def _get_empty_field_answers(self, fields: list[str] | None, **kwargs) -> dict | list[dict] | None:
+        """Return the field answers for a generation which failed; batch prompts get one set of answers per input record."""
+        field_answers = None if fields is None else {field_name: None for field_name in fields}
+        if self.prompt_strategy.is_batch_prompt():
+            return [deepcopy(field_answers) for _ in range(kwargs["num_records"])]
 
+        return field_answers
+
+    def _prepare_payload(self, candidate: DataRecord | list[DataRecord], fields: list[str] | None, **kwargs) -> tuple[list[dict], dict, dict]:
+        """Construct the messages and chat payload for the given input record(s) and output fields."""
         # fields can only be None if the user provides an answer parser
         assert fields is not None or "parse_answer" in kwargs, "`fields` must be provided if `parse_answer` function is not provided in kwargs."
 
@@ -237,64 +302,163 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
             kwargs.pop("system_prompt")
             warnings.warn("Provided `system_prompt` without providing `prompt`; setting `prompt` = `system_prompt`.")  # noqa: B028
 
+        # keep track of the number of input records for parsing the answer to a batch prompt
+        if self.prompt_strategy.is_batch_prompt():
+            kwargs["num_records"] = len(candidate)
+
         # generate a list of messages which can be used to construct a payload
-        self.messages = self.prompt_factory.create_messages(candidate, fields, **kwargs)
+        messages = self.prompt_factory.create_messages(candidate, fields, **kwargs)
+        self.messages = messages
 
         # create the chat payload
-        chat_payload = self._generate_payload(self.messages, **kwargs)
+        chat_payload = self._generate_payload(messages, **kwargs)
+
+        return messages, chat_payload, kwargs
+
+    def _create_generation_stats(self, usage: dict, llm_call_duration_secs: float, cost_multiplier: float = 1.0) -> GenerationStats:
+        """
+        Create the GenerationStats for a completion given its usage statistics. Input tokens which the provider
+        served from its prompt cache are charged at the model's cached input token price (if it has one).
+        """
+        # get cost per input/output token for the model and parse number of input and output tokens
+        model_card = MODEL_CARDS[self.model_name]
+        usd_per_input_token = model_card["usd_per_input_token"] * cost_multiplier
+        usd_per_cached_input_token = model_card.get("usd_per_cached_input_token", model_card["usd_per_input_token"]) * cost_multiplier
+        usd_per_output_token = model_card["usd_per_output_token"] * cost_multiplier
+        input_tokens = usage["input_tokens"]
+        cached_input_tokens = usage.get("cached_input_tokens", 0)
+        output_tokens = usage["output_tokens"]
+
+        total_input_cost = (input_tokens - cached_input_tokens) * usd_per_input_token + cached_input_tokens * usd_per_cached_input_token
+        total_output_cost = output_tokens * usd_per_output_token
+
+        return GenerationStats(
+            model_name=self.model_name,
+            llm_call_duration_secs=llm_call_duration_secs,
+            fn_call_duration_secs=0.0,
+            total_input_tokens=input_tokens,
+            total_cached_input_tokens=cached_input_tokens,
+            total_output_tokens=output_tokens,
+            total_input_cost=total_input_cost,
+            total_output_cost=total_output_cost,
+            cost_per_record=total_input_cost + total_output_cost,
+        )
+
+    def _lookup_cached_completion(self, chat_payload: dict) -> tuple[str | None, GenerationStats | None]:
+        """
+        If the LLM response cache is enabled, look up the payload before calling the provider. Cache hits
+        did not invoke the model, so they report zero tokens, zero cost, and only the lookup time.
+        """
+        cache = get_response_cache()
+        if cache is None:
+            return None, None
 
-        # generate the text completion
         start_time = time.time()
-        completion = None
-        try:
-            completion = self._generate_completion(client, chat_payload, **kwargs)
-            end_time = time.time()
+        cached_response = cache.get(hash_payload(chat_payload))
+        if cached_response is None:
+            return None, None
+
+        completion_text, _ = cached_response
+        generation_stats = GenerationStats(
+            model_name=self.model_name,
+            llm_call_duration_secs=time.time() - start_time,
+            cache_hits=1.0,
+        )
+
+        return completion_text, generation_stats
+
+    def _cache_completion(self, chat_payload: dict, completion_text: str, usage: dict, generation_stats: GenerationStats) -> None:
+        """Add the completion to the LLM response cache (if enabled)."""
+        cache = get_response_cache()
+        if cache is not None:
+            cache.put(hash_payload(chat_payload), completion_text, usage)
+            generation_stats.cache_misses = 1.0
+
+    @staticmethod
+    def _get_retry_kwargs(controller: RateLimitController) -> dict:
+        """Retry transient failures (e.g. 429s) with exponential backoff and jitter."""
+        return {
+            "stop": stop_after_attempt(RETRY_MAX_ATTEMPTS),
+            "wait": wait_random_exponential(multiplier=RETRY_MULTIPLIER, max=RETRY_MAX_SECS),
+            "retry": retry_if_exception(is_retryable_error),
+            "before_sleep": lambda retry_state: controller.record_retry(retry_state.next_action.sleep),
+            "reraise": True,
+        }
 
-        # if there's an error generating the completion, we have to return an empty answer
-        # and can only account for the time spent performing the failed generation
-        except Exception as e:
-            print(f"Error generating completion: {e}")
-            field_answers = {field_name: None for field_name in fields}
-            reasoning = None
-            generation_stats = GenerationStats(model_name=self.model_name, llm_call_duration_secs=time.time() - start_time)
-
-            return field_answers, reasoning, generation_stats
-
-        # parse usage statistics and create the GenerationStats
-        generation_stats = None
-        if completion is not None:
-            usage = self._get_usage(completion, **kwargs)
-            # finish_reason = self._get_finish_reason(completion, **kwargs)
-            # answer_log_probs = self._get_answer_log_probs(completion, **kwargs)
-
-            # get cost per input/output token for the model and parse number of input and output tokens
-            usd_per_input_token = MODEL_CARDS[self.model_name]["usd_per_input_token"]
-            usd_per_output_token = MODEL_CARDS[self.model_name]["usd_per_output_token"]
-            input_tokens = usage["input_tokens"]
-            output_tokens = usage["output_tokens"]
-
-            generation_stats = GenerationStats(
-                model_name=self.model_name,
-                llm_call_duration_secs=end_time - start_time,
-                fn_call_duration_secs=0.0,
-                total_input_tokens=input_tokens,
-                total_output_tokens=output_tokens,
-                total_input_cost=input_tokens * usd_per_input_token,
-                total_output_cost=output_tokens * usd_per_output_token,
-                cost_per_record=input_tokens * usd_per_input_token + output_tokens * usd_per_output_token,
-                # "system_prompt": system_prompt,
-                # "prompt": prompt,
-                # "usage": usage,
-                # "finish_reason": finish_reason,
-                # "answer_log_probs": answer_log_probs,
-                # "answer": answer,
-            )
+    def _generate_completion_with_retries(self, client: Any, chat_payload: dict, **kwargs) -> tuple[Any, dict, int, float]:
+        """
+        Generate the completion within the model's rate limits, retrying transient failures. Returns the
+        completion, its usage, the number of retries, and the time (in seconds) spent throttled.
+        """
+        controller = get_rate_limit_registry().get_controller(self.model_name)
+        num_tokens_reserved = controller.estimate_tokens(chat_payload)
+        throttle_duration_secs = 0.0
+
+        retrying = Retrying(**self._get_retry_kwargs(controller))
+        for attempt in retrying:
+            with attempt:
+                throttle_duration_secs += controller.acquire(num_tokens_reserved)
+                num_tokens_used, rate_limited = None, False
+                try:
+                    completion = self._generate_completion(client, chat_payload, **kwargs)
+                    usage = self._get_usage(completion, **kwargs)
+                    num_tokens_used = usage["input_tokens"] + usage["output_tokens"]
+                except Exception as e:
+                    rate_limited = is_rate_limit_error(e)
+                    raise
+                finally:
+                    # the slot must be released on every path (including cancellations) or the controller starves
+                    controller.release(num_tokens_reserved, num_tokens_used, rate_limited=rate_limited)
+
+        num_retries = retrying.statistics["attempt_number"] - 1
+        throttle_duration_secs += retrying.statistics["idle_for"]
+
+        return completion, usage, num_retries, throttle_duration_secs
+
+    def _generate_from_batch(
+        self, batch_session: BatchSession, chat_payload: dict, messages: list[dict], fields: list[str] | None, **kwargs
+    ) -> GenerationOutput:
+        """
+        Serve the completion from the response of the active BatchSession. If the payload has not been run
+        in a batch yet, the session records the request and raises DeferredCompletion. Batched requests are
+        billed at a discount and their (offline) latency is not attributed to the call.
+        """
+        start_time = time.time()
+        response = batch_session.get_response(chat_payload)
+        if response.get("status_code") != 200:
+            error = Exception(f"Batch request failed: {response.get('error')}")
+            return self._failed_generation_output(fields, error, start_time, **kwargs)
 
-        # pretty print prompt + full completion output for debugging
+        # create the GenerationStats
+        completion = self._get_completion_from_batch_body(response["body"], **kwargs)
+        usage = self._get_usage(completion, **kwargs)
+        generation_stats = self._create_generation_stats(usage, time.time() - start_time, BATCH_API_COST_DISCOUNT)
+
+        # get the completion text and add it to the cache (if enabled)
         completion_text = self._get_completion_text(completion, **kwargs)
+        self._cache_completion(chat_payload, completion_text, usage, generation_stats)
+
+        return self._parse_completion_text(completion_text, messages, fields, generation_stats, **kwargs)
+
+    def _failed_generation_output(self, fields: list[str] | None, error: Exception, start_time: float, **kwargs) -> GenerationOutput:
+        """
+        If there's an error generating the completion, we have to return an empty answer
+        and can only account for the time spent performing the failed generation.
+        """
+        print(f"Error generating completion: {error}")
+        field_answers = self._get_empty_field_answers(fields, **kwargs)
+        generation_stats = GenerationStats(model_name=self.model_name, llm_call_duration_secs=time.time() - start_time)
+
+        return field_answers, None, generation_stats
+
+    def _parse_completion_text(
+        self, completion_text: str, messages: list[dict], fields: list[str] | None, generation_stats: GenerationStats, **kwargs
+    ) -> GenerationOutput:
+        """Parse the reasoning and field answers out of the completion text."""
+        # pretty print prompt + full completion output for debugging
         if self.verbose:
             prompt = ""
-            for message in self.messages:
+            for message in messages:
                 if message["role"] == "user":
                     prompt += message["content"] + "\n" if message["type"] == "text" else "<image>\n"
             print(f"PROMPT:\n{prompt}")
@@ -308,7 +472,7 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
             print(f"Error parsing reasoning and answers: {e}")
 
         # parse field answers
-        field_answers = None if fields is None else {field_name: None for field_name in fields}
+        field_answers = self._get_empty_field_answers(fields, **kwargs)
         try:
             field_answers = self._parse_answer(completion_text, fields, **kwargs)
         except Exception as e:
@@ -316,32 +480,176 @@ class BaseGenerator(Generic[ContextType, InputType], ABC):
 
         return field_answers, reasoning, generation_stats
 
+    def __call__(self, candidate: DataRecord | list[DataRecord], fields: list[str] | None, **kwargs) -> GenerationOutput:
+        """
+        Take the input record (`candidate`), generate the output `fields`, and return the generated output.
+        For batch prompt strategies, `candidate` is a list of records and the field answers are a list with
+        one entry per record.
+        """
+        messages, chat_payload, kwargs = self._prepare_payload(candidate, fields, **kwargs)
+
+        # serve the completion from the LLM response cache if possible
+        completion_text, generation_stats = self._lookup_cached_completion(chat_payload)
+        if completion_text is not None:
+            return self._parse_completion_text(completion_text, messages, fields, generation_stats, **kwargs)
+
+        # if a BatchSession serving this provider is active, the completion is served from (or deferred to) a provider batch
+        batch_session = get_active_batch_session()
+        if batch_session is not None and batch_session.serves(self.provider):
+            return self._generate_from_batch(batch_session, chat_payload, messages, fields, **kwargs)
 
-class OpenAIGenerator(BaseGenerator[str | list[str], str]):
+        # generate the text completion
+        client = self._get_client_or_model()
+        start_time = time.time()
+        try:
+            completion, usage, num_retries, throttle_duration_secs = self._generate_completion_with_retries(
+                client, chat_payload, **kwargs
+            )
+            end_time = time.time()
+        except Exception as e:
+            return self._failed_generation_output(fields, e, start_time, **kwargs)
+
+        # create the GenerationStats
+        generation_stats = self._create_generation_stats(usage, end_time - start_time)
+        generation_stats.num_retries = num_retries
+        generation_stats.throttle_duration_secs = throttle_duration_secs
+
+        # get the completion text and add it to the cache (if enabled)
+        completion_text = self._get_completion_text(completion, **kwargs)
+        self._cache_completion(chat_payload, completion_text, usage, generation_stats)
+
+        return self._parse_completion_text(completion_text, messages, fields, generation_stats, **kwargs)
+
+
+class AsyncBaseGenerator(BaseGenerator[ContextType, InputType]):
+    """
+    Abstract base class for Generators which (in addition to the blocking __call__) can perform
+    their generation on an asyncio event loop using the provider's async client.
+    """
+
+    @abstractmethod
+    def _get_async_client(self, **kwargs) -> Any:
+        """Returns an async client which can be awaited to perform the generation."""
+        pass
+
+    @abstractmethod
+    async def _agenerate_completion(self, client: Any, payload: dict, **kwargs) -> Any:
+        """Generates a completion object using the async client."""
+        pass
+
+    async def _agenerate_completion_with_retries(self, client: Any, chat_payload: dict, **kwargs) -> tuple[Any, dict, int, float]:
+        """Async counterpart of _generate_completion_with_retries()."""
+        controller = get_rate_limit_registry().get_controller(self.model_name)
+        num_tokens_reserved = controller.estimate_tokens(chat_payload)
+        throttle_duration_secs = 0.0
+
+        retrying = AsyncRetrying(**self._get_retry_kwargs(controller))
+        async for attempt in retrying:
+            with attempt:
+                throttle_duration_secs += await controller.aacquire(num_tokens_reserved)
+                num_tokens_used, rate_limited = None, False
+                try:
+                    completion = await self._agenerate_completion(client, chat_payload, **kwargs)
+                    usage = self._get_usage(completion, **kwargs)
+                    num_tokens_used = usage["input_tokens"] + usage["output_tokens"]
+                except Exception as e:
+                    rate_limited = is_rate_limit_error(e)
+                    raise
+                finally:
+                    # the slot must be released on every path (including cancellations) or the controller starves
+                    controller.release(num_tokens_reserved, num_tokens_used, rate_limited=rate_limited)
+
+        num_retries = retrying.statistics["attempt_number"] - 1
+        throttle_duration_secs += retrying.statistics["idle_for"]
+
+        return completion, usage, num_retries, throttle_duration_secs
+
+    async def acall(self, candidate: DataRecord | list[DataRecord], fields: list[str] | None, **kwargs) -> GenerationOutput:
+        """Async counterpart of __call__(); awaits the provider instead of blocking a worker thread."""
+        messages, chat_payload, kwargs = self._prepare_payload(candidate, fields, **kwargs)
+
+        # serve the completion from the LLM response cache if possible
+        completion_text, generation_stats = self._lookup_cached_completion(chat_payload)
+        if completion_text is not None:
+            return self._parse_completion_text(completion_text, messages, fields, generation_stats, **kwargs)
+
+        # if a BatchSession serving this provider is active, the completion is served from (or deferred to) a provider batch
+        batch_session = get_active_batch_session()
+        if batch_session is not None and batch_session.serves(self.provider):
+            return self._generate_from_batch(batch_session, chat_payload, messages, fields, **kwargs)
+
+        # generate the text completion
+        client = self._get_async_client()
+        start_time = time.time()
+        try:
+            completion, usage, num_retries, throttle_duration_secs = await self._agenerate_completion_with_retries(
+                client, chat_payload, **kwargs
+            )
+            end_time = time.time()
+        except Exception as e:
+            return self._failed_generation_output(fields, e, start_time, **kwargs)
+
+        # create the GenerationStats
+        generation_stats = self._create_generation_stats(usage, end_time - start_time)
+        generation_stats.num_retries = num_retries
+        generation_stats.throttle_duration_secs = throttle_duration_secs
+
+        # get the completion text and add it to the cache (if enabled)
+        completion_text = self._get_completion_text(completion, **kwargs)
+        self._cache_completion(chat_payload, completion_text, usage, generation_stats)
+
+        return self._parse_completion_text(completion_text, messages, fields, generation_stats, **kwargs)
+
+
+class OpenAIGenerator(AsyncBaseGenerator[str | list[str], str]):
     """
     Class for generating text using the OpenAI chat API.
     """
-    def __init__(self, model: Model, prompt_strategy: PromptStrategy, cardinality: Cardinality = Cardinality.ONE_TO_ONE, verbose: bool = False):
+    provider = "openai"
+
+    def __init__(
+        self,
+        model: Model,
+        prompt_strategy: PromptStrategy,
+        cardinality: Cardinality = Cardinality.ONE_TO_ONE,
+        verbose: bool = False,
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
+    ):
         # assert that model is an OpenAI model
         assert model in [Model.GPT_4o, Model.GPT_4o_MINI, Model.GPT_4o_V, Model.GPT_4o_MINI_V]
-        super().__init__(model, prompt_strategy, cardinality, verbose, "developer")
+        super().__init__(model, prompt_strategy, cardinality, verbose, "developer", prompt_layout)
 
     def _get_client_or_model(self, **kwargs) -> OpenAI:
         """Returns a client (or local model) which can be invoked to perform the generation."""
-        return OpenAI(api_key=get_api_key("OPENAI_API_KEY"))
+        return get_client_registry().get_client("openai", get_api_key("OPENAI_API_KEY"))
 
     def _generate_completion(self, client: OpenAI, payload: dict, **kwargs) -> ChatCompletion:
         """Generates a completion object using the client (or local model)."""        
         return client.chat.completions.create(**payload)
 
+    def _get_async_client(self, **kwargs) -> AsyncOpenAI:
+        """Returns an async client which can be awaited to perform the generation."""
+        return get_client_registry().get_async_client("openai", get_api_key("OPENAI_API_KEY"))
+
+    async def _agenerate_completion(self, client: AsyncOpenAI, payload: dict, **kwargs) -> ChatCompletion:
+        """Generates a completion object using the async client."""
+        return await client.chat.completions.create(**payload)
+
+    def _get_completion_from_batch_body(self, body: dict, **kwargs) -> ChatCompletion:
+        """Construct the completion object from the response body returned by the OpenAI Batch API."""
+        return ChatCompletion.model_validate(body)
+
     def _get_completion_text(self, completion: ChatCompletion, **kwargs) -> str:
         """Extract the completion text from the completion object."""
         return completion.choices[0].message.content
 
     def _get_usage(self, completion: ChatCompletion, **kwargs) -> dict:
-        """Extract the usage statistics from the completion object."""
+        """Extract the usage statistics (including the input tokens served from the prompt cache) from the completion object."""
+        prompt_tokens_details = getattr(completion.usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(prompt_tokens_details, "cached_tokens", None)
         return {
             "input_tokens": completion.usage.prompt_tokens,
+            "cached_input_tokens": cached_tokens or 0,
             "output_tokens": completion.usage.completion_tokens,
         }
 
@@ -354,23 +662,44 @@ class OpenAIGenerator(BaseGenerator[str | list[str], str]):
         return completion.choices[0].logprobs
 
 
-class TogetherGenerator(BaseGenerator[str | list[str], str]):
+class TogetherGenerator(AsyncBaseGenerator[str | list[str], str]):
     """
     Class for generating text using the Together chat API.
     """
-    def __init__(self, model: Model, prompt_strategy: PromptStrategy, cardinality: Cardinality = Cardinality.ONE_TO_ONE, verbose: bool = False):
+    provider = "together"
+
+    def __init__(
+        self,
+        model: Model,
+        prompt_strategy: PromptStrategy,
+        cardinality: Cardinality = Cardinality.ONE_TO_ONE,
+        verbose: bool = False,
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
+    ):
         # assert that model is a model offered by Together
         assert model in [Model.MIXTRAL, Model.LLAMA3, Model.LLAMA3_V]
-        super().__init__(model, prompt_strategy, cardinality, verbose, "system")
+        super().__init__(model, prompt_strategy, cardinality, verbose, "system", prompt_layout)
 
     def _get_client_or_model(self, **kwargs) -> Together:
         """Returns a client (or local model) which can be invoked to perform the generation."""
-        return Together(api_key=get_api_key("TOGETHER_API_KEY"))
+        return get_client_registry().get_client("together", get_api_key("TOGETHER_API_KEY"))
 
     def _generate_completion(self, client: Together, payload: dict, **kwargs) -> ChatCompletionResponse:
         """Generates a completion object using the client (or local model)."""
         return client.chat.completions.create(**payload)
 
+    def _get_async_client(self, **kwargs) -> AsyncTogether:
+        """Returns an async client which can be awaited to perform the generation."""
+        return get_client_registry().get_async_client("together", get_api_key("TOGETHER_API_KEY"))
+
+    async def _agenerate_completion(self, client: AsyncTogether, payload: dict, **kwargs) -> ChatCompletionResponse:
+        """Generates a completion object using the async client."""
+        return await client.chat.completions.create(**payload)
+
+    def _get_completion_from_batch_body(self, body: dict, **kwargs) -> ChatCompletionResponse:
+        """Construct the completion object from the response body returned by the Together Batch API."""
+        return ChatCompletionResponse.model_validate(body)
+
     def _get_completion_text(self, completion: ChatCompletionResponse, **kwargs) -> str:
         """Extract the completion text from the completion object."""
         return completion.choices[0].message.content
@@ -0,0 +1,288 @@
+"""
+This file contains the per-model rate limit controllers which gate every LLM call made by the Generators.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import threading
+import time
+
+import openai
+import together
+
+from palimpzest.constants import (
+    DEFAULT_LLM_MAX_CONCURRENCY,
+    MODEL_CARDS,
+    TOKENS_PER_CHARACTER,
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Return True if the provider rejected the request because we exceeded a rate limit (i.e. a 429)."""
+    if isinstance(error, (openai.RateLimitError, together.RateLimitError)):
+        return True
+
+    return getattr(error, "status_code", None) == 429
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Return True if the request failed for a transient reason (rate limit, timeout, connection, or server error)."""
+    if is_rate_limit_error(error):
+        return True
+
+    # NOTE: timeouts are a subclass of connection errors for both providers
+    if isinstance(error, (openai.APIConnectionError, together.APIConnectionError)):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and status_code >= 500
+
+
+class TokenBucket:
+    """
+    A token bucket which refills at `rate_per_minute` units per minute up to a capacity of one minute's worth
+    of units. Reservations are allowed to overdraw the bucket; the caller is told how long it must wait for
+    the bucket to become non-negative again. The bucket is not thread-safe on its own; it is guarded by the
+    lock of its RateLimitController.
+    """
+    def __init__(self, rate_per_minute: float):
+        self.capacity = rate_per_minute
+        self.fill_rate = rate_per_minute / 60.0
+        self.level = rate_per_minute
+        self.last_refill_time = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.last_refill_time) * self.fill_rate)
+        self.last_refill_time = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` units from the bucket and return the number of seconds to wait before using them."""
+        self._refill()
+
+        # a single request larger than the capacity could otherwise never be served
+        self.level -= min(amount, self.capacity)
+
+        return 0.0 if self.level >= 0 else -self.level / self.fill_rate
+
+    def adjust(self, amount: float) -> None:
+        """Take (or, if negative, return) `amount` units once the true size of a reservation is known."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimitController:
+    """
+    Gates the LLM calls made to a single model. Each call must acquire a concurrency slot and a reservation
+    from the model's requests-per-minute and tokens-per-minute buckets before it is sent to the provider.
+
+    The concurrency limit is adapted with AIMD: it starts at `max_concurrency`, is halved whenever the
+    provider rate-limits a request, and grows by one (up to `max_concurrency`) after each window of
+    `concurrency_limit` successful requests.
+    """
+    def __init__(
+        self,
+        model_name: str,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = DEFAULT_LLM_MAX_CONCURRENCY,
+    ):
+        self.model_name = model_name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = float(max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute is not None else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute is not None else None
+        self.num_in_flight = 0
+
+        # metrics
+        self.num_requests = 0
+        self.num_retries = 0
+        self.num_rate_limit_errors = 0
+        self.throttle_duration_secs = 0.0
+        self.first_request_time = None
+
+        self._cond = threading.Condition()
+
+        # futures (and their event loops) of the coroutines waiting in aacquire() for a concurrency slot
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @staticmethod
+    def estimate_tokens(payload: dict) -> int:
+        """Estimate the number of input tokens in a chat payload before it is sent to the provider."""
+        return int(len(json.dumps(payload.get("messages", []), default=str)) * TOKENS_PER_CHARACTER)
+
+    def _try_acquire_slot(self) -> bool:
+        """If a concurrency slot is available, take it and return True; the caller must hold self._cond."""
+        if self.num_in_flight >= max(1, int(self.concurrency_limit)):
+            return False
+
+        self.num_in_flight += 1
+        if self.first_request_time is None:
+            self.first_request_time = time.time()
+        self.num_requests += 1
+
+        return True
+
+    def _reserve(self, num_tokens: int) -> float:
+        """Reserve one request and `num_tokens` tokens; return the seconds to wait; the caller must hold self._cond."""
+        wait_secs = 0.0
+        if self.request_bucket is not None:
+            wait_secs = max(wait_secs, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            wait_secs = max(wait_secs, self.token_bucket.reserve(num_tokens))
+
+        return wait_secs
+
+    def acquire(self, num_tokens: int) -> float:
+        """Block until the request may be sent; return the number of seconds spent waiting."""
+        start_time = time.time()
+        with self._cond:
+            while not self._try_acquire_slot():
+                self._cond.wait()
+            wait_secs = self._reserve(num_tokens)
+
+        if wait_secs > 0:
+            time.sleep(wait_secs)
+
+        return self._record_throttle(start_time)
+
+    async def aacquire(self, num_tokens: int) -> float:
+        """Async counterpart of acquire() which yields to the event loop while waiting."""
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._try_acquire_slot():
+                    wait_secs = self._reserve(num_tokens)
+                    break
+
+                # wait for release() to wake us up; it may be called from any thread
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+        if wait_secs > 0:
+            await asyncio.sleep(wait_secs)
+
+        return self._record_throttle(start_time)
+
+    @staticmethod
+    def _wake_async_waiter(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    def _record_throttle(self, start_time: float) -> float:
+        throttle_duration_secs = time.time() - start_time
+        with self._cond:
+            self.throttle_duration_secs += throttle_duration_secs
+
+        return throttle_duration_secs
+
+    def release(self, num_tokens_reserved: int, num_tokens_used: int | None = None, rate_limited: bool = False) -> None:
+        """
+        Release the concurrency slot taken by acquire() and update the concurrency limit. On success, the
+        caller passes the number of tokens the request actually used so that the token reservation is corrected.
+        """
+        with self._cond:
+            self.num_in_flight -= 1
+            if self.token_bucket is not None and num_tokens_used is not None:
+                self.token_bucket.adjust(num_tokens_used - num_tokens_reserved)
+
+            # multiplicative decrease on a 429; additive increase (of one per window of successes) on success
+            if rate_limited:
+                self.num_rate_limit_errors += 1
+                self.concurrency_limit = max(1.0, self.concurrency_limit / 2)
+            elif num_tokens_used is not None:
+                self.concurrency_limit = min(float(self.max_concurrency), self.concurrency_limit + 1 / self.concurrency_limit)
+
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+            for loop, future in waiters:
+                # the loop may have been closed since the coroutine started waiting
+                with contextlib.suppress(RuntimeError):
+                    loop.call_soon_threadsafe(self._wake_async_waiter, future)
+
+    def record_retry(self, backoff_secs: float) -> None:
+        """Record a retry and the time spent in backoff before it."""
+        with self._cond:
+            self.num_retries += 1
+            self.throttle_duration_secs += backoff_secs
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            elapsed_mins = 0.0 if self.first_request_time is None else (time.time() - self.first_request_time) / 60.0
+            return {
+                "num_requests": self.num_requests,
+                "num_retries": self.num_retries,
+                "num_rate_limit_errors": self.num_rate_limit_errors,
+                "throttle_duration_secs": self.throttle_duration_secs,
+                "effective_rpm": self.num_requests / elapsed_mins if elapsed_mins > 0 else 0.0,
+                "concurrency_limit": int(self.concurrency_limit),
+            }
+
+
+class RateLimitRegistry:
+    """
+    A thread-safe registry holding one RateLimitController per model. The rate limits for each model are
+    taken from its MODEL_CARD unless they are overridden with configure().
+    """
+    def __init__(self, max_concurrency: int = DEFAULT_LLM_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self.model_rate_limits: dict[str, dict] = {}
+        self._controllers: dict[str, RateLimitController] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, model_rate_limits: dict[str, dict] | None = None, max_concurrency: int | None = None) -> None:
+        """
+        Override the rate limits for some models, e.g. {"gpt-4o": {"requests_per_minute": 10_000}}, and/or
+        the maximum concurrency. Controllers whose settings change are replaced.
+        """
+        with self._lock:
+            if max_concurrency is not None and max_concurrency != self.max_concurrency:
+                self.max_concurrency = max_concurrency
+                self._controllers = {}
+
+            for model_name, rate_limits in (model_rate_limits or {}).items():
+                if self.model_rate_limits.get(model_name) != rate_limits:
+                    self.model_rate_limits[model_name] = rate_limits
+                    self._controllers.pop(model_name, None)
+
+    def get_controller(self, model_name: str) -> RateLimitController:
+        """Return the (shared) controller for the given model; creating it if necessary."""
+        with self._lock:
+            controller = self._controllers.get(model_name)
+            if controller is None:
+                rate_limits = {**MODEL_CARDS.get(model_name, {}), **self.model_rate_limits.get(model_name, {})}
+                controller = RateLimitController(
+                    model_name,
+                    requests_per_minute=rate_limits.get("requests_per_minute"),
+                    tokens_per_minute=rate_limits.get("tokens_per_minute"),
+                    max_concurrency=self.max_concurrency,
+                )
+                self._controllers[model_name] = controller
+
+        return controller
+
+    def get_stats(self) -> dict[str, dict]:
+        with self._lock:
+            controllers = list(self._controllers.values())
+
+        return {controller.model_name: controller.get_stats() for controller in controllers}
+
+
+# the process-wide rate limit registry used by all Generators
+_RATE_LIMIT_REGISTRY = RateLimitRegistry()
+
+
+def get_rate_limit_registry() -> RateLimitRegistry:
+    return _RATE_LIMIT_REGISTRY
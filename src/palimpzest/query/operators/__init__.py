@@ -2,6 +2,11 @@ from palimpzest.query.operators.aggregate import AggregateOp as _AggregateOp
 from palimpzest.query.operators.aggregate import ApplyGroupByOp as _ApplyGroupByOp
 from palimpzest.query.operators.aggregate import AverageAggregateOp as _AverageAggregateOp
 from palimpzest.query.operators.aggregate import CountAggregateOp as _CountAggregateOp
+from palimpzest.query.operators.aggregate import VectorizedApplyGroupByOp as _VectorizedApplyGroupByOp
+from palimpzest.query.operators.aggregate import VectorizedAverageAggregateOp as _VectorizedAverageAggregateOp
+from palimpzest.query.operators.batched import BatchedLLMConvertBonded as _BatchedLLMConvertBonded
+from palimpzest.query.operators.batched import BatchedLLMFilter as _BatchedLLMFilter
+from palimpzest.query.operators.batched import BatchedLLMOp as _BatchedLLMOp
 from palimpzest.query.operators.convert import ConvertOp as _ConvertOp
 from palimpzest.query.operators.convert import LLMConvert as _LLMConvert
 from palimpzest.query.operators.convert import LLMConvertBonded as _LLMConvertBonded
@@ -47,6 +52,7 @@ from palimpzest.query.operators.project import ProjectOp as _ProjectOp
 from palimpzest.query.operators.retrieve import RetrieveOp as _RetrieveOp
 from palimpzest.query.operators.scan import CacheScanDataOp as _CacheScanDataOp
 from palimpzest.query.operators.scan import MarshalAndScanDataOp as _MarshalAndScanDataOp
+from palimpzest.query.operators.scan import PrefetchingScanDataOp as _PrefetchingScanDataOp
 from palimpzest.query.operators.scan import ScanPhysicalOp as _ScanPhysicalOp
 
 LOGICAL_OPERATORS = [
@@ -65,10 +71,13 @@ LOGICAL_OPERATORS = [
 PHYSICAL_OPERATORS = (
     # aggregate
     [_AggregateOp, _ApplyGroupByOp, _AverageAggregateOp, _CountAggregateOp]
+    + [_VectorizedApplyGroupByOp, _VectorizedAverageAggregateOp]
+    # batched
+    + [_BatchedLLMOp, _BatchedLLMFilter, _BatchedLLMConvertBonded]
     # convert
     + [_ConvertOp, _NonLLMConvert, _LLMConvert, _LLMConvertConventional, _LLMConvertBonded]
     # scan
-    + [_ScanPhysicalOp, _MarshalAndScanDataOp, _CacheScanDataOp]
+    + [_ScanPhysicalOp, _MarshalAndScanDataOp, _PrefetchingScanDataOp, _CacheScanDataOp]
     # filter
     + [_FilterOp, _NonLLMFilter, _LLMFilter]
     # limit
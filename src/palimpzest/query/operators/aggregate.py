@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import re
 import time
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
 
 from palimpzest.constants import NAIVE_EST_NUM_GROUPS, AggFunc
 from palimpzest.core.data.dataclasses import OperatorCostEstimates, RecordOpStats
@@ -8,6 +13,241 @@ from palimpzest.core.elements.groupbysig import GroupBySig
 from palimpzest.core.elements.records import DataRecord, DataRecordSet
 from palimpzest.core.lib.schemas import Number
 from palimpzest.query.operators.physical import PhysicalOperator
+from palimpzest.utils.sketches import HyperLogLog, TDigest
+
+
+class AggState:
+    """
+    The partial state of a single aggregation function. Values are folded into the state one at a time
+    with update(), the states of disjoint subsets of the values can be combined with merge(), and result()
+    returns the value of the aggregation function over all of the values folded into (or merged into) it.
+    """
+    def update(self, value: Any) -> None:
+        raise NotImplementedError("Using update from abstract method")
+
+    def merge(self, other: AggState) -> None:
+        raise NotImplementedError("Using merge from abstract method")
+
+    def result(self) -> Any:
+        raise NotImplementedError("Using result from abstract method")
+
+
+class CountState(AggState):
+    def __init__(self):
+        self.count = 0
+
+    def update(self, value: Any) -> None:
+        self.count += 1
+
+    def merge(self, other: CountState) -> None:
+        self.count += other.count
+
+    def result(self) -> int:
+        return self.count
+
+
+class SumState(AggState):
+    def __init__(self):
+        self.sum = 0
+
+    def update(self, value: Any) -> None:
+        self.sum += value
+
+    def merge(self, other: SumState) -> None:
+        self.sum += other.sum
+
+    def result(self) -> Any:
+        return self.sum
+
+
+class AverageState(AggState):
+    def __init__(self):
+        self.sum = 0
+        self.count = 0
+
+    def update(self, value: Any) -> None:
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: AverageState) -> None:
+        self.sum += other.sum
+        self.count += other.count
+
+    def result(self) -> float:
+        return float(self.sum) / self.count
+
+
+class MinState(AggState):
+    def __init__(self):
+        self.min = None
+
+    def update(self, value: Any) -> None:
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def merge(self, other: MinState) -> None:
+        if other.min is not None:
+            self.update(other.min)
+
+    def result(self) -> Any:
+        return self.min
+
+
+class MaxState(AggState):
+    def __init__(self):
+        self.max = None
+
+    def update(self, value: Any) -> None:
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: MaxState) -> None:
+        if other.max is not None:
+            self.update(other.max)
+
+    def result(self) -> Any:
+        return self.max
+
+
+class CountDistinctState(AggState):
+    """Exact count-distinct, which keeps every distinct value (or its repr(), if it is unhashable) in memory."""
+    def __init__(self):
+        self.values = set()
+
+    def update(self, value: Any) -> None:
+        try:
+            self.values.add(value)
+        except TypeError:
+            self.values.add(repr(value))
+
+    def merge(self, other: CountDistinctState) -> None:
+        self.values |= other.values
+
+    def result(self) -> int:
+        return len(self.values)
+
+
+class ApproxCountDistinctState(AggState):
+    """Approximate count-distinct in constant memory (per group) using a HyperLogLog sketch."""
+    def __init__(self):
+        self.sketch = HyperLogLog()
+
+    def update(self, value: Any) -> None:
+        self.sketch.add(value)
+
+    def merge(self, other: ApproxCountDistinctState) -> None:
+        self.sketch.merge(other.sketch)
+
+    def result(self) -> int:
+        return self.sketch.estimate()
+
+
+class ApproxQuantileState(AggState):
+    """Approximate quantile in bounded memory (per group) using a t-digest sketch."""
+    def __init__(self, q: float):
+        self.q = q
+        self.sketch = TDigest()
+
+    def update(self, value: Any) -> None:
+        self.sketch.add(value)
+
+    def merge(self, other: ApproxQuantileState) -> None:
+        self.sketch.merge(other.sketch)
+
+    def result(self) -> float | None:
+        return self.sketch.quantile(self.q)
+
+
+AGG_STATES = {
+    AggFunc.COUNT: CountState,
+    AggFunc.AVERAGE: AverageState,
+    AggFunc.SUM: SumState,
+    AggFunc.MIN: MinState,
+    AggFunc.MAX: MaxState,
+    AggFunc.COUNT_DISTINCT: CountDistinctState,
+    AggFunc.APPROX_COUNT_DISTINCT: ApproxCountDistinctState,
+    AggFunc.APPROX_MEDIAN: lambda: ApproxQuantileState(0.5),
+}
+
+
+def create_agg_state(func: str) -> AggState:
+    """Create an empty AggState for the aggregation function (an AggFunc or "approx_p<percentile>")."""
+    func = func.lower()
+    if func in AGG_STATES:
+        return AGG_STATES[func]()
+
+    percentile_match = re.fullmatch(r"approx_p(\d+(?:\.\d+)?)", func)
+    if percentile_match is not None and float(percentile_match.group(1)) <= 100:
+        return ApproxQuantileState(float(percentile_match.group(1)) / 100)
+
+    raise Exception("Unknown agg function " + func)
+
+
+# the aggregation functions which VectorizedApplyGroupByOp computes with numpy kernels
+VECTORIZED_AGG_FUNCS = frozenset([AggFunc.COUNT, AggFunc.SUM, AggFunc.AVERAGE, AggFunc.MIN, AggFunc.MAX])
+
+
+def _to_array(values: list, allow_str: bool) -> np.ndarray | None:
+    """
+    Convert a column of values to a numpy array iff numpy computes the same groups, sums, and extrema over
+    it as python does: the values must all be ints (which fit in an int64), all be floats (none of which are
+    NaN), or (if allow_str) all be strs. Returns None otherwise.
+    """
+    value_types = set(map(type, values))
+    value_type = value_types.pop() if len(value_types) == 1 else None
+    if value_type is int:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return None
+
+    if value_type is float:
+        array = np.array(values, dtype=np.float64)
+        return None if np.isnan(array).any() else array
+
+    if value_type is str and allow_str:
+        return np.array(values, dtype=np.str_)
+
+    return None
+
+
+def _factorize(columns: list[np.ndarray], num_rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the group of each row (where groups are numbered in the order of their first appearance) and
+    the first row of each group, for the groups defined by the distinct combinations of the column values.
+    """
+    codes = np.zeros(num_rows, dtype=np.int64)
+    for column in columns:
+        _, column_codes = np.unique(column, return_inverse=True)
+        _, codes = np.unique(codes * (int(column_codes.max()) + 1) + column_codes, return_inverse=True)
+
+    _, first_rows, codes = np.unique(codes, return_index=True, return_inverse=True)
+    order = np.argsort(first_rows)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+
+    return ranks[codes.reshape(-1)], first_rows[order]
+
+
+class PartialAggregate:
+    """
+    The partial state of an aggregate operator over a subset of its input records. PartialAggregates
+    over disjoint subsets of the input can be merged, thus an aggregate's input can be folded into its
+    state as it arrives from upstream, and different subsets can be folded by different workers.
+    """
+    def __init__(self, state: Any):
+        self.state = state
+        self.num_records = 0
+
+        # the input record with the greatest source_idx, which is the parent of the aggregate's output(s)
+        self.last_record: DataRecord | None = None
+
+        # the time spent folding and merging records into this state
+        self.agg_time = 0.0
+
+    def _update_last_record(self, record: DataRecord | None) -> None:
+        if self.last_record is None or (record is not None and record.source_idx >= self.last_record.source_idx):
+            self.last_record = record
 
 
 class AggregateOp(PhysicalOperator):
@@ -15,9 +255,93 @@ class AggregateOp(PhysicalOperator):
     Aggregate operators accept a list of candidate DataRecords as input to their
     __call__ methods. Thus, we use a slightly modified abstract base class for
     these operators.
+
+    Aggregates which implement init_state(), update_state(), merge_states(), and finalize_state()
+    support partial aggregation: the execution strategies fold their input into a PartialAggregate
+    as it arrives (possibly in parallel) rather than buffering all of it, and __call__ is implemented
+    in terms of these methods. Other aggregates must implement __call__ themselves.
     """
-    def __call__(self, candidates: DataRecordSet) -> DataRecordSet:
-        raise NotImplementedError("Using __call__ from abstract method")
+    def __call__(self, candidates: Iterable[DataRecord]) -> DataRecordSet:
+        return self.finalize(self.fold(self.create_partial(), candidates))
+
+    def init_state(self) -> Any:
+        """Return the (mutable) state of the aggregate over zero records."""
+        raise NotImplementedError("Using init_state from abstract method")
+
+    def update_state(self, state: Any, candidate: DataRecord) -> None:
+        """Fold the candidate into the state."""
+        raise NotImplementedError("Using update_state from abstract method")
+
+    def merge_states(self, state: Any, other_state: Any) -> None:
+        """Merge other_state (which is discarded afterwards) into state."""
+        raise NotImplementedError("Using merge_states from abstract method")
+
+    def finalize_state(self, state: Any, parent_record: DataRecord) -> list[DataRecord]:
+        """Return the output records of the aggregate for the given (non-empty) state."""
+        raise NotImplementedError("Using finalize_state from abstract method")
+
+    def supports_partial_aggregation(self) -> bool:
+        return type(self).init_state is not AggregateOp.init_state
+
+    def create_partial(self) -> PartialAggregate:
+        return PartialAggregate(self.init_state())
+
+    def fold(self, partial: PartialAggregate, candidates: Iterable[DataRecord]) -> PartialAggregate:
+        """Fold the candidates into the partial aggregate (in place) and return it."""
+        start_time = time.time()
+        for candidate in candidates:
+            self.update_state(partial.state, candidate)
+            partial.num_records += 1
+            partial._update_last_record(candidate)
+        partial.agg_time += time.time() - start_time
+
+        return partial
+
+    def merge(self, partial: PartialAggregate, other: PartialAggregate) -> PartialAggregate:
+        """Merge the other partial aggregate into the first one (in place) and return it."""
+        start_time = time.time()
+        self.merge_states(partial.state, other.state)
+        partial.num_records += other.num_records
+        partial._update_last_record(other.last_record)
+        partial.agg_time += other.agg_time + time.time() - start_time
+
+        return partial
+
+    def finalize(self, partial: PartialAggregate) -> DataRecordSet:
+        """Compute the output of the aggregate from its partial aggregate over all of its input."""
+        start_time = time.time()
+
+        # NOTE: this will set the parent_id and source_idx of each output to be the id of the final source record;
+        #       in the near future we may want to have parent_id accept a list of ids
+        drs = [] if partial.num_records == 0 else self.finalize_state(partial.state, partial.last_record)
+
+        # create RecordOpStats objects
+        total_time = partial.agg_time + time.time() - start_time
+        record_op_stats_lst = []
+        for dr in drs:
+            record_op_stats = RecordOpStats(
+                record_id=dr.id,
+                record_parent_id=dr.parent_id,
+                record_source_idx=dr.source_idx,
+                record_state=dr.to_dict(include_bytes=False),
+                op_id=self.get_op_id(),
+                logical_op_id=self.logical_op_id,
+                op_name=self.op_name(),
+                time_per_record=total_time / len(drs),
+                cost_per_record=0.0,
+                op_details={k: str(v) for k, v in self.get_id_params().items()},
+            )
+            record_op_stats_lst.append(record_op_stats)
+
+        # construct and return DataRecordSet
+        return DataRecordSet(drs, record_op_stats_lst)
+
+    @staticmethod
+    def execute_fold_wrapper(operator: AggregateOp, candidates: list[DataRecord]) -> tuple[PartialAggregate, AggregateOp]:
+        """Counterpart of PhysicalOperator.execute_op_wrapper() which folds the candidates into a new partial aggregate."""
+        partial = operator.fold(operator.create_partial(), candidates)
+
+        return partial, operator, candidates
 
 
 class ApplyGroupByOp(AggregateOp):
@@ -25,11 +349,17 @@ class ApplyGroupByOp(AggregateOp):
     Implementation of a GroupBy operator. This operator groups records by a set of fields
     and applies a function to each group. The group_by_sig object contains the fields to
     group by and the aggregation functions to apply to each group.
+
+    The state of the operator maps each group to the AggStates of its aggregation functions.
     """
     def __init__(self, group_by_sig: GroupBySig, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.group_by_sig = group_by_sig
 
+        # fail fast on unknown aggregation functions
+        for func in self.group_by_sig.agg_funcs:
+            create_agg_state(func)
+
     def __str__(self):
         op = super().__str__()
         op += f"    Group-by Signature: {str(self.group_by_sig)}\n"
@@ -53,102 +383,171 @@ class ApplyGroupByOp(AggregateOp):
         )
 
     @staticmethod
-    def agg_init(func):
-        if func.lower() == "count":
-            return 0
-        elif func.lower() == "average":
-            return (0, 0)
-        else:
-            raise Exception("Unknown agg function " + func)
-
-    @staticmethod
-    def agg_merge(func, state, val):
-        if func.lower() == "count":
-            return state + 1
-        elif func.lower() == "average":
-            sum, cnt = state
-            return (sum + val, cnt + 1)
-        else:
-            raise Exception("Unknown agg function " + func)
-
-    @staticmethod
-    def agg_final(func, state):
-        if func.lower() == "count":
-            return state
-        elif func.lower() == "average":
-            sum, cnt = state
-            return float(sum) / cnt
-        else:
-            raise Exception("Unknown agg function " + func)
-
-    def __call__(self, candidates: DataRecordSet) -> DataRecordSet:
-        start_time = time.time()
-
-        # build group array
-        agg_state = {}
-        for candidate in candidates:
-            group = ()
-            for f in self.group_by_sig.group_by_fields:
-                if not hasattr(candidate, f):
-                    raise TypeError(f"ApplyGroupByOp record missing expected field {f}")
-                group = group + (getattr(candidate, f),)
-            if group in agg_state:
-                state = agg_state[group]
-            else:
-                state = []
-                for fun in self.group_by_sig.agg_funcs:
-                    state.append(ApplyGroupByOp.agg_init(fun))
-            for i in range(0, len(self.group_by_sig.agg_funcs)):
-                fun = self.group_by_sig.agg_funcs[i]
-                if not hasattr(candidate, self.group_by_sig.agg_fields[i]):
-                    raise TypeError(f"ApplyGroupByOp record missing expected field {self.group_by_sig.agg_fields[i]}")
-                field = getattr(candidate, self.group_by_sig.agg_fields[i])
-                state[i] = ApplyGroupByOp.agg_merge(fun, state[i], field)
-            agg_state[group] = state
-
+    def _get_field(candidate: DataRecord, field: str) -> Any:
+        if not hasattr(candidate, field):
+            raise TypeError(f"ApplyGroupByOp record missing expected field {field}")
+        return getattr(candidate, field)
+
+    def init_state(self) -> dict[tuple, list[AggState]]:
+        return {}
+
+    def update_state(self, state: dict[tuple, list[AggState]], candidate: DataRecord) -> None:
+        group = tuple(self._get_field(candidate, f) for f in self.group_by_sig.group_by_fields)
+        agg_states = state.get(group)
+        if agg_states is None:
+            agg_states = state[group] = [create_agg_state(func) for func in self.group_by_sig.agg_funcs]
+
+        for agg_state, agg_field in zip(agg_states, self.group_by_sig.agg_fields):
+            agg_state.update(self._get_field(candidate, agg_field))
+
+    def merge_states(self, state: dict[tuple, list[AggState]], other_state: dict[tuple, list[AggState]]) -> None:
+        for group, other_agg_states in other_state.items():
+            agg_states = state.get(group)
+            if agg_states is None:
+                state[group] = other_agg_states
+                continue
+
+            for agg_state, other_agg_state in zip(agg_states, other_agg_states):
+                agg_state.merge(other_agg_state)
+
+    def finalize_state(self, state: dict[tuple, list[AggState]], parent_record: DataRecord) -> list[DataRecord]:
         # return list of data records (one per group)
         drs = []
         group_by_fields = self.group_by_sig.group_by_fields
         agg_fields = self.group_by_sig.get_agg_field_names()
-        for g in agg_state:
-            dr = DataRecord(self.group_by_sig.output_schema())
-            # NOTE: this will set the parent_id and source_idx to be the id of the final source record;
-            #       in the near future we may want to have parent_id accept a list of ids
-            dr = DataRecord.from_parent(
-                schema=self.group_by_sig.output_schema(),
-                parent_record=candidates[-1],
-                project_cols=[],
-            )
-            for i in range(0, len(g)):
-                k = g[i]
-                setattr(dr, group_by_fields[i], k)
-            vals = agg_state[g]
-            for i in range(0, len(vals)):
-                v = ApplyGroupByOp.agg_final(self.group_by_sig.agg_funcs[i], vals[i])
-                setattr(dr, agg_fields[i], v)
+        output_schema = self.group_by_sig.output_schema()
+        for group, agg_states in state.items():
+            dr = DataRecord(output_schema, source_idx=parent_record.source_idx, parent_id=parent_record.id)
+            for field, value in zip(group_by_fields, group):
+                setattr(dr, field, value)
+            for field, agg_state in zip(agg_fields, agg_states):
+                setattr(dr, field, agg_state.result())
 
             drs.append(dr)
 
-        # create RecordOpStats objects
-        total_time = time.time() - start_time
-        record_op_stats_lst = []
-        for dr in drs:
-            record_op_stats = RecordOpStats(
-                record_id=dr.id,
-                record_parent_id=dr.parent_id,
-                record_source_idx=dr.source_idx,
-                record_state=dr.to_dict(include_bytes=False),
-                op_id=self.get_op_id(),
-                logical_op_id=self.logical_op_id,
-                op_name=self.op_name(),
-                time_per_record=total_time / len(drs),
-                cost_per_record=0.0,
-                op_details={k: str(v) for k, v in self.get_id_params().items()},
-            )
-            record_op_stats_lst.append(record_op_stats)
+        return drs
 
-        # construct and return DataRecordSet
-        return DataRecordSet(drs, record_op_stats_lst)
+
+class VectorizedApplyGroupByOp(ApplyGroupByOp):
+    """
+    Columnar implementation of a GroupBy operator. Rather than folding each record into its group's AggStates,
+    this operator gathers the group-by and aggregate fields of a batch of records into numpy arrays, assigns
+    rows to groups with np.unique(), and computes the count, sum, average, min, and max of every group with
+    (unbuffered, thus sequential) ufunc.at() kernels which continue from the groups' current AggStates.
+
+    The results are identical to those of ApplyGroupByOp: batches whose columns numpy cannot aggregate
+    exactly as python would (e.g. mixed types, NaNs, unset fields, or possible int64 overflows) are folded
+    record by record instead.
+    """
+    def __init__(self, group_by_sig: GroupBySig, *args, **kwargs):
+        super().__init__(group_by_sig, *args, **kwargs)
+        for func in self.group_by_sig.agg_funcs:
+            if func.lower() not in VECTORIZED_AGG_FUNCS:
+                raise Exception("Cannot vectorize agg function " + func)
+
+    def fold(self, partial: PartialAggregate, candidates: Iterable[DataRecord]) -> PartialAggregate:
+        start_time = time.time()
+        candidates = candidates if isinstance(candidates, list) else list(candidates)
+        if len(candidates) == 0 or not self._fold_columns(partial.state, candidates):
+            return super().fold(partial, candidates)
+
+        partial.num_records += len(candidates)
+        partial._update_last_record(max(reversed(candidates), key=lambda candidate: candidate.source_idx))
+        partial.agg_time += time.time() - start_time
+
+        return partial
+
+    def _fold_columns(self, state: dict[tuple, list[AggState]], candidates: list[DataRecord]) -> bool:
+        """
+        Fold the candidates into the state with vectorized kernels. Returns False (without modifying the
+        state) if the candidates' columns cannot be aggregated exactly as the per-record AggStates would.
+        """
+        agg_funcs = [func.lower() for func in self.group_by_sig.agg_funcs]
+        try:
+            group_columns = [DataRecord.get_column(candidates, field) for field in self.group_by_sig.group_by_fields]
+            agg_columns = [DataRecord.get_column(candidates, field) for field in self.group_by_sig.agg_fields]
+        except AttributeError:
+            return False
+
+        group_arrays = [_to_array(column, allow_str=True) for column in group_columns]
+        if any(array is None for array in group_arrays):
+            return False
+
+        # get the group of each candidate and the current AggStates of each group (None for new groups)
+        codes, first_rows = _factorize(group_arrays, len(candidates))
+        groups = [tuple(column[row] for column in group_columns) for row in first_rows.tolist()]
+        group_agg_states = [state.get(group) for group in groups]
+        counts = np.bincount(codes, minlength=len(groups)).tolist()
+
+        # compute the new value(s) of each aggregate for every group
+        new_values = []
+        for agg_idx, (func, column) in enumerate(zip(agg_funcs, agg_columns)):
+            agg_states = [None if agg_states is None else agg_states[agg_idx] for agg_states in group_agg_states]
+            if func == AggFunc.COUNT:
+                new_values.append([count + (0 if agg_state is None else agg_state.count) for count, agg_state in zip(counts, agg_states)])
+                continue
+
+            array = _to_array(column, allow_str=False)
+            if array is None:
+                return False
+
+            if func in (AggFunc.SUM, AggFunc.AVERAGE):
+                sums = self._fold_sums(array, codes, [0 if agg_state is None else agg_state.sum for agg_state in agg_states])
+                if sums is None:
+                    return False
+                if func == AggFunc.SUM:
+                    new_values.append(sums)
+                else:
+                    new_values.append([
+                        (agg_sum, count + (0 if agg_state is None else agg_state.count))
+                        for agg_sum, count, agg_state in zip(sums, counts, agg_states)
+                    ])
+                continue
+
+            # the current extremum of each group (or its first value, for new groups) must have the column's type
+            attr = "min" if func == AggFunc.MIN else "max"
+            current = [array[row] if agg_state is None else getattr(agg_state, attr) for row, agg_state in zip(first_rows, agg_states)]
+            if any(type(value) is not type(column[0]) for value, agg_state in zip(current, agg_states) if agg_state is not None):
+                return False
+            extrema = np.array(current, dtype=array.dtype)
+            (np.minimum if func == AggFunc.MIN else np.maximum).at(extrema, codes, array)
+            new_values.append(extrema.tolist())
+
+        # update the AggStates (creating those of new groups in the order of their first appearance)
+        for group_idx, (group, agg_states) in enumerate(zip(groups, group_agg_states)):
+            if agg_states is None:
+                agg_states = state[group] = [create_agg_state(func) for func in agg_funcs]
+            for func, agg_state, values in zip(agg_funcs, agg_states, new_values):
+                if func == AggFunc.COUNT:
+                    agg_state.count = values[group_idx]
+                elif func == AggFunc.SUM:
+                    agg_state.sum = values[group_idx]
+                elif func == AggFunc.AVERAGE:
+                    agg_state.sum, agg_state.count = values[group_idx]
+                elif func == AggFunc.MIN:
+                    agg_state.min = values[group_idx]
+                else:
+                    agg_state.max = values[group_idx]
+
+        return True
+
+    @staticmethod
+    def _fold_sums(array: np.ndarray, codes: np.ndarray, current_sums: list) -> list | None:
+        """Add the array to the current sum of each group (in row order); returns None if an int64 could overflow."""
+        try:
+            sums = np.array(current_sums)
+        except OverflowError:
+            return None
+        sums = sums.astype(np.result_type(sums, array))
+        if sums.dtype.kind == "i":
+            max_abs_value = max(abs(int(array.max())), abs(int(array.min())))
+            if max(abs(int(agg_sum)) for agg_sum in current_sums) + max_abs_value * len(array) >= 2**63:
+                return None
+        elif sums.dtype.kind != "f":
+            return None
+
+        np.add.at(sums, codes, array)
+        return sums.tolist()
 
 
 class AverageAggregateOp(AggregateOp):
@@ -184,27 +583,20 @@ class AverageAggregateOp(AggregateOp):
             quality=1.0,
         )
 
-    def __call__(self, candidates: DataRecordSet) -> DataRecordSet:
-        start_time = time.time()
+    def init_state(self) -> AverageState:
+        return AverageState()
 
-        # NOTE: this will set the parent_id and source_idx to be the id of the final source record;
-        #       in the near future we may want to have parent_id accept a list of ids
-        dr = DataRecord.from_parent(schema=Number, parent_record=candidates[-1], project_cols=[])
-        dr.value = sum(list(map(lambda c: float(c.value), candidates))) / len(candidates)
-
-        # create RecordOpStats object
-        record_op_stats = RecordOpStats(
-            record_id=dr.id,
-            record_parent_id=dr.parent_id,
-            record_source_idx=dr.source_idx,
-            record_state=dr.to_dict(include_bytes=False),
-            op_id=self.get_op_id(),
-            op_name=self.op_name(),
-            time_per_record=time.time() - start_time,
-            cost_per_record=0.0,
-        )
+    def update_state(self, state: AverageState, candidate: DataRecord) -> None:
+        state.update(float(candidate.value))
+
+    def merge_states(self, state: AverageState, other_state: AverageState) -> None:
+        state.merge(other_state)
+
+    def finalize_state(self, state: AverageState, parent_record: DataRecord) -> list[DataRecord]:
+        dr = DataRecord(Number, source_idx=parent_record.source_idx, parent_id=parent_record.id)
+        dr.value = state.result()
 
-        return DataRecordSet([dr], [record_op_stats])
+        return [dr]
 
 
 class CountAggregateOp(AggregateOp):
@@ -237,26 +629,48 @@ class CountAggregateOp(AggregateOp):
             quality=1.0,
         )
 
-    def __call__(self, candidates: DataRecordSet) -> DataRecordSet:
-        start_time = time.time()
+    def init_state(self) -> CountState:
+        return CountState()
 
-        # NOTE: this will set the parent_id to be the id of the final source record;
-        #       in the near future we may want to have parent_id accept a list of ids
-        dr = DataRecord.from_parent(schema=Number, parent_record=candidates[-1], project_cols=[])
-        dr.value = len(candidates)
-
-        # create RecordOpStats object
-        record_op_stats = RecordOpStats(
-            record_id=dr.id,
-            record_parent_id=dr.parent_id,
-            record_source_idx=dr.source_idx,
-            record_state=dr.to_dict(include_bytes=False),
-            op_id=self.get_op_id(),
-            logical_op_id=self.logical_op_id,
-            op_name=self.op_name(),
-            time_per_record=time.time() - start_time,
-            cost_per_record=0.0,
-            op_details={k: str(v) for k, v in self.get_id_params().items()},
-        )
+    def update_state(self, state: CountState, candidate: DataRecord) -> None:
+        state.update(candidate)
+
+    def merge_states(self, state: CountState, other_state: CountState) -> None:
+        state.merge(other_state)
+
+    def finalize_state(self, state: CountState, parent_record: DataRecord) -> list[DataRecord]:
+        dr = DataRecord(Number, source_idx=parent_record.source_idx, parent_id=parent_record.id)
+        dr.value = state.result()
 
-        return DataRecordSet([dr], [record_op_stats])
+        return [dr]
+
+
+class VectorizedAverageAggregateOp(AverageAggregateOp):
+    """
+    Columnar implementation of the AVERAGE aggregate, which gathers the values of a batch of records into
+    a numpy array and sums them with np.cumsum() (which, unlike np.sum(), adds them sequentially, thus the
+    result is identical to that of AverageAggregateOp). Batches which contain values other than ints and
+    floats are folded record by record instead.
+    """
+    def fold(self, partial: PartialAggregate, candidates: Iterable[DataRecord]) -> PartialAggregate:
+        start_time = time.time()
+        candidates = candidates if isinstance(candidates, list) else list(candidates)
+        try:
+            values = DataRecord.get_column(candidates, "value")
+        except AttributeError:
+            return super().fold(partial, candidates)
+        if len(values) == 0 or not set(map(type, values)) <= {int, float}:
+            return super().fold(partial, candidates)
+
+        # numpy converts ints to floats exactly as float() (which AverageAggregateOp applies) does
+        try:
+            array = np.array([partial.state.sum, *values], dtype=np.float64)
+        except OverflowError:
+            return super().fold(partial, candidates)
+        partial.state.sum = float(np.cumsum(array)[-1])
+        partial.state.count += len(values)
+        partial.num_records += len(candidates)
+        partial._update_last_record(max(reversed(candidates), key=lambda candidate: candidate.source_idx))
+        partial.agg_time += time.time() - start_time
+
+        return partial
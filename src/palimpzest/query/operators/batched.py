@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from palimpzest.constants import (
+    NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS,
+    Cardinality,
+    PromptStrategy,
+)
+from palimpzest.core.data.dataclasses import GenerationStats, OperatorCostEstimates
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.query.generators.generators import AsyncBaseGenerator
+from palimpzest.query.operators.convert import FieldName, LLMConvertBonded
+from palimpzest.query.operators.filter import LLMFilter
+from palimpzest.query.operators.physical import PhysicalOperator
+from palimpzest.utils.model_helpers import get_naive_input_cost
+
+
+class BatchedLLMOp(PhysicalOperator, ABC):
+    """
+    Base class for LLM operators which pack up to `batch_size` input records into a single prompt.
+
+    Execution strategies call batch_call() with a list of (at most `batch_size`) records and receive one
+    DataRecordSet per input record. The tokens, cost, and time of each LLM call are amortized evenly
+    across the records in its batch. Calling the operator on a single record (i.e. __call__()) executes
+    a batch of one, thus batched operators can still be run by any execution strategy.
+    """
+    def __init__(self, batch_size: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        assert self.prompt_strategy.is_batch_prompt(), "Batched operators must use a batch prompt strategy"
+        self.batch_size = batch_size
+
+    def __str__(self):
+        op = super().__str__()
+        op += f"    Batch Size: {self.batch_size}\n"
+        return op
+
+    def get_id_params(self):
+        id_params = super().get_id_params()
+        return {"batch_size": self.batch_size, **id_params}
+
+    def get_op_params(self):
+        op_params = super().get_op_params()
+        return {"batch_size": self.batch_size, **op_params}
+
+    def _amortize_naive_cost_estimates(self, naive_op_cost_estimates: OperatorCostEstimates) -> OperatorCostEstimates:
+        """
+        Adjust the per-record cost estimates of the un-batched operator to account for the fixed prompt
+        overhead (i.e. the instructions and few-shot example) being paid once per batch instead of per record.
+        """
+        saved_input_tokens = NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS * (1 - 1 / self.batch_size)
+        saved_usd_per_record = get_naive_input_cost(self.model.value, saved_input_tokens, self.prompt_layout)
+
+        naive_op_cost_estimates.cost_per_record = max(0.0, naive_op_cost_estimates.cost_per_record - saved_usd_per_record)
+        naive_op_cost_estimates.cost_per_record_lower_bound = naive_op_cost_estimates.cost_per_record
+        naive_op_cost_estimates.cost_per_record_upper_bound = naive_op_cost_estimates.cost_per_record
+
+        return naive_op_cost_estimates
+
+    @abstractmethod
+    def batch_call(self, candidates: list[DataRecord]) -> list[DataRecordSet]:
+        """Process a batch of input records and return one DataRecordSet for each of them (in order)."""
+        pass
+
+    async def abatch_call(self, candidates: list[DataRecord]) -> list[DataRecordSet]:
+        """
+        Async counterpart of batch_call(). By default, batch_call() is run on a worker thread; subclasses
+        override this method to await their (async) generator instead.
+        """
+        return await asyncio.to_thread(self.batch_call, candidates)
+
+    def __call__(self, candidate: DataRecord) -> DataRecordSet:
+        return self.batch_call([candidate])[0]
+
+    @staticmethod
+    def execute_batch_op_wrapper(operator: BatchedLLMOp, candidates: list[DataRecord]) -> tuple[list[DataRecordSet], BatchedLLMOp]:
+        """Batched counterpart of PhysicalOperator.execute_op_wrapper() for use by worker pools."""
+        record_sets = operator.batch_call(candidates)
+
+        return record_sets, operator, candidates
+
+    async def acall(self, candidate: DataRecord) -> DataRecordSet:
+        return (await self.abatch_call([candidate]))[0]
+
+
+class BatchedLLMFilter(BatchedLLMOp, LLMFilter):
+    """An LLMFilter which evaluates the filter condition for a batch of records with a single LLM call."""
+    def __init__(self, *args, prompt_strategy: PromptStrategy = PromptStrategy.COT_BOOL_BATCH, **kwargs):
+        super().__init__(*args, prompt_strategy=prompt_strategy, **kwargs)
+
+    def naive_cost_estimates(self, source_op_cost_estimates: OperatorCostEstimates) -> OperatorCostEstimates:
+        naive_op_cost_estimates = super().naive_cost_estimates(source_op_cost_estimates)
+        return self._amortize_naive_cost_estimates(naive_op_cost_estimates)
+
+    def _get_gen_kwargs(self) -> dict:
+        return {"project_cols": self.get_input_fields(), "filter_condition": self.filter_obj.filter_condition}
+
+    def _create_record_sets(
+        self,
+        candidates: list[DataRecord],
+        batch_field_answers: list[dict[str, Any]],
+        generation_stats: GenerationStats,
+        start_time: float,
+    ) -> list[DataRecordSet]:
+        """Create one DataRecordSet per input record with the generation stats and time amortized across the batch."""
+        per_record_stats = generation_stats / len(candidates)
+        time_per_record = (time.time() - start_time) / len(candidates)
+
+        record_sets = []
+        for candidate, field_answers in zip(candidates, batch_field_answers):
+            answer = self._parse_passed_operator(field_answers)
+            record_set = self._create_record_set(
+                candidate, answer["passed_operator"], per_record_stats, time_per_record, answer
+            )
+            record_sets.append(record_set)
+
+        return record_sets
+
+    def filter(self, candidate: DataRecord) -> tuple[dict[str, bool], GenerationStats]:
+        batch_field_answers, _, generation_stats = self.generator([candidate], ["passed_operator"], **self._get_gen_kwargs())
+
+        return self._parse_passed_operator(batch_field_answers[0]), generation_stats
+
+    def batch_call(self, candidates: list[DataRecord]) -> list[DataRecordSet]:
+        start_time = time.time()
+
+        # generate the answers for all records in a single query
+        batch_field_answers, _, generation_stats = self.generator(candidates, ["passed_operator"], **self._get_gen_kwargs())
+
+        return self._create_record_sets(candidates, batch_field_answers, generation_stats, start_time)
+
+    async def abatch_call(self, candidates: list[DataRecord]) -> list[DataRecordSet]:
+        if not isinstance(self.generator, AsyncBaseGenerator):
+            return await super().abatch_call(candidates)
+
+        start_time = time.time()
+
+        # generate the answers for all records in a single query
+        batch_field_answers, _, generation_stats = await self.generator.acall(
+            candidates, ["passed_operator"], **self._get_gen_kwargs()
+        )
+
+        return self._create_record_sets(candidates, batch_field_answers, generation_stats, start_time)
+
+
+class BatchedLLMConvertBonded(BatchedLLMOp, LLMConvertBonded):
+    """
+    An LLMConvertBonded which generates all output fields for a batch of records with a single LLM call.
+    Records whose answers are missing (or incomplete) are re-generated once with a batch containing only them.
+    """
+    def __init__(self, *args, prompt_strategy: PromptStrategy = PromptStrategy.COT_QA_BATCH, **kwargs):
+        super().__init__(*args, prompt_strategy=prompt_strategy, **kwargs)
+        assert self.cardinality == Cardinality.ONE_TO_ONE, "Batched converts only support one-to-one cardinality"
+
+    def naive_cost_estimates(self, source_op_cost_estimates: OperatorCostEstimates) -> OperatorCostEstimates:
+        naive_op_cost_estimates = super().naive_cost_estimates(source_op_cost_estimates)
+        return self._amortize_naive_cost_estimates(naive_op_cost_estimates)
+
+    def _get_gen_kwargs(self) -> dict:
+        return {"project_cols": self.get_input_fields(), "output_schema": self.output_schema}
+
+    @staticmethod
+    def _get_failed_idxs(batch_field_answers: list[dict[FieldName, list[Any] | None]]) -> list[int]:
+        return [
+            idx for idx, field_answers in enumerate(batch_field_answers)
+            if any(answers is None for answers in field_answers.values())
+        ]
+
+    def _create_record_sets(
+        self,
+        candidates: list[DataRecord],
+        fields: list[str],
+        batch_field_answers: list[dict[FieldName, list[Any] | None]],
+        generation_stats: GenerationStats,
+        start_time: float,
+    ) -> list[DataRecordSet]:
+        """Create one DataRecordSet per input record with the generation stats and time amortized across the batch."""
+        per_record_stats = generation_stats / len(candidates)
+        time_per_record = (time.time() - start_time) / len(candidates)
+
+        record_sets = []
+        for candidate, field_answers in zip(candidates, batch_field_answers):
+            # replace any None values with an empty list (as is done by ConvertOp)
+            field_answers = {field: [] if answers is None else answers for field, answers in field_answers.items()}
+            drs, successful_convert = self._create_data_records_from_field_answers(field_answers, candidate)
+            record_set = self._create_record_set(
+                records=drs,
+                fields=fields,
+                generation_stats=per_record_stats,
+                total_time=time_per_record,
+                successful_convert=successful_convert,
+            )
+            record_sets.append(record_set)
+
+        return record_sets
+
+    def convert(self, candidate: DataRecord, fields: list[str]) -> tuple[dict[FieldName, list[Any]], GenerationStats]:
+        batch_field_answers, _, generation_stats = self.generator([candidate], fields, **self._get_gen_kwargs())
+
+        return batch_field_answers[0], generation_stats
+
+    def batch_call(self, candidates: list[DataRecord]) -> list[DataRecordSet]:
+        start_time = time.time()
+
+        # get fields to generate with this convert; all records in a batch share the same schema
+        fields_to_generate = self.get_fields_to_generate(candidates[0])
+
+        # generate outputs for all records in a single query
+        gen_kwargs = self._get_gen_kwargs()
+        batch_field_answers, _, generation_stats = self.generator(candidates, fields_to_generate, **gen_kwargs)
+
+        # if there was an error for any record, re-generate the failed records in a single (smaller) query
+        failed_idxs = self._get_failed_idxs(batch_field_answers)
+        if 0 < len(failed_idxs) < len(candidates):
+            retry_candidates = [candidates[idx] for idx in failed_idxs]
+            retry_field_answers, _, retry_stats = self.generator(retry_candidates, fields_to_generate, **gen_kwargs)
+            for idx, field_answers in zip(failed_idxs, retry_field_answers):
+                batch_field_answers[idx] = field_answers
+            generation_stats += retry_stats
+
+        return self._create_record_sets(candidates, fields_to_generate, batch_field_answers, generation_stats, start_time)
+
+    async def abatch_call(self, candidates: list[DataRecord]) -> list[DataRecordSet]:
+        if not isinstance(self.generator, AsyncBaseGenerator):
+            return await super().abatch_call(candidates)
+
+        start_time = time.time()
+
+        # get fields to generate with this convert; all records in a batch share the same schema
+        fields_to_generate = self.get_fields_to_generate(candidates[0])
+
+        # generate outputs for all records in a single query
+        gen_kwargs = self._get_gen_kwargs()
+        batch_field_answers, _, generation_stats = await self.generator.acall(candidates, fields_to_generate, **gen_kwargs)
+
+        # if there was an error for any record, re-generate the failed records in a single (smaller) query
+        failed_idxs = self._get_failed_idxs(batch_field_answers)
+        if 0 < len(failed_idxs) < len(candidates):
+            retry_candidates = [candidates[idx] for idx in failed_idxs]
+            retry_field_answers, _, retry_stats = await self.generator.acall(retry_candidates, fields_to_generate, **gen_kwargs)
+            for idx, field_answers in zip(failed_idxs, retry_field_answers):
+                batch_field_answers[idx] = field_answers
+            generation_stats += retry_stats
+
+        return self._create_record_sets(candidates, fields_to_generate, batch_field_answers, generation_stats, start_time)
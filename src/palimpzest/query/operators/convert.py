@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from abc import ABC, abstractmethod
 from typing import Any, Callable
@@ -11,13 +12,15 @@ from palimpzest.constants import (
     NAIVE_EST_ONE_TO_MANY_SELECTIVITY,
     Cardinality,
     Model,
+    PromptLayout,
     PromptStrategy,
 )
 from palimpzest.core.data.dataclasses import GenerationStats, OperatorCostEstimates, RecordOpStats
 from palimpzest.core.elements.records import DataRecord, DataRecordSet
-from palimpzest.query.generators.generators import generator_factory
+from palimpzest.query.generators.generators import AsyncBaseGenerator, generator_factory
 from palimpzest.query.operators.physical import PhysicalOperator
-from palimpzest.utils.model_helpers import get_vision_models
+from palimpzest.utils.hash_helpers import hash_callable
+from palimpzest.utils.model_helpers import get_naive_input_cost, get_vision_models
 
 # TYPE DEFINITIONS
 FieldName = str
@@ -35,13 +38,14 @@ class ConvertOp(PhysicalOperator, ABC):
         super().__init__(*args, **kwargs)
         self.cardinality = cardinality
         self.udf = udf
+        self.udf_id = None if udf is None else hash_callable(udf)
         self.desc = desc
 
     def get_id_params(self):
         id_params = super().get_id_params()
         id_params = {
             "cardinality": self.cardinality.value,
-            "udf": self.udf,
+            "udf_id": self.udf_id,
             **id_params,
         }
 
@@ -132,6 +136,7 @@ class ConvertOp(PhysicalOperator, ABC):
                 input_fields=self.input_schema.field_names(),
                 generated_fields=fields,
                 total_input_tokens=per_record_stats.total_input_tokens,
+                total_cached_input_tokens=per_record_stats.total_cached_input_tokens,
                 total_output_tokens=per_record_stats.total_output_tokens,
                 total_input_cost=per_record_stats.total_input_cost,
                 total_output_cost=per_record_stats.total_output_cost,
@@ -174,20 +179,22 @@ class ConvertOp(PhysicalOperator, ABC):
         """
         pass
 
-    def __call__(self, candidate: DataRecord) -> DataRecordSet:
+    async def aconvert(self, candidate: DataRecord, fields: list[str]) -> tuple[dict[FieldName, list[Any] | None], GenerationStats]:
         """
-        This method converts an input DataRecord into an output DataRecordSet. The output DataRecordSet contains the
-        DataRecord(s) output by the operator's convert() method and their corresponding RecordOpStats objects.
-        Some subclasses may override this __call__method to implement their own custom logic.
+        Async counterpart of convert(). By default, convert() is run on a worker thread; subclasses which
+        can await their generation (e.g. with an async generator) override this method.
         """
-        start_time = time.time()
+        return await asyncio.to_thread(self.convert, candidate, fields)
 
-        # get fields to generate with this convert
-        fields_to_generate = self.get_fields_to_generate(candidate)
-
-        # execute the convert
-        field_answers: dict[str, list]
-        field_answers, generation_stats = self.convert(candidate=candidate, fields=fields_to_generate)
+    def _create_record_set_from_field_answers(
+        self,
+        candidate: DataRecord,
+        fields_to_generate: list[str],
+        field_answers: dict[FieldName, list[Any] | None],
+        generation_stats: GenerationStats,
+        start_time: float,
+    ) -> DataRecordSet:
+        """Transform the output of convert() into the DataRecordSet returned by this operator."""
         assert all([field in field_answers for field in fields_to_generate]), "Not all fields were generated!"
 
         # replace any None values with an empty list; subclasses may override __call__ to change this behavior
@@ -207,6 +214,40 @@ class ConvertOp(PhysicalOperator, ABC):
 
         return record_set
 
+    def __call__(self, candidate: DataRecord) -> DataRecordSet:
+        """
+        This method converts an input DataRecord into an output DataRecordSet. The output DataRecordSet contains the
+        DataRecord(s) output by the operator's convert() method and their corresponding RecordOpStats objects.
+        Some subclasses may override this __call__method to implement their own custom logic.
+        """
+        start_time = time.time()
+
+        # get fields to generate with this convert
+        fields_to_generate = self.get_fields_to_generate(candidate)
+
+        # execute the convert
+        field_answers: dict[str, list]
+        field_answers, generation_stats = self.convert(candidate=candidate, fields=fields_to_generate)
+
+        return self._create_record_set_from_field_answers(
+            candidate, fields_to_generate, field_answers, generation_stats, start_time
+        )
+
+    async def acall(self, candidate: DataRecord) -> DataRecordSet:
+        """Async counterpart of __call__() which awaits aconvert() instead of calling convert()."""
+        start_time = time.time()
+
+        # get fields to generate with this convert
+        fields_to_generate = self.get_fields_to_generate(candidate)
+
+        # execute the convert
+        field_answers: dict[str, list]
+        field_answers, generation_stats = await self.aconvert(candidate=candidate, fields=fields_to_generate)
+
+        return self._create_record_set_from_field_answers(
+            candidate, fields_to_generate, field_answers, generation_stats, start_time
+        )
+
 
 class NonLLMConvert(ConvertOp):
     def __str__(self):
@@ -283,14 +324,16 @@ class LLMConvert(ConvertOp):
         self,
         model: Model,
         prompt_strategy: PromptStrategy = PromptStrategy.COT_QA,
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.model = model
         self.prompt_strategy = prompt_strategy
+        self.prompt_layout = prompt_layout
         if model is not None:
-            self.generator = generator_factory(model, prompt_strategy, self.cardinality, self.verbose)
+            self.generator = generator_factory(model, prompt_strategy, self.cardinality, self.verbose, prompt_layout)
 
     def __str__(self):
         op = super().__str__()
@@ -302,6 +345,7 @@ class LLMConvert(ConvertOp):
         id_params = {
             "model": None if self.model is None else self.model.value,
             "prompt_strategy": None if self.prompt_strategy is None else self.prompt_strategy.value,
+            "prompt_layout": self.prompt_layout.value,
             **id_params,
         }
 
@@ -312,6 +356,7 @@ class LLMConvert(ConvertOp):
         op_params = {
             "model": self.model,
             "prompt_strategy": self.prompt_strategy,
+            "prompt_layout": self.prompt_layout,
             **op_params,
         }
 
@@ -343,7 +388,7 @@ class LLMConvert(ConvertOp):
 
         # get est. of conversion cost (in USD) per record from model card
         model_conversion_usd_per_record = (
-            MODEL_CARDS[model_name]["usd_per_input_token"] * est_num_input_tokens
+            get_naive_input_cost(model_name, est_num_input_tokens, self.prompt_layout)
             + MODEL_CARDS[model_name]["usd_per_output_token"] * est_num_output_tokens
         )
 
@@ -393,7 +438,7 @@ class LLMConvertConventional(LLMConvert):
 
         # get est. of conversion cost (in USD) per record from model card
         model_conversion_usd_per_record = (
-            MODEL_CARDS[self.model.value]["usd_per_input_token"] * est_num_input_tokens
+            get_naive_input_cost(self.model.value, est_num_input_tokens, self.prompt_layout)
             + MODEL_CARDS[self.model.value]["usd_per_output_token"] * est_num_output_tokens
         )
 
@@ -426,6 +471,28 @@ class LLMConvertConventional(LLMConvert):
 
         return field_answers, generation_stats
 
+    async def aconvert(self, candidate: DataRecord, fields: list[str]) -> tuple[dict[FieldName, list[Any]], GenerationStats]:
+        if not isinstance(self.generator, AsyncBaseGenerator):
+            return await super().aconvert(candidate, fields)
+
+        # get the set of input fields to use for the convert operation
+        input_fields = self.get_input_fields()
+
+        # construct kwargs for generation
+        gen_kwargs = {"project_cols": input_fields, "output_schema": self.output_schema}
+
+        # generate outputs one field at a time (concurrently)
+        field_answers, generation_stats_lst = {}, []
+        results = await asyncio.gather(*[self.generator.acall(candidate, [field], **gen_kwargs) for field in fields])
+        for single_field_answers, _, single_field_stats in results:
+            field_answers.update(single_field_answers)
+            generation_stats_lst.append(single_field_stats)
+
+        # aggregate generation stats into single object
+        generation_stats = sum(generation_stats_lst)
+
+        return field_answers, generation_stats
+
 
 class LLMConvertBonded(LLMConvert):
 
@@ -447,3 +514,25 @@ class LLMConvertBonded(LLMConvert):
                 generation_stats += single_field_stats
 
         return field_answers, generation_stats
+
+    async def aconvert(self, candidate: DataRecord, fields: list[str]) -> tuple[dict[FieldName, list[Any]], GenerationStats]:
+        if not isinstance(self.generator, AsyncBaseGenerator):
+            return await super().aconvert(candidate, fields)
+
+        # get the set of input fields to use for the convert operation
+        input_fields = self.get_input_fields()
+
+        # construct kwargs for generation
+        gen_kwargs = {"project_cols": input_fields, "output_schema": self.output_schema}
+
+        # generate outputs for all fields in a single query
+        field_answers, _, generation_stats = await self.generator.acall(candidate, fields, **gen_kwargs)
+
+        # if there was an error for any field, execute a conventional query on that field
+        for field, answers in list(field_answers.items()):
+            if answers is None:
+                single_field_answers, _, single_field_stats = await self.generator.acall(candidate, [field], **gen_kwargs)
+                field_answers.update(single_field_answers)
+                generation_stats += single_field_stats
+
+        return field_answers, generation_stats
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from abc import ABC, abstractmethod
 from typing import Any
@@ -10,14 +11,15 @@ from palimpzest.constants import (
     NAIVE_EST_NUM_INPUT_TOKENS,
     Cardinality,
     Model,
+    PromptLayout,
     PromptStrategy,
 )
 from palimpzest.core.data.dataclasses import GenerationStats, OperatorCostEstimates, RecordOpStats
 from palimpzest.core.elements.filters import Filter
 from palimpzest.core.elements.records import DataRecord, DataRecordSet
-from palimpzest.query.generators.generators import generator_factory
+from palimpzest.query.generators.generators import AsyncBaseGenerator, generator_factory
 from palimpzest.query.operators.physical import PhysicalOperator
-from palimpzest.utils.model_helpers import get_vision_models
+from palimpzest.utils.model_helpers import get_naive_input_cost, get_vision_models
 
 
 class FilterOp(PhysicalOperator, ABC):
@@ -91,6 +93,7 @@ class FilterOp(PhysicalOperator, ABC):
             model_name=self.get_model_name(),
             filter_str=self.filter_obj.get_filter_str(),
             total_input_tokens=generation_stats.total_input_tokens,
+            total_cached_input_tokens=generation_stats.total_cached_input_tokens,
             total_output_tokens=generation_stats.total_output_tokens,
             total_input_cost=generation_stats.total_input_cost,
             total_output_cost=generation_stats.total_output_cost,
@@ -121,6 +124,31 @@ class FilterOp(PhysicalOperator, ABC):
 
         return record_set
 
+    async def afilter(self, candidate: DataRecord) -> tuple[dict[str, bool], GenerationStats]:
+        """
+        Async counterpart of filter(). By default, filter() is run on a worker thread; subclasses which
+        can await their generation (e.g. with an async generator) override this method.
+        """
+        return await asyncio.to_thread(self.filter, candidate)
+
+    async def acall(self, candidate: DataRecord) -> DataRecordSet:
+        """Async counterpart of __call__() which awaits afilter() instead of calling filter()."""
+        start_time = time.time()
+
+        # apply the filter operation
+        field_answers, generation_stats = await self.afilter(candidate)
+
+        # create and return record set
+        record_set = self._create_record_set(
+            candidate,
+            field_answers["passed_operator"],
+            generation_stats,
+            time.time() - start_time,
+            field_answers
+        )
+
+        return record_set
+
 
 class NonLLMFilter(FilterOp):
     def is_image_filter(self) -> bool:
@@ -171,19 +199,22 @@ class LLMFilter(FilterOp):
         self,
         model: Model,
         prompt_strategy: PromptStrategy = PromptStrategy.COT_BOOL,
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.model = model
         self.prompt_strategy = prompt_strategy
-        self.generator = generator_factory(model, prompt_strategy, Cardinality.ONE_TO_ONE, self.verbose)
+        self.prompt_layout = prompt_layout
+        self.generator = generator_factory(model, prompt_strategy, Cardinality.ONE_TO_ONE, self.verbose, prompt_layout)
 
     def get_id_params(self):
         id_params = super().get_id_params()
         id_params = {
             "model": self.model.value,
             "prompt_strategy": self.prompt_strategy.value,
+            "prompt_layout": self.prompt_layout.value,
             **id_params,
         }
 
@@ -194,6 +225,7 @@ class LLMFilter(FilterOp):
         op_params = {
             "model": self.model,
             "prompt_strategy": self.prompt_strategy,
+            "prompt_layout": self.prompt_layout,
             **op_params,
         }
 
@@ -223,7 +255,7 @@ class LLMFilter(FilterOp):
 
         # get est. of conversion cost (in USD) per record from model card
         model_conversion_usd_per_record = (
-            MODEL_CARDS[self.model.value]["usd_per_input_token"] * est_num_input_tokens
+            get_naive_input_cost(self.model.value, est_num_input_tokens, self.prompt_layout)
             + MODEL_CARDS[self.model.value]["usd_per_output_token"] * est_num_output_tokens
         )
 
@@ -251,11 +283,30 @@ class LLMFilter(FilterOp):
         # generate output
         field_answers, _, generation_stats = self.generator(candidate, ["passed_operator"], **gen_kwargs)
 
-        # compute whether the record passed the filter or not
+        return self._parse_passed_operator(field_answers), generation_stats
+
+    async def afilter(self, candidate: DataRecord) -> tuple[dict[str, bool], GenerationStats]:
+        if not isinstance(self.generator, AsyncBaseGenerator):
+            return await super().afilter(candidate)
+
+        # get the set of input fields to use for the filter operation
+        input_fields = self.get_input_fields()
+
+        # construct kwargs for generation
+        gen_kwargs = {"project_cols": input_fields, "filter_condition": self.filter_obj.filter_condition}
+
+        # generate output
+        field_answers, _, generation_stats = await self.generator.acall(candidate, ["passed_operator"], **gen_kwargs)
+
+        return self._parse_passed_operator(field_answers), generation_stats
+
+    @staticmethod
+    def _parse_passed_operator(field_answers: dict[str, Any]) -> dict[str, bool]:
+        """Compute whether the record passed the filter or not from the generator's field answers."""
         passed_operator = False
         if isinstance(field_answers["passed_operator"], str):
             passed_operator = "true" in field_answers["passed_operator"].lower()
         elif isinstance(field_answers["passed_operator"], bool):
             passed_operator = field_answers["passed_operator"]
 
-        return {"passed_operator": passed_operator}, generation_stats
+        return {"passed_operator": passed_operator}
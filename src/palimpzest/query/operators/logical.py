@@ -8,7 +8,7 @@ from palimpzest.core.data.datareaders import DataReader
 from palimpzest.core.elements.filters import Filter
 from palimpzest.core.elements.groupbysig import GroupBySig
 from palimpzest.core.lib.schemas import Schema
-from palimpzest.utils.hash_helpers import hash_for_id
+from palimpzest.utils.hash_helpers import hash_callable, hash_for_id
 
 
 class LogicalOperator:
@@ -208,6 +208,7 @@ class ConvertScan(LogicalOperator):
         super().__init__(*args, **kwargs)
         self.cardinality = cardinality
         self.udf = udf
+        self.udf_id = None if udf is None else hash_callable(udf)
         self.depends_on = [] if depends_on is None else sorted(depends_on)
         self.desc = desc
         self.target_cache_id = target_cache_id
@@ -219,7 +220,7 @@ class ConvertScan(LogicalOperator):
         logical_id_params = super().get_logical_id_params()
         logical_id_params = {
             "cardinality": self.cardinality,
-            "udf": self.udf,
+            "udf_id": self.udf_id,
             **logical_id_params,
         }
 
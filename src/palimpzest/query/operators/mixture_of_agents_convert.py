@@ -38,10 +38,12 @@ class MixtureOfAgentsConvert(LLMConvert):
 
         # create generators
         self.proposer_generators = [
-            generator_factory(model, self.proposer_prompt_strategy, self.cardinality, self.verbose)
+            generator_factory(model, self.proposer_prompt_strategy, self.cardinality, self.verbose, self.prompt_layout)
             for model in proposer_models
         ]
-        self.aggregator_generator = generator_factory(aggregator_model, self.aggregator_prompt_strategy, self.cardinality, self.verbose)
+        self.aggregator_generator = generator_factory(
+            aggregator_model, self.aggregator_prompt_strategy, self.cardinality, self.verbose, self.prompt_layout
+        )
 
     def __str__(self):
         op = super().__str__()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 
 from palimpzest.core.data.dataclasses import OperatorCostEstimates
@@ -188,6 +189,14 @@ class PhysicalOperator:
     def __call__(self, candidate: DataRecord) -> DataRecordSet:
         raise NotImplementedError("Calling __call__ from abstract method")
 
+    async def acall(self, op_input: DataRecord | list[DataRecord] | int) -> DataRecordSet:
+        """
+        Async counterpart of __call__() used by the asyncio-based execution strategy. By default, the
+        (blocking) __call__() is run on a worker thread; operators which can await their work (e.g. LLM
+        operators with an async generator) override this method to avoid occupying a thread.
+        """
+        return await asyncio.to_thread(self, op_input)
+
     @staticmethod
     def execute_op_wrapper(operator: PhysicalOperator, op_input: DataRecord | list[DataRecord] | int) -> tuple[DataRecordSet, PhysicalOperator]:
         """
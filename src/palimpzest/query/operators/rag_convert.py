@@ -13,7 +13,9 @@ from palimpzest.constants import (
 from palimpzest.core.data.dataclasses import GenerationStats, OperatorCostEstimates
 from palimpzest.core.elements.records import DataRecord
 from palimpzest.core.lib.fields import StringField
+from palimpzest.query.generators.batch_api import get_active_batch_session
 from palimpzest.query.operators.convert import FieldName, LLMConvert
+from palimpzest.utils.model_helpers import get_naive_input_cost
 
 
 class RAGConvert(LLMConvert):
@@ -59,7 +61,7 @@ class RAGConvert(LLMConvert):
         est_num_input_tokens = self.num_chunks_per_field * self.chunk_size
         est_num_output_tokens = NAIVE_EST_NUM_OUTPUT_TOKENS
         model_conversion_usd_per_record = (
-            MODEL_CARDS[self.model.value]["usd_per_input_token"] * est_num_input_tokens
+            get_naive_input_cost(self.model.value, est_num_input_tokens, self.prompt_layout)
             + MODEL_CARDS[self.model.value]["usd_per_output_token"] * est_num_output_tokens
         )
 
@@ -95,11 +97,18 @@ class RAGConvert(LLMConvert):
 
     def compute_embedding(self, text: str) -> list[float]:
         """
-        Compute the embedding for a text string.
+        Compute the embedding for a text string. Under the batch execution strategy, the operator is re-invoked
+        on a record until none of its LLM calls are deferred, thus the embeddings are memoized on the BatchSession.
         """
-        response = self.client.embeddings.create(input=text, model=self.embedding_model)
+        def embed() -> list[float]:
+            response = self.client.embeddings.create(input=text, model=self.embedding_model)
+            return response.data[0].embedding
 
-        return response.data[0].embedding
+        batch_session = get_active_batch_session()
+        if batch_session is not None:
+            return batch_session.memoize(("embedding", self.embedding_model, text), embed)
+
+        return embed()
 
     def compute_similarity(self, query_embedding: list[float], chunk_embedding: list[float]) -> float:
         """
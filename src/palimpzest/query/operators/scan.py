@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
 from palimpzest.constants import (
+    DEFAULT_SCAN_IO_WORKERS,
+    DEFAULT_SCAN_PREFETCH_WINDOW,
     LOCAL_SCAN_TIME_PER_KB,
     MEMORY_SCAN_TIME_PER_KB,
+    SCAN_IO_BATCH_SIZE,
     Cardinality,
 )
 from palimpzest.core.data.dataclasses import OperatorCostEstimates, RecordOpStats
@@ -69,6 +75,19 @@ class ScanPhysicalOp(PhysicalOperator, ABC):
         item = self.datareader[idx]
         end_time = time.time()
 
+        # the scan is blocked for the entire time it takes to read the item
+        return self._create_record_set(idx, item, end_time - start_time, io_blocked_time=end_time - start_time)
+
+    def limit_prefetch(self, end_idx: int | None) -> None:
+        """Do not read ahead items at or after `end_idx` (if set); scans which do not read ahead ignore this."""
+        pass
+
+    def close(self) -> None:
+        """Release the resources held to scan the datareader (e.g. read-ahead threads); the scan may still be called afterwards."""
+        pass
+
+    def _create_record(self, idx: int, item: dict) -> DataRecord:
+        """Construct the DataRecord for the item at the given `idx`."""
         # check that item covers fields in output schema
         output_field_names = self.output_schema.field_names()
         assert all([field in item for field in output_field_names]), f"Some fields in DataReader schema not present in item!\n - DataReader fields: {output_field_names}\n - Item fields: {list(item.keys())}"
@@ -78,6 +97,12 @@ class ScanPhysicalOp(PhysicalOperator, ABC):
         for field in output_field_names:
             setattr(dr, field, item[field])
 
+        return dr
+
+    def _create_record_set(self, idx: int, item: dict, time_per_record: float, io_blocked_time: float) -> DataRecordSet:
+        """Construct the DataRecord (and its RecordOpStats) for the item at the given `idx`."""
+        dr = self._create_record(idx, item)
+
         # create RecordOpStats objects
         record_op_stats = RecordOpStats(
             record_id=dr.id,
@@ -87,8 +112,9 @@ class ScanPhysicalOp(PhysicalOperator, ABC):
             op_id=self.get_op_id(),
             logical_op_id=self.logical_op_id,
             op_name=self.op_name(),
-            time_per_record=(end_time - start_time),
+            time_per_record=time_per_record,
             cost_per_record=0.0,
+            io_blocked_time=io_blocked_time,
             op_details={k: str(v) for k, v in self.get_id_params().items()},
         )
  
@@ -125,7 +151,165 @@ class MarshalAndScanDataOp(ScanPhysicalOp):
         )
 
 
+class PrefetchingScanDataOp(MarshalAndScanDataOp):
+    """
+    A MarshalAndScanDataOp which reads ahead of the item it is scanning. When item `idx` is scanned, the items
+    in [idx, idx + prefetch_window) are read (in batches of `io_batch_size` items with `DataReader.get_batch`)
+    on a dedicated pool of `num_io_workers` threads, thus reading the items is overlapped with processing the
+    records which were scanned before them. Scanning an item which is not being read ahead (e.g. because items
+    are scanned out of order) discards the items read ahead and restarts reading ahead from that item.
+
+    The time each scan spends waiting for its item to be read is reported as its `io_blocked_time`. If the
+    prefetch_window is 0, items are read synchronously, as they are by the MarshalAndScanDataOp.
+
+    Executors which know how many items they still need bound the read-ahead with limit_prefetch(), and
+    release the I/O threads with close() once they stop scanning; otherwise, the I/O threads are released
+    once the last item has been scanned.
+    """
+
+    def __init__(
+        self,
+        *args,
+        prefetch_window: int = DEFAULT_SCAN_PREFETCH_WINDOW,
+        num_io_workers: int = DEFAULT_SCAN_IO_WORKERS,
+        io_batch_size: int = SCAN_IO_BATCH_SIZE,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.prefetch_window = prefetch_window
+        self.num_io_workers = num_io_workers
+        self.io_batch_size = io_batch_size
+
+        # the batches being read ahead, keyed by the index of their first item, and the index of the next item
+        # to read ahead; the lock guards this state, as scans may be executed by several threads at once
+        self.batches: dict[int, Future] = {}
+        self.next_prefetch_idx = 0
+        self.prefetch_end_idx: int | None = None
+        self.lock = threading.Lock()
+        self.io_pool: ThreadPoolExecutor | None = None
+
+    def get_op_params(self):
+        op_params = super().get_op_params()
+        return {
+            "prefetch_window": self.prefetch_window,
+            "num_io_workers": self.num_io_workers,
+            "io_batch_size": self.io_batch_size,
+            **op_params,
+        }
+
+    def __getstate__(self) -> dict:
+        # the lock, I/O threads, and batches being read ahead belong to this process' scan; they are not pickled
+        state = self.__dict__.copy()
+        for attr in ["lock", "io_pool", "batches"]:
+            state.pop(attr)
+        state["next_prefetch_idx"] = 0
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.batches = {}
+        self.lock = threading.Lock()
+        self.io_pool = None
+
+    def naive_cost_estimates(
+        self,
+        source_op_cost_estimates: OperatorCostEstimates,
+        input_record_size_in_bytes: int | float,
+    ) -> OperatorCostEstimates:
+        op_estimates = super().naive_cost_estimates(source_op_cost_estimates, input_record_size_in_bytes)
+
+        # items are read by up to num_io_workers threads at once
+        if self.prefetch_window > 0:
+            op_estimates.time_per_record /= max(min(self.num_io_workers, self.prefetch_window), 1)
+
+        return op_estimates
+
+    def __call__(self, idx: int) -> DataRecordSet:
+        if self.prefetch_window <= 0:
+            return super().__call__(idx)
+
+        start_time = time.time()
+        with self.lock:
+            batch_start_idx, batch = self._prefetch(idx)
+
+        # wait for the batch containing the item to be read; if the read-ahead was cancelled (e.g. because the
+        # scan was closed by another thread) before the batch was read, read the item synchronously instead
+        try:
+            item = batch.result()[idx - batch_start_idx]
+        except CancelledError:
+            item = self.datareader[idx]
+        io_blocked_time = time.time() - start_time
+
+        # nothing remains to be read ahead once the last item has been scanned
+        if idx == len(self.datareader) - 1:
+            self.close()
+
+        return self._create_record_set(idx, item, io_blocked_time, io_blocked_time)
+
+    def limit_prefetch(self, end_idx: int | None) -> None:
+        with self.lock:
+            self.prefetch_end_idx = end_idx
+            if end_idx is None:
+                return
+
+            # cancel the batches past the bound which have not started to be read
+            cancelled_start_idxs = [
+                start_idx for start_idx, batch in self.batches.items() if start_idx >= end_idx and batch.cancel()
+            ]
+            for start_idx in cancelled_start_idxs:
+                self.batches.pop(start_idx)
+            if len(cancelled_start_idxs) > 0:
+                self.next_prefetch_idx = min(cancelled_start_idxs)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.io_pool is not None:
+                self.io_pool.shutdown(wait=False, cancel_futures=True)
+                self.io_pool = None
+            self.batches = {}
+
+    def _prefetch(self, idx: int) -> tuple[int, Future]:
+        """Read ahead the items in [idx, idx + prefetch_window) and return the batch which contains item idx."""
+        if self.io_pool is None:
+            self.io_pool = ThreadPoolExecutor(max_workers=self.num_io_workers, thread_name_prefix="pz-scan-io")
+            weakref.finalize(self, self.io_pool.shutdown, wait=False, cancel_futures=True)
+
+        # drop the batches before the item; if the item is not being read ahead, restart reading ahead from it
+        for batch_start_idx in [start_idx for start_idx in self.batches if start_idx + self.io_batch_size <= idx]:
+            self.batches.pop(batch_start_idx)
+        if not any(start_idx <= idx < start_idx + self.io_batch_size for start_idx in self.batches):
+            for batch in self.batches.values():
+                batch.cancel()
+            self.batches = {}
+            self.next_prefetch_idx = idx
+
+        # submit batches until the window (or at least the item) is being read ahead
+        end_idx = idx + self.prefetch_window
+        if self.prefetch_end_idx is not None:
+            end_idx = min(end_idx, self.prefetch_end_idx)
+        end_idx = min(max(end_idx, idx + 1), len(self.datareader))
+        while self.next_prefetch_idx < end_idx:
+            indices = list(range(self.next_prefetch_idx, min(self.next_prefetch_idx + self.io_batch_size, len(self.datareader))))
+            self.batches[self.next_prefetch_idx] = self.io_pool.submit(self.datareader.get_batch, indices)
+            self.next_prefetch_idx += self.io_batch_size
+
+        batch_start_idx = next(start_idx for start_idx in self.batches if start_idx <= idx < start_idx + self.io_batch_size)
+        return batch_start_idx, self.batches[batch_start_idx]
+
+
 class CacheScanDataOp(ScanPhysicalOp):
+    """
+    Scans the records which a previous execution materialized in the MaterializationCache (see MaterializedResultReader).
+    """
+    def _create_record(self, idx: int, item: dict) -> DataRecord:
+        # the cached items are the field values of the records which were output by the replaced (sub-)plan; these
+        # include every field which was set on the records (and exclude schema fields which were never computed)
+        dr = DataRecord(self.output_schema, source_idx=idx)
+        for field, value in item.items():
+            setattr(dr, field, value)
+
+        return dr
+
     def naive_cost_estimates(
         self,
         source_op_cost_estimates: OperatorCostEstimates,
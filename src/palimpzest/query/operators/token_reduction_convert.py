@@ -10,6 +10,7 @@ from palimpzest.constants import (
 )
 from palimpzest.core.data.dataclasses import OperatorCostEstimates
 from palimpzest.query.operators.convert import LLMConvert, LLMConvertBonded, LLMConvertConventional
+from palimpzest.utils.model_helpers import get_naive_input_cost
 from palimpzest.utils.token_reduction_helpers import best_substring_match, find_best_range
 
 
@@ -76,7 +77,7 @@ class TokenReducedConvert(LLMConvert):
         est_num_input_tokens = NAIVE_EST_NUM_INPUT_TOKENS * self.token_budget
         est_num_output_tokens = NAIVE_EST_NUM_OUTPUT_TOKENS
         model_conversion_usd_per_record = (
-            MODEL_CARDS[self.model.value]["usd_per_input_token"] * est_num_input_tokens
+            get_naive_input_cost(self.model.value, est_num_input_tokens, self.prompt_layout)
             + MODEL_CARDS[self.model.value]["usd_per_output_token"] * est_num_output_tokens
         )
 
@@ -4,6 +4,15 @@ from palimpzest.query.optimizer.rules import (
 from palimpzest.query.optimizer.rules import (
     BasicSubstitutionRule as _BasicSubstitutionRule,
 )
+from palimpzest.query.optimizer.rules import (
+    BatchedLLMConvertBondedRule as _BatchedLLMConvertBondedRule,
+)
+from palimpzest.query.optimizer.rules import (
+    BatchedLLMFilterRule as _BatchedLLMFilterRule,
+)
+from palimpzest.query.optimizer.rules import (
+    BatchedLLMRule as _BatchedLLMRule,
+)
 from palimpzest.query.optimizer.rules import (
     CodeSynthesisConvertRule as _CodeSynthesisConvertRule,
 )
@@ -37,6 +46,9 @@ from palimpzest.query.optimizer.rules import (
 from palimpzest.query.optimizer.rules import (
     NonLLMFilterRule as _NonLLMFilterRule,
 )
+from palimpzest.query.optimizer.rules import (
+    PrefetchingScanRule as _PrefetchingScanRule,
+)
 from palimpzest.query.optimizer.rules import (
     PushDownFilter as _PushDownFilter,
 )
@@ -61,10 +73,16 @@ from palimpzest.query.optimizer.rules import (
 from palimpzest.query.optimizer.rules import (
     TransformationRule as _TransformationRule,
 )
+from palimpzest.query.optimizer.rules import (
+    VectorizedAggregateRule as _VectorizedAggregateRule,
+)
 
 ALL_RULES = [
     _AggregateRule,
     _BasicSubstitutionRule,
+    _BatchedLLMConvertBondedRule,
+    _BatchedLLMFilterRule,
+    _BatchedLLMRule,
     _CodeSynthesisConvertRule,
     _CodeSynthesisConvertSingleRule,
     _CriticAndRefineConvertRule,
@@ -76,6 +94,7 @@ ALL_RULES = [
     _MixtureOfAgentsConvertRule,
     _NonLLMConvertRule,
     _NonLLMFilterRule,
+    _PrefetchingScanRule,
     _PushDownFilter,
     _RAGConvertRule,
     _RetrieveRule,
@@ -84,13 +103,16 @@ ALL_RULES = [
     _TokenReducedConvertConventionalRule,
     _TokenReducedConvertRule,
     _TransformationRule,
+    _VectorizedAggregateRule,
 ]
 
 IMPLEMENTATION_RULES = [
     rule
     for rule in ALL_RULES
     if issubclass(rule, _ImplementationRule)
-    and rule not in [_CodeSynthesisConvertRule, _ImplementationRule, _LLMConvertRule, _TokenReducedConvertRule]
+    and rule not in [
+        _BatchedLLMRule, _CodeSynthesisConvertRule, _ImplementationRule, _LLMConvertRule, _TokenReducedConvertRule
+    ]
 ]
 
 TRANSFORMATION_RULES = [
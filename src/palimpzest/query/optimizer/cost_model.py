@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import math
 
 # NOTE: the answer.mode() call(s) inside of _est_quality() throw a UserWarning when there are multiple
@@ -27,6 +28,7 @@ from palimpzest.query.operators.rag_convert import RAGConvert
 from palimpzest.query.operators.scan import CacheScanDataOp, MarshalAndScanDataOp, ScanPhysicalOp
 from palimpzest.query.operators.token_reduction_convert import TokenReducedConvert
 from palimpzest.query.optimizer.plan import SentinelPlan
+from palimpzest.utils.hash_helpers import hash_for_id
 from palimpzest.utils.model_helpers import get_champion_model_name, get_models
 
 warnings.simplefilter(action='ignore', category=UserWarning)
@@ -51,6 +53,14 @@ class BaseCostModel:
         """
         raise NotImplementedError("Calling get_costed_phys_op_ids from abstract method")
 
+    def get_stats_version(self) -> str | None:
+        """
+        Return a hash of the statistics which the cost model's estimates are computed from, thus two cost models
+        with the same version produce the same estimates. None means that the estimates cannot be versioned
+        (and thus the plans chosen with them must not be cached).
+        """
+        return None
+
     def __call__(self, operator: PhysicalOperator) -> PlanCost:
         """
         The interface exposed by the CostModel to the Optimizer. Subclasses may require
@@ -92,6 +102,9 @@ class SampleBasedCostModel:
     def get_costed_phys_op_ids(self):
         return self.costed_phys_op_ids
 
+    def get_stats_version(self) -> str:
+        return hash_for_id(json.dumps(self.operator_to_stats, sort_keys=True, default=str))
+
 
     def compute_operator_stats(
             self,
@@ -254,6 +267,10 @@ class CostModel(BaseCostModel):
     def get_costed_phys_op_ids(self):
         return self.costed_phys_op_ids
 
+    def get_stats_version(self) -> str:
+        stats = {"operator_estimates": self.operator_estimates, "conf_level": self.conf_level, "models": self.available_models}
+        return hash_for_id(json.dumps(stats, sort_keys=True, default=str))
+
     def _compute_ci(self, sample_mean: float, n_samples: int, std_dev: float) -> tuple[float, float]:
         """
         Compute confidence interval (for non-proportion quantities) given the sample mean, number of samples,
@@ -573,7 +590,7 @@ class CostModel(BaseCostModel):
                     "selectivity_upper_bound": selectivity_ub,
                 }
 
-            elif op_name in ["MarshalAndScanDataOp", "CacheScanDataOp", "LimitScanOp", "CountAggregateOp", "AverageAggregateOp"]:
+            elif op_name in ["MarshalAndScanDataOp", "PrefetchingScanDataOp", "CacheScanDataOp", "LimitScanOp", "CountAggregateOp", "AverageAggregateOp", "VectorizedAverageAggregateOp"]:
                 time_per_record, time_per_record_lb, time_per_record_ub = self._est_time_per_record(op_df)
                 estimates = {
                     "time_per_record": time_per_record,
@@ -581,7 +598,7 @@ class CostModel(BaseCostModel):
                     "time_per_record_upper_bound": time_per_record_ub,
                 }
 
-            elif op_name in ["ApplyGroupByOp"]:
+            elif op_name in ["ApplyGroupByOp", "VectorizedApplyGroupByOp"]:
                 time_per_record, time_per_record_lb, time_per_record_ub = self._est_time_per_record(op_df)
                 cardinality = self._est_cardinality(op_df)
                 estimates = {
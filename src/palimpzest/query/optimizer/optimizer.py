@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import json
 from copy import deepcopy
+from typing import Callable
 
-from palimpzest.constants import Model
-from palimpzest.core.data.datareaders import DataReader
+from palimpzest.constants import DEFAULT_SCAN_IO_WORKERS, DEFAULT_SCAN_PREFETCH_WINDOW, Model, PromptLayout
+from palimpzest.core.data.datareaders import DataReader, MaterializedResultReader
+from palimpzest.core.data.materialization_cache import MaterializationCache, get_materialization_cache
 from palimpzest.core.lib.fields import Field
+from palimpzest.core.lib.schemas import Schema
 from palimpzest.policy import Policy
 from palimpzest.query.operators.logical import (
     Aggregate,
     BaseScan,
+    CacheScan,
     ConvertScan,
     FilteredScan,
     GroupByAggregate,
@@ -27,8 +32,11 @@ from palimpzest.query.optimizer.optimizer_strategy import (
     OptimizerStrategyRegistry,
 )
 from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.optimizer.plan_cache import get_plan_cache, get_pz_version
 from palimpzest.query.optimizer.primitives import Group, LogicalExpression
 from palimpzest.query.optimizer.rules import (
+    BatchedLLMConvertBondedRule,
+    BatchedLLMRule,
     CodeSynthesisConvertRule,
     CriticAndRefineConvertRule,
     LLMConvertBondedRule,
@@ -47,10 +55,21 @@ from palimpzest.query.optimizer.tasks import (
     OptimizePhysicalExpression,
 )
 from palimpzest.sets import Dataset, Set
-from palimpzest.utils.hash_helpers import hash_for_serialized_dict
+from palimpzest.utils.hash_helpers import (
+    hash_callable,
+    hash_for_id,
+    hash_for_serialized_dict,
+    is_cacheable_callable,
+)
 from palimpzest.utils.model_helpers import get_champion_model, get_code_champion_model, get_conventional_fallback_model
 
 
+def get_node_callables(node: Dataset) -> list[Callable]:
+    """Helper function to return the UDFs (i.e. the map UDF, the filter function, and the search function) of a node in the query plan."""
+    filter_fn = None if node._filter is None else node._filter.filter_fn
+    return [fn for fn in [node._udf, filter_fn, node._search_func] if fn is not None]
+
+
 def get_node_uid(node: Dataset | DataReader) -> str:
     """Helper function to compute the universal identifier for a node in the query plan."""
     # NOTE: technically, hash_for_serialized_dict(node.serialize()) would be valid for both DataReader and Dataset;
@@ -96,8 +115,13 @@ class Optimizer:
         allow_rag_reduction: bool = False,
         allow_mixtures: bool = True,
         allow_critic: bool = False,
+        allow_batched_query: bool = False,
+        prompt_layout: PromptLayout = PromptLayout.INTERLEAVED,
+        scan_prefetch_window: int = DEFAULT_SCAN_PREFETCH_WINDOW,
+        scan_io_workers: int = DEFAULT_SCAN_IO_WORKERS,
         optimization_strategy_type: OptimizationStrategyType = OptimizationStrategyType.PARETO,
         use_final_op_quality: bool = False, # TODO: make this func(plan) -> final_quality
+        max_pareto_frontier_size: int | None = None,
     ):
         # store the policy
         if available_models is None or len(available_models) == 0:
@@ -139,6 +163,7 @@ class Optimizer:
             self.allow_rag_reduction = False
             self.allow_mixtures = False
             self.allow_critic = False
+            self.allow_batched_query = False
             self.available_models = [available_models[0]]
 
         # store optimization hyperparameters
@@ -152,15 +177,20 @@ class Optimizer:
         self.allow_rag_reduction = allow_rag_reduction
         self.allow_mixtures = allow_mixtures
         self.allow_critic = allow_critic
+        self.allow_batched_query = allow_batched_query
+        self.prompt_layout = prompt_layout
+        self.scan_prefetch_window = scan_prefetch_window
+        self.scan_io_workers = scan_io_workers
         self.optimization_strategy_type = optimization_strategy_type
         self.use_final_op_quality = use_final_op_quality
+        self.max_pareto_frontier_size = max_pareto_frontier_size
 
         # prune implementation rules based on boolean flags
         if not self.allow_bonded_query:
             self.implementation_rules = [
                 rule
                 for rule in self.implementation_rules
-                if rule not in [LLMConvertBondedRule, TokenReducedConvertBondedRule]
+                if rule not in [BatchedLLMConvertBondedRule, LLMConvertBondedRule, TokenReducedConvertBondedRule]
             ]
 
         if not self.allow_conventional_query:
@@ -196,12 +226,20 @@ class Optimizer:
                 rule for rule in self.implementation_rules if not issubclass(rule, CriticAndRefineConvertRule)
             ]
 
+        if not self.allow_batched_query:
+            self.implementation_rules = [
+                rule for rule in self.implementation_rules if not issubclass(rule, BatchedLLMRule)
+            ]
+
     def update_cost_model(self, cost_model: CostModel):
         self.cost_model = cost_model
 
     def get_physical_op_params(self):
         return {
             "verbose": self.verbose,
+            "prompt_layout": self.prompt_layout,
+            "scan_prefetch_window": self.scan_prefetch_window,
+            "scan_io_workers": self.scan_io_workers,
             "available_models": self.available_models,
             "champion_model": get_champion_model(self.available_models),
             "code_champion_model": get_code_champion_model(self.available_models),
@@ -219,8 +257,13 @@ class Optimizer:
             allow_conventional_query=self.allow_conventional_query,
             allow_code_synth=self.allow_code_synth,
             allow_token_reduction=self.allow_token_reduction,
+            allow_batched_query=self.allow_batched_query,
+            prompt_layout=self.prompt_layout,
+            scan_prefetch_window=self.scan_prefetch_window,
+            scan_io_workers=self.scan_io_workers,
             optimization_strategy_type=self.optimization_strategy_type,
             use_final_op_quality=self.use_final_op_quality,
+            max_pareto_frontier_size=self.max_pareto_frontier_size,
         )
         return optimizer
     
@@ -228,22 +271,19 @@ class Optimizer:
         self.optimization_strategy_type = optimizer_strategy_type
         self.strategy = OptimizerStrategyRegistry.get_strategy(optimizer_strategy_type.value)
     
-    def construct_group_tree(self, dataset_nodes: list[Set]) -> tuple[list[int], dict[str, Field], dict[str, set[str]]]:
-        # get node, output_schema, and input_schema (if applicable)
-        node = dataset_nodes[-1]
-        output_schema = node.schema
-        input_schema = dataset_nodes[-2].schema if len(dataset_nodes) > 1 else None
-        
-        ### convert node --> Group ###
-        uid = get_node_uid(node)
+    def _create_logical_op(
+        self, node: Dataset | DataReader, input_schema: Schema | None, output_schema: Schema, uid: str
+    ) -> LogicalOperator | None:
+        """Create the logical operator for the given node, or return None if the node is a (legacy) useless convert."""
+        # the outputs of operators whose UDFs cannot be identified by their hash are never materialized (or re-used)
+        target_cache_id = uid
+        if isinstance(node, Dataset) and not all(is_cacheable_callable(fn) for fn in get_node_callables(node)):
+            target_cache_id = None
 
-        # create the op for the given node
         op: LogicalOperator | None = None
-
-        # TODO: add cache scan when we add caching back to PZ
-        # if not self.no_cache:
-        #     op = CacheScan(datareader=node, output_schema=output_schema)
-        if isinstance(node, DataReader):
+        if isinstance(node, MaterializedResultReader):
+            op = CacheScan(datareader=node, output_schema=output_schema)
+        elif isinstance(node, DataReader):
             op = BaseScan(datareader=node, output_schema=output_schema)
         elif node._filter is not None:
             op = FilteredScan(
@@ -251,35 +291,35 @@ class Optimizer:
                 output_schema=output_schema,
                 filter=node._filter,
                 depends_on=node._depends_on,
-                target_cache_id=uid,
+                target_cache_id=target_cache_id,
             )
         elif node._group_by is not None:
             op = GroupByAggregate(
                 input_schema=input_schema,
                 output_schema=output_schema,
                 group_by_sig=node._group_by,
-                target_cache_id=uid,
+                target_cache_id=target_cache_id,
             )
         elif node._agg_func is not None:
             op = Aggregate(
                 input_schema=input_schema,
                 output_schema=output_schema,
                 agg_func=node._agg_func,
-                target_cache_id=uid,
+                target_cache_id=target_cache_id,
             )
         elif node._limit is not None:
             op = LimitScan(
                 input_schema=input_schema,
                 output_schema=output_schema,
                 limit=node._limit,
-                target_cache_id=uid,
+                target_cache_id=target_cache_id,
             )
         elif node._project_cols is not None:
             op = Project(
                 input_schema=input_schema,
                 output_schema=output_schema,
                 project_cols=node._project_cols,
-                target_cache_id=uid,
+                target_cache_id=target_cache_id,
             )
         elif node._index is not None:
             op = RetrieveScan(
@@ -290,7 +330,7 @@ class Optimizer:
                 search_attr=node._search_attr,
                 output_attr=node._output_attr,
                 k=node._k,
-                target_cache_id=uid
+                target_cache_id=target_cache_id
             )
         elif output_schema != input_schema:
             op = ConvertScan(
@@ -299,17 +339,35 @@ class Optimizer:
                 cardinality=node._cardinality,
                 udf=node._udf,
                 depends_on=node._depends_on,
-                target_cache_id=uid,
+                target_cache_id=target_cache_id,
             )
         # some legacy plans may have a useless convert; for now we simply skip it
         elif output_schema == input_schema:
-            return self.construct_group_tree(dataset_nodes[:-1]) if len(dataset_nodes) > 1 else ([], {}, {})
+            return None
         else:
             raise NotImplementedError(
                 f"""No logical operator exists for the specified dataset construction.
                 {input_schema}->{output_schema} {"with filter:'" + node._filter + "'" if node._filter is not None else ""}"""
             )
 
+        return op
+
+    def construct_group_tree(self, dataset_nodes: list[Set]) -> tuple[list[int], dict[str, Field], dict[str, set[str]]]:
+        # get node, output_schema, and input_schema (if applicable)
+        node = dataset_nodes[-1]
+        output_schema = node.schema
+        input_schema = dataset_nodes[-2].schema if len(dataset_nodes) > 1 else None
+        
+        ### convert node --> Group ###
+        uid = get_node_uid(node)
+
+        # create the op for the given node
+        op = self._create_logical_op(node, input_schema, output_schema, uid)
+
+        # some legacy plans may have a useless convert; for now we simply skip it
+        if op is None:
+            return self.construct_group_tree(dataset_nodes[:-1]) if len(dataset_nodes) > 1 else ([], {}, {})
+
         # compute the input group ids and fields for this node
         input_group_ids, input_group_fields, input_group_properties = (
             self.construct_group_tree(dataset_nodes[:-1]) if len(dataset_nodes) > 1 else ([], {}, {})
@@ -390,6 +448,9 @@ class Optimizer:
         dataset_nodes.append(node)
         dataset_nodes = list(reversed(dataset_nodes))
 
+        # replace the longest prefix of the plan whose output was materialized by a previous execution (if any)
+        dataset_nodes = self.replace_cached_prefix(dataset_nodes)
+
         # compute depends_on field for every node
         short_to_full_field_name = {}
         for node_idx, node in enumerate(dataset_nodes):
@@ -427,6 +488,43 @@ class Optimizer:
 
         return final_group_id
 
+    def replace_cached_prefix(self, dataset_nodes: list[Dataset | DataReader]) -> list[Dataset | DataReader]:
+        """
+        Replace the longest prefix of the plan whose output is in the MaterializationCache with a MaterializedResultReader
+        of the cached records; thus, the Optimizer plans (and the execution computes) only the remaining operators.
+        The prefixes are keyed in the same way as the outputs which the execution strategies materialize (i.e. by the
+        DataReader's fingerprint followed by the target_cache_id of each operator).
+        """
+        cache = get_materialization_cache()
+        if self.no_cache or cache is None:
+            return dataset_nodes
+
+        # compute the cache id of the output of each prefix of the plan
+        cache_id = MaterializationCache.get_source_cache_id(dataset_nodes[0])
+        if cache_id is None:
+            return dataset_nodes
+
+        prefix_cache_ids = [cache_id]
+        for node_idx, node in enumerate(dataset_nodes[1:], start=1):
+            op = self._create_logical_op(node, dataset_nodes[node_idx - 1].schema, node.schema, get_node_uid(node))
+            if op is not None and (cache_id is None or op.target_cache_id is None):
+                cache_id = None
+            elif op is not None:
+                cache_id = MaterializationCache.get_cache_id(cache_id, op.target_cache_id)
+            prefix_cache_ids.append(cache_id)
+
+        # scan the records of the longest cached prefix instead of computing them
+        for node_idx in range(len(dataset_nodes) - 1, 0, -1):
+            cache_id = prefix_cache_ids[node_idx]
+            items = cache.get_cached_result(cache_id) if cache_id is not None and cache_id in cache else None
+            if items is not None:
+                if self.verbose:
+                    print(f"Scanning {len(items)} cached records in place of the first {node_idx} operator(s)")
+                reader = MaterializedResultReader(cache_id, items, dataset_nodes[node_idx].schema)
+                return [reader] + dataset_nodes[node_idx + 1:]
+
+        return dataset_nodes
+
     def heuristic_optimization(self, group_id: int) -> None:
         """
         Apply universally desirable transformations (e.g. filter/projection push-down).
@@ -450,7 +548,10 @@ class Optimizer:
                 context = {"costed_phys_op_ids": self.costed_phys_op_ids}
                 new_tasks = task.perform(self.groups, self.expressions, context=context, **self.get_physical_op_params())
             elif isinstance(task, OptimizePhysicalExpression):
-                context = {"optimization_strategy_type": self.optimization_strategy_type}
+                context = {
+                    "optimization_strategy_type": self.optimization_strategy_type,
+                    "max_pareto_frontier_size": self.max_pareto_frontier_size,
+                }
                 new_tasks = task.perform(self.cost_model, self.groups, self.policy, context=context)
 
             self.tasks_stack.extend(new_tasks)
@@ -460,6 +561,17 @@ class Optimizer:
         The optimize function takes in an initial query plan and searches the space of
         logical and physical plans in order to cost and produce a (near) optimal physical plan.
         """
+        # return the plans which were chosen for the same optimization by a previous run (if any)
+        plan_cache = get_plan_cache()
+        plan_cache_key = None if plan_cache is None else self.get_plan_cache_key(query_plan, policy)
+        if plan_cache_key is not None:
+            datareader, callables = self.get_query_refs(query_plan)
+            plans = plan_cache.get(plan_cache_key, datareader, callables)
+            if plans is not None:
+                if self.verbose:
+                    print(f"Re-using the {len(plans)} cached plan(s) for this query")
+                return plans
+
         # compute the initial group tree for the user plan
         final_group_id = self.convert_query_plan_to_group_tree(query_plan)
 
@@ -469,6 +581,68 @@ class Optimizer:
 
         # search the optimization space by applying logical and physical transformations to the initial group tree
         self.search_optimization_space(final_group_id)
-        
-        return self.strategy.get_optimal_plans(self.groups, final_group_id, policy, self.use_final_op_quality)
+
+        plans = self.strategy.get_optimal_plans(self.groups, final_group_id, policy, self.use_final_op_quality)
+
+        # NOTE: sentinel plans are not cached, as they are only used to sample the query's operators
+        if plan_cache_key is not None and all(isinstance(plan, PhysicalPlan) for plan in plans):
+            plan_cache.put(plan_cache_key, plans, callables)
+
+        return plans
+
+    def get_query_refs(self, query_plan: Dataset) -> tuple[DataReader, dict[str, Callable]]:
+        """
+        Return the DataReader of the query plan and its UDFs (keyed by their hash_callable()), which are stored
+        by reference (rather than by value) in the PlanCache.
+        """
+        callables, node = {}, query_plan
+        while isinstance(node, Dataset):
+            for fn in get_node_callables(node):
+                callables[hash_callable(fn)] = fn
+            node = node._source
+
+        return node, callables
+
+    def get_plan_cache_key(self, query_plan: Dataset, policy: Policy | None) -> str | None:
+        """
+        Return the key of the optimization of the query plan in the PlanCache, i.e. a hash of the logical plan
+        (including its UDFs' code), the number of items in its DataReader, the policy, the available models, the
+        optimizer's settings, and the version of the cost model's statistics. Returns None if the optimization
+        cannot be cached.
+        """
+        # plans which scan a materialized prefix of the query depend on the contents of the materialization cache
+        if not self.no_cache and get_materialization_cache() is not None:
+            return None
+
+        # plans chosen with estimates which cannot be versioned are not cached
+        get_stats_version = getattr(self.cost_model, "get_stats_version", None)
+        stats_version = None if get_stats_version is None else get_stats_version()
+        if stats_version is None:
+            return None
+
+        depends_on, node = [], query_plan
+        while isinstance(node, Dataset):
+            # plans are re-used by the hash of their UDFs, thus queries whose UDFs cannot be hashed are not cached
+            if not all(is_cacheable_callable(fn) for fn in get_node_callables(node)):
+                return None
+            depends_on.append(list(node._depends_on))
+            node = node._source
+        datareader = node
+
+        key = {
+            "query_plan": query_plan.universal_identifier(),
+            "depends_on": depends_on,
+            "num_items": len(datareader),
+            "policy": None if policy is None else policy.to_json_str(),
+            "optimization_strategy_type": self.optimization_strategy_type.value,
+            "implementation_rules": [rule.__name__ for rule in self.implementation_rules],
+            "transformation_rules": [rule.__name__ for rule in self.transformation_rules],
+            "physical_op_params": {param: str(value) for param, value in self.get_physical_op_params().items()},
+            "use_final_op_quality": self.use_final_op_quality,
+            "max_pareto_frontier_size": self.max_pareto_frontier_size,
+            "stats_version": stats_version,
+            "pz_version": get_pz_version(),
+        }
+
+        return hash_for_id(json.dumps(key, sort_keys=True))
     
@@ -83,14 +83,21 @@ class GreedyStrategy(OptimizationStrategy):
 
 
 class ParetoStrategy(OptimizationStrategy):
-    def _get_candidate_pareto_physical_plans(self, groups: dict, group_id: int, policy: Policy) -> list[PhysicalPlan]:
+    def _get_candidate_pareto_physical_plans(
+        self, groups: dict, group_id: int, policy: Policy, memo: dict[int, list[PhysicalPlan]] | None = None
+    ) -> list[PhysicalPlan]:
         """
         Return a list of plans which will contain all of the pareto optimal plans (and some additional
         plans which may not be pareto optimal).
 
-        TODO: can we cache group_id --> final_pareto_optimal_plans to avoid re-computing upstream
-        groups' pareto-optimal plans for each expression?
+        The plans for each group are memoized in `memo` (which maps group_id --> plans), thus the
+        upstream groups' pareto-optimal plans are computed once rather than once per expression.
         """
+        if memo is None:
+            memo = {}
+        if group_id in memo:
+            return memo[group_id]
+
         # get the pareto optimal physical expressions for this group
         pareto_optimal_phys_exprs = groups[group_id].pareto_optimal_physical_expressions
 
@@ -108,7 +115,7 @@ class ParetoStrategy(OptimizationStrategy):
             else:
                 # get the pareto optimal physical plan(s) for this group's inputs
                 input_group_id = phys_expr.input_group_ids[0] # TODO: need to handle joins
-                pareto_optimal_phys_subplans = self._get_candidate_pareto_physical_plans(groups, input_group_id, policy)
+                pareto_optimal_phys_subplans = self._get_candidate_pareto_physical_plans(groups, input_group_id, policy, memo)
 
                 # iterate over the input subplans and find the one(s) which combine with this physical expression
                 # to make a pareto-optimal plan
@@ -126,6 +133,8 @@ class ParetoStrategy(OptimizationStrategy):
                             plan = PhysicalPlan.from_ops_and_sub_plan([phys_expr.operator], subplan, plan_cost)
                             pareto_optimal_plans.append(plan)
 
+        memo[group_id] = pareto_optimal_plans
+
         return pareto_optimal_plans
     
     def get_optimal_plans(self, groups: dict, final_group_id: int, policy: Policy, use_final_op_quality: bool) -> list[PhysicalPlan]:
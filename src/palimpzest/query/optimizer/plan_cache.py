@@ -0,0 +1,150 @@
+"""
+This file contains the on-disk cache of the physical plans chosen by the Optimizer, which is (optionally)
+consulted before the Optimizer searches the space of plans.
+"""
+from __future__ import annotations
+
+import importlib.metadata
+import io
+import pickle
+import sys
+import types
+import warnings
+from functools import partial
+from typing import Any, Callable
+
+from palimpzest.constants import DEFAULT_PLAN_CACHE_MAX_ENTRIES, DEFAULT_PLAN_CACHE_PATH
+from palimpzest.core.data.datareaders import DataReader
+from palimpzest.core.data.sqlite_lru_store import SqliteLRUStore
+from palimpzest.core.lib.fields import Field
+from palimpzest.core.lib.schemas import Schema
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.utils.hash_helpers import hash_callable
+
+
+def get_pz_version() -> str:
+    """Return the installed version of palimpzest, which is part of each plan cache key."""
+    try:
+        return importlib.metadata.version("palimpzest")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _is_importable(cls: type) -> bool:
+    module = sys.modules.get(cls.__module__)
+    obj = module
+    for name in cls.__qualname__.split("."):
+        obj = getattr(obj, name, None)
+    return obj is cls
+
+
+class _PlanPickler(pickle.Pickler):
+    """
+    Pickles physical plans without the objects which belong to the query rather than to the plan: the plan's
+    DataReader and the query's UDFs are stored as references which are resolved to the objects of the query
+    which loads the plan. The (dynamically created) schemas which cannot be imported are stored by value.
+    """
+    def __init__(self, file: io.BytesIO, callables: dict[str, Callable]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.callable_hashes = {id(fn): fn_hash for fn_hash, fn in callables.items()}
+        self.schema_idxs, self.schemas = {}, []
+
+    def persistent_id(self, obj: Any) -> tuple | None:
+        if isinstance(obj, DataReader):
+            return ("datareader",)
+
+        if isinstance(obj, (types.FunctionType, partial)):
+            # NOTE: the query plan is deep-copied by the optimizer, which copies partials (but not functions)
+            fn_hash = self.callable_hashes.get(id(obj)) or hash_callable(obj)
+            if fn_hash in self.callable_hashes.values():
+                return ("callable", fn_hash)
+
+        if isinstance(obj, type) and issubclass(obj, Schema) and not _is_importable(obj):
+            # store each schema's definition by value the first time it is referenced
+            if id(obj) in self.schema_idxs:
+                return ("schema", self.schema_idxs[id(obj)])
+            schema_idx = len(self.schemas)
+            self.schema_idxs[id(obj)] = schema_idx
+            self.schemas.append(obj)
+            attrs = {
+                attr: value
+                for attr, value in vars(obj).items()
+                if attr in ("_desc", "__doc__", "__module__") or isinstance(value, Field)
+            }
+            return ("schema", schema_idx, obj.__name__, obj.__bases__, attrs)
+
+        return None
+
+
+class _PlanUnpickler(pickle.Unpickler):
+    """Loads physical plans pickled by the _PlanPickler, resolving their references to the given query's objects."""
+    def __init__(self, file: io.BytesIO, datareader: DataReader, callables: dict[str, Callable]):
+        super().__init__(file)
+        self.datareader = datareader
+        self.callables = callables
+        self.schemas = {}
+
+    def persistent_load(self, pid: tuple) -> Any:
+        if pid[0] == "datareader":
+            return self.datareader
+
+        if pid[0] == "callable":
+            return self.callables[pid[1]]
+
+        if pid[0] == "schema":
+            schema_idx = pid[1]
+            if schema_idx not in self.schemas:
+                _, _, name, bases, attrs = pid
+                self.schemas[schema_idx] = type(name, bases, attrs)
+            return self.schemas[schema_idx]
+
+        raise pickle.UnpicklingError(f"unknown persistent id: {pid[0]}")
+
+
+class PlanCache(SqliteLRUStore):
+    """
+    A persistent cache mapping the key of an optimization (i.e. a hash of the logical plan, the policy, the
+    available models, the optimizer's settings, and the version of the cost model's statistics) to the list
+    of physical plans which the Optimizer returned for it. Thus, re-running an unchanged program skips the
+    search of the plan space.
+
+    The cache is backed by a single SQLite file and is bounded to `max_entries` entries; once this bound is
+    exceeded, the least recently used entries are evicted. Plans are stored without their DataReader and the
+    query's UDFs, which are supplied by the query which loads the plans.
+    """
+    def __init__(self, path: str = DEFAULT_PLAN_CACHE_PATH, max_entries: int = DEFAULT_PLAN_CACHE_MAX_ENTRIES):
+        super().__init__(path, max_entries=max_entries)
+
+    def get(self, key: str, datareader: DataReader, callables: dict[str, Callable]) -> list[PhysicalPlan] | None:
+        """
+        Return the physical plans for the given key, or None if the key is not cached. The plans' DataReader
+        and UDFs are resolved to the given datareader and callables (keyed by their hash_callable()).
+        """
+        return self._get_value(key, lambda value: _PlanUnpickler(io.BytesIO(value), datareader, callables).load())
+
+    def put(self, key: str, plans: list[PhysicalPlan], callables: dict[str, Callable]) -> bool:
+        """
+        Insert (or replace) the physical plans for the given key and evict the LRU entries beyond max_entries.
+        Returns False (and caches nothing, with a warning) if the plans cannot be pickled.
+        """
+        try:
+            buffer = io.BytesIO()
+            _PlanPickler(buffer, callables).dump(plans)
+        except Exception as e:
+            warnings.warn(f"The optimizer's plans could not be cached: {type(e).__name__}: {e}", stacklevel=2)
+            return False
+
+        return self._put_value(key, buffer.getvalue())
+
+
+# the process-wide plan cache used by the Optimizer; None means plan caching is disabled
+_PLAN_CACHE: PlanCache | None = None
+
+
+def get_plan_cache() -> PlanCache | None:
+    return _PLAN_CACHE
+
+
+def set_plan_cache(cache: PlanCache | None) -> None:
+    global _PLAN_CACHE
+    _PLAN_CACHE = cache
@@ -1,8 +1,18 @@
-from copy import deepcopy
+from copy import copy
 from itertools import combinations
 
 from palimpzest.constants import AggFunc, Cardinality, Model, PromptStrategy
-from palimpzest.query.operators.aggregate import ApplyGroupByOp, AverageAggregateOp, CountAggregateOp
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.lib.fields import FloatField, IntField, NumericField, StringField
+from palimpzest.query.operators.aggregate import (
+    VECTORIZED_AGG_FUNCS,
+    ApplyGroupByOp,
+    AverageAggregateOp,
+    CountAggregateOp,
+    VectorizedApplyGroupByOp,
+    VectorizedAverageAggregateOp,
+)
+from palimpzest.query.operators.batched import BatchedLLMConvertBonded, BatchedLLMFilter
 from palimpzest.query.operators.code_synthesis_convert import CodeSynthesisConvertSingle
 from palimpzest.query.operators.convert import LLMConvertBonded, LLMConvertConventional, NonLLMConvert
 from palimpzest.query.operators.critique_and_refine_convert import CriticAndRefineConvert
@@ -23,7 +33,7 @@ from palimpzest.query.operators.mixture_of_agents_convert import MixtureOfAgents
 from palimpzest.query.operators.project import ProjectOp
 from palimpzest.query.operators.rag_convert import RAGConvert
 from palimpzest.query.operators.retrieve import RetrieveOp
-from palimpzest.query.operators.scan import CacheScanDataOp, MarshalAndScanDataOp
+from palimpzest.query.operators.scan import CacheScanDataOp, MarshalAndScanDataOp, PrefetchingScanDataOp
 from palimpzest.query.operators.token_reduction_convert import (
     TokenReducedConvertBonded,
     TokenReducedConvertConventional,
@@ -101,8 +111,9 @@ class PushDownFilter(TransformationRule):
             if any([field not in input_group.fields for field in filter_operator.depends_on]):
                 continue
 
-            # iterate over logical expressions
-            logical_exprs = deepcopy(input_group.logical_expressions)
+            # iterate over (a snapshot of) the logical expressions; NOTE: the expressions' operators are immutable,
+            # thus (like filter_operator) they are shared by the new expressions rather than deep-copied
+            logical_exprs = list(input_group.logical_expressions)
             for expr in logical_exprs:
                 # if the expression operator is not a convert or a filter, we cannot swap
                 if not (isinstance(expr.operator, (ConvertScan, FilteredScan))):
@@ -113,10 +124,10 @@ class PushDownFilter(TransformationRule):
                     continue
 
                 # create new logical expression with filter pushed down to the input group's logical expression
-                new_input_group_ids = deepcopy(expr.input_group_ids)
-                new_input_fields = deepcopy(expr.input_fields)
-                new_depends_on_field_names = deepcopy(logical_expression.depends_on_field_names)
-                new_generated_fields = deepcopy(logical_expression.generated_fields)
+                new_input_group_ids = copy(expr.input_group_ids)
+                new_input_fields = copy(expr.input_fields)
+                new_depends_on_field_names = copy(logical_expression.depends_on_field_names)
+                new_generated_fields = copy(logical_expression.generated_fields)
                 new_filter_expr = LogicalExpression(
                     filter_operator,
                     input_group_ids=new_input_group_ids,
@@ -145,7 +156,7 @@ class PushDownFilter(TransformationRule):
 
                     # next, compute the properties; the properties will be identical to those of the input group
                     # EXCEPT for the filters which will change as a result of our swap
-                    new_group_properties = deepcopy(input_group.properties)
+                    new_group_properties = {key: copy(value) for key, value in input_group.properties.items()}
 
                     # if the expression we're swapping with is a FilteredScan,
                     # we need to remove its filter from the input group properties
@@ -266,6 +277,7 @@ class LLMConvertRule(ImplementationRule):
         op_kwargs.update(
             {
                 "verbose": physical_op_params["verbose"],
+                "prompt_layout": physical_op_params["prompt_layout"],
                 "logical_op_id": logical_op.get_logical_op_id(),
                 "logical_op_name": logical_op.logical_op_name(),
             }
@@ -375,6 +387,7 @@ class TokenReducedConvertRule(ImplementationRule):
         op_kwargs.update(
             {
                 "verbose": physical_op_params["verbose"],
+                "prompt_layout": physical_op_params["prompt_layout"],
                 "logical_op_id": logical_op.get_logical_op_id(),
                 "logical_op_name": logical_op.logical_op_name(),
             }
@@ -525,6 +538,7 @@ class RAGConvertRule(ImplementationRule):
         op_kwargs.update(
             {
                 "verbose": physical_op_params["verbose"],
+                "prompt_layout": physical_op_params["prompt_layout"],
                 "logical_op_id": logical_op.get_logical_op_id(),
                 "logical_op_name": logical_op.logical_op_name(),
             }
@@ -586,6 +600,7 @@ class MixtureOfAgentsConvertRule(ImplementationRule):
         op_kwargs: dict = logical_op.get_logical_op_params()
         op_kwargs.update({
             "verbose": physical_op_params['verbose'],
+            "prompt_layout": physical_op_params['prompt_layout'],
             "logical_op_id": logical_op.get_logical_op_id(),
             "logical_op_name": logical_op.logical_op_name(),
         })
@@ -669,6 +684,7 @@ class CriticAndRefineConvertRule(ImplementationRule):
         op_kwargs.update(
             {
                 "verbose": physical_op_params["verbose"],
+                "prompt_layout": physical_op_params["prompt_layout"],
                 "logical_op_id": logical_op.get_logical_op_id(),
                 "logical_op_name": logical_op.logical_op_name(),
             }
@@ -845,6 +861,7 @@ class LLMFilterRule(ImplementationRule):
         op_kwargs = logical_op.get_logical_op_params()
         op_kwargs.update({
             "verbose": physical_op_params["verbose"],
+            "prompt_layout": physical_op_params["prompt_layout"],
             "logical_op_id": logical_op.get_logical_op_id(),
             "logical_op_name": logical_op.logical_op_name(),
         })
@@ -906,6 +923,104 @@ class LLMFilterRule(ImplementationRule):
         return set(physical_expressions)
 
 
+class BatchedLLMRule(ImplementationRule):
+    """
+    Base rule for batched LLM operators, which pack multiple input records into a single prompt; the
+    physical operator class (BatchedLLMFilter or BatchedLLMConvertBonded) is provided by sub-class rules.
+    The optimizer chooses the batch size by costing one physical operator for each of the `batch_sizes`.
+    """
+
+    physical_op_class = None  # overriden by sub-classes
+    batch_sizes = [4, 16]
+
+    @staticmethod
+    def _is_image_operation(logical_expression: LogicalExpression) -> bool:
+        return any([
+            field.is_image_field
+            for field_name, field in logical_expression.input_fields.items()
+            if field_name.split(".")[-1] in logical_expression.depends_on_field_names
+        ])
+
+    @classmethod
+    def substitute(cls, logical_expression: LogicalExpression, **physical_op_params) -> set[PhysicalExpression]:
+        logical_op = logical_expression.operator
+
+        # get initial set of parameters for physical op
+        op_kwargs = logical_op.get_logical_op_params()
+        op_kwargs.update(
+            {
+                "verbose": physical_op_params["verbose"],
+                "prompt_layout": physical_op_params["prompt_layout"],
+                "logical_op_id": logical_op.get_logical_op_id(),
+                "logical_op_name": logical_op.logical_op_name(),
+            }
+        )
+
+        # NOTE: when comparing pz.Model(s), equality is determined by the string (i.e. pz.Model.value)
+        #       thus, Model.GPT_4o and Model.GPT_4o_V map to the same value; this allows us to use set logic
+        #
+        # identify models which can be used strictly for images
+        vision_models = set(get_vision_models())
+        text_models = set(get_models())
+        pure_vision_models = {model for model in vision_models if model not in text_models}
+
+        physical_expressions = []
+        for model in physical_op_params["available_models"]:
+            # skip this model if this is a pure image model
+            if model in pure_vision_models:
+                continue
+
+            for batch_size in cls.batch_sizes:
+                # construct multi-expression
+                op = cls.physical_op_class(model=model, batch_size=batch_size, **op_kwargs)
+                expression = PhysicalExpression(
+                    operator=op,
+                    input_group_ids=logical_expression.input_group_ids,
+                    input_fields=logical_expression.input_fields,
+                    depends_on_field_names=logical_expression.depends_on_field_names,
+                    generated_fields=logical_expression.generated_fields,
+                    group_id=logical_expression.group_id,
+                )
+                physical_expressions.append(expression)
+
+        return set(physical_expressions)
+
+
+class BatchedLLMFilterRule(BatchedLLMRule):
+    """
+    Substitute a logical expression for a (text) FilteredScan with a batched llm filter physical implementation.
+    """
+
+    physical_op_class = BatchedLLMFilter
+
+    @classmethod
+    def matches_pattern(cls, logical_expression: LogicalExpression) -> bool:
+        logical_op = logical_expression.operator
+        return (
+            isinstance(logical_op, FilteredScan)
+            and logical_op.filter.filter_condition is not None
+            and not cls._is_image_operation(logical_expression)
+        )
+
+
+class BatchedLLMConvertBondedRule(BatchedLLMRule):
+    """
+    Substitute a logical expression for a (text, one-to-one) ConvertScan with a batched bonded convert physical implementation.
+    """
+
+    physical_op_class = BatchedLLMConvertBonded
+
+    @classmethod
+    def matches_pattern(cls, logical_expression: LogicalExpression) -> bool:
+        logical_op = logical_expression.operator
+        return (
+            isinstance(logical_op, ConvertScan)
+            and logical_op.udf is None
+            and logical_op.cardinality == Cardinality.ONE_TO_ONE
+            and not cls._is_image_operation(logical_expression)
+        )
+
+
 class AggregateRule(ImplementationRule):
     """
     Substitute the logical expression for an aggregate with its physical counterpart.
@@ -913,7 +1028,10 @@ class AggregateRule(ImplementationRule):
 
     @staticmethod
     def matches_pattern(logical_expression: LogicalExpression) -> bool:
-        return isinstance(logical_expression.operator, Aggregate)
+        return (
+            isinstance(logical_expression.operator, Aggregate)
+            and not VectorizedAggregateRule.matches_pattern(logical_expression)
+        )
 
     @staticmethod
     def substitute(logical_expression: LogicalExpression, **physical_op_params) -> set[PhysicalExpression]:
@@ -946,6 +1064,102 @@ class AggregateRule(ImplementationRule):
         return set([expression])
 
 
+class VectorizedAggregateRule(ImplementationRule):
+    """
+    Substitute the logical expression for an AVERAGE aggregate, or for a GroupByAggregate whose group-by fields
+    are all numeric or string fields and whose aggregation functions are all vectorizable over numeric fields,
+    with its columnar physical implementation. The columnar implementations produce the same results as
+    ApplyGroupByOp and AverageAggregateOp, thus the AggregateRule and BasicSubstitutionRule do not match the
+    expressions which this rule matches.
+    """
+
+    NUMERIC_FIELD_TYPES = (NumericField, IntField, FloatField)
+
+    @classmethod
+    def matches_pattern(cls, logical_expression: LogicalExpression) -> bool:
+        logical_op = logical_expression.operator
+        if isinstance(logical_op, Aggregate):
+            return logical_op.agg_func == AggFunc.AVERAGE
+
+        if not isinstance(logical_op, GroupByAggregate):
+            return False
+
+        group_by_sig, field_map = logical_op.group_by_sig, logical_op.input_schema.field_map()
+        if not all(isinstance(field_map[field], (*cls.NUMERIC_FIELD_TYPES, StringField)) for field in group_by_sig.group_by_fields):
+            return False
+
+        for func, field in zip(group_by_sig.agg_funcs, group_by_sig.agg_fields):
+            # count only requires the field to be set, thus it may also count string fields
+            field_types = (*cls.NUMERIC_FIELD_TYPES, StringField) if func.lower() == AggFunc.COUNT else cls.NUMERIC_FIELD_TYPES
+            if func.lower() not in VECTORIZED_AGG_FUNCS or not isinstance(field_map[field], field_types):
+                return False
+
+        return True
+
+    @classmethod
+    def substitute(cls, logical_expression: LogicalExpression, **physical_op_params) -> set[PhysicalExpression]:
+        logical_op = logical_expression.operator
+        op_kwargs = logical_op.get_logical_op_params()
+        op_kwargs.update(
+            {
+                "verbose": physical_op_params["verbose"],
+                "logical_op_id": logical_op.get_logical_op_id(),
+                "logical_op_name": logical_op.logical_op_name(),
+            }
+        )
+        physical_op_class = VectorizedAverageAggregateOp if isinstance(logical_op, Aggregate) else VectorizedApplyGroupByOp
+        op = physical_op_class(**op_kwargs)
+
+        expression = PhysicalExpression(
+            operator=op,
+            input_group_ids=logical_expression.input_group_ids,
+            input_fields=logical_expression.input_fields,
+            depends_on_field_names=logical_expression.depends_on_field_names,
+            generated_fields=logical_expression.generated_fields,
+            group_id=logical_expression.group_id,
+        )
+        return set([expression])
+
+
+class PrefetchingScanRule(ImplementationRule):
+    """
+    Substitute the logical expression for a BaseScan of a DataReader which reads its items from outside of
+    memory (i.e. any DataReader other than a MemoryReader) with a PrefetchingScanDataOp, which reads ahead
+    of the items being scanned on a dedicated I/O thread pool. Thus, the BasicSubstitutionRule does not
+    match the expressions which this rule matches.
+    """
+
+    @classmethod
+    def matches_pattern(cls, logical_expression: LogicalExpression) -> bool:
+        logical_op = logical_expression.operator
+        return isinstance(logical_op, BaseScan) and not isinstance(logical_op.datareader, MemoryReader)
+
+    @classmethod
+    def substitute(cls, logical_expression: LogicalExpression, **physical_op_params) -> set[PhysicalExpression]:
+        logical_op = logical_expression.operator
+        op_kwargs = logical_op.get_logical_op_params()
+        op_kwargs.update(
+            {
+                "verbose": physical_op_params["verbose"],
+                "logical_op_id": logical_op.get_logical_op_id(),
+                "logical_op_name": logical_op.logical_op_name(),
+                "prefetch_window": physical_op_params["scan_prefetch_window"],
+                "num_io_workers": physical_op_params["scan_io_workers"],
+            }
+        )
+        op = PrefetchingScanDataOp(**op_kwargs)
+
+        expression = PhysicalExpression(
+            operator=op,
+            input_group_ids=logical_expression.input_group_ids,
+            input_fields=logical_expression.input_fields,
+            depends_on_field_names=logical_expression.depends_on_field_names,
+            generated_fields=logical_expression.generated_fields,
+            group_id=logical_expression.group_id,
+        )
+        return set([expression])
+
+
 class BasicSubstitutionRule(ImplementationRule):
     """
     For logical operators with a single physical implementation, substitute the
@@ -963,7 +1177,11 @@ class BasicSubstitutionRule(ImplementationRule):
     @classmethod
     def matches_pattern(cls, logical_expression: LogicalExpression) -> bool:
         logical_op_class = logical_expression.operator.__class__
-        return logical_op_class in cls.LOGICAL_OP_CLASS_TO_PHYSICAL_OP_CLASS_MAP
+        return (
+            logical_op_class in cls.LOGICAL_OP_CLASS_TO_PHYSICAL_OP_CLASS_MAP
+            and not VectorizedAggregateRule.matches_pattern(logical_expression)
+            and not PrefetchingScanRule.matches_pattern(logical_expression)
+        )
 
     @classmethod
     def substitute(cls, logical_expression: LogicalExpression, **physical_op_params) -> set[PhysicalExpression]:
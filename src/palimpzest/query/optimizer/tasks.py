@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import cmp_to_key
 from typing import Any
 
 from palimpzest.core.data.dataclasses import PlanCost
@@ -295,16 +296,15 @@ class OptimizePhysicalExpression(Task):
         # get the dictionary representation of this poicy
         policy_dict = policy.get_dict()
 
-        # get the metrics which matter for this policy
-        metrics_of_interest = {metric for metric, weight in policy_dict.items() if weight > 0.0}
-        remaining_metrics = {metric for metric, weight in policy_dict.items() if weight == 0.0}
-
         # corner case: if the two plan costs are perfectly tied on all dimensions of interest,
         # use other dimensions as tiebreaker
-        if (
-            all([getattr(plan_cost, metric) == getattr(other_plan_cost, metric) for metric in metrics_of_interest])
-            and plan_cost.op_estimates.cardinality == other_plan_cost.op_estimates.cardinality
+        # NOTE: this is checked on every dominance test, thus we compare the (cheaper) cardinalities first
+        if plan_cost.op_estimates.cardinality == other_plan_cost.op_estimates.cardinality and all(
+            getattr(plan_cost, metric) == getattr(other_plan_cost, metric)
+            for metric, weight in policy_dict.items()
+            if weight > 0.0
         ):
+            remaining_metrics = {metric for metric, weight in policy_dict.items() if weight == 0.0}
             for metric in remaining_metrics:
                 if metric == "cost" and plan_cost.cost < other_plan_cost.cost:  # noqa: SIM114
                     return False
@@ -337,6 +337,58 @@ class OptimizePhysicalExpression(Task):
 
         return pareto_optimal
 
+    def _get_pareto_optimal_plan_costs(
+        self, plan_costs: list[tuple[PlanCost, PlanCost | None]], policy: Policy
+    ) -> list[tuple[PlanCost, PlanCost | None]]:
+        """
+        Return the (plan cost, input plan cost) pairs whose plan cost is not dominated by the plan cost of another
+        pair. If two plan costs dominate each other (i.e. they are tied), the first one is kept.
+        """
+        pareto_optimal_plan_costs = []
+        for plan_cost, input_plan_cost in plan_costs:
+            if any(self._is_dominated(plan_cost, other_plan_cost, policy) for other_plan_cost, _ in pareto_optimal_plan_costs):
+                continue
+
+            # remove the plan costs on the frontier which are dominated by this plan cost
+            pareto_optimal_plan_costs = [
+                (other_plan_cost, other_input_plan_cost)
+                for other_plan_cost, other_input_plan_cost in pareto_optimal_plan_costs
+                if not self._is_dominated(other_plan_cost, plan_cost, policy)
+            ]
+            pareto_optimal_plan_costs.append((plan_cost, input_plan_cost))
+
+        return pareto_optimal_plan_costs
+
+    def _get_capped_plan_costs(
+        self, plan_costs: list[tuple[PlanCost, PlanCost | None]], policy: Policy, max_plan_costs: int | None
+    ) -> list[tuple[PlanCost, PlanCost | None]]:
+        """
+        Return (at most) max_plan_costs of the given (pareto-optimal) (plan cost, input plan cost) pairs. The pairs
+        are ranked by the policy (preferring plan costs which satisfy its constraint) and the returned pairs are
+        spaced evenly across the ranking, thus they include the best plan cost for the policy as well as plan costs
+        which trade it off for the other metric(s) (e.g. the cheapest and the highest quality plan costs), which
+        downstream operators may need in order to satisfy the policy's constraint.
+        """
+        if max_plan_costs is None or len(plan_costs) <= max_plan_costs:
+            return plan_costs
+
+        def compare(plan_cost_tup: tuple, other_plan_cost_tup: tuple) -> int:
+            plan_cost, other_plan_cost = plan_cost_tup[0], other_plan_cost_tup[0]
+            satisfies_constraint, other_satisfies_constraint = policy.constraint(plan_cost), policy.constraint(other_plan_cost)
+            if satisfies_constraint != other_satisfies_constraint:
+                return -1 if satisfies_constraint else 1
+            if policy.choose(plan_cost, other_plan_cost):
+                return -1
+            return 1 if policy.choose(other_plan_cost, plan_cost) else 0
+
+        ranked_plan_costs = sorted(plan_costs, key=cmp_to_key(compare))
+        if max_plan_costs == 1:
+            return ranked_plan_costs[:1]
+
+        last_idx = len(ranked_plan_costs) - 1
+        idxs = sorted({round(idx * last_idx / (max_plan_costs - 1)) for idx in range(max_plan_costs)})
+        return [ranked_plan_costs[idx] for idx in idxs]
+
     def update_pareto_optimal_physical_expressions(self, group: Group, policy: Policy) -> Group:
         """
         Update the pareto optimal physical expressions for the given group and policy (if necessary).
@@ -511,9 +563,12 @@ class OptimizePhysicalExpression(Task):
 
                 # NOTE: this list will not necessarily be pareto-optimal, as a plan cost on the pareto frontier of
                 # one pareto_optimal_physical_expression might be dominated by the plan cost on another physical
-                # expression's pareto frontier; we handle this below by taking the pareto frontier of all_possible_plan_costs
+                # expression's pareto frontier; thus, we prune it to its pareto frontier (and to at most
+                # max_pareto_frontier_size plan costs) before costing this expression on top of each input plan cost
                 # de-duplicate equivalent plan costs; we will still reconstruct plans with equivalent cost in optimizer.py
-                input_plan_costs = list(set(input_plan_costs))
+                input_plan_costs = self._get_pareto_optimal_plan_costs([(plan_cost, None) for plan_cost in set(input_plan_costs)], policy)
+                input_plan_costs = self._get_capped_plan_costs(input_plan_costs, policy, context.get("max_pareto_frontier_size"))
+                input_plan_costs = [plan_cost for plan_cost, _ in input_plan_costs]
 
             else:
                 task = OptimizeGroup(input_group_id)
@@ -541,26 +596,25 @@ class OptimizePhysicalExpression(Task):
                 full_plan_cost.op_estimates = op_plan_cost.op_estimates
                 all_possible_plan_costs.append((full_plan_cost, input_plan_cost))
 
-            # reduce the set of possible plan costs to the subset which are pareto-optimal
-            pareto_optimal_plan_costs = []
-            for idx, (plan_cost, input_plan_cost) in enumerate(all_possible_plan_costs):
-                pareto_optimal = True
-
-                # check if any other_expr dominates expr
-                for other_idx, (other_plan_cost, _) in enumerate(all_possible_plan_costs):
-                    if idx == other_idx:
-                        continue
-
-                    # if plan is dominated by other_expr, set pareto_optimal = False and break
-                    if self._is_dominated(plan_cost, other_plan_cost, policy):
-                        pareto_optimal = False
-                        break
-
-                # add expr to pareto frontier if it's not dominated
-                if pareto_optimal:
-                    pareto_optimal_plan_costs.append((plan_cost, input_plan_cost))
+            # prune the possible plan costs which are dominated by a plan cost on the group's current pareto frontier;
+            # as every plan cost of the group computes the same output, these plan costs bound the plan costs which
+            # may be pareto-optimal and the pruned plan costs need not be considered by the group's parent(s)
+            group_plan_costs = [
+                plan_cost
+                for pareto_physical_expression in group.pareto_optimal_physical_expressions or []
+                for plan_cost, _ in pareto_physical_expression.pareto_optimal_plan_costs
+            ]
+            all_possible_plan_costs = [
+                (plan_cost, input_plan_cost)
+                for plan_cost, input_plan_cost in all_possible_plan_costs
+                if not any(self._is_dominated(plan_cost, group_plan_cost, policy) for group_plan_cost in group_plan_costs)
+            ]
 
-            # set the pareto frontier of plan costs which can be obtained by this physical expression
+            # reduce the set of possible plan costs to the subset which are pareto-optimal (and to at most
+            # max_pareto_frontier_size plan costs) and set it as the pareto frontier of plan costs which
+            # can be obtained by this physical expression
+            pareto_optimal_plan_costs = self._get_pareto_optimal_plan_costs(all_possible_plan_costs, policy)
+            pareto_optimal_plan_costs = self._get_capped_plan_costs(pareto_optimal_plan_costs, policy, context.get("max_pareto_frontier_size"))
             self.physical_expression.pareto_optimal_plan_costs = pareto_optimal_plan_costs
 
             # update the group's pareto optimal costs
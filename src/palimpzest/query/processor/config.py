@@ -1,9 +1,32 @@
 import json
 from dataclasses import dataclass, field
 
-from palimpzest.constants import Model
+from palimpzest.constants import (
+    DEFAULT_BATCH_POLL_INTERVAL_SECS,
+    DEFAULT_CHECKPOINT_INTERVAL_SECS,
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY_SECS,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_LLM_CACHE_MAX_ENTRIES,
+    DEFAULT_LLM_CACHE_PATH,
+    DEFAULT_LLM_MAX_CONCURRENCY,
+    DEFAULT_MANIFEST_DIR,
+    DEFAULT_MATERIALIZATION_CACHE_DIR,
+    DEFAULT_MATERIALIZATION_CACHE_MAX_BYTES,
+    DEFAULT_MAX_CONCURRENCY_PER_OP,
+    DEFAULT_PARSE_TIMEOUT_SECS,
+    DEFAULT_PARSED_DOC_CACHE_DIR,
+    DEFAULT_PARSED_DOC_CACHE_MAX_BYTES,
+    DEFAULT_PARSER_WORKERS,
+    DEFAULT_PLAN_CACHE_MAX_ENTRIES,
+    DEFAULT_PLAN_CACHE_PATH,
+    DEFAULT_SCAN_IO_WORKERS,
+    DEFAULT_SCAN_PREFETCH_WINDOW,
+    DEFAULT_STREAMING_WINDOW,
+    Model,
+)
 from palimpzest.core.data.datareaders import DataReader
 from palimpzest.policy import MaxQuality, Policy
+from palimpzest.query.generators.batch_api import BatchBackend
 
 
 # TODO: Separate out the config for the Optimizer, ExecutionStrategy, and QueryProcessor
@@ -20,7 +43,7 @@ class QueryProcessorConfig:
     policy: Policy = field(default_factory=MaxQuality)
     scan_start_idx: int = field(default=0)
     num_samples: int = field(default=float("inf"))
-    nocache: bool = field(default=True)  # NOTE: until we properly implement caching, let's set the default to True
+    nocache: bool = field(default=True)  # set to False to materialize (and re-use) the outputs of each operator
     include_baselines: bool = field(default=False)
     min_plans: int | None = field(default=None)
     verbose: bool = field(default=False)
@@ -28,6 +51,23 @@ class QueryProcessorConfig:
     
     max_workers: int | None = field(default=None)
     num_workers_per_plan: int = field(default=1)
+    max_concurrency_per_op: int = field(default=DEFAULT_MAX_CONCURRENCY_PER_OP)
+    max_llm_concurrency: int = field(default=DEFAULT_LLM_MAX_CONCURRENCY)
+    model_rate_limits: dict[str, dict] = field(default_factory=dict)  # e.g. {"gpt-4o": {"requests_per_minute": 10_000}}
+    max_http_connections: int = field(default=DEFAULT_HTTP_MAX_CONNECTIONS)
+    http_keepalive_expiry_secs: float = field(default=DEFAULT_HTTP_KEEPALIVE_EXPIRY_SECS)
+    batch_backend: BatchBackend | None = field(default=None)  # defaults to the OpenAI Batch API
+    batch_poll_interval_secs: float = field(default=DEFAULT_BATCH_POLL_INTERVAL_SECS)
+    max_queued_records: int | None = field(default=None)  # per inter-operator queue in pipelined execution
+    max_queued_bytes: int | None = field(default=None)  # per inter-operator queue in pipelined execution
+    spill_threshold_bytes: int | None = field(default=None)  # spill aggregate inputs to disk beyond this size
+    spill_dir: str | None = field(default=None)  # defaults to the system's temporary directory
+    scan_prefetch_window: int = field(default=DEFAULT_SCAN_PREFETCH_WINDOW)  # items read ahead by scans; 0 disables
+    scan_io_workers: int = field(default=DEFAULT_SCAN_IO_WORKERS)  # I/O threads per prefetching scan
+    num_parser_workers: int | None = field(default=DEFAULT_PARSER_WORKERS)  # None = one per CPU; 0 = parse in-thread
+    parse_timeout_secs: float | None = field(default=DEFAULT_PARSE_TIMEOUT_SECS)  # per file; None disables
+    streaming_ordered: bool = field(default=True)  # yield streamed outputs in the order of their source records
+    streaming_window: int = field(default=DEFAULT_STREAMING_WINDOW)  # source records in flight in a streaming execution
 
     allow_bonded_query: bool = field(default=True)
     allow_conventional_query: bool = field(default=False)
@@ -37,7 +77,32 @@ class QueryProcessorConfig:
     allow_rag_reduction: bool = field(default=False)
     allow_mixtures: bool = field(default=True)
     allow_critic: bool = field(default=False)
+    allow_batched_query: bool = field(default=False)
+    prompt_layout: str = field(default="interleaved")
     use_final_op_quality: bool = field(default=False)
+    max_pareto_frontier_size: int | None = field(default=None)  # cap the plans kept per group by the pareto optimizer
+
+    llm_cache: bool = field(default=False)
+    llm_cache_path: str = field(default=DEFAULT_LLM_CACHE_PATH)
+    llm_cache_max_entries: int = field(default=DEFAULT_LLM_CACHE_MAX_ENTRIES)
+
+    plan_cache: bool = field(default=False)  # re-use the plans chosen by the optimizer for an unchanged query
+    plan_cache_path: str = field(default=DEFAULT_PLAN_CACHE_PATH)
+    plan_cache_max_entries: int = field(default=DEFAULT_PLAN_CACHE_MAX_ENTRIES)
+
+    parsed_doc_cache: bool = field(default=False)  # re-use the parsed contents of unchanged documents across readers and runs
+    parsed_doc_cache_dir: str = field(default=DEFAULT_PARSED_DOC_CACHE_DIR)
+    parsed_doc_cache_max_bytes: int = field(default=DEFAULT_PARSED_DOC_CACHE_MAX_BYTES)
+
+    materialization_cache_dir: str = field(default=DEFAULT_MATERIALIZATION_CACHE_DIR)  # only used if nocache=False
+    materialization_cache_max_bytes: int = field(default=DEFAULT_MATERIALIZATION_CACHE_MAX_BYTES)
+
+    incremental: bool = field(default=False)  # only process the new or changed files of a DirectoryReader
+    manifest_dir: str = field(default=DEFAULT_MANIFEST_DIR)
+
+    checkpoint_dir: str | None = field(default=None)  # periodically checkpoint nosentinel, pipelined_parallel executions here
+    checkpoint_interval_secs: float = field(default=DEFAULT_CHECKPOINT_INTERVAL_SECS)
+    resume: bool = field(default=False)  # skip the source records completed by a checkpointed execution
 
     def to_json_str(self):
         return json.dumps({
@@ -55,6 +120,23 @@ class QueryProcessorConfig:
             "available_models": self.available_models,
             "max_workers": self.max_workers,
             "num_workers_per_plan": self.num_workers_per_plan,
+            "max_concurrency_per_op": self.max_concurrency_per_op,
+            "max_llm_concurrency": self.max_llm_concurrency,
+            "model_rate_limits": self.model_rate_limits,
+            "max_http_connections": self.max_http_connections,
+            "http_keepalive_expiry_secs": self.http_keepalive_expiry_secs,
+            "batch_backend": None if self.batch_backend is None else self.batch_backend.__class__.__name__,
+            "batch_poll_interval_secs": self.batch_poll_interval_secs,
+            "max_queued_records": self.max_queued_records,
+            "max_queued_bytes": self.max_queued_bytes,
+            "spill_threshold_bytes": self.spill_threshold_bytes,
+            "spill_dir": self.spill_dir,
+            "scan_prefetch_window": self.scan_prefetch_window,
+            "scan_io_workers": self.scan_io_workers,
+            "num_parser_workers": self.num_parser_workers,
+            "parse_timeout_secs": self.parse_timeout_secs,
+            "streaming_ordered": self.streaming_ordered,
+            "streaming_window": self.streaming_window,
             "allow_bonded_query": self.allow_bonded_query,
             "allow_conventional_query": self.allow_conventional_query,
             "allow_model_selection": self.allow_model_selection,
@@ -63,7 +145,26 @@ class QueryProcessorConfig:
             "allow_rag_reduction": self.allow_rag_reduction,
             "allow_mixtures": self.allow_mixtures,
             "allow_critic": self.allow_critic,
+            "allow_batched_query": self.allow_batched_query,
+            "prompt_layout": self.prompt_layout,
             "use_final_op_quality": self.use_final_op_quality,
+            "max_pareto_frontier_size": self.max_pareto_frontier_size,
+            "llm_cache": self.llm_cache,
+            "llm_cache_path": self.llm_cache_path,
+            "llm_cache_max_entries": self.llm_cache_max_entries,
+            "plan_cache": self.plan_cache,
+            "plan_cache_path": self.plan_cache_path,
+            "plan_cache_max_entries": self.plan_cache_max_entries,
+            "parsed_doc_cache": self.parsed_doc_cache,
+            "parsed_doc_cache_dir": self.parsed_doc_cache_dir,
+            "parsed_doc_cache_max_bytes": self.parsed_doc_cache_max_bytes,
+            "materialization_cache_dir": self.materialization_cache_dir,
+            "materialization_cache_max_bytes": self.materialization_cache_max_bytes,
+            "incremental": self.incremental,
+            "manifest_dir": self.manifest_dir,
+            "checkpoint_dir": self.checkpoint_dir,
+            "checkpoint_interval_secs": self.checkpoint_interval_secs,
+            "resume": self.resume,
         }, indent=2)
 
     def update(self, **kwargs) -> None:
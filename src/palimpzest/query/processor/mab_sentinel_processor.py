@@ -26,6 +26,7 @@ from palimpzest.query.optimizer.optimizer_strategy import OptimizationStrategyTy
 from palimpzest.query.optimizer.plan import SentinelPlan
 from palimpzest.query.processor.query_processor import QueryProcessor
 from palimpzest.sets import Set
+from palimpzest.utils.progress import PeakMemoryMonitor
 
 
 class MABSentinelQueryProcessor(QueryProcessor):
@@ -714,12 +715,9 @@ class MABSentinelQueryProcessor(QueryProcessor):
                     plan_id=plan.plan_id,
                 )
 
-                # add records (which are not filtered) to the cache, if allowed
-                if not self.nocache:
-                    for record in all_records:
-                        if getattr(record, "passed_operator", True):
-                            # self.datadir.append_cache(logical_op_id, record)
-                            pass
+                # NOTE: the records output by sentinel executions are not materialized, as they are computed on samples of
+                #       the validation data (by many physical operators per logical operator); the records output by the final
+                #       plan are materialized by its execution strategy
 
                 # compute quality for each operator
                 all_outputs = self.score_quality(
@@ -744,12 +742,6 @@ class MABSentinelQueryProcessor(QueryProcessor):
             # update the number of samples drawn to be the max across all logical operators
             samples_drawn = max(logical_op_id_to_num_samples.values())
 
-        # if caching was allowed, close the cache
-        if not self.nocache:
-            for _, _, _ in plan:
-                # self.datadir.close_cache(logical_op_id)
-                pass
-
         # finalize plan stats
         total_plan_time = time.time() - plan_start_time
         plan_stats.finalize(total_plan_time)
@@ -802,6 +794,7 @@ class MABSentinelQueryProcessor(QueryProcessor):
 
     def execute(self) -> DataRecordCollection:
         execution_start_time = time.time()
+        memory_monitor = PeakMemoryMonitor().start()
 
         # for now, enforce that we are using validation data; we can relax this after paper submission
         if self.val_datasource is None:
@@ -835,6 +828,8 @@ class MABSentinelQueryProcessor(QueryProcessor):
         all_records.extend(records)
         all_plan_stats.extend(plan_stats)
 
+        peak_memory_usage_mb = memory_monitor.stop()
+
         # aggregate plan stats
         aggregate_plan_stats = self.aggregate_plan_stats(all_plan_stats)
 
@@ -846,6 +841,7 @@ class MABSentinelQueryProcessor(QueryProcessor):
             total_execution_time=time.time() - execution_start_time,
             total_execution_cost=sum(list(map(lambda plan_stats: plan_stats.total_plan_cost, aggregate_plan_stats.values()))),
             plan_strs={plan_id: plan_stats.plan_str for plan_id, plan_stats in aggregate_plan_stats.items()},
+            peak_memory_usage_mb=peak_memory_usage_mb,
         )
 
         return DataRecordCollection(all_records, execution_stats = execution_stats)
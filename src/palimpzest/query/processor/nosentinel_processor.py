@@ -2,18 +2,22 @@ import time
 
 from palimpzest.core.data.dataclasses import ExecutionStats, OperatorStats, PlanStats
 from palimpzest.core.elements.records import DataRecordCollection
+from palimpzest.query.execution.async_execution_strategy import PipelinedAsyncExecutionStrategy
+from palimpzest.query.execution.batch_execution_strategy import BatchExecutionStrategy
+from palimpzest.query.execution.execution_strategy import RecordQueue
 from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy
 from palimpzest.query.execution.single_threaded_execution_strategy import (
     PipelinedSingleThreadExecutionStrategy,
     SequentialSingleThreadExecutionStrategy,
 )
 from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.batched import BatchedLLMOp
 from palimpzest.query.operators.filter import FilterOp
 from palimpzest.query.operators.limit import LimitScanOp
 from palimpzest.query.operators.scan import ScanPhysicalOp
 from palimpzest.query.optimizer.plan import PhysicalPlan
 from palimpzest.query.processor.query_processor import QueryProcessor
-from palimpzest.utils.progress import create_progress_manager
+from palimpzest.utils.progress import PeakMemoryMonitor, create_progress_manager
 
 
 class NoSentinelQueryProcessor(QueryProcessor):
@@ -31,8 +35,9 @@ class NoSentinelQueryProcessor(QueryProcessor):
             # self.clear_cached_examples()
             pass
 
-        # execute plan(s) according to the optimization strategy
-        records, plan_stats = self._execute_with_strategy(self.dataset, self.policy, self.optimizer)
+        # execute plan(s) according to the optimization strategy while tracking the peak memory usage
+        with PeakMemoryMonitor() as memory_monitor:
+            records, plan_stats = self._execute_with_strategy(self.dataset, self.policy, self.optimizer)
 
         # aggregate plan stats
         aggregate_plan_stats = self.aggregate_plan_stats(plan_stats)
@@ -46,6 +51,7 @@ class NoSentinelQueryProcessor(QueryProcessor):
                 list(map(lambda plan_stats: plan_stats.total_plan_cost, aggregate_plan_stats.values()))
             ),
             plan_strs={plan_id: plan_stats.plan_str for plan_id, plan_stats in aggregate_plan_stats.items()},
+            peak_memory_usage_mb=memory_monitor.peak_memory_usage_mb,
         )
 
         return DataRecordCollection(records, execution_stats=execution_stats)
@@ -96,6 +102,9 @@ class NoSentinelSequentialSingleThreadProcessor(NoSentinelQueryProcessor, Sequen
         assert isinstance(source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
         datareader_len = len(source_operator.datareader)
 
+        # get the ids under which the output of each operator is cached (if caching is allowed)
+        cache_ids = self._open_materialization_caches(plan, num_samples)
+
         # Calculate total work units - each record needs to go through each operator
         total_ops = len(plan.operators)
         total_items = min(num_samples, datareader_len) if num_samples != float("inf") else datareader_len
@@ -155,6 +164,22 @@ class NoSentinelSequentialSingleThreadProcessor(NoSentinelQueryProcessor, Sequen
                         f"Aggregating {len(processing_queues[op_id])} records"
                     )
 
+                # batched operators process the records in the processing queue for this operator one batch at a time
+                elif isinstance(operator, BatchedLLMOp) and len(processing_queues[op_id]) > 0:
+                    queue = processing_queues[op_id]
+                    for batch_start_idx in range(0, len(queue), operator.batch_size):
+                        batch = queue[batch_start_idx:batch_start_idx + operator.batch_size]
+                        for record_set in operator.batch_call(batch):
+                            records.extend(record_set.data_records)
+                            record_op_stats.extend(record_set.record_op_stats)
+
+                        # Update progress for each processed batch in the queue
+                        work_units_completed += len(batch)
+                        self.progress_manager.update(
+                            work_units_completed,
+                            f"Processing records: {batch_start_idx + len(batch)}/{len(queue)}"
+                        )
+
                 # otherwise, process the records in the processing queue for this operator one at a time
                 elif len(processing_queues[op_id]) > 0:
                     queue_size = len(processing_queues[op_id])
@@ -181,11 +206,7 @@ class NoSentinelSequentialSingleThreadProcessor(NoSentinelQueryProcessor, Sequen
                 )
 
                 # add records (which are not filtered) to the cache, if allowed
-                if not self.nocache:
-                    for record in records:
-                        if getattr(record, "passed_operator", True):
-                            # self.datadir.append_cache(operator.target_cache_id, record)
-                            pass
+                self._materialize(cache_ids, op_idx, records)
 
                 # update processing_queues or output_records
                 for record in records:
@@ -200,11 +221,8 @@ class NoSentinelSequentialSingleThreadProcessor(NoSentinelQueryProcessor, Sequen
                 if next_op_id is not None and processing_queues[next_op_id] == []:
                     break
 
-            # if caching was allowed, close the cache
-            if not self.nocache:
-                for _ in plan.operators:
-                    # self.datadir.close_cache(operator.target_cache_id)
-                    pass
+            # if caching was allowed, write the records output by each operator to the cache
+            self._close_materialization_caches(cache_ids)
 
             # finalize plan stats
             total_plan_time = time.time() - plan_start_time
@@ -229,7 +247,11 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
             scan_start_idx=self.scan_start_idx,
             max_workers=self.max_workers,
             nocache=self.nocache,
-            verbose=self.verbose
+            verbose=self.verbose,
+            max_queued_records=self.config.max_queued_records,
+            max_queued_bytes=self.config.max_queued_bytes,
+            spill_threshold_bytes=self.config.spill_threshold_bytes,
+            spill_dir=self.config.spill_dir,
         )
         self.progress_manager = None
 
@@ -264,6 +286,9 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
         assert isinstance(source_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
         datareader_len = len(source_operator.datareader)
 
+        # get the ids under which the output of each operator is cached (if caching is allowed)
+        cache_ids = self._open_materialization_caches(plan, num_samples)
+
         # Calculate total work units - each record needs to go through each operator
         total_ops = len(plan.operators)
         total_items = min(num_samples, datareader_len) if num_samples != float("inf") else datareader_len
@@ -272,8 +297,24 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
         work_units_completed = 0
 
         try:
+            # aggregates which support partial aggregation fold their inputs into a partial state as they arrive,
+            # while the inputs of any other aggregate are buffered until all of them have arrived
+            partials = {
+                op.get_op_id(): op.create_partial()
+                for op in plan.operators
+                if isinstance(op, AggregateOp) and op.supports_partial_aggregation()
+            }
+
             # initialize processing queues for each operation
-            processing_queues = {op.get_op_id(): [] for op in plan.operators if not isinstance(op, ScanPhysicalOp)}
+            processing_queues = {
+                op.get_op_id(): (
+                    self._create_aggregate_buffer()
+                    if isinstance(op, AggregateOp) and op.get_op_id() not in partials
+                    else RecordQueue(self.queue_budget)
+                )
+                for op in plan.operators
+                if not isinstance(op, ScanPhysicalOp)
+            }
 
             # execute the plan until either:
             # 1. all records have been processed, or
@@ -285,6 +326,16 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
                     prev_op_id = plan.operators[op_idx - 1].get_op_id() if op_idx > 1 else None
                     next_op_id = plan.operators[op_idx + 1].get_op_id() if op_idx + 1 < len(plan.operators) else None
 
+                    # throttle this operator while the (bounded) queue of the next operator is full; aggregates
+                    # must buffer all of their inputs, thus their queues are never considered full
+                    next_queue_is_full = (
+                        next_op_id is not None
+                        and not isinstance(plan.operators[op_idx + 1], AggregateOp)
+                        and processing_queues[next_op_id].is_full()
+                    )
+                    if next_queue_is_full:
+                        continue
+
                     # Update progress with current operator info
                     op_name = operator.__class__.__name__
                     self.progress_manager.update(work_units_completed, f"Running {op_name} ({op_idx + 1}/{total_ops})")
@@ -314,9 +365,14 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
                             # update whether to keep scanning source records
                             keep_scanning_source_records = current_scan_idx < datareader_len and source_records_scanned < num_samples
 
-                    # only invoke aggregate operator(s) once there are no more source records and all
-                    # upstream operators' processing queues are empty
+                    # fold the inputs of aggregate operator(s) into their partial state as they arrive, and only
+                    # compute their output once there are no more source records and all upstream operators'
+                    # processing queues are empty
                     elif isinstance(operator, AggregateOp):
+                        if op_id in partials and len(processing_queues[op_id]) > 0:
+                            operator.fold(partials[op_id], processing_queues[op_id])
+                            processing_queues[op_id].clear()
+
                         upstream_ops_are_finished = True
                         for upstream_op_idx in range(op_idx):
                             # scan operators do not have processing queues
@@ -329,11 +385,19 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
                                 upstream_ops_are_finished and len(processing_queues[upstream_op_id]) == 0
                             )
 
-                        if not keep_scanning_source_records and upstream_ops_are_finished:
+                        if not keep_scanning_source_records and upstream_ops_are_finished and op_id in partials:
+                            partial = partials.pop(op_id)
+                            record_set = operator.finalize(partial)
+                            records = record_set.data_records
+                            record_op_stats = record_set.record_op_stats
+                            self.progress_manager.update(work_units_completed, f"Aggregating {partial.num_records} records")
+
+                        elif not keep_scanning_source_records and upstream_ops_are_finished and len(processing_queues[op_id]) > 0:
                             record_set = operator(candidates=processing_queues[op_id])
                             records = record_set.data_records
                             record_op_stats = record_set.record_op_stats
-                            processing_queues[op_id] = []
+                            self._add_spill_stats(plan_stats.operator_stats[op_id], processing_queues[op_id])
+                            processing_queues[op_id].clear()
 
                             # Update progress for aggregate operation
                             work_units_completed += len(processing_queues[op_id])
@@ -344,7 +408,7 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
 
                     # otherwise, process the next record in the processing queue for this operator
                     elif len(processing_queues[op_id]) > 0:
-                        input_record = processing_queues[op_id].pop(0)
+                        input_record = processing_queues[op_id].popleft()
                         record_set = operator(input_record)
                         records = record_set.data_records
                         record_op_stats = record_set.record_op_stats
@@ -366,11 +430,7 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
                         )
 
                         # add records (which are not filtered) to the cache, if allowed
-                        if not self.nocache:
-                            for record in records:
-                                if getattr(record, "passed_operator", True):
-                                    # self.datadir.append_cache(operator.target_cache_id, record)
-                                    pass
+                        self._materialize(cache_ids, op_idx, records)
 
                         # update processing_queues or output_records
                         for record in records:
@@ -381,19 +441,17 @@ class NoSentinelPipelinedSingleThreadProcessor(NoSentinelQueryProcessor, Pipelin
                             else:
                                 output_records.append(record)
 
-                # update finished_executing based on whether all records have been processed
-                still_processing = any([len(queue) > 0 for queue in processing_queues.values()])
+                # update finished_executing based on whether all records have been processed (and all aggregates
+                # have computed their output from their partial state)
+                still_processing = any([len(queue) > 0 for queue in processing_queues.values()]) or len(partials) > 0
                 finished_executing = not keep_scanning_source_records and not still_processing
 
                 # update finished_executing based on limit
                 if isinstance(operator, LimitScanOp):
                     finished_executing = len(output_records) == operator.limit
 
-            # if caching was allowed, close the cache
-            if not self.nocache:
-                for _ in plan.operators:
-                    # self.datadir.close_cache(operator.target_cache_id)
-                    pass
+            # if caching was allowed, write the records output by each operator to the cache
+            self._close_materialization_caches(cache_ids)
 
             # finalize plan stats
             total_plan_time = time.time() - plan_start_time
@@ -418,7 +476,14 @@ class NoSentinelPipelinedParallelProcessor(NoSentinelQueryProcessor, PipelinedPa
             scan_start_idx=self.scan_start_idx,
             max_workers=self.max_workers,
             nocache=self.nocache,
-            verbose=self.verbose
+            verbose=self.verbose,
+            max_queued_records=self.config.max_queued_records,
+            max_queued_bytes=self.config.max_queued_bytes,
+            spill_threshold_bytes=self.config.spill_threshold_bytes,
+            spill_dir=self.config.spill_dir,
+            checkpoint_dir=self.config.checkpoint_dir,
+            checkpoint_interval_secs=self.config.checkpoint_interval_secs,
+            resume=self.config.resume,
         )
         self.progress_manager = None
 
@@ -535,3 +600,37 @@ class NoSentinelPipelinedParallelProcessor(NoSentinelQueryProcessor, PipelinedPa
     #             self.progress_manager.finish()
 
     #     return output_records, plan_stats
+
+
+class NoSentinelPipelinedAsyncProcessor(NoSentinelQueryProcessor, PipelinedAsyncExecutionStrategy):
+    """
+    This class performs non-sample based execution while executing plans in a pipelined fashion on an asyncio event loop.
+    """
+    def __init__(self, *args, **kwargs):
+        NoSentinelQueryProcessor.__init__(self, *args, **kwargs)
+        PipelinedAsyncExecutionStrategy.__init__(
+            self,
+            scan_start_idx=self.scan_start_idx,
+            max_workers=self.max_workers,
+            nocache=self.nocache,
+            verbose=self.verbose,
+            max_concurrency_per_op=self.config.max_concurrency_per_op,
+        )
+
+
+class NoSentinelBatchProcessor(NoSentinelQueryProcessor, BatchExecutionStrategy):
+    """
+    This class performs non-sample based execution while executing plans one operator at a time with each
+    operator's LLM calls run through a provider Batch API.
+    """
+    def __init__(self, *args, **kwargs):
+        NoSentinelQueryProcessor.__init__(self, *args, **kwargs)
+        BatchExecutionStrategy.__init__(
+            self,
+            scan_start_idx=self.scan_start_idx,
+            max_workers=self.max_workers,
+            nocache=self.nocache,
+            verbose=self.verbose,
+            batch_backend=self.config.batch_backend,
+            batch_poll_interval_secs=self.config.batch_poll_interval_secs,
+        )
@@ -1,16 +1,35 @@
 from abc import abstractmethod
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 
 from palimpzest.core.data.dataclasses import PlanStats, RecordOpStats
 from palimpzest.core.data.datareaders import DataReader
+from palimpzest.core.data.document_cache import (
+    ParsedDocumentCache,
+    get_parsed_document_cache,
+    set_parsed_document_cache,
+)
+from palimpzest.core.data.manifest import SourceManifest
+from palimpzest.core.data.materialization_cache import (
+    MaterializationCache,
+    get_materialization_cache,
+    set_materialization_cache,
+)
+from palimpzest.core.data.sqlite_lru_store import SqliteLRUStore
 from palimpzest.core.elements.records import DataRecord, DataRecordCollection
 from palimpzest.policy import Policy
+from palimpzest.query.execution.incremental import IncrementalExecutor
+from palimpzest.query.generators.cache import LLMResponseCache, get_response_cache, set_response_cache
+from palimpzest.query.generators.clients import get_client_registry
+from palimpzest.query.generators.rate_limits import get_rate_limit_registry
 from palimpzest.query.optimizer.cost_model import CostModel
 from palimpzest.query.optimizer.optimizer import Optimizer
 from palimpzest.query.optimizer.optimizer_strategy import OptimizationStrategyType
 from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.optimizer.plan_cache import PlanCache, get_plan_cache, set_plan_cache
 from palimpzest.query.processor.config import QueryProcessorConfig
 from palimpzest.sets import Dataset, Set
+from palimpzest.tools.parsing import get_parser_pool
 from palimpzest.utils.hash_helpers import hash_for_id
 from palimpzest.utils.model_helpers import get_models
 
@@ -62,12 +81,84 @@ class QueryProcessor:
         if self.verbose:
             print("Available models: ", self.available_models)
 
+        # enable (or disable) the process-wide LLM response cache used by the generators
+        self._configure_cache(
+            self.config.llm_cache, get_response_cache, set_response_cache, LLMResponseCache,
+            location={"path": self.config.llm_cache_path},
+            bounds={"max_entries": self.config.llm_cache_max_entries},
+        )
+
+        # enable (or disable) the process-wide cache of the plans chosen by the optimizer
+        self._configure_cache(
+            self.config.plan_cache, get_plan_cache, set_plan_cache, PlanCache,
+            location={"path": self.config.plan_cache_path},
+            bounds={"max_entries": self.config.plan_cache_max_entries},
+        )
+
+        # enable (or disable) the process-wide cache of the field values parsed by the file readers
+        self._configure_cache(
+            self.config.parsed_doc_cache, get_parsed_document_cache, set_parsed_document_cache, ParsedDocumentCache,
+            location={"cache_dir": self.config.parsed_doc_cache_dir},
+            bounds={"max_bytes": self.config.parsed_doc_cache_max_bytes},
+        )
+
+        # enable (or disable) the process-wide cache of the records materialized by each execution
+        self._configure_cache(
+            not self.nocache, get_materialization_cache, set_materialization_cache, MaterializationCache,
+            location={"cache_dir": self.config.materialization_cache_dir},
+            bounds={"max_bytes": self.config.materialization_cache_max_bytes},
+        )
+
+        # size the connection pools of the LLM clients which are shared by all generators
+        get_client_registry().configure(
+            max_connections=self.config.max_http_connections,
+            max_keepalive_connections=self.config.max_http_connections,
+            keepalive_expiry=self.config.http_keepalive_expiry_secs,
+        )
+
+        # apply any user-provided rate limits to the per-model controllers which gate all LLM calls
+        get_rate_limit_registry().configure(
+            model_rate_limits=self.config.model_rate_limits,
+            max_concurrency=self.config.max_llm_concurrency,
+        )
+
+        # size the process pool in which the directory readers parse documents (independently of the LLM threads)
+        get_parser_pool().configure(
+            num_workers=self.config.num_parser_workers,
+            timeout_secs=self.config.parse_timeout_secs,
+        )
+
         # Initialize optimizer and execution engine
         # TODO: config currently has optimizer field which is string. 
         # In this case, we only use the initialized optimizer. Later after we split the config to multiple configs, there won't be such confusion.
         assert optimizer is not None, "Optimizer is required. Please use QueryProcessorFactory.create_processor() to initialize a QueryProcessor."
         self.optimizer = optimizer
 
+    @staticmethod
+    def _configure_cache(
+        enabled: bool,
+        get_cache: Callable[[], SqliteLRUStore | None],
+        set_cache: Callable[[SqliteLRUStore | None], None],
+        cache_cls: type[SqliteLRUStore],
+        location: dict,
+        bounds: dict,
+    ) -> None:
+        """
+        Set a process-wide cache based on the config. An existing cache is re-used if it has the same `location`
+        (i.e. it is backed by the same file), so that its connection and hit/miss counters are preserved; its
+        size `bounds` are updated to the config's.
+        """
+        if not enabled:
+            set_cache(None)
+            return
+
+        cache = get_cache()
+        if cache is None or any(getattr(cache, attr) != value for attr, value in location.items()):
+            cache = cache_cls(**location, **bounds)
+        for attr, value in bounds.items():
+            setattr(cache, attr, value)
+        set_cache(cache)
+
     def _get_datareader(self, dataset: Set | DataReader) -> DataReader:
         """
         Gets the DataReader for the given dataset.
@@ -184,8 +275,24 @@ class QueryProcessor:
         # get the optimal plan according to the optimizer
         plans = optimizer.optimize(dataset, policy)
         final_plan = plans[0]
-        # execute the plan
+
+        # execution strategies use the optimizer's cost model to estimate the selectivities of the plan's operators
+        self.cost_model = optimizer.cost_model
+
+        # execute the plan (only on the new or changed source files, if the execution is incremental)
         # TODO: for some reason this is not picking up change to self.max_workers from PipelinedParallelPlanExecutor.__init__()
+        if self.config.incremental:
+            manifest = SourceManifest(self.config.manifest_dir)
+            try:
+                incremental_executor = IncrementalExecutor(
+                    manifest,
+                    lambda plan: self.execute_plan(plan=plan, plan_workers=self.max_workers),
+                    verbose=self.verbose,
+                )
+                return incremental_executor.execute(final_plan)
+            finally:
+                manifest.close()
+
         records, plan_stats = self.execute_plan(
             plan=final_plan,
             plan_workers=self.max_workers,
@@ -249,6 +356,7 @@ class QueryProcessor:
         if self.scan_start_idx < len(self.datareader):
             # execute final plan until end
             final_plan = plans[0]
+            self.cost_model = optimizer.cost_model
             new_records, new_plan_stats = self.execute_plan(
                 plan=final_plan,
                 plan_workers=self.max_workers,
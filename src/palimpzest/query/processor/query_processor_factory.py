@@ -1,5 +1,6 @@
 from enum import Enum
 
+from palimpzest.constants import PromptLayout
 from palimpzest.core.elements.records import DataRecordCollection
 from palimpzest.query.execution.execution_strategy import ExecutionStrategyType
 from palimpzest.query.optimizer.cost_model import CostModel
@@ -11,6 +12,8 @@ from palimpzest.query.processor.mab_sentinel_processor import (
     MABSentinelSequentialSingleThreadProcessor,
 )
 from palimpzest.query.processor.nosentinel_processor import (
+    NoSentinelBatchProcessor,
+    NoSentinelPipelinedAsyncProcessor,
     NoSentinelPipelinedParallelProcessor,
     NoSentinelPipelinedSingleThreadProcessor,
     NoSentinelSequentialSingleThreadProcessor,
@@ -51,6 +54,10 @@ class QueryProcessorFactory:
             NoSentinelPipelinedSingleThreadProcessor,
         (ProcessingStrategyType.NO_SENTINEL, ExecutionStrategyType.PIPELINED_PARALLEL): 
             NoSentinelPipelinedParallelProcessor,
+        (ProcessingStrategyType.NO_SENTINEL, ExecutionStrategyType.PIPELINED_ASYNC):
+            NoSentinelPipelinedAsyncProcessor,
+        (ProcessingStrategyType.NO_SENTINEL, ExecutionStrategyType.BATCH):
+            NoSentinelBatchProcessor,
         (ProcessingStrategyType.MAB_SENTINEL, ExecutionStrategyType.SEQUENTIAL):
             MABSentinelSequentialSingleThreadProcessor,
         (ProcessingStrategyType.MAB_SENTINEL, ExecutionStrategyType.PIPELINED_PARALLEL):
@@ -88,6 +95,7 @@ class QueryProcessorFactory:
 
         config = cls._config_validation_and_normalization(config)
         processing_strategy, execution_strategy, optimizer_strategy = cls._normalize_strategies(config)
+        cls._validate_checkpointing(config, processing_strategy, execution_strategy)
         optimizer = cls._create_optimizer(optimizer_strategy, config)
 
         processor_key = (processing_strategy, execution_strategy)
@@ -123,8 +131,13 @@ class QueryProcessorFactory:
             allow_conventional_query=config.allow_conventional_query,
             allow_code_synth=config.allow_code_synth,
             allow_token_reduction=config.allow_token_reduction,
+            allow_batched_query=config.allow_batched_query,
+            prompt_layout=PromptLayout(config.prompt_layout),
+            scan_prefetch_window=config.scan_prefetch_window,
+            scan_io_workers=config.scan_io_workers,
             optimization_strategy_type=optimizer_strategy,
-            use_final_op_quality=config.use_final_op_quality
+            use_final_op_quality=config.use_final_op_quality,
+            max_pareto_frontier_size=config.max_pareto_frontier_size,
         )
 
     @classmethod
@@ -151,13 +164,33 @@ class QueryProcessorFactory:
                                     The supported strategies are: {OptimizationStrategyType.__members__.keys()}""") from e
         return processing_strategy, execution_strategy, optimizer_strategy
 
+    @classmethod
+    def _validate_checkpointing(
+        cls,
+        config: QueryProcessorConfig,
+        processing_strategy: ProcessingStrategyType,
+        execution_strategy: ExecutionStrategyType,
+    ) -> None:
+        """Check that the (normalized) strategies support the checkpointing requested by the config."""
+        if config.checkpoint_dir is None:
+            return
+
+        if processing_strategy != ProcessingStrategyType.NO_SENTINEL:
+            raise ValueError("checkpointing is only supported by the nosentinel processing strategy")
+
+        if execution_strategy != ExecutionStrategyType.PIPELINED_PARALLEL:
+            raise ValueError("checkpointing is only supported by the pipelined_parallel execution strategy")
+
     @classmethod
     def _config_validation_and_normalization(cls, config: QueryProcessorConfig):
         if config.policy is None:
             raise ValueError("Policy is required for optimizer")
 
-        if not config.nocache:
-            raise ValueError("nocache=False is not supported yet")
+        if config.incremental and config.scan_start_idx > 0:
+            raise ValueError("incremental execution processes every new or changed file; scan_start_idx must be 0")
+
+        if config.resume and config.checkpoint_dir is None:
+            raise ValueError("resume requires the checkpoint_dir of the execution to resume")
 
         if config.val_datasource is None and config.processing_strategy in [ProcessingStrategyType.MAB_SENTINEL, ProcessingStrategyType.RANDOM_SAMPLING]:
             raise ValueError("val_datasource is required for MAB_SENTINEL and RANDOM_SAMPLING processing strategies")
@@ -1,12 +1,15 @@
+import multiprocessing
 import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 
 from palimpzest.core.data.dataclasses import OperatorStats, PlanStats
 from palimpzest.core.elements.records import DataRecordCollection
 from palimpzest.policy import Policy
+from palimpzest.query.execution.execution_strategy import ExecutionStrategy, ExecutionStrategyType, QueueBudget
+from palimpzest.query.execution.parallel_execution_strategy import StreamingPipelineScheduler
 from palimpzest.query.operators.aggregate import AggregateOp
-from palimpzest.query.operators.filter import FilterOp
 from palimpzest.query.operators.limit import LimitScanOp
-from palimpzest.query.operators.scan import ScanPhysicalOp
 from palimpzest.query.optimizer.plan import PhysicalPlan
 from palimpzest.query.processor.query_processor import QueryProcessor
 from palimpzest.sets import Dataset
@@ -20,10 +23,7 @@ class StreamingQueryProcessor(QueryProcessor):
         super().__init__(*args, **kwargs)
         self._plan: PhysicalPlan | None = None
         self._plan_stats: PlanStats | None = None
-        self.last_record = False
-        self.current_scan_idx: int = 0
         self.plan_generated: bool = False
-        self.records_count: int = 0
 
     @property
     def plan(self) -> PhysicalPlan:
@@ -53,7 +53,14 @@ class StreamingQueryProcessor(QueryProcessor):
         # Effectively always use the optimal strategy   
         optimizer = self.optimizer.deepcopy_clean()
         plans = optimizer.optimize(dataset, policy)
-        self.plan = plans[0]
+        self.set_plan(plans[0])
+        print("Time for planning: ", time.time() - start_time)
+        print("Generated plan:\n", self.plan)
+        return self.plan
+
+    def set_plan(self, plan: PhysicalPlan):
+        """Set the plan which will be executed and initialize its stats."""
+        self.plan = plan
         self.plan_stats = PlanStats(plan_id=self.plan.plan_id)
         for op in self.plan.operators:
             if isinstance(op, AggregateOp):
@@ -61,96 +68,51 @@ class StreamingQueryProcessor(QueryProcessor):
             op_id = op.get_op_id()
             op_name = op.op_name()
             op_details = {k: str(v) for k, v in op.get_id_params().items()}
-            self.plan_stats.operator_stats[op_id] = OperatorStats(op_id=op_id, op_name=op_name, op_details=op_details) 
-        print("Time for planning: ", time.time() - start_time)
+            self.plan_stats.operator_stats[op_id] = OperatorStats(op_id=op_id, op_name=op_name, op_details=op_details)
         self.plan_generated = True
-        print("Generated plan:\n", self.plan)
-        return self.plan
 
-    def execute(self):
+    def execute(self) -> Generator[DataRecordCollection]:
+        """
+        Execute the plan and lazily yield its output records in DataRecordCollections as soon as they are
+        produced. Source records are only scanned as the pipeline has room for them, thus the first results
+        are yielded before the datareader has been scanned and the memory used does not grow with its size.
+        The collections share the plan's PlanStats, which are finalized once the last collection is yielded.
+        """
         start_time = time.time()
-        # Always delete cache
         if not self.plan_generated:
             self.generate_plan(self.dataset, self.policy)
-
-        # if dry_run:
-        #     yield [], self.plan, self.plan_stats
-        #     return
-
-        input_records = self.get_input_records()
-        for idx, record in enumerate(input_records):
-            # print("Iteration number: ", idx+1, "out of", len(input_records))
-            output_records = self.execute_opstream(self.plan, record)
-            if idx == len(input_records) - 1:
-                total_plan_time = time.time() - start_time
-                self.plan_stats.finalize(total_plan_time)
-            self.plan_stats.plan_str = str(self.plan)
-            yield DataRecordCollection(output_records, plan_stats=self.plan_stats)
-
-    def get_input_records(self):
-        scan_operator = self.plan.operators[0]
-        assert isinstance(scan_operator, ScanPhysicalOp), "First operator in physical plan must be a ScanPhysicalOp"
-        datareader = scan_operator.datareader
-        if not datareader:
-            raise Exception("DataReader not found")
-        datareader_len = len(datareader)
-
-        input_records = []
-        record_op_stats = []
-        for source_idx in range(datareader_len):
-            record_set = scan_operator(source_idx)
-            input_records += record_set.data_records
-            record_op_stats += record_set.record_op_stats
-
-        op_id = scan_operator.get_op_id()
-        self.plan_stats.operator_stats[op_id].add_record_op_stats(
-            record_op_stats,
-            source_op_id=None,
-            plan_id=self.plan.plan_id,
-        )
-
-        return input_records
-
-    def execute_opstream(self, plan, record):
-        # initialize list of output records and intermediate variables
-        input_records = [record]
-        record_op_stats_lst = []
-
-        for op_idx, operator in enumerate(plan.operators):
-            # TODO: this being defined in the for loop potentially makes the return
-            # unbounded if plan.operators is empty. This should be defined outside the loop
-            # and the loop refactored to account for not redeclaring this for each operator
-            output_records = []
-            op_id = operator.get_op_id()
-            prev_op_id = plan.operators[op_idx - 1].get_op_id() if op_idx > 1 else None
-
-            if isinstance(operator, ScanPhysicalOp):
-                continue
-            # only invoke aggregate operator(s) once there are no more source records and all
-            # upstream operators' processing queues are empty
-            # elif isinstance(operator, AggregateOp):
-            # output_records, record_op_stats_lst = operator(candidates=input_records)
-            elif isinstance(operator, LimitScanOp):
-                if self.records_count >= operator.limit:
-                    break
-            else:
-                for r in input_records:
-                    record_set = operator(r)
-                    output_records += record_set.data_records
-                    record_op_stats_lst += record_set.record_op_stats
-
-                if isinstance(operator, FilterOp):
-                    # delete all records that did not pass the filter
-                    output_records = [r for r in output_records if r.passed_operator]
-                    if not output_records:
-                        break
-
-            self.plan_stats.operator_stats[op_id].add_record_op_stats(
-                record_op_stats_lst,
-                source_op_id=prev_op_id,
-                plan_id=plan.plan_id,
+        self.plan_stats.plan_str = str(self.plan)
+
+        # a sequential streaming execution processes one record at a time; otherwise, records are processed in parallel
+        num_workers = 1
+        if self.config.execution_strategy != ExecutionStrategyType.SEQUENTIAL:
+            num_workers = self.max_workers if self.max_workers is not None else max(int(0.8 * multiprocessing.cpu_count()), 1)
+
+        # estimate the fraction of the source records which reach each limit, to size how far the scan reads ahead of it
+        est_records_per_source = None
+        if any(isinstance(op, LimitScanOp) for op in self.plan.operators):
+            est_records_per_source = ExecutionStrategy.estimate_records_per_source(self.plan, self.optimizer.cost_model)
+
+        executor = ThreadPoolExecutor(max_workers=num_workers)
+        try:
+            scheduler = StreamingPipelineScheduler(
+                self.plan,
+                self.plan_stats,
+                executor,
+                scan_start_idx=self.scan_start_idx,
+                num_samples=self.num_samples,
+                queue_budget=QueueBudget(max_records=self.config.max_queued_records, max_bytes=self.config.max_queued_bytes),
+                est_records_per_source=est_records_per_source,
+                ordered=self.config.streaming_ordered,
+                window=self.config.streaming_window,
             )
-            input_records = output_records
-            self.records_count += len(output_records)
+            for records in scheduler.stream():
+                if self.plan_stats.time_to_first_result is None:
+                    self.plan_stats.time_to_first_result = time.time() - start_time
+                yield DataRecordCollection(records, plan_stats=self.plan_stats)
+
+            self.plan_stats.finalize(time.time() - start_time)
 
-        return output_records
+        # if the consumer stops early, do not wait for (or start) the remaining work
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -14,7 +14,7 @@ from palimpzest.core.lib.schemas import Number, Schema
 from palimpzest.policy import construct_policy_from_kwargs
 from palimpzest.query.processor.config import QueryProcessorConfig
 from palimpzest.utils.datareader_helpers import get_local_datareader
-from palimpzest.utils.hash_helpers import hash_for_serialized_dict
+from palimpzest.utils.hash_helpers import hash_callable, hash_for_serialized_dict
 from palimpzest.utils.index_helpers import get_index_str
 
 
@@ -83,14 +83,14 @@ class Set:
             "source": self._source.serialize(),
             "desc": repr(self._desc),
             "filter": None if self._filter is None else self._filter.serialize(),
-            "udf": None if self._udf is None else str(self._udf),
+            "udf": None if self._udf is None else hash_callable(self._udf),
             "agg_func": None if self._agg_func is None else self._agg_func.value,
             "cardinality": self._cardinality,
             "limit": self._limit,
             "group_by": (None if self._group_by is None else self._group_by.serialize()),
             "project_cols": (None if self._project_cols is None else self._project_cols),
             "index": None if self._index is None else get_index_str(self._index),
-            "search_func": None if self._search_func is None else str(self._search_func),
+            "search_func": None if self._search_func is None else hash_callable(self._search_func),
             "search_attr": self._search_attr,
             "output_attr": self._output_attr,
             "k": self._k,
@@ -0,0 +1,173 @@
+"""
+This file contains the process pool in which the directory readers parse documents. Parsing PDFs and HTML is
+CPU-bound and holds the GIL, thus parsing in the (thread-based) executors' threads would serialize it; instead,
+documents are parsed by a pool of worker processes which is sized independently of the executors' threads.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+from palimpzest.constants import DEFAULT_PARSE_TIMEOUT_SECS, DEFAULT_PARSER_WORKERS, MAX_HTML_ROWS
+
+
+def html_to_text_with_links(html: str) -> str:
+    """Return the text of the HTML, with each hyperlink replaced by its text and URL in parentheses."""
+    soup = BeautifulSoup(html, "html.parser")
+    for a in soup.find_all("a"):
+        if a.has_attr("href"):
+            a.replace_with(f"{a.text} ({a['href']})")
+
+    return soup.get_text(separator="\n", strip=True)
+
+
+def parse_html(html: str) -> tuple[str, str]:
+    """Return the raw HTML and its text (with hyperlinks inlined), each truncated to MAX_HTML_ROWS tokens."""
+    html_tokens = html.split()[:MAX_HTML_ROWS]
+    text_tokens = html_to_text_with_links(html).split()[:MAX_HTML_ROWS]
+
+    return " ".join(html_tokens), " ".join(text_tokens)
+
+
+def _warm_up_worker() -> None:
+    """Exercise the parsers once in each new worker process, so that the first document it parses is not slowed down."""
+    parse_html("<html><body><a href='https://palimpzest.org'>warm-up</a></body></html>")
+
+
+def _get_worker_pid() -> int:
+    return os.getpid()
+
+
+def _get_mp_context() -> multiprocessing.context.BaseContext:
+    """
+    Workers are started by a fork server (where available) which has already imported this module (and thus
+    palimpzest), rather than by forking the (multi-threaded) parent process or importing palimpzest in every
+    worker process.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+
+    return multiprocessing.get_context("spawn")
+
+
+class ParserPool:
+    """
+    A pool of `num_workers` processes which parse documents for the directory readers. The worker processes
+    are started (and warmed up) as soon as the pool is first used. If `num_workers` is None the pool has
+    one worker per CPU; if it is 0, documents are parsed in the calling thread (and are never timed out).
+
+    Parsing a single document may take at most `timeout_secs` seconds (or forever, if it is None). As a
+    worker cannot be interrupted, a timeout terminates the pool's workers and replaces the pool; documents
+    which were being parsed by the terminated workers are parsed again by the new pool.
+    """
+    def __init__(self, num_workers: int | None = DEFAULT_PARSER_WORKERS, timeout_secs: float | None = DEFAULT_PARSE_TIMEOUT_SECS):
+        self.num_workers = num_workers
+        self.timeout_secs = timeout_secs
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        # the number of documents parsed, the number of parses which timed out, and the number of pool restarts
+        self.num_parsed = 0
+        self.num_timeouts = 0
+        self.num_restarts = 0
+
+    def configure(self, num_workers: int | None, timeout_secs: float | None) -> None:
+        """Update the pool's settings; the worker processes are replaced if the number of workers changes."""
+        with self._lock:
+            if num_workers != self.num_workers and self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.num_workers = num_workers
+            self.timeout_secs = timeout_secs
+
+    def parse(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Return fn(*args, **kwargs), computed by one of the pool's workers. The function and its arguments must
+        be picklable. Raises a TimeoutError if the function does not return within the pool's timeout.
+        """
+        if self.num_workers == 0:
+            return fn(*args, **kwargs)
+
+        # if the pool is broken (because another parse timed out, or a worker crashed) retry once on a new pool
+        for attempt in range(2):
+            with self._lock:
+                executor = self._get_executor()
+                future = executor.submit(fn, *args, **kwargs)
+
+            done, _ = wait([future], timeout=self.timeout_secs)
+            if not done:
+                self._restart(executor)
+                with self._lock:
+                    self.num_timeouts += 1
+                raise TimeoutError(f"Parsing with {fn.__name__} timed out after {self.timeout_secs} seconds")
+
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                self._restart(executor)
+                if attempt == 1:
+                    raise
+                continue
+
+            with self._lock:
+                self.num_parsed += 1
+            return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "num_parsed": self.num_parsed,
+                "num_timeouts": self.num_timeouts,
+                "num_restarts": self.num_restarts,
+            }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the pool's executor, creating (and warming up) a new one if necessary. Requires the lock."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=_get_mp_context(),
+                initializer=_warm_up_worker,
+            )
+
+            # start every worker now, rather than as documents are submitted
+            for _ in range(self._executor._max_workers):
+                self._executor.submit(_get_worker_pid)
+
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Terminate the executor's workers and replace it (unless another thread has already done so)."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+
+            # NOTE: ProcessPoolExecutor has no public method for terminating workers which are busy
+            for process in list((executor._processes or {}).values()):
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.num_restarts += 1
+
+
+# the process-wide parser pool used by all DataReaders
+_PARSER_POOL = ParserPool()
+
+
+def get_parser_pool() -> ParserPool:
+    return _PARSER_POOL
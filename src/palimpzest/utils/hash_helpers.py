@@ -1,5 +1,10 @@
+import functools
 import hashlib
+import inspect
 import json
+import re
+import types
+from typing import Any, Callable
 
 from palimpzest.constants import MAX_ID_CHARS
 
@@ -10,3 +15,129 @@ def hash_for_id(id_str: str, max_chars: int = MAX_ID_CHARS) -> str:
 
 def hash_for_serialized_dict(dict_obj: dict) -> str:
     return hash_for_id(json.dumps(dict_obj, sort_keys=True))
+
+
+def hash_callable(fn: Callable) -> str:
+    """
+    Returns a hash of the callable which is stable across processes (unlike str(fn), which embeds the callable's
+    memory address). Functions are hashed by their qualified name and their code (i.e. their bytecode, constants,
+    referenced names, default arguments, the values captured by their closure, and the values of the globals they
+    reference), thus identically defined functions hash identically while functions whose code differs do not.
+    The functions which a function calls by (global) name are hashed along with it if they are defined in the same
+    module; functions (and modules) imported from other modules are hashed by their name.
+    """
+    return hash_for_id(_get_callable_repr(fn, set(), []))
+
+
+def is_cacheable_callable(fn: Callable) -> bool:
+    """
+    Returns True if the hash_callable() of the callable identifies its behavior, i.e. if it does not reference any
+    object which is only identified by its memory address (such as an instance of a class which does not define a
+    __repr__), as the hash cannot tell such objects of the same class apart. The outputs of callables which are not
+    cacheable must not be re-used across executions.
+    """
+    unhashable_reprs = []
+    _get_callable_repr(fn, set(), unhashable_reprs)
+    return len(unhashable_reprs) == 0
+
+
+def _get_callable_repr(fn: Callable, seen: set[int], unhashable_reprs: list[str]) -> str:
+    # callables which (directly or indirectly) capture themselves are only expanded once
+    name = getattr(fn, "__qualname__", type(fn).__qualname__)
+    if id(fn) in seen:
+        return name
+    seen = seen | {id(fn)}
+
+    if isinstance(fn, functools.partial):
+        return (
+            f"partial({_get_callable_repr(fn.func, seen, unhashable_reprs)}, {_get_value_repr(fn.args, seen, unhashable_reprs)}, "
+            f"{_get_value_repr(fn.keywords, seen, unhashable_reprs)})"
+        )
+
+    if inspect.ismethod(fn):
+        return (
+            f"method({_get_value_repr(fn.__self__, seen, unhashable_reprs)}, "
+            f"{_get_callable_repr(fn.__func__, seen, unhashable_reprs)})"
+        )
+
+    if isinstance(fn, types.FunctionType):
+        closure = [_get_cell_contents(cell) for cell in fn.__closure__ or []]
+        global_reprs = {
+            global_name: _get_global_repr(fn, fn.__globals__[global_name], seen, unhashable_reprs)
+            for global_name in sorted(_get_code_names(fn.__code__))
+            if global_name in fn.__globals__
+        }
+        return (
+            f"{fn.__module__}.{name}({_get_code_repr(fn.__code__)}, {_get_value_repr(fn.__defaults__, seen, unhashable_reprs)}, "
+            f"{_get_value_repr(fn.__kwdefaults__, seen, unhashable_reprs)}, {_get_value_repr(closure, seen, unhashable_reprs)}, "
+            f"{global_reprs})"
+        )
+
+    # objects which implement __call__ are hashed by their type, their __call__ method, and their attributes
+    call = inspect.getattr_static(type(fn), "__call__", None)
+    if isinstance(call, types.FunctionType):
+        return (
+            f"{type(fn).__module__}.{name}({_get_callable_repr(call, seen, unhashable_reprs)}, "
+            f"{_get_value_repr(getattr(fn, '__dict__', {}), seen, unhashable_reprs)})"
+        )
+
+    # builtins (and any other callables) are hashed by their repr
+    return _strip_memory_addresses(repr(fn), unhashable_reprs)
+
+
+def _get_cell_contents(cell: types.CellType) -> Any:
+    try:
+        return cell.cell_contents
+    except ValueError:
+        # the cell is empty (i.e. the captured variable has not been assigned yet)
+        return None
+
+
+def _get_code_names(code: types.CodeType) -> set[str]:
+    """Return the names referenced by the code, including those referenced by the code objects nested in it (e.g. lambdas)."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_code_names(const)
+    return names
+
+
+def _get_code_repr(code: types.CodeType) -> str:
+    consts = [_get_code_repr(const) if isinstance(const, types.CodeType) else repr(const) for const in code.co_consts]
+    return f"code({code.co_name}, {code.co_code.hex()}, {consts}, {code.co_names})"
+
+
+def _get_global_repr(fn: types.FunctionType, value: Any, seen: set[int], unhashable_reprs: list[str]) -> str:
+    if isinstance(value, types.ModuleType):
+        return f"module({value.__name__})"
+
+    # functions which are imported from other modules (e.g. from libraries) are referenced by their name
+    if isinstance(value, types.FunctionType) and value.__module__ != fn.__module__:
+        return f"{value.__module__}.{value.__qualname__}"
+
+    return _get_value_repr(value, seen, unhashable_reprs)
+
+
+def _get_value_repr(value: Any, seen: set[int], unhashable_reprs: list[str]) -> str:
+    # the items of builtin containers are expanded, while any other values (including subclasses of containers)
+    # are hashed by their repr
+    if type(value) in (list, tuple, set, frozenset):
+        reprs = [_get_value_repr(item, seen, unhashable_reprs) for item in value]
+        return f"{type(value).__name__}({sorted(reprs) if isinstance(value, (set, frozenset)) else reprs})"
+
+    if type(value) is dict:
+        return f"dict({sorted((repr(key), _get_value_repr(item, seen, unhashable_reprs)) for key, item in value.items())})"
+
+    if callable(value) and not isinstance(value, type):
+        return _get_callable_repr(value, seen, unhashable_reprs)
+
+    return _strip_memory_addresses(repr(value), unhashable_reprs)
+
+
+def _strip_memory_addresses(value_repr: str, unhashable_reprs: list[str]) -> str:
+    # the default repr of an object embeds its memory address, which differs across processes; as the address
+    # is all that tells objects of the same class apart, the repr is recorded as unhashable
+    stripped_repr = re.sub(r" at 0x[0-9a-fA-F]+", "", value_repr)
+    if stripped_repr != value_repr:
+        unhashable_reprs.append(stripped_repr)
+    return stripped_repr
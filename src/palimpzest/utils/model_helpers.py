@@ -1,6 +1,6 @@
 import os
 
-from palimpzest.constants import Model
+from palimpzest.constants import MODEL_CARDS, NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS, Model, PromptLayout
 
 
 def get_vision_models() -> list[Model]:
@@ -77,3 +77,23 @@ def get_code_champion_model(available_models):
 
 def get_champion_model_name(available_models, vision=False):
     return get_champion_model(available_models, vision).value
+
+
+def get_naive_input_cost(model_name: str, est_num_input_tokens: float, prompt_layout: PromptLayout = PromptLayout.INTERLEAVED) -> float:
+    """
+    Return a naive estimate of the cost (in USD) of the input tokens of a single LLM call. With the static-prefix
+    prompt layout, the fixed part of the prompt is shared by every call and is thus charged at the model's
+    cached input token price (if it has one) once the prompt is long enough to be cached by the provider.
+    """
+    model_card = MODEL_CARDS[model_name]
+    usd_per_input_token = model_card["usd_per_input_token"]
+    if prompt_layout != PromptLayout.STATIC_PREFIX or est_num_input_tokens < model_card.get("min_cached_input_tokens", 0):
+        return usd_per_input_token * est_num_input_tokens
+
+    usd_per_cached_input_token = model_card.get("usd_per_cached_input_token", usd_per_input_token)
+    est_num_cached_input_tokens = min(NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS, est_num_input_tokens)
+
+    return (
+        usd_per_input_token * (est_num_input_tokens - est_num_cached_input_tokens)
+        + usd_per_cached_input_token * est_num_cached_input_tokens
+    )
@@ -1,3 +1,4 @@
+import threading
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -13,6 +14,8 @@ from rich.progress import (
 )
 from rich.progress import Progress as RichProgress
 
+from palimpzest.constants import MEMORY_USAGE_SAMPLE_INTERVAL_SECS
+
 try:
     import ipywidgets as widgets
     from IPython.display import display
@@ -47,6 +50,44 @@ def get_memory_usage() -> float:
     except Exception:
         return 0.0
 
+class PeakMemoryMonitor:
+    """
+    Samples get_memory_usage() on a background thread (every `interval_secs`) between start() and stop()
+    and keeps track of the peak memory usage in MB. May also be used as a context manager.
+    """
+    def __init__(self, interval_secs: float = MEMORY_USAGE_SAMPLE_INTERVAL_SECS):
+        self.interval_secs = interval_secs
+        self.peak_memory_usage_mb = 0.0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _sample(self) -> None:
+        self.peak_memory_usage_mb = max(self.peak_memory_usage_mb, get_memory_usage())
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_secs):
+            self._sample()
+
+    def start(self) -> "PeakMemoryMonitor":
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="pz-memory-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> float:
+        """Stop sampling and return the peak memory usage in MB."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+        return self.peak_memory_usage_mb
+
+    def __enter__(self) -> "PeakMemoryMonitor":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
 class ProgressManager(ABC):
     """Abstract base class for progress managers"""
     
@@ -0,0 +1,185 @@
+"""
+Mergeable sketches which summarize a stream of values in bounded memory. Both sketches can be built
+independently over disjoint parts of a stream and then merged, which is what allows aggregates to be
+computed incrementally and in parallel.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+from bisect import bisect_left
+from typing import Any
+
+import numpy as np
+
+from palimpzest.constants import HLL_PRECISION, TDIGEST_COMPRESSION
+
+
+class HyperLogLog:
+    """
+    A HyperLogLog sketch which estimates the number of distinct values added to it.
+
+    Values are hashed by their repr(), thus values which are equal but have different reprs (e.g. 1 and 1.0)
+    are counted separately. The sketch uses 2 ** precision one-byte registers; while few registers are set,
+    they are kept in a (sparse) dict instead, thus sketches of small sets (e.g. of most of the groups of a
+    high-cardinality groupby) stay small.
+    """
+    def __init__(self, precision: int = HLL_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 16, not {precision}")
+
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.sparse_registers: dict[int, int] | None = {}
+        self.registers: np.ndarray | None = None
+
+    def add(self, value: Any) -> None:
+        hash_value = int.from_bytes(hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest(), "big")
+
+        # the first `precision` bits select the register; the rank is the position of the first 1-bit in the rest
+        num_rest_bits = 64 - self.precision
+        register_idx = hash_value >> num_rest_bits
+        rank = num_rest_bits - (hash_value & ((1 << num_rest_bits) - 1)).bit_length() + 1
+        if self.registers is not None:
+            if rank > self.registers[register_idx]:
+                self.registers[register_idx] = rank
+        elif rank > self.sparse_registers.get(register_idx, 0):
+            self.sparse_registers[register_idx] = rank
+            self._densify_if_full()
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions")
+
+        if other.registers is not None:
+            self._densify()
+            np.maximum(self.registers, other.registers, out=self.registers)
+        elif self.registers is not None:
+            for register_idx, rank in other.sparse_registers.items():
+                self.registers[register_idx] = max(self.registers[register_idx], rank)
+        else:
+            for register_idx, rank in other.sparse_registers.items():
+                if rank > self.sparse_registers.get(register_idx, 0):
+                    self.sparse_registers[register_idx] = rank
+            self._densify_if_full()
+
+    def estimate(self) -> int:
+        num_registers = self.num_registers
+
+        # use linear counting for small cardinalities (which is always the case for sparse sketches)
+        if self.registers is None:
+            return round(num_registers * math.log(num_registers / (num_registers - len(self.sparse_registers))))
+
+        alpha = 0.7213 / (1 + 1.079 / num_registers)
+        estimate = alpha * num_registers ** 2 / float(np.exp2(-self.registers.astype(np.float64)).sum())
+        num_empty_registers = num_registers - int(np.count_nonzero(self.registers))
+        if estimate <= 2.5 * num_registers and num_empty_registers > 0:
+            estimate = num_registers * math.log(num_registers / num_empty_registers)
+
+        return round(estimate)
+
+    def _densify_if_full(self) -> None:
+        # a dict entry takes roughly as much memory as 16 dense registers
+        if len(self.sparse_registers) > self.num_registers // 16:
+            self._densify()
+
+    def _densify(self) -> None:
+        if self.registers is None:
+            self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+            for register_idx, rank in self.sparse_registers.items():
+                self.registers[register_idx] = rank
+            self.sparse_registers = None
+
+
+class TDigest:
+    """
+    A t-digest sketch which estimates quantiles of the (numeric) values added to it.
+
+    The digest summarizes the values as a sorted list of weighted centroids. Centroids near the median may
+    absorb many values while centroids near the tails stay small, thus extreme quantiles remain accurate.
+    Values (and the centroids of merged digests) are buffered and merged into the centroids in batches; the
+    number of centroids is O(compression).
+    """
+    def __init__(self, compression: float = TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means: list[float] = []
+        self.weights: list[float] = []
+        self.buffer: list[tuple[float, float]] = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        self.buffer.append((value, 1.0))
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: TDigest) -> None:
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.buffer.extend(zip(other.means, other.weights))
+        self.buffer.extend(other.buffer)
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def quantile(self, q: float) -> float | None:
+        """Return the estimated q-th quantile (for 0 <= q <= 1), or None if no values have been added."""
+        self._compress()
+        if self.count == 0:
+            return None
+
+        # interpolate between the centers of the centroids, which are anchored by the exact min and max
+        positions, values, cumulative_weight = [0.0], [self.min], 0.0
+        for mean, weight in zip(self.means, self.weights):
+            positions.append(cumulative_weight + weight / 2)
+            values.append(mean)
+            cumulative_weight += weight
+        positions.append(cumulative_weight)
+        values.append(self.max)
+
+        target = min(max(q, 0.0), 1.0) * cumulative_weight
+        idx = max(bisect_left(positions, target), 1)
+        left_pos, right_pos = positions[idx - 1], positions[idx]
+        if right_pos == left_pos:
+            return values[idx]
+
+        return values[idx - 1] + (values[idx] - values[idx - 1]) * (target - left_pos) / (right_pos - left_pos)
+
+    def _compress(self) -> None:
+        """Merge the buffered (mean, weight) points into the centroids."""
+        if not self.buffer:
+            return
+
+        points = sorted(list(zip(self.means, self.weights)) + self.buffer)
+        self.buffer = []
+        total_weight = sum(weight for _, weight in points)
+
+        # greedily merge adjacent points into a centroid while its weight stays within the limit of the k1 scale
+        # function, k(q) = compression / (2 * pi) * asin(2q - 1): each centroid may span at most one unit of k,
+        # thus the number of centroids is O(compression) and centroids near the tails are small
+        def get_weight_limit(weight_so_far: float) -> float:
+            k = self.compression / (2 * math.pi) * math.asin(2 * min(weight_so_far / total_weight, 1.0) - 1) + 1
+            return total_weight * (math.sin(min(k * 2 * math.pi / self.compression, math.pi / 2)) + 1) / 2
+
+        means, weights, weight_so_far = [], [], 0.0
+        weight_limit = get_weight_limit(weight_so_far)
+        centroid_mean, centroid_weight = points[0]
+        for mean, weight in points[1:]:
+            if weight_so_far + centroid_weight + weight <= weight_limit:
+                centroid_weight += weight
+                centroid_mean += (mean - centroid_mean) * weight / centroid_weight
+            else:
+                means.append(centroid_mean)
+                weights.append(centroid_weight)
+                weight_so_far += centroid_weight
+                weight_limit = get_weight_limit(weight_so_far)
+                centroid_mean, centroid_weight = mean, weight
+        means.append(centroid_mean)
+        weights.append(centroid_weight)
+
+        self.means, self.weights = means, weights
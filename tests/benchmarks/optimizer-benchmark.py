@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the optimizer's search time. The benchmark builds synthetic logical plans of N operators (which
+alternate between semantic converts and semantic filters which only depend on the input field, thus every
+filter may be pushed down) for each N in --num-ops, and optimizes each plan with the first M models of MODELS
+available for each M in --num-models, with a policy which trades off cost and quality. For each (N, M) it
+reports the optimizer's wall time and the size of its memo: the number of groups, logical and physical
+expressions, and the number of plan costs on the groups' Pareto frontiers.
+"""
+import argparse
+import time
+
+from palimpzest.constants import Model
+from palimpzest.policy import MaxQualityAtFixedCost
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.optimizer_strategy import OptimizationStrategyType
+from palimpzest.sets import Dataset
+
+MODELS = [Model.GPT_4o, Model.GPT_4o_MINI, Model.LLAMA3, Model.MIXTRAL, Model.LLAMA3_V]
+
+
+def create_plan(num_ops: int) -> Dataset:
+    dataset = Dataset(list(range(100)))
+    for idx in range(num_ops):
+        if idx % 2 == 0:
+            cols = [{"name": f"field_{idx}", "type": str, "desc": f"The value's property #{idx}"}]
+            dataset = dataset.sem_add_columns(cols, depends_on=["value"])
+        else:
+            dataset = dataset.sem_filter(f"The value satisfies condition #{idx}", depends_on=["value"])
+    return dataset
+
+
+def run(num_ops: int, num_models: int, strategy: OptimizationStrategyType, max_frontier_size: int | None) -> dict:
+    policy = MaxQualityAtFixedCost(max_cost=1.0)
+    optimizer = Optimizer(
+        policy=policy,
+        cost_model=CostModel(),
+        available_models=MODELS[:num_models],
+        optimization_strategy_type=strategy,
+        max_pareto_frontier_size=max_frontier_size,
+    )
+    start_time = time.perf_counter()
+    plans = optimizer.optimize(create_plan(num_ops), policy)
+    duration = time.perf_counter() - start_time
+
+    groups = optimizer.groups.values()
+    return {
+        "secs": duration,
+        "groups": len(optimizer.groups),
+        "logical": sum(len(group.logical_expressions) for group in groups),
+        "physical": sum(len(group.physical_expressions) for group in groups),
+        "frontier": sum(
+            len(expr.pareto_optimal_plan_costs)
+            for group in groups
+            for expr in group.pareto_optimal_physical_expressions or []
+        ),
+        "quality": plans[0].plan_cost.quality,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the optimizer's search time and memo size")
+    parser.add_argument("--num-ops", type=int, nargs="+", default=[2, 4, 6, 8], help="The numbers of operators in the plans")
+    parser.add_argument("--num-models", type=int, nargs="+", default=[1, 3, 5], help="The numbers of available models")
+    parser.add_argument("--strategy", type=str, default="pareto", help="The optimization strategy (e.g. pareto or greedy)")
+    parser.add_argument("--max-frontier-size", type=int, default=None, help="The cap on each group's Pareto frontier")
+    args = parser.parse_args()
+    strategy = OptimizationStrategyType(args.strategy)
+
+    # warm up (the first run pays for one-time setup costs)
+    run(1, 1, strategy, args.max_frontier_size)
+
+    print(f"{'ops':>4}{'models':>8}{'groups':>8}{'logical':>9}{'physical':>10}{'frontier':>10}{'quality':>9}{'secs':>9}")
+    for num_ops in args.num_ops:
+        for num_models in args.num_models:
+            result = run(num_ops, num_models, strategy, args.max_frontier_size)
+            print(
+                f"{num_ops:>4}{num_models:>8}{result['groups']:>8}{result['logical']:>9}{result['physical']:>10}"
+                f"{result['frontier']:>10}{result['quality']:>9.4f}{result['secs']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
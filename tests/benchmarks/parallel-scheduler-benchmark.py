@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the scheduling overhead of the PipelinedParallelExecutionStrategy. The plan scans a
+MemoryReader and passes every record through a chain of zero-latency stub operators (followed by an
+aggregate), thus the measured throughput is bounded by the scheduler rather than by the operators.
+"""
+import argparse
+import time
+
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.core.lib.schemas import DefaultSchema, Number
+from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy
+from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.physical import PhysicalOperator
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+
+
+class StubOp(PhysicalOperator):
+    """An operator which returns its input record without doing any work."""
+    def __init__(self, stub_idx: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stub_idx = stub_idx
+
+    def get_id_params(self):
+        id_params = super().get_id_params()
+        return {"stub_idx": self.stub_idx, **id_params}
+
+    def __call__(self, candidate: DataRecord) -> DataRecordSet:
+        return DataRecordSet([candidate], [])
+
+
+class CountOp(AggregateOp):
+    def __call__(self, candidates: list[DataRecord]) -> DataRecordSet:
+        dr = DataRecord.from_parent(schema=Number, parent_record=candidates[-1])
+        dr.value = len(candidates)
+        return DataRecordSet([dr], [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the throughput of the parallel execution strategy")
+    parser.add_argument("--num-records", type=int, default=5000, help="The number of records to scan")
+    parser.add_argument("--num-ops", type=int, default=4, help="The number of stub operators in the plan")
+    parser.add_argument("--workers", type=int, default=8, help="The number of workers executing the plan")
+    parser.add_argument("--trials", type=int, default=3, help="The number of trials (the best trial is reported)")
+    args = parser.parse_args()
+
+    datareader = MemoryReader(list(range(args.num_records)))
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=datareader)
+    stub_ops = [StubOp(idx, input_schema=DefaultSchema, output_schema=DefaultSchema) for idx in range(args.num_ops)]
+    count_op = CountOp(input_schema=DefaultSchema, output_schema=Number)
+    plan = PhysicalPlan(operators=[scan_op, *stub_ops, count_op])
+
+    best = float("inf")
+    for _ in range(args.trials):
+        strategy = PipelinedParallelExecutionStrategy(max_workers=args.workers)
+        start_time = time.perf_counter()
+        output_records, _ = strategy.execute_plan(plan, plan_workers=args.workers)
+        best = min(best, time.perf_counter() - start_time)
+        assert output_records[0].value == args.num_records
+
+    print(f"{'records':>10}{'operators':>12}{'seconds':>10}{'records/sec':>14}")
+    print(f"{args.num_records:>10}{args.num_ops + 2:>12}{best:>10.2f}{args.num_records / best:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for parsing documents in the parser pool. The benchmark writes --num-pdfs synthetic PDFs (each with
+--num-pages pages of text) to a temporary directory and scans them with a PDFFileDirectoryReader, whose reads
+are spread over --io-workers threads by a prefetching scan. The PDFs are either parsed in the scan's threads
+(which hold the GIL while parsing) or by a pool of worker processes.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from palimpzest.core.data.datareaders import PDFFileDirectoryReader
+from palimpzest.core.lib.schemas import PDFFile
+from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy
+from palimpzest.query.operators.scan import PrefetchingScanDataOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.tools.parsing import get_parser_pool
+
+
+def make_pdf(num_pages: int, lines_per_page: int = 40) -> bytes:
+    """Return the bytes of a PDF with `num_pages` pages of text."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page_idx in range(num_pages):
+        lines = " ".join(
+            f"({page_idx}.{line_idx} the quick brown fox jumps over the lazy dog) Tj T*" for line_idx in range(lines_per_page)
+        )
+        stream = f"BT /F1 10 Tf 12 TL 36 756 Td {lines} ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+            % (len(objects))
+        )
+        page_refs.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(page_refs), num_pages)
+
+    pdf, offsets = b"%PDF-1.4\n", []
+    for obj_idx, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % obj_idx + obj + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return pdf
+
+
+def run(reader: PDFFileDirectoryReader, io_workers: int) -> float:
+    scan_op = PrefetchingScanDataOp(output_schema=PDFFile, datareader=reader, prefetch_window=4 * io_workers, num_io_workers=io_workers)
+    start_time = time.perf_counter()
+    records, _ = PipelinedParallelExecutionStrategy().execute_plan(PhysicalPlan(operators=[scan_op]), plan_workers=io_workers)
+    duration = time.perf_counter() - start_time
+    assert len(records) == len(reader) and all(len(record.text_contents) > 0 for record in records)
+
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing PDFs in the parser pool")
+    parser.add_argument("--num-pdfs", type=int, default=64, help="The number of synthetic PDFs")
+    parser.add_argument("--num-pages", type=int, default=10, help="The number of pages per PDF")
+    parser.add_argument("--io-workers", type=int, default=4, help="The number of threads reading the PDFs")
+    parser.add_argument("--parser-workers", type=int, default=os.cpu_count(), help="The number of parser processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pdf_dir:
+        pdf = make_pdf(args.num_pages)
+        for idx in range(args.num_pdfs):
+            with open(os.path.join(pdf_dir, f"paper-{idx}.pdf"), "wb") as f:
+                f.write(pdf)
+        reader = PDFFileDirectoryReader(pdf_dir)
+
+        print(f"{'parsing':<16}{'workers':>8}{'pdfs/sec':>10}")
+        for name, num_workers in [("in-thread", 0), ("process-pool", args.parser_workers)]:
+            get_parser_pool().configure(num_workers=num_workers, timeout_secs=None)
+
+            # start (and warm up) the pool's workers before timing the scan
+            get_parser_pool().parse(len, b"")
+            duration = run(reader, args.io_workers)
+            print(f"{name:<16}{num_workers:>8}{args.num_pdfs / duration:>10,.1f}")
+
+        get_parser_pool().shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the per-record prompt construction time of the PromptFactory.
+
+The "uncached" setting constructs a new PromptFactory for every record, thus every record pays for
+building the strategy-dependent format kwargs, walking the output schema, and rendering the full
+templates (i.e. the per-record work which was done before prompts were compiled). The "compiled"
+setting re-uses a single PromptFactory, thus only the context and input field descriptions are
+rendered per record.
+"""
+import argparse
+import functools
+import time
+
+from palimpzest.constants import Cardinality, Model, PromptLayout, PromptStrategy
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import NumericField, StringField
+from palimpzest.core.lib.schemas import TextFile
+from palimpzest.prompts.prompt_factory import PromptFactory
+
+
+class Email(TextFile):
+    sender = StringField(desc="The email address of the sender")
+    subject = StringField(desc="The subject of the email")
+    summary = StringField(desc="A one sentence summary of the email")
+    num_recipients = NumericField(desc="The number of recipients of the email")
+
+
+def make_records(num_records: int, contents_size: int) -> list[DataRecord]:
+    records = []
+    for idx in range(num_records):
+        record = DataRecord(schema=TextFile, source_idx=idx)
+        record.filename = f"email-{idx}.txt"
+        record.contents = f"From: sender-{idx}@example.com\n" + "lorem ipsum " * (contents_size // 12)
+        records.append(record)
+
+    return records
+
+
+def construct_prompts(records, prompt_strategy, prompt_layout, output_fields, gen_kwargs, compiled: bool) -> None:
+    prompt_factory = PromptFactory(prompt_strategy, Model.GPT_4o_MINI, Cardinality.ONE_TO_ONE, prompt_layout)
+    for record in records:
+        if not compiled:
+            prompt_factory = PromptFactory(prompt_strategy, Model.GPT_4o_MINI, Cardinality.ONE_TO_ONE, prompt_layout)
+        prompt_factory.create_messages(record, output_fields, **gen_kwargs)
+
+
+def benchmark(fn, trials: int) -> float:
+    best = float("inf")
+    for _ in range(trials):
+        start_time = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start_time)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-record prompt construction time")
+    parser.add_argument("--num-records", type=int, default=2000, help="The number of records to construct prompts for")
+    parser.add_argument("--contents-size", type=int, default=1000, help="The number of characters in each record's contents")
+    parser.add_argument("--trials", type=int, default=3, help="The number of trials per setting (the best trial is reported)")
+    parser.add_argument(
+        "--prompt-layout",
+        type=str,
+        default=PromptLayout.INTERLEAVED.value,
+        help="One of 'interleaved' or 'static-prefix'",
+    )
+    args = parser.parse_args()
+
+    records = make_records(args.num_records, args.contents_size)
+    prompt_layout = PromptLayout(args.prompt_layout)
+    output_fields = ["sender", "subject", "summary", "num_recipients"]
+    settings = [
+        ("convert", PromptStrategy.COT_QA, output_fields, {"output_schema": Email, "project_cols": ["contents"]}),
+        ("filter", PromptStrategy.COT_BOOL, ["passed_operator"], {"filter_condition": "The email is about a meeting", "project_cols": ["contents"]}),
+    ]
+
+    print(f"{'prompt':<10}{'uncached (us/record)':>24}{'compiled (us/record)':>24}{'speedup':>10}")
+    for name, prompt_strategy, fields, gen_kwargs in settings:
+        uncached, compiled = [
+            benchmark(
+                functools.partial(construct_prompts, records, prompt_strategy, prompt_layout, fields, gen_kwargs, compiled),
+                args.trials,
+            ) / args.num_records
+            for compiled in [False, True]
+        ]
+        print(f"{name:<10}{uncached * 1e6:>24.1f}{compiled * 1e6:>24.1f}{uncached / compiled:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the throughput of constructing DataRecords, which relies heavily on Schema field
+introspection: every DataRecord copies its schema's field map, records derived from a parent record
+take the union (and possibly a projection) of their schemas, and record equality compares schema
+descriptions.
+"""
+import argparse
+import time
+
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import NumericField, StringField
+from palimpzest.core.lib.schemas import TextFile
+
+
+class Email(TextFile):
+    sender = StringField(desc="The email address of the sender")
+    subject = StringField(desc="The subject of the email")
+    summary = StringField(desc="A one sentence summary of the email")
+    num_recipients = NumericField(desc="The number of recipients of the email")
+
+
+def construct_records(num_records: int) -> list[DataRecord]:
+    records = []
+    for idx in range(num_records):
+        record = DataRecord(schema=TextFile, source_idx=idx)
+        record.filename = f"email-{idx}.txt"
+        record.contents = f"From: sender-{idx}@example.com"
+        records.append(record)
+
+    return records
+
+
+def derive_records(records: list[DataRecord], project_cols: list[str] | None) -> list[DataRecord]:
+    return [DataRecord.from_parent(Email, parent_record=record, project_cols=project_cols) for record in records]
+
+
+def compare_records(records: list[DataRecord]) -> int:
+    return sum(left == right for left, right in zip(records, records[1:]))
+
+
+def benchmark(fn, trials: int) -> float:
+    best = float("inf")
+    for _ in range(trials):
+        start_time = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start_time)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataRecord construction throughput")
+    parser.add_argument("--num-records", type=int, default=20000, help="The number of records to construct per trial")
+    parser.add_argument("--trials", type=int, default=3, help="The number of trials per benchmark (the best trial is reported)")
+    args = parser.parse_args()
+
+    records = construct_records(args.num_records)
+    derived_records = derive_records(records, project_cols=None)
+    benchmarks = [
+        ("construct", lambda: construct_records(args.num_records)),
+        ("from_parent", lambda: derive_records(records, project_cols=None)),
+        ("from_parent+project", lambda: derive_records(records, project_cols=["filename", "contents"])),
+        ("compare", lambda: compare_records(derived_records)),
+    ]
+
+    print(f"{'benchmark':<22}{'records/sec':>14}")
+    for name, fn in benchmarks:
+        duration = benchmark(fn, args.trials)
+        print(f"{name:<22}{args.num_records / duration:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
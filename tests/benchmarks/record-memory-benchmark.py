@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the memory footprint and construction throughput of DataRecords when scanning a large
+MemoryReader: each item is scanned into a DataRecord (as MarshalAndScanDataOp does) and then converted
+into a record with a wider schema (as a convert operation does).
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import NumericField, StringField
+from palimpzest.core.lib.schemas import DefaultSchema
+
+
+class Parity(DefaultSchema):
+    parity = StringField(desc="Whether the value is even or odd")
+    half = NumericField(desc="Half of the value")
+
+
+def scan(datareader: MemoryReader) -> list[DataRecord]:
+    field_names = datareader.schema.field_names()
+    records = []
+    for idx in range(len(datareader)):
+        item = datareader[idx]
+        record = DataRecord(datareader.schema, source_idx=idx)
+        for field_name in field_names:
+            record[field_name] = item[field_name]
+        records.append(record)
+
+    return records
+
+
+def convert(records: list[DataRecord]) -> list[DataRecord]:
+    output_records = []
+    for record in records:
+        output_record = DataRecord.from_parent(Parity, parent_record=record)
+        output_record.parity = "even" if record.value % 2 == 0 else "odd"
+        output_record.half = record.value / 2
+        output_records.append(output_record)
+
+    return output_records
+
+
+def measure_memory(fn, *args) -> tuple[object, int]:
+    """Return the output of fn and the number of bytes it retains."""
+    gc.collect()
+    tracemalloc.start()
+    output = fn(*args)
+    gc.collect()
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return output, retained_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataRecord memory footprint and construction throughput")
+    parser.add_argument("--num-rows", type=int, default=1_000_000, help="The number of rows in the MemoryReader")
+    args = parser.parse_args()
+
+    datareader = MemoryReader(list(range(args.num_rows)))
+
+    # throughput (measured without tracemalloc, which slows down allocations)
+    start_time = time.perf_counter()
+    records = scan(datareader)
+    scan_duration = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    convert(records)
+    convert_duration = time.perf_counter() - start_time
+
+    # memory retained by the records (excluding the MemoryReader's values)
+    del records
+    records, scan_bytes = measure_memory(scan, datareader)
+    _, convert_bytes = measure_memory(convert, records)
+
+    print(f"{'phase':<10}{'records/sec':>14}{'bytes/record':>14}")
+    print(f"{'scan':<10}{args.num_rows / scan_duration:>14,.0f}{scan_bytes / args.num_rows:>14,.0f}")
+    print(f"{'convert':<10}{args.num_rows / convert_duration:>14,.0f}{convert_bytes / args.num_rows:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 import pytest
 
 from palimpzest.constants import Model
+from palimpzest.core.data.document_cache import set_parsed_document_cache
+from palimpzest.core.data.materialization_cache import set_materialization_cache
 from palimpzest.policy import MaxQuality, MaxQualityAtFixedCost, MinCost, MinCostAtFixedQuality
+from palimpzest.query.generators.cache import set_response_cache
+from palimpzest.query.optimizer.plan_cache import set_plan_cache
 
 pytest_plugins = [
     "fixtures.champion_outputs",
+    "fixtures.completions",
     "fixtures.cost_est_data",
     "fixtures.datareaders",
+    "fixtures.documents",
     "fixtures.execution_data",
     "fixtures.expected_cost_est_results",
     "fixtures.expected_physical_plans",
@@ -19,6 +25,18 @@ pytest_plugins = [
     "fixtures.workloads",
 ]
 
+@pytest.fixture(autouse=True)
+def no_process_wide_caches():
+    # query processors set the process-wide caches which their config enables; reset them so that
+    # the results cached by one test are not re-used by the next
+    set_cache_fns = [set_response_cache, set_plan_cache, set_parsed_document_cache, set_materialization_cache]
+    for set_cache in set_cache_fns:
+        set_cache(None)
+    yield
+    for set_cache in set_cache_fns:
+        set_cache(None)
+
+
 # NOTE: these fixtures may grow to have long lists of arguments;
 #       the benefit of using fixtures here (which requires us to specify them
 #       as arguments) is that pytest will compute each fixture value once
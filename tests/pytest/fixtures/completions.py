@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+### Fake Provider Completions for Mocking LLM Calls ###
+@pytest.fixture
+def mock_completion():
+    def make_completion(text, input_tokens=100, output_tokens=10, cached_tokens=0):
+        # mimics the (OpenAI and Together) chat completion objects which the generators parse
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop", logprobs=None)],
+            usage=SimpleNamespace(
+                prompt_tokens=input_tokens,
+                completion_tokens=output_tokens,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+            ),
+        )
+
+    return make_completion
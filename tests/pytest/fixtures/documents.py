@@ -0,0 +1,27 @@
+import pytest
+
+
+### Generated Documents for DirectoryReader Tests ###
+@pytest.fixture
+def make_pdf():
+    def make_pdf_bytes(text: str) -> bytes:
+        """Return the bytes of a single-page PDF which displays the given text."""
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        ]
+        pdf, offsets = b"%PDF-1.4\n", []
+        for obj_idx, obj in enumerate(objects, start=1):
+            offsets.append(len(pdf))
+            pdf += b"%d 0 obj\n" % obj_idx + obj + b"\nendobj\n"
+        xref_offset = len(pdf)
+        pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+        return pdf
+
+    return make_pdf_bytes
@@ -0,0 +1,252 @@
+import random
+import statistics
+
+import pytest
+
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.groupbysig import GroupBySig
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import NumericField, StringField
+from palimpzest.core.lib.schemas import DefaultSchema, Number, Schema
+from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy
+from palimpzest.query.execution.single_threaded_execution_strategy import PipelinedSingleThreadExecutionStrategy
+from palimpzest.query.operators.aggregate import (
+    ApplyGroupByOp,
+    AverageAggregateOp,
+    CountAggregateOp,
+    VectorizedApplyGroupByOp,
+    VectorizedAverageAggregateOp,
+)
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.utils.sketches import HyperLogLog, TDigest
+
+
+class Sale(Schema):
+    region = StringField(desc="The region of the sale")
+    customer = StringField(desc="The customer who made the sale")
+    amount = NumericField(desc="The amount of the sale")
+
+
+def make_sales(num_sales):
+    sales = []
+    for idx in range(num_sales):
+        record = DataRecord(Sale, source_idx=idx)
+        record.region = ["north", "south", "east"][idx % 3]
+        record.customer = f"customer-{idx % 7}"
+        record.amount = idx
+        sales.append(record)
+    return sales
+
+
+def make_groupby_op(agg_funcs, agg_fields):
+    group_by_sig = GroupBySig(group_by_fields=["region"], agg_funcs=agg_funcs, agg_fields=agg_fields)
+    return ApplyGroupByOp(group_by_sig, input_schema=Sale, output_schema=group_by_sig.output_schema())
+
+
+def test_groupby_aggregation_functions():
+    agg_funcs = ["count", "average", "sum", "min", "max", "count_distinct", "approx_count_distinct", "approx_median"]
+    groupby_op = make_groupby_op(agg_funcs, ["amount", "amount", "amount", "amount", "amount", "customer", "customer", "amount"])
+    sales = make_sales(30)
+
+    record_set = groupby_op(sales)
+
+    outputs = {record.region: record for record in record_set}
+    north = outputs["north"].to_dict()
+    north_amounts = [sale.amount for sale in sales if sale.region == "north"]
+    assert north["count(amount)"] == 10
+    assert north["average(amount)"] == statistics.mean(north_amounts)
+    assert north["sum(amount)"] == sum(north_amounts)
+    assert north["min(amount)"] == 0
+    assert north["max(amount)"] == 27
+    assert north["count_distinct(customer)"] == 7
+    assert north["approx_count_distinct(customer)"] == 7
+    assert north["approx_median(amount)"] == statistics.median(north_amounts)
+
+    # every output is derived from the final input record
+    assert all(record.parent_id == sales[-1].id for record in record_set)
+    assert len(record_set.record_op_stats) == 3
+
+
+def test_groupby_rejects_unknown_aggregation_function():
+    with pytest.raises(Exception, match="Unknown agg function"):
+        make_groupby_op(["mode"], ["amount"])
+
+
+def test_merged_partial_aggregates_match_single_pass():
+    agg_funcs = ["count", "sum", "max", "approx_count_distinct", "approx_p90"]
+    groupby_op = make_groupby_op(agg_funcs, ["amount"] * len(agg_funcs))
+    sales = make_sales(1000)
+
+    # fold disjoint chunks of the input and merge them out of order
+    partials = [groupby_op.fold(groupby_op.create_partial(), sales[idx:idx + 128]) for idx in range(0, 1000, 128)]
+    merged = partials.pop()
+    for partial in partials:
+        groupby_op.merge(merged, partial)
+
+    merged_outputs = {record.region: record.to_dict() for record in groupby_op.finalize(merged)}
+    single_pass_outputs = {record.region: record.to_dict() for record in groupby_op(sales)}
+
+    assert merged.num_records == 1000
+    assert merged.last_record is sales[-1]
+    for region, output in single_pass_outputs.items():
+        merged_output = merged_outputs[region]
+        for field in ["count(amount)", "sum(amount)", "max(amount)", "approx_count_distinct(amount)"]:
+            assert merged_output[field] == output[field]
+
+        # the quantile estimates are within 2% of the range of the amounts
+        assert merged_output["approx_p90(amount)"] == pytest.approx(output["approx_p90(amount)"], abs=20)
+
+
+def test_hyperloglog_estimates_distinct_values():
+    left, right = HyperLogLog(), HyperLogLog()
+    for idx in range(50_000):
+        left.add(f"value-{idx}")
+        right.add(f"value-{idx + 25_000}")
+
+    left.merge(right)
+
+    # the relative standard error of the default sketch is ~1.6%
+    assert abs(left.estimate() - 75_000) / 75_000 < 0.05
+    assert len(left.registers) == 4096
+
+    # sketches of small sets are sparse (and remain sparse when merged)
+    small, other_small = HyperLogLog(), HyperLogLog()
+    for idx in range(100):
+        small.add(idx)
+        other_small.add(idx + 50)
+    small.merge(other_small)
+    assert small.registers is None
+    assert abs(small.estimate() - 150) <= 3
+
+
+def test_tdigest_estimates_quantiles():
+    rng = random.Random(42)
+    values = [rng.gauss(0, 1) for _ in range(20_000)]
+    left, right = TDigest(), TDigest()
+    for idx, value in enumerate(values):
+        (left if idx % 2 == 0 else right).add(value)
+
+    left.merge(right)
+
+    sorted_values = sorted(values)
+    for q in [0.01, 0.25, 0.5, 0.9, 0.999]:
+        assert abs(left.quantile(q) - sorted_values[int(q * len(values))]) < 0.05
+    assert left.quantile(0) == sorted_values[0]
+    assert left.quantile(1) == sorted_values[-1]
+    assert len(left.means) < 200
+    assert TDigest().quantile(0.5) is None
+
+
+@pytest.mark.parametrize("strategy_cls", [PipelinedSingleThreadExecutionStrategy, PipelinedParallelExecutionStrategy])
+def test_aggregates_fold_inputs_as_they_arrive(strategy_cls, mocker):
+    mocker.patch("palimpzest.query.execution.parallel_execution_strategy.PARTIAL_AGGREGATION_CHUNK_SIZE", 16)
+    values = list(range(100))
+    scan_op = MarshalAndScanDataOp(output_schema=Number, datareader=MemoryReader(values))
+    average_op = AverageAggregateOp("average", input_schema=Number)
+    count_op = CountAggregateOp("count", input_schema=Number)
+    fold = mocker.spy(AverageAggregateOp, "fold")
+
+    strategy = strategy_cls()
+    average_records, _ = strategy.execute_plan(PhysicalPlan(operators=[scan_op, average_op]), plan_workers=4)
+    count_records, plan_stats = strategy.execute_plan(PhysicalPlan(operators=[scan_op, count_op]), plan_workers=4)
+
+    assert [record.value for record in average_records] == [statistics.mean(values)]
+    assert [record.value for record in count_records] == [100]
+    assert fold.call_count > 1
+    assert plan_stats.operator_stats[count_op.get_op_id()].num_spilled_records == 0
+
+
+def test_aggregate_without_inputs_produces_no_output():
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=MemoryReader([]))
+    count_op = CountAggregateOp("count", input_schema=DefaultSchema)
+
+    output_records, _ = PipelinedParallelExecutionStrategy().execute_plan(PhysicalPlan(operators=[scan_op, count_op]))
+
+    assert output_records == []
+
+
+def make_readings(num_readings, seed=0):
+    rng = random.Random(seed)
+    readings = []
+    for idx in range(num_readings):
+        record = DataRecord(Sale, source_idx=idx)
+        record.region = rng.choice(["north", "south", "east"])
+        record.customer = f"customer-{rng.randint(0, 3)}"
+        record.amount = rng.random() * 100
+        readings.append(record)
+    return readings
+
+
+@pytest.mark.parametrize("chunk_size", [None, 37])
+def test_vectorized_groupby_matches_groupby(chunk_size):
+    agg_funcs = ["count", "sum", "average", "min", "max"]
+    group_by_sig = GroupBySig(group_by_fields=["region", "customer"], agg_funcs=agg_funcs, agg_fields=["amount"] * 5)
+    ops = [
+        op_cls(group_by_sig, input_schema=Sale, output_schema=group_by_sig.output_schema())
+        for op_cls in [ApplyGroupByOp, VectorizedApplyGroupByOp]
+    ]
+    readings = make_readings(500)
+
+    outputs = []
+    for op in ops:
+        partial = op.create_partial()
+        for idx in range(0, len(readings), chunk_size or len(readings)):
+            op.fold(partial, readings[idx:idx + (chunk_size or len(readings))])
+        outputs.append([record.to_dict() for record in op.finalize(partial)])
+
+    # the groups, their order, and the (floating point) aggregates are identical
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0]) == 12
+
+
+@pytest.mark.parametrize(
+    "amounts",
+    [[1, 2.5, 3], [1.0, float("nan"), 2.0], [2**62, 2**62, 1], [True, False, True]],
+    ids=["mixed-types", "nan", "int64-overflow", "bools"],
+)
+def test_vectorized_groupby_falls_back_to_records(amounts, mocker):
+    group_by_sig = GroupBySig(group_by_fields=["region"], agg_funcs=["sum", "max"], agg_fields=["amount", "amount"])
+    groupby_op = ApplyGroupByOp(group_by_sig, input_schema=Sale, output_schema=group_by_sig.output_schema())
+    vectorized_op = VectorizedApplyGroupByOp(group_by_sig, input_schema=Sale, output_schema=group_by_sig.output_schema())
+    update_state = mocker.spy(vectorized_op, "update_state")
+    sales = make_sales(len(amounts))
+    for sale, amount in zip(sales, amounts):
+        sale.amount = amount
+
+    expected = [record.to_dict() for record in groupby_op(sales)]
+    actual = [record.to_dict() for record in vectorized_op(sales)]
+
+    assert repr(actual) == repr(expected)
+    assert update_state.call_count == len(amounts)
+
+
+def test_vectorized_groupby_requires_fields():
+    group_by_sig = GroupBySig(group_by_fields=["region"], agg_funcs=["sum"], agg_fields=["amount"])
+    vectorized_op = VectorizedApplyGroupByOp(group_by_sig, input_schema=Sale, output_schema=group_by_sig.output_schema())
+    sales = make_sales(3)
+    sales[1] = DataRecord(Sale, source_idx=1)
+    sales[1].region = "south"
+
+    with pytest.raises(TypeError, match="missing expected field amount"):
+        vectorized_op(sales)
+
+    with pytest.raises(Exception, match="Cannot vectorize agg function"):
+        VectorizedApplyGroupByOp(GroupBySig(["region"], ["approx_median"], ["amount"]), input_schema=Sale, output_schema=Sale)
+
+
+def test_vectorized_average_matches_average():
+    records = []
+    for idx, value in enumerate([0.1, 0.2, 3, 1e16, -1e16, 0.3] * 50):
+        record = DataRecord(Number, source_idx=idx)
+        record.value = value
+        records.append(record)
+
+    average_op = AverageAggregateOp("average", input_schema=Number)
+    vectorized_op = VectorizedAverageAggregateOp("average", input_schema=Number)
+    partial = vectorized_op.create_partial()
+    for idx in range(0, len(records), 7):
+        vectorized_op.fold(partial, records[idx:idx + 7])
+
+    assert vectorized_op.finalize(partial)[0].value == average_op(records)[0].value
+    assert vectorized_op(records)[0].value == average_op(records)[0].value
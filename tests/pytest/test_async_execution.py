@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from palimpzest.constants import Model
+from palimpzest.core.data.dataclasses import RecordOpStats
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.core.lib.schemas import DefaultSchema, Number
+from palimpzest.policy import MaxQuality
+from palimpzest.query.generators.generators import OpenAIGenerator
+from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.filter import LLMFilter, NonLLMFilter
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.nosentinel_processor import NoSentinelPipelinedAsyncProcessor
+
+
+@pytest.fixture
+def numbers():
+    return MemoryReader(list(range(20)))
+
+
+@pytest.fixture
+def processor(numbers):
+    return NoSentinelPipelinedAsyncProcessor(
+        dataset=numbers,
+        config=QueryProcessorConfig(max_concurrency_per_op=8),
+        optimizer=Optimizer(policy=MaxQuality(), cost_model=CostModel()),
+    )
+
+
+def even_filter_op():
+    return NonLLMFilter(
+        input_schema=DefaultSchema,
+        output_schema=DefaultSchema,
+        filter=Filter(filter_fn=lambda record: record["value"] % 2 == 0),
+    )
+
+
+def test_async_execution_preserves_order_and_limit(processor, numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    limit_op = LimitScanOp(limit=3, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(), limit_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    assert [record.value for record in output_records] == [0, 2, 4]
+    assert plan_stats.total_plan_time > 0.0
+
+
+class CountOp(AggregateOp):
+    def __call__(self, candidates: list[DataRecord]) -> DataRecordSet:
+        dr = DataRecord.from_parent(schema=Number, parent_record=candidates[-1])
+        dr.value = len(candidates)
+        record_op_stats = RecordOpStats(
+            record_id=dr.id,
+            record_parent_id=dr.parent_id,
+            record_source_idx=dr.source_idx,
+            record_state=dr.to_dict(),
+            op_id=self.get_op_id(),
+            logical_op_id=self.logical_op_id,
+            op_name=self.op_name(),
+            time_per_record=0.0,
+            cost_per_record=0.0,
+        )
+        return DataRecordSet([dr], [record_op_stats])
+
+
+def test_async_execution_with_aggregate(processor, numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    count_op = CountOp(input_schema=DefaultSchema, output_schema=Number)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(), count_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    assert len(output_records) == 1
+    assert output_records[0].value == 10
+    assert len(plan_stats.operator_stats[count_op.get_op_id()].record_op_stats_lst) == 1
+
+
+def test_async_execution_overlaps_llm_calls(mocker, processor, numbers, mock_completion):
+    num_in_flight, max_in_flight = 0, 0
+
+    async def agenerate_completion(self, client, payload, **kwargs):
+        nonlocal num_in_flight, max_in_flight
+        num_in_flight += 1
+        max_in_flight = max(max_in_flight, num_in_flight)
+        await asyncio.sleep(0.05)
+        num_in_flight -= 1
+        return mock_completion('ANSWER: TRUE\n---')
+
+    mocker.patch.object(OpenAIGenerator, "_get_async_client", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_agenerate_completion", agenerate_completion)
+
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = LLMFilter(
+        input_schema=DefaultSchema,
+        output_schema=DefaultSchema,
+        filter=Filter("The value is a number"),
+        model=Model.GPT_4o_MINI,
+    )
+    plan = PhysicalPlan(operators=[scan_op, filter_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    assert [record.value for record in output_records] == list(range(20))
+    assert max_in_flight == 8
+    assert plan_stats.total_plan_cost > 0.0
@@ -0,0 +1,152 @@
+import json
+import os
+import re
+
+import pytest
+
+from palimpzest.constants import BATCH_API_COST_DISCOUNT, BATCH_API_ENDPOINT, MODEL_CARDS, Model
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.lib.fields import StringField
+from palimpzest.core.lib.schemas import DefaultSchema
+from palimpzest.policy import MaxQuality
+from palimpzest.query.generators.batch_api import BatchSession, LocalBatchBackend
+from palimpzest.query.generators.generators import OpenAIGenerator, TogetherGenerator
+from palimpzest.query.operators.convert import LLMConvertBonded
+from palimpzest.query.operators.filter import LLMFilter
+from palimpzest.query.operators.rag_convert import RAGConvert
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.nosentinel_processor import NoSentinelBatchProcessor
+
+
+class Parity(DefaultSchema):
+    parity = StringField(desc="Whether the value is even or odd")
+
+
+def chat_completion_body(text, input_tokens=1000, output_tokens=100):
+    return {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 0,
+        "model": Model.GPT_4o_MINI.value,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": input_tokens, "completion_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+    }
+
+
+def respond(body):
+    """Answer filter prompts with whether the value is even and convert prompts with its parity."""
+    user_prompt = body["messages"][-1]["content"][0]["text"]
+    value = int(re.search(r'"value": (\d+)', user_prompt).group(1))
+    if value == 7:
+        raise ValueError("the provider could not process this request")
+
+    if "FILTER CONDITION" in user_prompt:
+        return chat_completion_body(f"REASONING: checked the value\nANSWER: {'TRUE' if value % 2 == 0 else 'FALSE'}\n---")
+
+    return chat_completion_body(f'REASONING: checked the value\nANSWER: {{"parity": "{"even" if value % 2 == 0 else "odd"}"}}\n---')
+
+
+@pytest.fixture
+def processor(mocker, tmp_path):
+    # the synchronous API must never be called
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_generate_completion", side_effect=AssertionError("synchronous call"))
+
+    numbers = MemoryReader(list(range(10)))
+    backend = LocalBatchBackend(respond, batch_dir=str(tmp_path))
+    config = QueryProcessorConfig(execution_strategy="batch", batch_backend=backend, batch_poll_interval_secs=0.0)
+    processor = NoSentinelBatchProcessor(
+        dataset=numbers, config=config, optimizer=Optimizer(policy=MaxQuality(), cost_model=CostModel())
+    )
+    return processor, numbers, backend
+
+
+def test_batch_execution_runs_one_batch_per_operator(processor, tmp_path):
+    processor, numbers, backend = processor
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = LLMFilter(
+        input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter("The value is even"), model=Model.GPT_4o_MINI
+    )
+    convert_op = LLMConvertBonded(input_schema=DefaultSchema, output_schema=Parity, model=Model.GPT_4o_MINI)
+    plan = PhysicalPlan(operators=[scan_op, filter_op, convert_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    assert [(record.value, record.parity) for record in output_records] == [(idx, "even") for idx in range(0, 10, 2)]
+
+    # each LLM operator submitted a single batch file with one request per input record
+    assert len(backend.batch_ids) == 2
+    with open(os.path.join(tmp_path, f"{backend.batch_ids[0]}_input.jsonl")) as f:
+        requests = [json.loads(line) for line in f]
+    assert len(requests) == 10
+    assert len({request["custom_id"] for request in requests}) == 10
+    assert all(request["method"] == "POST" and request["url"] == BATCH_API_ENDPOINT for request in requests)
+    assert all(request["body"]["model"] == Model.GPT_4o_MINI.value for request in requests)
+
+    # batched calls are billed at the discounted price
+    model_card = MODEL_CARDS[Model.GPT_4o_MINI.value]
+    sync_cost = 1000 * model_card["usd_per_input_token"] + 100 * model_card["usd_per_output_token"]
+    convert_stats = plan_stats.operator_stats[convert_op.get_op_id()].record_op_stats_lst
+    assert len(convert_stats) == 5
+    assert all(stats.cost_per_record == pytest.approx(sync_cost * BATCH_API_COST_DISCOUNT) for stats in convert_stats)
+
+
+def test_batch_execution_fails_records_whose_requests_errored(processor):
+    processor, numbers, backend = processor
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    convert_op = LLMConvertBonded(input_schema=DefaultSchema, output_schema=Parity, model=Model.GPT_4o_MINI)
+    plan = PhysicalPlan(operators=[scan_op, convert_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    parities = {record.value: record.parity for record in output_records}
+    assert parities[6] == "even" and parities[9] == "odd"
+    assert parities[7] is None
+
+    # the bonded convert's fallback for the failed record repeats its (single-field) payload, which is
+    # served from the batch's response instead of being submitted again
+    assert len(backend.batch_ids) == 1
+    convert_stats = plan_stats.operator_stats[convert_op.get_op_id()].record_op_stats_lst
+    assert sum(stats.failed_convert for stats in convert_stats) == 1
+
+
+def test_batch_execution_calls_other_providers_synchronously(processor, mocker, mock_completion):
+    processor, numbers, backend = processor
+    mocker.patch.object(TogetherGenerator, "_get_client_or_model", return_value=None)
+    generate = mocker.patch.object(
+        TogetherGenerator,
+        "_generate_completion",
+        return_value=mock_completion('ANSWER: {"parity": "even"}\n---', input_tokens=1000, output_tokens=100),
+    )
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    convert_op = LLMConvertBonded(input_schema=DefaultSchema, output_schema=Parity, model=Model.LLAMA3)
+    plan = PhysicalPlan(operators=[scan_op, convert_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    # the OpenAI batch backend does not serve Together models, thus their calls are not batched (or discounted)
+    assert len(output_records) == 10
+    assert generate.call_count == 10
+    assert backend.batch_ids == []
+    model_card = MODEL_CARDS[Model.LLAMA3.value]
+    sync_cost = 1000 * model_card["usd_per_input_token"] + 100 * model_card["usd_per_output_token"]
+    convert_stats = plan_stats.operator_stats[convert_op.get_op_id()].record_op_stats_lst
+    assert all(stats.cost_per_record == pytest.approx(sync_cost) for stats in convert_stats)
+
+
+def test_batch_session_memoizes_embeddings(mocker, tmp_path):
+    rag_op = RAGConvert(num_chunks_per_field=1, input_schema=DefaultSchema, output_schema=Parity, model=Model.GPT_4o_MINI)
+    rag_op.client = mocker.MagicMock()
+    rag_op.client.embeddings.create.return_value.data = [mocker.MagicMock(embedding=[1.0, 0.0])]
+
+    # the operator is re-invoked once per batch round; its embedding calls are only made in the first
+    session = BatchSession(LocalBatchBackend(respond, batch_dir=str(tmp_path)))
+    for _ in range(3):
+        with session.activate():
+            assert rag_op.compute_embedding("The value is 2") == [1.0, 0.0]
+    assert rag_op.client.embeddings.create.call_count == 1
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+from palimpzest.constants import MODEL_CARDS, Model, PromptStrategy
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import StringField
+from palimpzest.core.lib.schemas import DefaultSchema, TextFile
+from palimpzest.policy import MaxQuality
+from palimpzest.query.generators.generators import OpenAIGenerator
+from palimpzest.query.operators.batched import BatchedLLMConvertBonded, BatchedLLMFilter
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.optimizer.rules import BatchedLLMRule
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.nosentinel_processor import (
+    NoSentinelPipelinedAsyncProcessor,
+    NoSentinelPipelinedParallelProcessor,
+    NoSentinelSequentialSingleThreadProcessor,
+)
+
+
+class Email(TextFile):
+    sender = StringField(desc="The email address of the sender")
+
+
+
+def batch_answer(answers: list[dict]) -> str:
+    return f"REASONING: looked at each context\nANSWER:\n{json.dumps(answers)}\n---"
+
+
+@pytest.fixture
+def emails():
+    records = []
+    for idx, sender in enumerate(["alice@example.com", "bob@example.com", "carol@example.com"]):
+        record = DataRecord(schema=TextFile, source_idx=idx)
+        record.filename = f"email{idx}.txt"
+        record.contents = f"From: {sender}\nHello!"
+        records.append(record)
+    return records
+
+
+def test_batched_filter_parses_answers_and_amortizes_stats(mocker, emails, mock_completion):
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    generate = mocker.patch.object(
+        OpenAIGenerator,
+        "_generate_completion",
+        return_value=mock_completion(batch_answer([
+            {"idx": 2, "passed_operator": True},
+            {"idx": 0, "passed_operator": False},
+            {"idx": 1, "passed_operator": True},
+        ]), input_tokens=1000, output_tokens=100),
+    )
+    filter_op = BatchedLLMFilter(
+        batch_size=3,
+        input_schema=TextFile,
+        output_schema=TextFile,
+        filter=Filter("The email is from Bob or Carol"),
+        model=Model.GPT_4o_MINI,
+    )
+
+    record_sets = filter_op.batch_call(emails)
+
+    # all records are packed into a single prompt with indexed contexts
+    assert generate.call_count == 1
+    prompt = json.dumps(generate.call_args.args[1]["messages"])
+    assert all(f"[{idx}]" in prompt for idx in range(3))
+
+    assert [record_set[0].passed_operator for record_set in record_sets] == [False, True, True]
+    assert [record_set[0].parent_id for record_set in record_sets] == [email.id for email in emails]
+
+    # each record is charged one third of the tokens and cost of the call
+    stats = [record_set.record_op_stats[0] for record_set in record_sets]
+    assert all(stat.total_input_tokens == pytest.approx(1000 / 3) for stat in stats)
+    model_card = MODEL_CARDS[Model.GPT_4o_MINI.value]
+    assert sum(stat.cost_per_record for stat in stats) == pytest.approx(
+        1000 * model_card["usd_per_input_token"] + 100 * model_card["usd_per_output_token"]
+    )
+
+
+def test_batched_convert_regenerates_missing_records(mocker, emails, mock_completion):
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    generate = mocker.patch.object(
+        OpenAIGenerator,
+        "_generate_completion",
+        side_effect=[
+            # the first answer skips the record at index 1
+            mock_completion(batch_answer([{"idx": 0, "sender": "alice@example.com"}, {"idx": 2, "sender": "carol@example.com"}]), input_tokens=1000, output_tokens=100),
+            mock_completion(batch_answer([{"idx": 0, "sender": "bob@example.com"}]), input_tokens=1000, output_tokens=100),
+        ],
+    )
+    convert_op = BatchedLLMConvertBonded(
+        batch_size=3,
+        input_schema=TextFile,
+        output_schema=Email,
+        model=Model.GPT_4o_MINI,
+    )
+
+    record_sets = convert_op.batch_call(emails)
+
+    assert generate.call_count == 2
+    assert [record_set[0].sender for record_set in record_sets] == ["alice@example.com", "bob@example.com", "carol@example.com"]
+    assert all(record_set[0].contents == email.contents for record_set, email in zip(record_sets, emails))
+
+    # the tokens of both calls are amortized across all records in the batch
+    stats = [record_set.record_op_stats[0] for record_set in record_sets]
+    assert all(stat.total_input_tokens == pytest.approx(2000 / 3) for stat in stats)
+    assert not any(stat.failed_convert for stat in stats)
+
+
+def test_batched_rules_are_opt_in():
+    optimizer = Optimizer(policy=MaxQuality(), cost_model=CostModel(), available_models=[Model.GPT_4o_MINI])
+    assert not any(issubclass(rule, BatchedLLMRule) for rule in optimizer.implementation_rules)
+
+    optimizer = Optimizer(
+        policy=MaxQuality(), cost_model=CostModel(), available_models=[Model.GPT_4o_MINI], allow_batched_query=True
+    )
+    assert any(issubclass(rule, BatchedLLMRule) for rule in optimizer.implementation_rules)
+    assert optimizer.deepcopy_clean().allow_batched_query
+
+
+@pytest.mark.parametrize(
+    "processor_class",
+    [NoSentinelSequentialSingleThreadProcessor, NoSentinelPipelinedParallelProcessor, NoSentinelPipelinedAsyncProcessor],
+)
+def test_execution_strategies_dispatch_batches(mocker, processor_class, mock_completion):
+    batch_sizes = []
+
+    def generate_completion(self, client, payload, **kwargs):
+        user_prompt = payload["messages"][-1]["content"][0]["text"]
+        num_records = len(re.findall(r"^\[\d+\]$", user_prompt, flags=re.MULTILINE))
+        batch_sizes.append(num_records)
+        return mock_completion(batch_answer([{"idx": idx, "passed_operator": True} for idx in range(num_records)]))
+
+    async def agenerate_completion(self, client, payload, **kwargs):
+        await asyncio.sleep(0.01)
+        return generate_completion(self, client, payload, **kwargs)
+
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_get_async_client", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_generate_completion", generate_completion)
+    mocker.patch.object(OpenAIGenerator, "_agenerate_completion", agenerate_completion)
+
+    numbers = MemoryReader(list(range(10)))
+    processor = processor_class(
+        dataset=numbers,
+        config=QueryProcessorConfig(max_concurrency_per_op=8),
+        optimizer=Optimizer(policy=MaxQuality(), cost_model=CostModel()),
+    )
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = BatchedLLMFilter(
+        batch_size=4,
+        input_schema=DefaultSchema,
+        output_schema=DefaultSchema,
+        filter=Filter("The value is a number"),
+        model=Model.GPT_4o_MINI,
+        prompt_strategy=PromptStrategy.COT_BOOL_BATCH,
+    )
+    plan = PhysicalPlan(operators=[scan_op, filter_op])
+
+    output_records, plan_stats = processor.execute_plan(plan)
+
+    assert sorted(record.value for record in output_records) == list(range(10))
+    assert sorted(batch_sizes) == [2, 4, 4]
+    assert len(plan_stats.operator_stats[filter_op.get_op_id()].record_op_stats_lst) == 10
@@ -0,0 +1,158 @@
+import os
+import re
+import threading
+
+import pytest
+
+from palimpzest.constants import Model, PromptStrategy
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.core.lib.schemas import DefaultSchema, Number
+from palimpzest.policy import MaxQuality
+from palimpzest.query.execution.checkpoint import ExecutionCheckpoint
+from palimpzest.query.generators.generators import OpenAIGenerator
+from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.filter import LLMFilter
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.nosentinel_processor import NoSentinelPipelinedParallelProcessor
+from palimpzest.query.processor.query_processor_factory import QueryProcessorFactory
+
+
+class SimulatedCrash(BaseException):
+    """Stands in for the process dying (e.g. on OOM); as a BaseException, it is not caught by the generator."""
+
+
+class CountOp(AggregateOp):
+    def __call__(self, candidates: list[DataRecord]) -> DataRecordSet:
+        dr = DataRecord.from_parent(schema=Number, parent_record=candidates[-1])
+        dr.value = len(candidates)
+        return DataRecordSet([dr], [])
+
+
+class StubGenerator:
+    """Answers whether the record's value is even, and crashes on the call after `crash_after` calls (if set)."""
+    def __init__(self, mock_completion, crash_after: int | None = None):
+        self.mock_completion = mock_completion
+        self.crash_after = crash_after
+        self.values = []
+        self.lock = threading.Lock()
+
+    def __call__(self, client, payload, **kwargs):
+        user_prompt = payload["messages"][-1]["content"][0]["text"]
+        value = int(re.search(r'"value": (\d+)', user_prompt).group(1))
+        with self.lock:
+            if self.crash_after is not None and len(self.values) >= self.crash_after:
+                raise SimulatedCrash()
+            self.values.append(value)
+
+        answer = "TRUE" if value % 2 == 0 else "FALSE"
+        return self.mock_completion(f"REASONING: checked\nANSWER: {answer}\n---")
+
+
+@pytest.fixture
+def numbers():
+    return MemoryReader(list(range(20)))
+
+
+def create_plan(numbers, count=False):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = LLMFilter(
+        input_schema=DefaultSchema,
+        output_schema=DefaultSchema,
+        filter=Filter("The value is even"),
+        model=Model.GPT_4o_MINI,
+        prompt_strategy=PromptStrategy.COT_BOOL,
+    )
+    count_ops = [CountOp(input_schema=DefaultSchema, output_schema=Number)] if count else []
+    return PhysicalPlan(operators=[scan_op, filter_op, *count_ops])
+
+
+def execute(mocker, numbers, plan, generator, checkpoint_dir, resume=False, checkpoint_interval_secs=0.0):
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_generate_completion", generator)
+    config = QueryProcessorConfig(
+        execution_strategy="pipelined_parallel",
+        checkpoint_dir=checkpoint_dir,
+        checkpoint_interval_secs=checkpoint_interval_secs,
+        resume=resume,
+    )
+    processor = NoSentinelPipelinedParallelProcessor(
+        dataset=numbers, config=config, optimizer=Optimizer(policy=MaxQuality(), cost_model=CostModel())
+    )
+    return processor.execute_plan(plan)
+
+
+@pytest.mark.parametrize("checkpoint_interval_secs", [0.0, 3600.0])
+def test_resumed_execution_outputs_each_record_exactly_once(mocker, tmp_path, numbers, checkpoint_interval_secs, mock_completion):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    plan = create_plan(numbers)
+
+    # the execution dies partway; its progress is saved periodically (or, at the latest, as it dies)
+    crashing_generator = StubGenerator(mock_completion, crash_after=12)
+    with pytest.raises(SimulatedCrash):
+        execute(mocker, numbers, plan, crashing_generator, checkpoint_dir, checkpoint_interval_secs=checkpoint_interval_secs)
+    assert crashing_generator.values == list(range(12))
+
+    # the resumed execution only processes the source records which were not completed
+    generator = StubGenerator(mock_completion)
+    output_records, plan_stats = execute(mocker, numbers, plan, generator, checkpoint_dir, resume=True)
+    assert sorted(record.value for record in output_records) == list(range(0, 20, 2))
+    assert generator.values == list(range(12, 20))
+
+    # the plan stats include the filter's stats from the checkpoint, and the checkpoint is removed once the execution finishes
+    assert len(plan_stats.operator_stats[plan.operators[1].get_op_id()].record_op_stats_lst) == 20
+    assert os.listdir(checkpoint_dir) == []
+
+
+def test_restored_outputs_are_aggregated_once(mocker, tmp_path, numbers, mock_completion):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    plan = create_plan(numbers, count=True)
+    with pytest.raises(SimulatedCrash):
+        execute(mocker, numbers, plan, StubGenerator(mock_completion, crash_after=7), checkpoint_dir)
+
+    output_records, _ = execute(mocker, numbers, plan, StubGenerator(mock_completion), checkpoint_dir, resume=True)
+    assert [record.value for record in output_records] == [10]
+
+
+def test_partially_written_segments_are_ignored(tmp_path, numbers):
+    plan = create_plan(numbers)
+    checkpoint = ExecutionCheckpoint(str(tmp_path), ExecutionCheckpoint.get_key(plan, scan_start_idx=0, num_samples=float("inf")))
+    checkpoint.write({0: [{"value": 0}], 1: []}, operator_stats={})
+
+    # a segment which was not fully written is never renamed, thus it is not loaded
+    with open(os.path.join(checkpoint.path, ".segment-crashed.tmp"), "wb") as f:
+        f.write(b"truncated")
+
+    source_outputs, _ = ExecutionCheckpoint(str(tmp_path), os.path.basename(checkpoint.path)).load(DefaultSchema)
+    assert {source_idx: [record.value for record in records] for source_idx, records in source_outputs.items()} == {0: [0], 1: []}
+
+    # the key depends on the source records which are processed
+    assert ExecutionCheckpoint.get_key(plan, scan_start_idx=0, num_samples=10) != os.path.basename(checkpoint.path)
+
+
+@pytest.mark.parametrize("execution_strategy", ["pipelined_parallel", "PIPELINED_PARALLEL", "pipelined-parallel"])
+def test_checkpointing_accepts_any_spelling_of_the_execution_strategy(tmp_path, numbers, execution_strategy):
+    config = QueryProcessorConfig(execution_strategy=execution_strategy, checkpoint_dir=str(tmp_path))
+    processor = QueryProcessorFactory.create_processor(numbers, config)
+    assert isinstance(processor, NoSentinelPipelinedParallelProcessor)
+
+
+@pytest.mark.parametrize(
+    "config_kwargs, error",
+    [
+        ({"execution_strategy": "pipelined_parallel", "resume": True}, "resume requires"),
+        ({"execution_strategy": "sequential", "checkpoint_dir": "checkpoints"}, "only supported by the pipelined_parallel"),
+        ({"processing_strategy": "mab_sentinel", "checkpoint_dir": "checkpoints"}, "only supported by the nosentinel"),
+        ({"processing_strategy": "random_sampling", "checkpoint_dir": "checkpoints"}, "only supported by the nosentinel"),
+        ({"processing_strategy": "streaming", "checkpoint_dir": "checkpoints"}, "only supported by the nosentinel"),
+    ],
+)
+def test_checkpointing_is_rejected_by_unsupported_processors(numbers, config_kwargs, error):
+    config = QueryProcessorConfig(**{"execution_strategy": "pipelined_parallel", **config_kwargs})
+    with pytest.raises(ValueError, match=error):
+        QueryProcessorFactory.create_processor(numbers, config)
@@ -0,0 +1,140 @@
+import os
+import pickle
+import shutil
+
+import pandas as pd
+import pytest
+
+from palimpzest.core.data.datareaders import (
+    HTMLFileDirectoryReader,
+    ImageFileDirectoryReader,
+    PDFFileDirectoryReader,
+    XLSFileDirectoryReader,
+)
+from palimpzest.core.data.document_cache import ParsedDocumentCache, set_parsed_document_cache
+from palimpzest.tools.parsing import ParserPool
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ParsedDocumentCache(cache_dir=str(tmp_path / "cache"))
+    set_parsed_document_cache(cache)
+    yield cache
+    set_parsed_document_cache(None)
+    cache.close()
+
+
+@pytest.fixture
+def parse(mocker):
+    # parse documents in the calling thread, so that the parses can be counted
+    parser_pool = ParserPool(num_workers=0)
+    mocker.patch("palimpzest.core.data.datareaders.get_parser_pool", return_value=parser_pool)
+    return mocker.spy(parser_pool, "parse")
+
+
+@pytest.fixture
+def pdf_dir(tmp_path, make_pdf):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    for idx in range(3):
+        (pdf_dir / f"paper-{idx}.pdf").write_bytes(make_pdf(f"Paper number {idx}"))
+    return pdf_dir
+
+
+def test_repeated_reads_do_not_reparse_or_rehash(cache, parse, pdf_dir):
+    items = PDFFileDirectoryReader(str(pdf_dir)).get_batch([0, 1, 2])
+    assert parse.call_count == 3
+    assert cache.get_stats()["num_files_hashed"] == 3
+
+    # a new reader over the same files (e.g. in another sentinel pass) reads the parsed text from the cache
+    cached_items = PDFFileDirectoryReader(str(pdf_dir)).get_batch([0, 1, 2])
+    assert cached_items == items
+    assert [item["text_contents"].strip() for item in cached_items] == ["Paper number 0", "Paper number 1", "Paper number 2"]
+    assert parse.call_count == 3
+    assert cache.get_stats() == {"hits": 3, "misses": 3, "num_files_hashed": 3, "num_bytes": cache.num_bytes}
+
+    # the cache persists across processes
+    reopened_cache = ParsedDocumentCache(cache_dir=cache.cache_dir)
+    set_parsed_document_cache(reopened_cache)
+    assert PDFFileDirectoryReader(str(pdf_dir)).get_batch([0, 1, 2]) == items
+    assert reopened_cache.get_stats()["hits"] == 3 and reopened_cache.get_stats()["num_files_hashed"] == 0
+    reopened_cache.close()
+
+
+def test_cache_is_keyed_by_contents_reader_and_options(cache, parse, pdf_dir, make_pdf):
+    PDFFileDirectoryReader(str(pdf_dir))[0]
+
+    # a copy of a file is not parsed again, but it keeps its own filename
+    shutil.copy(pdf_dir / "paper-0.pdf", pdf_dir / "paper-3.pdf")
+    assert PDFFileDirectoryReader(str(pdf_dir))[3]["filename"] == "paper-3.pdf"
+    assert parse.call_count == 1
+
+    # a file is parsed again once its contents change
+    (pdf_dir / "paper-0.pdf").write_bytes(make_pdf("A revised paper"))
+    assert PDFFileDirectoryReader(str(pdf_dir))[0]["text_contents"].strip() == "A revised paper"
+    assert parse.call_count == 2
+
+    # as is a file which is parsed with different options
+    key = cache.get_key(str(pdf_dir / "paper-1.pdf"), "PDFFileDirectoryReader", {"pdfprocessor": "pypdf"})
+    assert key != cache.get_key(str(pdf_dir / "paper-1.pdf"), "PDFFileDirectoryReader", {"pdfprocessor": "cosmos"})
+    assert key != cache.get_key(str(pdf_dir / "paper-1.pdf"), "HTMLFileDirectoryReader", {"pdfprocessor": "pypdf"})
+
+
+def test_cache_evicts_least_recently_used_entries(cache):
+    field_values = {"text_contents": "x" * 1000}
+    cache.max_bytes = 3 * len(pickle.dumps(field_values))
+    for idx in range(3):
+        cache.put(f"key-{idx}", field_values)
+    cache.get("key-0")
+
+    cache.put("key-3", field_values)
+
+    assert cache.get("key-1") is None
+    assert all(cache.get(f"key-{idx}") == field_values for idx in [0, 2, 3])
+    assert len(cache) == 3 and cache.num_bytes == cache.max_bytes
+
+
+def test_readers_which_time_out_are_not_cached(cache, pdf_dir, mocker):
+    parser_pool = mocker.Mock(parse=mocker.Mock(side_effect=TimeoutError("timed out")))
+    mocker.patch("palimpzest.core.data.datareaders.get_parser_pool", return_value=parser_pool)
+
+    assert PDFFileDirectoryReader(str(pdf_dir))[0]["text_contents"] == ""
+    assert len(cache) == 0
+
+
+def write_html(path):
+    path.write_text("<p>Hello <a href='https://example.com'>world</a></p>")
+
+
+def write_image(path):
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + os.urandom(64))
+
+
+def write_xls(path):
+    pytest.importorskip("openpyxl", minversion="3.1.5")
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame({"a": [1, 2]}).to_excel(writer, sheet_name="first")
+        pd.DataFrame({"b": [3]}).to_excel(writer, sheet_name="second")
+
+
+@pytest.mark.parametrize(
+    "reader_cls, filename, write_file",
+    [
+        (HTMLFileDirectoryReader, "page.html", write_html),
+        (ImageFileDirectoryReader, "image.png", write_image),
+        (XLSFileDirectoryReader, "sheets.xlsx", write_xls),
+    ],
+    ids=["html", "image", "xls"],
+)
+def test_file_readers_use_cache(cache, parse, tmp_path, reader_cls, filename, write_file):
+    file_dir = tmp_path / "files"
+    file_dir.mkdir()
+    write_file(file_dir / filename)
+
+    item = reader_cls(str(file_dir))[0]
+    cached_item = reader_cls(str(file_dir))[0]
+
+    assert cached_item == item
+    assert item["filename"] == filename
+    assert cache.get_stats()["hits"] == 1 and cache.get_stats()["misses"] == 1
+    assert parse.call_count == (1 if reader_cls is HTMLFileDirectoryReader else 0)
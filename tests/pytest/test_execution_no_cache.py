@@ -11,6 +11,7 @@ from palimpzest.query.optimizer.cost_model import CostModel
 from palimpzest.query.optimizer.optimizer import Optimizer
 from palimpzest.query.processor.config import QueryProcessorConfig
 from palimpzest.query.processor.nosentinel_processor import (
+    NoSentinelPipelinedAsyncProcessor,
     NoSentinelPipelinedParallelProcessor,
     NoSentinelSequentialSingleThreadProcessor,
 )
@@ -21,6 +22,7 @@ from palimpzest.query.processor.nosentinel_processor import (
     argvalues=[
         pytest.param(NoSentinelSequentialSingleThreadProcessor, id="seq-single-thread"),
         pytest.param(NoSentinelPipelinedParallelProcessor, id="parallel"),
+        pytest.param(NoSentinelPipelinedAsyncProcessor, id="async"),
     ]
 )
 class TestParallelExecutionNoCache:
@@ -0,0 +1,68 @@
+import pytest
+
+from palimpzest.constants import Model, PromptStrategy
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import StringField
+from palimpzest.core.lib.schemas import TextFile
+from palimpzest.query.generators.cache import LLMResponseCache, get_response_cache, set_response_cache
+from palimpzest.query.generators.generators import OpenAIGenerator
+
+
+class Email(TextFile):
+    sender = StringField(desc="The email address of the sender")
+
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm_cache.sqlite"), max_entries=2)
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+    cache.close()
+
+
+@pytest.fixture
+def candidate():
+    record = DataRecord(schema=TextFile, source_idx=0)
+    record.filename = "email.txt"
+    record.contents = "From: alice@example.com\nHello!"
+    return record
+
+
+def test_cache_eviction_is_lru(response_cache):
+    response_cache.put("a", "A", {"input_tokens": 1, "output_tokens": 1})
+    response_cache.put("b", "B", {"input_tokens": 1, "output_tokens": 1})
+    assert response_cache.get("a") is not None
+    response_cache.put("c", "C", {"input_tokens": 1, "output_tokens": 1})
+
+    assert len(response_cache) == 2
+    assert response_cache.get("b") is None
+    assert response_cache.get("a")[0] == "A"
+    assert response_cache.get("c")[0] == "C"
+
+
+def test_generator_cache_hit(mocker, response_cache, candidate, mock_completion):
+    generator = OpenAIGenerator(Model.GPT_4o_MINI, PromptStrategy.COT_QA)
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    generate = mocker.patch.object(
+        OpenAIGenerator,
+        "_generate_completion",
+        return_value=mock_completion('ANSWER: {"sender": "alice@example.com"}\n---'),
+    )
+    gen_kwargs = {"project_cols": ["contents"], "output_schema": Email}
+
+    # the first call misses the cache and is charged for the generation
+    field_answers, _, miss_stats = generator(candidate, ["sender"], **gen_kwargs)
+    assert field_answers == {"sender": ["alice@example.com"]}
+    assert miss_stats.cache_misses == 1 and miss_stats.cache_hits == 0
+    assert miss_stats.cost_per_record > 0.0
+
+    # the second (identical) call is served from the cache at zero cost
+    field_answers, _, hit_stats = generator(candidate, ["sender"], **gen_kwargs)
+    assert field_answers == {"sender": ["alice@example.com"]}
+    assert hit_stats.cache_hits == 1 and hit_stats.cache_misses == 0
+    assert hit_stats.cost_per_record == 0.0
+    assert hit_stats.total_input_tokens == 0.0
+    assert generate.call_count == 1
+    assert get_response_cache().hits == 1
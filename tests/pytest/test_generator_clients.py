@@ -0,0 +1,71 @@
+import asyncio
+import gc
+from concurrent.futures import ThreadPoolExecutor
+
+from palimpzest.query.generators.clients import ClientRegistry
+
+
+def test_clients_are_reused_per_key():
+    registry = ClientRegistry()
+    client = registry.get_client("openai", "test-key")
+
+    assert registry.get_client("openai", "test-key") is client
+    assert registry.get_client("openai", "other-key") is not client
+    assert registry.get_client("together", "test-key") is not client
+    assert registry.get_stats() == {"num_clients": 3, "num_clients_created": 3, "num_client_reuses": 1}
+    registry.close()
+
+
+def test_clients_are_shared_across_threads():
+    registry = ClientRegistry()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: registry.get_client("openai", "test-key"), range(64)))
+
+    assert all(client is clients[0] for client in clients)
+    assert registry.num_clients_created == 1
+    assert registry.num_client_reuses == 63
+    registry.close()
+
+
+def test_configure_replaces_clients():
+    registry = ClientRegistry(max_connections=10)
+    client = registry.get_client("openai", "test-key")
+
+    # re-applying the same settings keeps the warm client
+    registry.configure(max_connections=10)
+    assert registry.get_client("openai", "test-key") is client
+
+    # changing the pool settings creates a new client
+    registry.configure(max_connections=20)
+    assert registry.get_client("openai", "test-key") is not client
+    registry.close()
+
+
+def test_configure_does_not_close_clients_in_use():
+    registry = ClientRegistry(max_connections=10)
+    client = registry.get_client("openai", "test-key")
+
+    # a client which is still referenced (e.g. by an in-flight request) stays open after the swap
+    registry.configure(max_connections=20)
+    assert not client._client.is_closed
+
+    # and its connection pool is closed once the last reference to it is released
+    http_client = client._client
+    del client
+    gc.collect()
+    assert http_client.is_closed
+    registry.close()
+
+
+def test_async_clients_are_closed_with_their_loop():
+    registry = ClientRegistry()
+
+    async def run():
+        client = registry.get_async_client("openai", "test-key")
+        assert registry.get_async_client("openai", "test-key") is client
+        await registry.aclose_loop_clients()
+        return client
+
+    client = asyncio.run(run())
+    assert client._client.is_closed
+    assert len(registry._async_clients) == 0
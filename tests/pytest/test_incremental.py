@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from palimpzest.constants import Model
+from palimpzest.core.data.datareaders import TextFileDirectoryReader
+from palimpzest.core.data.manifest import SourceManifest
+from palimpzest.core.elements.groupbysig import GroupBySig
+from palimpzest.policy import MaxQuality
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.query_processor_factory import QueryProcessorFactory
+from palimpzest.sets import Dataset
+
+
+class CallLog(list):
+    """The files parsed by the UDF; as its repr omits its contents, the UDF's hash does not change as files are parsed."""
+    def __repr__(self):
+        return "CallLog()"
+
+
+PARSED_FILENAMES = CallLog()
+
+
+def parse_number(record):
+    PARSED_FILENAMES.append(record["filename"])
+    number = int(record["contents"])
+    return {"number": number, "parity": "even" if number % 2 == 0 else "odd"}
+
+
+def is_not_seven(record):
+    return record["number"] != 7
+
+
+@pytest.fixture(autouse=True)
+def reset_parsed_filenames():
+    PARSED_FILENAMES.clear()
+
+
+@pytest.fixture
+def number_dir(tmp_path):
+    number_dir = tmp_path / "numbers"
+    number_dir.mkdir()
+    for number in range(10):
+        (number_dir / f"{number:02d}.txt").write_text(str(number))
+    return number_dir
+
+
+def numbers(number_dir):
+    cols = [{"name": "number", "type": int}, {"name": "parity", "type": str}]
+    return Dataset(TextFileDirectoryReader(str(number_dir))).add_columns(udf=parse_number, cols=cols).filter(is_not_seven)
+
+
+def run(dataset, tmp_path, **kwargs):
+    config = QueryProcessorConfig(
+        policy=MaxQuality(),
+        available_models=[Model.GPT_4o_MINI],
+        incremental=True,
+        manifest_dir=str(tmp_path / "manifest"),
+        **kwargs,
+    )
+    return dataset.run(config)
+
+
+@pytest.mark.parametrize("execution_strategy", ["sequential", "pipelined_parallel"])
+def test_only_new_and_changed_files_are_processed(tmp_path, number_dir, execution_strategy):
+    assert [record.number for record in run(numbers(number_dir), tmp_path, execution_strategy=execution_strategy)] == [0, 1, 2, 3, 4, 5, 6, 8, 9]
+    assert len(PARSED_FILENAMES) == 10
+
+    # add, modify, delete, and touch (without modifying) a file
+    (number_dir / "10.txt").write_text("10")
+    (number_dir / "02.txt").write_text("12")
+    (number_dir / "05.txt").unlink()
+    os.utime(number_dir / "08.txt", ns=(0, 0))
+    PARSED_FILENAMES.clear()
+
+    output = run(numbers(number_dir), tmp_path, execution_strategy=execution_strategy)
+    assert [record.number for record in output] == [0, 1, 12, 3, 4, 6, 8, 9, 10]
+    assert sorted(PARSED_FILENAMES) == ["02.txt", "10.txt"]
+
+    # the outputs match those of a full execution
+    assert [record.field_values for record in output] == [record.field_values for record in numbers(number_dir).run(policy=MaxQuality(), available_models=[Model.GPT_4o_MINI])]
+
+    # once the manifest is up to date, nothing is processed
+    PARSED_FILENAMES.clear()
+    assert len(run(numbers(number_dir), tmp_path, execution_strategy=execution_strategy)) == 9
+    assert PARSED_FILENAMES == []
+
+
+def test_aggregates_are_recomputed_from_stored_partials(tmp_path, number_dir):
+    group_by = GroupBySig(["parity"], ["count"], ["number"])
+    assert [record.value for record in run(numbers(number_dir).count(), tmp_path)] == [9]
+    assert sorted(record.field_values["count(number)"] for record in run(numbers(number_dir).groupby(group_by), tmp_path)) == [4, 5]
+
+    # the outputs of deleted files are retracted from the aggregates
+    (number_dir / "00.txt").unlink()
+    (number_dir / "02.txt").unlink()
+    (number_dir / "11.txt").write_text("11")
+    PARSED_FILENAMES.clear()
+
+    assert [record.value for record in run(numbers(number_dir).count(), tmp_path)] == [8]
+    groups = {record.parity: record.field_values["count(number)"] for record in run(numbers(number_dir).groupby(group_by), tmp_path)}
+    assert groups == {"even": 3, "odd": 5}
+    assert PARSED_FILENAMES == ["11.txt", "11.txt"]
+
+    # the manifest stores an entry for each of the directory's files for each of the two plans
+    manifest = SourceManifest(str(tmp_path / "manifest"))
+    assert len(manifest) == 2 * 9
+    manifest.close()
+
+
+def test_plans_with_limits_are_executed_in_full(tmp_path, number_dir):
+    assert len(run(numbers(number_dir).limit(3), tmp_path)) == 3
+    assert len(run(numbers(number_dir).limit(3), tmp_path)) == 3
+    manifest = SourceManifest(str(tmp_path / "manifest"))
+    assert len(manifest) == 0
+    manifest.close()
+
+    # as are plans whose UDFs cannot be hashed (here, a filter which captures an object without a repr of its own)
+    excluded = type("Excluded", (), {"number": 7})()
+    assert len(run(numbers(number_dir).filter(lambda record: record["number"] != excluded.number), tmp_path)) == 9
+    manifest = SourceManifest(str(tmp_path / "manifest"))
+    assert len(manifest) == 0
+    manifest.close()
+
+    with pytest.raises(ValueError, match="scan_start_idx must be 0"):
+        QueryProcessorFactory.create_processor(numbers(number_dir), QueryProcessorConfig(incremental=True, scan_start_idx=2))
@@ -0,0 +1,197 @@
+import pickle
+
+import pytest
+
+from palimpzest.constants import Model
+from palimpzest.core.data.datareaders import MemoryReader, TextFileDirectoryReader
+from palimpzest.core.data.materialization_cache import (
+    MaterializationCache,
+    get_materialization_cache,
+    set_materialization_cache,
+)
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.schemas import DefaultSchema
+from palimpzest.policy import MaxQuality
+from palimpzest.query.execution.single_threaded_execution_strategy import SequentialSingleThreadExecutionStrategy
+from palimpzest.query.operators.filter import NonLLMFilter
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.sets import Dataset
+
+
+class CallCounts(dict):
+    """The number of calls to each UDF; as its repr omits the counts, the UDFs' hashes do not change as they are called."""
+    def __repr__(self):
+        return "CallCounts()"
+
+
+CALLS = CallCounts(add_double=0, is_even=0, is_large=0)
+
+
+def add_double(record):
+    CALLS["add_double"] += 1
+    return {"double": record["value"] * 2}
+
+
+def is_even(record):
+    CALLS["is_even"] += 1
+    return record["value"] % 2 == 0
+
+
+def is_large(record):
+    CALLS["is_large"] += 1
+    return record["double"] > 10
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    for fn_name in CALLS:
+        CALLS[fn_name] = 0
+
+
+def get_config(cache_dir, **kwargs):
+    return QueryProcessorConfig(
+        policy=MaxQuality(),
+        available_models=[Model.GPT_4o_MINI],
+        processing_strategy="no_sentinel",
+        materialization_cache_dir=str(cache_dir),
+        **{"nocache": False, **kwargs},
+    )
+
+
+def even_doubles(values):
+    return Dataset(values).add_columns(udf=add_double, cols=[{"name": "double", "type": int}]).filter(is_even)
+
+
+@pytest.mark.parametrize("execution_strategy", ["sequential", "pipelined", "pipelined_parallel", "pipelined_async"])
+def test_appending_an_operator_only_executes_it(tmp_path, execution_strategy):
+    config = get_config(tmp_path, execution_strategy=execution_strategy)
+    doubles = [record.double for record in even_doubles(list(range(20))).run(config)]
+    assert doubles == list(range(0, 40, 4))
+    assert CALLS == {"add_double": 20, "is_even": 20, "is_large": 0}
+
+    # the output of the previous plan is scanned from the cache, thus only the new filter is executed
+    output = even_doubles(list(range(20))).filter(is_large).run(config)
+    assert sorted(record.double for record in output) == [double for double in doubles if double > 10]
+    assert CALLS == {"add_double": 20, "is_even": 20, "is_large": 10}
+    assert "CacheScanDataOp" in next(iter(output.execution_stats.plan_strs.values()))
+
+    # re-running the extended plan executes nothing
+    assert sorted(record.double for record in even_doubles(list(range(20))).filter(is_large).run(config)) == [12, 16, 20, 24, 28, 32, 36]
+    assert CALLS == {"add_double": 20, "is_even": 20, "is_large": 10}
+
+
+class Threshold:
+    """A threshold without a repr of its own, thus the UDFs which capture it cannot be told apart by their hash."""
+    def __init__(self, value):
+        self.value = value
+
+
+def exceeds(threshold):
+    def exceeds_threshold(record):
+        CALLS["is_large"] += 1
+        return record["double"] > threshold.value
+    return exceeds_threshold
+
+
+def test_udfs_which_cannot_be_hashed_are_not_materialized(tmp_path):
+    config = get_config(tmp_path)
+    assert [record.double for record in even_doubles(list(range(20))).filter(exceeds(Threshold(10))).run(config)] == list(range(12, 40, 4))
+
+    # a filter which only differs in the object it captures is executed again (on the cached output of the prefix)
+    assert [record.double for record in even_doubles(list(range(20))).filter(exceeds(Threshold(30))).run(config)] == [32, 36]
+    assert CALLS == {"add_double": 20, "is_even": 20, "is_large": 20}
+
+
+def test_cache_is_keyed_by_input_data(tmp_path):
+    config = get_config(tmp_path)
+    even_doubles(list(range(20))).run(config)
+
+    # the same plan over different data is executed again
+    assert [record.double for record in even_doubles(list(range(10, 30))).run(config)] == list(range(20, 60, 4))
+    assert CALLS["add_double"] == 40
+
+    # as is a plan over a directory whose files were modified
+    text_dir = tmp_path / "texts"
+    text_dir.mkdir()
+    (text_dir / "a.txt").write_text("first")
+    fingerprint = TextFileDirectoryReader(str(text_dir)).get_fingerprint()
+    (text_dir / "a.txt").write_text("second version")
+    assert TextFileDirectoryReader(str(text_dir)).get_fingerprint() != fingerprint
+
+
+def test_partial_executions_are_not_materialized(tmp_path):
+    set_materialization_cache(MaterializationCache(cache_dir=str(tmp_path)))
+    datareader = MemoryReader(list(range(20)))
+    plan = PhysicalPlan(
+        operators=[
+            MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=datareader),
+            NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=is_even), target_cache_id="even"),
+            LimitScanOp(limit=3, input_schema=DefaultSchema, output_schema=DefaultSchema, target_cache_id="limit"),
+            NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=is_even), target_cache_id="even-again"),
+        ]
+    )
+
+    # only the operators downstream of the (last) limit are materialized
+    cache_ids = SequentialSingleThreadExecutionStrategy(nocache=False)._open_materialization_caches(plan, float("inf"))
+    assert cache_ids[:2] == [None, None] and None not in cache_ids[2:]
+
+    # and nothing is materialized for executions of a sample of the source records (or if caching is disabled)
+    assert SequentialSingleThreadExecutionStrategy(nocache=False)._open_materialization_caches(plan, 5) == [None] * 4
+    assert SequentialSingleThreadExecutionStrategy(nocache=False, scan_start_idx=5)._open_materialization_caches(plan, float("inf")) == [None] * 4
+    assert SequentialSingleThreadExecutionStrategy(nocache=True)._open_materialization_caches(plan, float("inf")) == [None] * 4
+
+    even_doubles(list(range(20))).run(get_config(tmp_path, nocache=True))
+    assert get_materialization_cache() is None
+
+
+def get_records(num_records):
+    records = []
+    for idx in range(num_records):
+        record = DataRecord(DefaultSchema, source_idx=idx)
+        record.value = str(idx % 10) * 1000
+        records.append(record)
+    return records
+
+
+def test_cache_evicts_least_recently_used_results(tmp_path):
+    cache = MaterializationCache(cache_dir=str(tmp_path))
+    cache.max_bytes = 3 * len(pickle.dumps([{"value": "0" * 1000}]))
+    for idx in range(3):
+        cache.open_cache(f"result-{idx}")
+        cache.append_cache(f"result-{idx}", get_records(1))
+        cache.close_cache(f"result-{idx}")
+    cache.get_cached_result("result-0")
+
+    cache.append_cache("result-3", get_records(1))
+    cache.close_cache("result-3")
+
+    assert "result-1" not in cache
+    assert all(cache.get_cached_result(f"result-{idx}") == [{"value": "0" * 1000}] for idx in [0, 2, 3])
+    assert len(cache) == 3 and cache.num_bytes == cache.max_bytes
+
+    # results which do not fit in the cache are not written
+    cache.append_cache("result-4", get_records(4))
+    cache.close_cache("result-4")
+    assert "result-4" not in cache and len(cache) == 3
+    cache.close()
+
+
+def test_results_are_cached_in_source_order(tmp_path):
+    cache = MaterializationCache(cache_dir=str(tmp_path))
+    records = get_records(3)
+    for record, value in zip(records, ["a", "b", "c"]):
+        record.value = value
+    records[1].passed_operator = False
+
+    # parallel executions may output records out of order; records which were filtered out are not cached
+    cache.append_cache("result", [records[2], records[1], records[0]])
+    cache.close_cache("result")
+
+    assert cache.get_cached_result("result") == [{"value": "a"}, {"value": "c"}]
+    assert MaterializationCache.get_source_cache_id(MemoryReader([1, 2])) == MaterializationCache.get_source_cache_id(MemoryReader([1, 2]))
+    assert MaterializationCache.get_source_cache_id(MemoryReader([1, 2])) != MaterializationCache.get_source_cache_id(MemoryReader([2, 1]))
+    cache.close()
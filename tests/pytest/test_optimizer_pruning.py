@@ -0,0 +1,99 @@
+import pytest
+
+from palimpzest.constants import Model
+from palimpzest.core.data.dataclasses import OperatorCostEstimates, PlanCost
+from palimpzest.policy import MaxQuality, MaxQualityAtFixedCost, MinCostAtFixedQuality
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.optimizer_strategy import OptimizationStrategyType, ParetoStrategy
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.optimizer.tasks import OptimizePhysicalExpression
+from palimpzest.sets import Dataset
+
+MODELS = [Model.GPT_4o, Model.GPT_4o_MINI, Model.LLAMA3]
+
+
+def create_plan(num_ops: int) -> Dataset:
+    # every filter only depends on the input field, thus it may be pushed down below the other operators
+    dataset = Dataset(list(range(10)))
+    for idx in range(num_ops):
+        if idx % 2 == 0:
+            dataset = dataset.sem_add_columns([{"name": f"field_{idx}", "type": str, "desc": f"Property #{idx}"}], depends_on=["value"])
+        else:
+            dataset = dataset.sem_filter(f"The value satisfies condition #{idx}", depends_on=["value"])
+    return dataset
+
+
+def optimize(policy, strategy=OptimizationStrategyType.PARETO, max_pareto_frontier_size=None):
+    optimizer = Optimizer(
+        policy=policy,
+        cost_model=CostModel(),
+        available_models=MODELS,
+        optimization_strategy_type=strategy,
+        max_pareto_frontier_size=max_pareto_frontier_size,
+    )
+    return optimizer, optimizer.optimize(create_plan(5), policy)
+
+
+def get_frontiers(optimizer):
+    return [
+        expr.pareto_optimal_plan_costs
+        for group in optimizer.groups.values()
+        for expr in group.pareto_optimal_physical_expressions or []
+    ]
+
+
+def make_plan_cost(cost, quality):
+    plan_cost = PlanCost(cost=cost, time=1.0, quality=quality)
+    plan_cost.op_estimates = OperatorCostEstimates(cardinality=10, time_per_record=0.1, cost_per_record=cost / 10, quality=quality)
+    return plan_cost
+
+
+def test_pareto_frontiers_are_pruned():
+    policy = MaxQualityAtFixedCost(max_cost=0.5)
+    optimizer, _ = optimize(policy)
+
+    # no plan cost on an expression's frontier is dominated by another plan cost on the frontier
+    task = OptimizePhysicalExpression(None)
+    for plan_costs in get_frontiers(optimizer):
+        for idx, (plan_cost, _) in enumerate(plan_costs):
+            assert not any(
+                task._is_dominated(plan_cost, other_plan_cost, policy)
+                for other_idx, (other_plan_cost, _) in enumerate(plan_costs)
+                if idx != other_idx
+            )
+
+    # plan costs which are tied (and thus dominate each other) are pruned to one of them
+    tied_plan_costs = [(make_plan_cost(0.1, 0.9), None), (make_plan_cost(0.1, 0.9), None), (make_plan_cost(0.2, 0.8), None)]
+    assert task._get_pareto_optimal_plan_costs(tied_plan_costs, policy) == tied_plan_costs[:1]
+
+
+def test_pareto_plans_are_memoized_per_group(mocker):
+    policy = MaxQualityAtFixedCost(max_cost=0.5)
+    optimizer = Optimizer(policy=policy, cost_model=CostModel(), available_models=MODELS)
+    final_group_id = optimizer.convert_query_plan_to_group_tree(create_plan(5))
+    optimizer.search_optimization_space(final_group_id)
+
+    # each group's candidate plans are constructed once, even though many downstream expressions extend them
+    from_ops_and_sub_plan = mocker.spy(PhysicalPlan, "from_ops_and_sub_plan")
+    memo = {}
+    ParetoStrategy()._get_candidate_pareto_physical_plans(optimizer.groups, final_group_id, policy, memo)
+    assert from_ops_and_sub_plan.call_count == sum(len(plans) for plans in memo.values() if len(plans[0].operators) > 1)
+
+
+@pytest.mark.parametrize("max_pareto_frontier_size", [1, 2, 4])
+def test_pareto_frontier_size_is_capped(max_pareto_frontier_size):
+    optimizer, plans = optimize(MinCostAtFixedQuality(min_quality=0.05), max_pareto_frontier_size=max_pareto_frontier_size)
+    assert len(plans) == 1
+    assert max(len(plan_costs) for plan_costs in get_frontiers(optimizer)) <= max_pareto_frontier_size
+
+    # the cap keeps plan costs across the frontier (rather than only the cheapest), thus the constraint can be satisfied
+    if max_pareto_frontier_size > 1:
+        assert optimizer.policy.constraint(plans[0].plan_cost)
+
+
+def test_pruned_search_finds_the_optimal_plan():
+    # for a single-metric policy, the greedy plan is optimal, thus the (pruned) pareto search must find it
+    _, pareto_plans = optimize(MaxQuality())
+    _, greedy_plans = optimize(MaxQuality(), strategy=OptimizationStrategyType.GREEDY)
+    assert pareto_plans[0].plan_id == greedy_plans[0].plan_id
@@ -0,0 +1,238 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from palimpzest.core.data.dataclasses import OperatorStats, PlanStats
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.core.lib.schemas import DefaultSchema, Number
+from palimpzest.policy import MaxQuality
+from palimpzest.query.execution.execution_strategy import ExecutionStrategy, QueueBudget
+from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy, PipelineScheduler
+from palimpzest.query.execution.single_threaded_execution_strategy import PipelinedSingleThreadExecutionStrategy
+from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.filter import NonLLMFilter
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.physical import PhysicalOperator
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.nosentinel_processor import NoSentinelPipelinedParallelProcessor
+from palimpzest.utils.progress import PeakMemoryMonitor
+
+
+@pytest.fixture
+def numbers():
+    return MemoryReader(list(range(20)))
+
+
+@pytest.fixture
+def processor(numbers):
+    return NoSentinelPipelinedParallelProcessor(
+        dataset=numbers,
+        config=QueryProcessorConfig(max_workers=4),
+        optimizer=Optimizer(policy=MaxQuality(), cost_model=CostModel()),
+    )
+
+
+def even_filter_op(sleep_secs=0.0):
+    def is_even(record):
+        time.sleep(sleep_secs if record["value"] == 0 else 0.0)
+        return record["value"] % 2 == 0
+
+    return NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=is_even))
+
+
+class CountOp(AggregateOp):
+    def __call__(self, candidates: list[DataRecord]) -> DataRecordSet:
+        dr = DataRecord.from_parent(schema=Number, parent_record=candidates[-1])
+        dr.value = len(candidates)
+        return DataRecordSet([dr], [])
+
+
+def test_parallel_execution_with_limit(processor, numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    limit_op = LimitScanOp(limit=3, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(), limit_op])
+
+    output_records, _ = processor.execute_plan(plan, plan_workers=4)
+
+    assert len(output_records) == 3
+    assert all(record.value % 2 == 0 for record in output_records)
+
+
+def test_parallel_execution_stops_scan_at_intermediate_limit(processor, numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    limit_op = LimitScanOp(limit=2, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    count_op = CountOp(input_schema=DefaultSchema, output_schema=Number)
+    plan = PhysicalPlan(operators=[scan_op, limit_op, count_op])
+
+    output_records, plan_stats = processor.execute_plan(plan, plan_workers=4)
+
+    # the aggregate only sees the records which passed the limit, and the scan stops once it is reached
+    assert [record.value for record in output_records] == [2]
+    assert len(plan_stats.operator_stats[scan_op.get_op_id()].record_op_stats_lst) == 2
+
+
+def test_parallel_execution_reads_ahead_of_limit_by_estimated_selectivity():
+    numbers = MemoryReader(list(range(1000)))
+    filtered_values = []
+
+    def is_multiple_of_ten(record):
+        filtered_values.append(record["value"])
+        time.sleep(0.02)
+        return record["value"] % 10 == 0
+
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=is_multiple_of_ten))
+    limit_op = LimitScanOp(limit=3, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, filter_op, limit_op])
+
+    strategy = PipelinedParallelExecutionStrategy(max_workers=64)
+    output_records, _ = strategy.execute_plan(plan, plan_workers=64)
+
+    # 21 records are needed to produce the limit; the scan does not read ahead by one record per worker
+    assert sorted(record.value for record in output_records) == [0, 10, 20]
+    assert len(filtered_values) < 40
+
+
+def test_parallel_execution_drops_upstream_work_once_limit_is_reached():
+    numbers = MemoryReader(list(range(20)))
+    filtered_values = []
+
+    def is_zero(record):
+        filtered_values.append(record["value"])
+        return record["value"] == 0
+
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=is_zero))
+    limit_op = LimitScanOp(limit=1, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, filter_op, limit_op, even_filter_op()])
+
+    output_records, _ = PipelinedParallelExecutionStrategy(max_workers=1).execute_plan(plan, plan_workers=1)
+
+    # the record which is scanned while the first record is being filtered is not filtered
+    assert [record.value for record in output_records] == [0]
+    assert filtered_values == [0]
+
+
+def test_pipeline_scheduler_cancels_upstream_futures_once_limit_is_reached(numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    limit_op = LimitScanOp(limit=1, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(), limit_op])
+    plan_stats = PlanStats(plan_id=plan.plan_id)
+    for op in plan.operators:
+        plan_stats.operator_stats[op.get_op_id()] = OperatorStats(op_id=op.get_op_id(), op_name=op.op_name())
+
+    # block the executor's only worker, so that the filter's futures are queued behind it
+    executor, is_blocked = ThreadPoolExecutor(max_workers=1), threading.Event()
+    executor.submit(is_blocked.wait)
+    try:
+        scheduler = PipelineScheduler(plan, plan_stats, executor)
+        records = [DataRecord(DefaultSchema, source_idx=idx) for idx in range(3)]
+        for record in records:
+            scheduler._submit(1, PhysicalOperator.execute_op_wrapper, record)
+
+        # once a record reaches the limit, the queued filter futures are cancelled and processed without output
+        filter_futures = list(scheduler.pending_futures)
+        scheduler._enqueue(2, records[0])
+        assert scheduler.scan_is_stopped and all(future.cancelled() for future in filter_futures)
+        is_blocked.set()
+        while len(scheduler.pending_futures) > 0:
+            future = scheduler.completed_futures.get(timeout=10)
+            scheduler.pending_futures.discard(future)
+            scheduler._process_future(future)
+    finally:
+        is_blocked.set()
+        executor.shutdown()
+
+    assert scheduler.num_in_flight == [0, 0, 0] and scheduler.future_to_input == {}
+    assert [record.source_idx for record in scheduler.output_records] == [0]
+
+
+def test_estimate_records_per_source():
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=MemoryReader([]))
+    limit_op = LimitScanOp(limit=1, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(), even_filter_op(), limit_op])
+
+    assert ExecutionStrategy.estimate_records_per_source(plan) == [1.0, 1.0, 0.5, 0.25]
+
+
+def test_parallel_execution_runs_aggregate_once_upstream_is_finished(processor, numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    count_op = CountOp(input_schema=DefaultSchema, output_schema=Number)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(sleep_secs=0.1), count_op])
+
+    output_records, plan_stats = processor.execute_plan(plan, plan_workers=4)
+
+    assert [record.value for record in output_records] == [10]
+    assert len(plan_stats.operator_stats[scan_op.get_op_id()].record_op_stats_lst) == 20
+    assert plan_stats.total_plan_time < 1.0
+
+
+class LoggingReader(MemoryReader):
+    """A MemoryReader which logs the number of scanned records which have not been filtered yet at each scan."""
+    def __init__(self, vals):
+        super().__init__(vals)
+        self.num_scanned, self.num_filtered = 0, 0
+        self.num_queued_at_scan = []
+
+    def __getitem__(self, idx):
+        self.num_queued_at_scan.append(self.num_scanned - self.num_filtered)
+        self.num_scanned += 1
+        return super().__getitem__(idx)
+
+
+def test_parallel_execution_throttles_scan_when_queue_is_full():
+    numbers = LoggingReader(list(range(20)))
+
+    def slow_is_even(record):
+        time.sleep(0.01)
+        numbers.num_filtered += 1
+        return record["value"] % 2 == 0
+
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    filter_op = NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=slow_is_even))
+    plan = PhysicalPlan(operators=[scan_op, filter_op])
+
+    strategy = PipelinedParallelExecutionStrategy(max_workers=16, max_queued_records=2)
+    output_records, _ = strategy.execute_plan(plan, plan_workers=16)
+
+    # the scan is paused while two records are waiting on (or being processed by) the filter
+    assert sorted(record.value for record in output_records) == list(range(0, 20, 2))
+    assert max(numbers.num_queued_at_scan) < 2
+
+
+def test_pipelined_execution_with_bounded_queues(numbers):
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=numbers)
+    count_op = CountOp(input_schema=DefaultSchema, output_schema=Number)
+    plan = PhysicalPlan(operators=[scan_op, even_filter_op(), count_op])
+
+    strategy = PipelinedSingleThreadExecutionStrategy(max_queued_records=1, max_queued_bytes=1)
+    output_records, _ = strategy.execute_plan(plan)
+
+    assert [record.value for record in output_records] == [10]
+
+
+def test_queue_budget():
+    record = DataRecord(DefaultSchema, source_idx=0)
+    record.value = b"x" * 10_000
+
+    assert record.get_size_in_bytes() > 10_000
+    assert QueueBudget(max_bytes=10_000).is_full(1, record.get_size_in_bytes())
+    assert not QueueBudget(max_records=2).is_full(1, record.get_size_in_bytes())
+    assert not QueueBudget().is_bounded()
+    with pytest.raises(ValueError):
+        QueueBudget(max_records=0)
+
+
+def test_peak_memory_monitor():
+    with PeakMemoryMonitor(interval_secs=0.01) as memory_monitor:
+        time.sleep(0.05)
+
+    assert memory_monitor.peak_memory_usage_mb > 0.0
@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+from palimpzest.core.data.datareaders import HTMLFileDirectoryReader, PDFFileDirectoryReader
+from palimpzest.tools.parsing import ParserPool, _get_worker_pid, html_to_text_with_links, parse_html
+
+
+@pytest.fixture
+def parser_pool():
+    pool = ParserPool(num_workers=2, timeout_secs=10)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def pdf_dir(tmp_path, make_pdf):
+    for idx in range(3):
+        (tmp_path / f"paper-{idx}.pdf").write_bytes(make_pdf(f"Paper number {idx}"))
+    return str(tmp_path)
+
+
+def test_parse_html():
+    html = "<html><body><p>Hello</p><a href='https://example.com'>a link</a></body></html>"
+
+    raw_html, text = parse_html(html)
+
+    assert raw_html == " ".join(html.split())
+    assert text == "Hello a link (https://example.com)"
+    assert html_to_text_with_links(html) == "Hello\na link (https://example.com)"
+
+
+def test_parser_pool_parses_in_worker_processes(parser_pool):
+    assert parser_pool.parse(parse_html, "<p>Hello</p>") == ("<p>Hello</p>", "Hello")
+    assert parser_pool.parse(_get_worker_pid) != os.getpid()
+    assert parser_pool.get_stats() == {"num_parsed": 2, "num_timeouts": 0, "num_restarts": 0}
+
+    # a pool without workers parses in the calling thread
+    assert ParserPool(num_workers=0).parse(_get_worker_pid) == os.getpid()
+
+
+def test_parser_pool_times_out_and_recovers(parser_pool):
+    parser_pool.configure(num_workers=2, timeout_secs=0.5)
+
+    start_time = time.time()
+    with pytest.raises(TimeoutError, match="timed out after 0.5 seconds"):
+        parser_pool.parse(time.sleep, 60)
+    assert time.time() - start_time < 10
+
+    # the stuck worker is terminated and the pool is replaced
+    assert parser_pool.parse(parse_html, "<p>Hello</p>") == ("<p>Hello</p>", "Hello")
+    assert parser_pool.get_stats() == {"num_parsed": 1, "num_timeouts": 1, "num_restarts": 1}
+
+
+def test_pdf_reader_parses_in_parser_pool(pdf_dir, parser_pool, mocker):
+    mocker.patch("palimpzest.core.data.datareaders.get_parser_pool", return_value=parser_pool)
+    reader = PDFFileDirectoryReader(pdf_dir)
+
+    items = reader.get_batch(list(range(len(reader))))
+
+    assert [item["filename"] for item in items] == ["paper-0.pdf", "paper-1.pdf", "paper-2.pdf"]
+    assert [item["text_contents"].strip() for item in items] == ["Paper number 0", "Paper number 1", "Paper number 2"]
+    assert parser_pool.get_stats()["num_parsed"] == 3
+
+
+def test_readers_skip_text_of_files_which_time_out(pdf_dir, tmp_path, mocker):
+    parser_pool = mocker.Mock(parse=mocker.Mock(side_effect=TimeoutError("timed out")))
+    mocker.patch("palimpzest.core.data.datareaders.get_parser_pool", return_value=parser_pool)
+    html_dir = tmp_path / "html"
+    html_dir.mkdir()
+    (html_dir / "page.html").write_text("<p>Hello</p>")
+
+    assert PDFFileDirectoryReader(pdf_dir)[0]["text_contents"] == ""
+    assert HTMLFileDirectoryReader(str(html_dir))[0] == {"filename": "page.html", "html": "<p>Hello</p>", "text": ""}
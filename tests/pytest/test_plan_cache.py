@@ -0,0 +1,187 @@
+import pytest
+
+from palimpzest.constants import Model
+from palimpzest.core.data.datareaders import MemoryReader, TextFileDirectoryReader
+from palimpzest.core.data.materialization_cache import MaterializationCache, set_materialization_cache
+from palimpzest.core.elements.filters import Filter
+from palimpzest.policy import MaxQuality, MinCost
+from palimpzest.query.operators.scan import PrefetchingScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan_cache import PlanCache, get_plan_cache, set_plan_cache
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.sets import Dataset
+from palimpzest.utils.hash_helpers import hash_callable, is_cacheable_callable
+
+MODELS = [Model.GPT_4o, Model.GPT_4o_MINI, Model.LLAMA3]
+
+
+def add_double(record):
+    return {"double": record["value"] * 2}
+
+
+def create_query(values, threshold=5):
+    # the filter is a lambda which captures the threshold, i.e. it cannot be pickled by reference
+    dataset = Dataset(values).add_columns(udf=add_double, cols=[{"name": "double", "type": int}])
+    dataset = dataset.filter(lambda record: record["double"] > threshold)
+    return dataset.sem_add_columns([{"name": "parity", "type": str, "desc": "Whether the value is even or odd"}])
+
+
+def create_optimizer(policy=None, available_models=None, cost_model=None):
+    return Optimizer(
+        policy=MaxQuality() if policy is None else policy,
+        cost_model=CostModel() if cost_model is None else cost_model,
+        available_models=MODELS if available_models is None else available_models,
+    )
+
+
+@pytest.fixture
+def plan_cache(tmp_path):
+    cache = PlanCache(path=str(tmp_path / "plan_cache.sqlite"))
+    set_plan_cache(cache)
+    yield cache
+    cache.close()
+
+
+def test_cached_plans_are_reused(mocker, plan_cache):
+    plans = create_optimizer().optimize(create_query(list(range(10))), MaxQuality())
+    assert (plan_cache.hits, plan_cache.misses, len(plan_cache)) == (0, 1, 1)
+
+    # an identical query (with newly created UDFs and DataReader) returns the cached plans without searching
+    reader = MemoryReader(list(range(10, 20)))
+    query = create_query(reader)
+    optimizer = create_optimizer()
+    search = mocker.spy(optimizer, "search_optimization_space")
+    cached_plans = optimizer.optimize(query, MaxQuality())
+    assert search.call_count == 0
+    assert (plan_cache.hits, plan_cache.misses) == (1, 1)
+    assert [plan.plan_id for plan in cached_plans] == [plan.plan_id for plan in plans]
+
+    # the cached plans reference the objects of the query which loaded them
+    scan_op, _, filter_op, _ = cached_plans[0].operators
+    assert scan_op.datareader is reader
+    assert filter_op.filter_obj.filter_fn is query._source._filter.filter_fn
+    assert scan_op.output_schema == plans[0].operators[0].output_schema
+
+
+def test_plans_which_prefetch_their_scan_are_cached(tmp_path, plan_cache):
+    text_dir = tmp_path / "files"
+    text_dir.mkdir()
+    for idx in range(3):
+        (text_dir / f"file-{idx}.txt").write_text(f"File number {idx}")
+
+    def create_directory_query(reader):
+        return Dataset(reader).sem_filter("The file number is even")
+
+    # the scan of a DataReader which is not in memory reads ahead of the records it scans
+    plans = create_optimizer().optimize(create_directory_query(TextFileDirectoryReader(str(text_dir))), MaxQuality())
+    assert isinstance(plans[0].operators[0], PrefetchingScanDataOp)
+    assert len(plan_cache) == 1
+
+    # the cached scan does not share its lock or I/O threads with the scan which was cached
+    reader = TextFileDirectoryReader(str(text_dir))
+    cached_plans = create_optimizer().optimize(create_directory_query(reader), MaxQuality())
+    assert plan_cache.hits == 1
+    scan_op = cached_plans[0].operators[0]
+    assert scan_op.datareader is reader
+    assert scan_op.lock is not plans[0].operators[0].lock and scan_op.io_pool is None and scan_op.batches == {}
+    assert scan_op(0).data_records[0].contents == "File number 0"
+    scan_op.close()
+
+
+def test_plans_which_cannot_be_pickled_are_not_cached(mocker, plan_cache):
+    mocker.patch("palimpzest.query.optimizer.plan_cache._PlanPickler.dump", side_effect=TypeError("cannot pickle"))
+    with pytest.warns(UserWarning, match="could not be cached: TypeError: cannot pickle"):
+        create_optimizer().optimize(create_query(list(range(10))), MaxQuality())
+    assert len(plan_cache) == 0
+
+
+def test_filter_fn_hash_is_stable():
+    # identically defined functions hash (and serialize) identically, regardless of their memory addresses
+    filters = [Filter(filter_fn=lambda record: record["value"] > 5) for _ in range(2)]
+    assert filters[0].filter_fn is not filters[1].filter_fn
+    assert hash(filters[0]) == hash(filters[1])
+    assert filters[0].serialize() == filters[1].serialize()
+    assert "0x" not in filters[0].get_filter_str()
+
+    # functions with different code (or captured values) do not
+    def greater_than(threshold):
+        return lambda record: record["value"] > threshold
+
+    assert hash_callable(lambda record: record["value"] < 5) != hash_callable(filters[0].filter_fn)
+    assert hash_callable(greater_than(5)) == hash_callable(greater_than(5))
+    assert hash_callable(greater_than(5)) != hash_callable(greater_than(6))
+
+
+THRESHOLD = 5
+
+
+def above_threshold(record):
+    return record["value"] > THRESHOLD
+
+
+def calls_above_threshold(record):
+    return above_threshold(record)
+
+
+class Threshold:
+    def __init__(self, value):
+        self.value = value
+
+
+def test_callable_hash_covers_globals_and_callees(monkeypatch):
+    fn_hashes = [hash_callable(above_threshold), hash_callable(calls_above_threshold)]
+
+    # the hash changes with the values of the globals which a function (or a function it calls) references
+    monkeypatch.setitem(globals(), "THRESHOLD", 6)
+    assert hash_callable(above_threshold) != fn_hashes[0]
+    assert hash_callable(calls_above_threshold) != fn_hashes[1]
+
+    # and with the functions it calls
+    monkeypatch.setitem(globals(), "THRESHOLD", 5)
+    assert [hash_callable(above_threshold), hash_callable(calls_above_threshold)] == fn_hashes
+    monkeypatch.setitem(globals(), "above_threshold", lambda record: record["value"] >= THRESHOLD)
+    assert hash_callable(calls_above_threshold) != fn_hashes[1]
+    assert is_cacheable_callable(calls_above_threshold)
+
+    # objects which are only identified by their memory address cannot be told apart by the hash
+    def greater_than(threshold):
+        return lambda record: record["value"] > threshold.value
+
+    assert hash_callable(greater_than(Threshold(5))) == hash_callable(greater_than(Threshold(6)))
+    assert not is_cacheable_callable(greater_than(Threshold(5)))
+
+
+def test_plan_cache_key(tmp_path):
+    query = create_query(list(range(10)))
+    key = create_optimizer().get_plan_cache_key(query, MaxQuality())
+    assert key == create_optimizer().get_plan_cache_key(create_query(list(range(10, 20))), MaxQuality())
+
+    # the key changes with the logical plan (including its UDFs), the policy, the available models, and the cost model's stats
+    assert key != create_optimizer().get_plan_cache_key(create_query(list(range(10)), threshold=6), MaxQuality())
+    assert key != create_optimizer().get_plan_cache_key(create_query(list(range(11))), MaxQuality())
+    assert key != create_optimizer().get_plan_cache_key(query, MinCost())
+    assert key != create_optimizer(available_models=MODELS[:2]).get_plan_cache_key(query, MaxQuality())
+    assert key != create_optimizer(cost_model=CostModel(confidence_level=0.95)).get_plan_cache_key(query, MaxQuality())
+
+    # plans are not cached if their UDFs cannot be hashed
+    threshold = Threshold(5)
+    uncacheable_query = Dataset(list(range(10))).filter(lambda record: record["value"] > threshold.value)
+    assert create_optimizer().get_plan_cache_key(uncacheable_query, MaxQuality()) is None
+
+    # plans are not cached if they may scan the outputs of the materialization cache
+    set_materialization_cache(MaterializationCache(cache_dir=str(tmp_path / "materialization_cache")))
+    assert create_optimizer().get_plan_cache_key(query, MaxQuality()) is None
+
+
+def test_plan_cache_config(tmp_path):
+    config = QueryProcessorConfig(
+        policy=MaxQuality(),
+        available_models=[Model.GPT_4o_MINI],
+        plan_cache=True,
+        plan_cache_path=str(tmp_path / "plan_cache.sqlite"),
+    )
+    dataset = Dataset(list(range(10))).add_columns(udf=add_double, cols=[{"name": "double", "type": int}])
+    assert [record.double for record in dataset.run(config)] == list(range(0, 20, 2))
+    assert [record.double for record in dataset.run(config)] == list(range(0, 20, 2))
+    assert (get_plan_cache().hits, get_plan_cache().misses) == (1, 1)
@@ -0,0 +1,55 @@
+from palimpzest.constants import Cardinality, Model, PromptStrategy
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import StringField
+from palimpzest.core.lib.schemas import TextFile
+from palimpzest.prompts.convert_prompts import COT_QA_EXAMPLE_ANSWER
+from palimpzest.prompts.prompt_factory import PromptFactory
+
+
+class Email(TextFile):
+    sender = StringField(desc="The email address of the {sender}")
+
+
+def make_record(idx, contents):
+    record = DataRecord(schema=TextFile, source_idx=idx)
+    record.filename = f"email-{idx}.txt"
+    record.contents = contents
+    return record
+
+
+def test_prompt_is_compiled_once_per_operator(mocker):
+    field_desc_map = mocker.spy(Email, "field_desc_map")
+    prompt_factory = PromptFactory(PromptStrategy.COT_QA, Model.GPT_4o_MINI, Cardinality.ONE_TO_ONE)
+    gen_kwargs = {"output_schema": Email, "project_cols": ["contents"]}
+
+    messages = [
+        prompt_factory.create_messages(make_record(idx, f"Hello {{world}} #{idx}"), ["sender"], **gen_kwargs)
+        for idx in range(3)
+    ]
+
+    # the output schema is only walked when the prompt is compiled
+    assert field_desc_map.call_count == 1
+    assert len(prompt_factory._compiled_prompts) == 1
+
+    # the static content (including braces in the example answer and field descriptions) is rendered verbatim
+    system_prompt = messages[0][0]["content"]
+    assert COT_QA_EXAMPLE_ANSWER in system_prompt
+    assert all(record_messages[0] == messages[0][0] for record_messages in messages)
+
+    # while the context is substituted for each record
+    for idx, record_messages in enumerate(messages):
+        user_prompt = record_messages[1]["content"]
+        assert f"Hello {{world}} #{idx}" in user_prompt
+        assert "- sender: The email address of the {sender}" in user_prompt
+
+
+def test_prompt_is_recompiled_for_new_filter_condition():
+    prompt_factory = PromptFactory(PromptStrategy.COT_BOOL, Model.GPT_4o_MINI, Cardinality.ONE_TO_ONE)
+    record = make_record(0, "Let's meet on Monday.")
+
+    first = prompt_factory.create_messages(record, ["passed_operator"], filter_condition="The email is about a meeting")
+    second = prompt_factory.create_messages(record, ["passed_operator"], filter_condition="The email is urgent")
+
+    assert len(prompt_factory._compiled_prompts) == 2
+    assert "The email is about a meeting" in first[-1]["content"]
+    assert "The email is urgent" in second[-1]["content"]
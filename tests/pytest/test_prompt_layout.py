@@ -0,0 +1,99 @@
+import pytest
+
+from palimpzest.constants import MODEL_CARDS, NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS, Model, PromptLayout
+from palimpzest.core.data.dataclasses import OperatorCostEstimates
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.schemas import TextFile
+from palimpzest.query.generators.generators import OpenAIGenerator
+from palimpzest.query.operators.filter import LLMFilter
+from palimpzest.utils.model_helpers import get_naive_input_cost
+
+
+def make_record(idx, contents):
+    record = DataRecord(schema=TextFile, source_idx=idx)
+    record.filename = f"email-{idx}.txt"
+    record.contents = contents
+    return record
+
+
+def make_filter(prompt_layout):
+    return LLMFilter(
+        input_schema=TextFile,
+        output_schema=TextFile,
+        filter=Filter("The email is about a meeting"),
+        model=Model.GPT_4o_MINI,
+        prompt_layout=prompt_layout,
+    )
+
+
+@pytest.fixture
+def generate(mocker, mock_completion):
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    return mocker.patch.object(
+        OpenAIGenerator,
+        "_generate_completion",
+        return_value=mock_completion("REASONING: it is\nANSWER: TRUE\n---", input_tokens=1000, cached_tokens=800),
+    )
+
+
+def test_static_prefix_layout_shares_prompt_prefix(generate):
+    filter_op = make_filter(PromptLayout.STATIC_PREFIX)
+    filter_op(make_record(0, "Let's meet on Monday."))
+    filter_op(make_record(1, "The invoice is attached."))
+
+    first_messages = generate.call_args_list[0].args[1]["messages"]
+    second_messages = generate.call_args_list[1].args[1]["messages"]
+
+    # all static content (instructions, field descriptions, and filter condition) is in the (developer) system prompt...
+    assert first_messages[0]["role"] == "developer"
+    assert "The email is about a meeting" in first_messages[0]["content"]
+    assert "contents" in first_messages[0]["content"]
+    assert first_messages[0] == second_messages[0]
+
+    # ...while the user prompt only contains the record
+    first_user_prompt = first_messages[-1]["content"][0]["text"]
+    assert first_user_prompt.startswith("CONTEXT:")
+    assert "Let's meet on Monday." in first_user_prompt
+    assert "The email is about a meeting" not in first_user_prompt
+
+
+def test_cached_input_tokens_are_charged_at_cached_price(generate):
+    filter_op = make_filter(PromptLayout.STATIC_PREFIX)
+    record_set = filter_op(make_record(0, "Let's meet on Monday."))
+
+    model_card = MODEL_CARDS[Model.GPT_4o_MINI.value]
+    expected_cost = (
+        200 * model_card["usd_per_input_token"]
+        + 800 * model_card["usd_per_cached_input_token"]
+        + 10 * model_card["usd_per_output_token"]
+    )
+    record_op_stats = record_set.record_op_stats[0]
+    assert record_op_stats.total_cached_input_tokens == 800
+    assert record_op_stats.cost_per_record == pytest.approx(expected_cost)
+
+
+def test_static_prefix_layout_lowers_naive_cost_estimate():
+    model_name = Model.GPT_4o_MINI.value
+    model_card = MODEL_CARDS[model_name]
+    interleaved = get_naive_input_cost(model_name, 2000, PromptLayout.INTERLEAVED)
+    static_prefix = get_naive_input_cost(model_name, 2000, PromptLayout.STATIC_PREFIX)
+
+    expected_discount = NAIVE_EST_NUM_PROMPT_OVERHEAD_TOKENS * (model_card["usd_per_input_token"] - model_card["usd_per_cached_input_token"])
+    assert interleaved - static_prefix == pytest.approx(expected_discount)
+
+
+def test_short_prompts_are_not_charged_at_cached_price():
+    # the provider does not cache prompts which are shorter than the model's minimum
+    model_name = Model.GPT_4o_MINI.value
+    num_input_tokens = MODEL_CARDS[model_name]["min_cached_input_tokens"] - 1
+    assert get_naive_input_cost(model_name, num_input_tokens, PromptLayout.STATIC_PREFIX) == pytest.approx(
+        get_naive_input_cost(model_name, num_input_tokens, PromptLayout.INTERLEAVED)
+    )
+
+    # e.g. the naive estimate of a filter's prompt is too short to be cached
+    source_estimates = OperatorCostEstimates(cardinality=100, time_per_record=0.0, cost_per_record=0.0, quality=1.0)
+    interleaved = make_filter(PromptLayout.INTERLEAVED).naive_cost_estimates(source_estimates)
+    static_prefix = make_filter(PromptLayout.STATIC_PREFIX).naive_cost_estimates(source_estimates)
+    assert static_prefix.cost_per_record == pytest.approx(interleaved.cost_per_record)
+    assert make_filter(PromptLayout.STATIC_PREFIX).get_op_id() != make_filter(PromptLayout.INTERLEAVED).get_op_id()
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import httpx
+import openai
+import pytest
+
+from palimpzest.constants import Model, PromptStrategy
+from palimpzest.core.elements.records import DataRecord
+from palimpzest.core.lib.fields import StringField
+from palimpzest.core.lib.schemas import TextFile
+from palimpzest.query.generators.generators import OpenAIGenerator
+from palimpzest.query.generators.rate_limits import RateLimitController, RateLimitRegistry, TokenBucket
+
+
+class Email(TextFile):
+    sender = StringField(desc="The email address of the sender")
+
+
+
+def rate_limit_error():
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+@pytest.fixture
+def rate_limit_registry(mocker):
+    registry = RateLimitRegistry(max_concurrency=8)
+    mocker.patch("palimpzest.query.generators.generators.get_rate_limit_registry", return_value=registry)
+    return registry
+
+
+@pytest.fixture
+def candidate():
+    record = DataRecord(schema=TextFile, source_idx=0)
+    record.filename = "email.txt"
+    record.contents = "From: alice@example.com\nHello!"
+    return record
+
+
+def test_token_bucket_waits_once_empty():
+    bucket = TokenBucket(rate_per_minute=60)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+    # returning unused units makes them available again
+    bucket.adjust(-2)
+    assert bucket.reserve(1) == 0.0
+
+
+def test_concurrency_limit_is_aimd():
+    controller = RateLimitController("gpt-4o-mini", max_concurrency=8)
+    controller.acquire(num_tokens=10)
+    controller.release(num_tokens_reserved=10, rate_limited=True)
+    assert controller.get_stats()["concurrency_limit"] == 4
+
+    # successes grow the limit by one per window (4 -> 5 after four successes, 5 -> 6 after five more)
+    for _ in range(11):
+        controller.acquire(num_tokens=10)
+        controller.release(num_tokens_reserved=10, num_tokens_used=10)
+    assert controller.get_stats()["concurrency_limit"] == 6
+    assert controller.get_stats()["num_rate_limit_errors"] == 1
+
+
+def test_generator_retries_rate_limit_errors(mocker, rate_limit_registry, candidate, mock_completion):
+    mocker.patch("palimpzest.query.generators.generators.RETRY_MULTIPLIER", 0)
+    generator = OpenAIGenerator(Model.GPT_4o_MINI, PromptStrategy.COT_QA)
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    generate = mocker.patch.object(
+        OpenAIGenerator,
+        "_generate_completion",
+        side_effect=[rate_limit_error(), rate_limit_error(), mock_completion('ANSWER: {"sender": "alice@example.com"}\n---')],
+    )
+
+    field_answers, _, generation_stats = generator(candidate, ["sender"], project_cols=["contents"], output_schema=Email)
+
+    assert field_answers == {"sender": ["alice@example.com"]}
+    assert generate.call_count == 3
+    assert generation_stats.num_retries == 2
+    assert generation_stats.cost_per_record > 0.0
+
+    stats = rate_limit_registry.get_stats()[Model.GPT_4o_MINI.value]
+    assert stats["num_requests"] == 3
+    assert stats["num_retries"] == 2
+    assert stats["num_rate_limit_errors"] == 2
+    assert stats["concurrency_limit"] == 2
+
+
+def test_generator_gives_up_after_max_attempts(mocker, rate_limit_registry, candidate):
+    mocker.patch("palimpzest.query.generators.generators.RETRY_MULTIPLIER", 0)
+    generator = OpenAIGenerator(Model.GPT_4o_MINI, PromptStrategy.COT_QA)
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_generate_completion", side_effect=rate_limit_error())
+
+    field_answers, _, generation_stats = generator(candidate, ["sender"], project_cols=["contents"], output_schema=Email)
+
+    assert field_answers == {"sender": None}
+    assert generation_stats.cost_per_record == 0.0
+    assert rate_limit_registry.get_stats()[Model.GPT_4o_MINI.value]["num_requests"] == 4
+
+
+def test_slot_is_released_if_usage_cannot_be_parsed(mocker, rate_limit_registry, candidate, mock_completion):
+    generator = OpenAIGenerator(Model.GPT_4o_MINI, PromptStrategy.COT_QA)
+    mocker.patch.object(OpenAIGenerator, "_get_client_or_model", return_value=None)
+    mocker.patch.object(OpenAIGenerator, "_generate_completion", return_value=mock_completion("ANSWER: {}\n---"))
+    mocker.patch.object(OpenAIGenerator, "_get_usage", side_effect=ValueError("malformed usage"))
+
+    field_answers, _, _ = generator(candidate, ["sender"], project_cols=["contents"], output_schema=Email)
+
+    assert field_answers == {"sender": None}
+    assert rate_limit_registry.get_controller(Model.GPT_4o_MINI.value).num_in_flight == 0
+
+
+def test_async_acquire_is_woken_by_release_from_another_thread():
+    controller = RateLimitController("gpt-4o-mini", max_concurrency=1)
+    controller.acquire(num_tokens=10)
+
+    async def run():
+        # a waiter which is cancelled is removed from the controller's waiters
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(controller.aacquire(num_tokens=10), timeout=0.01)
+        assert controller._async_waiters == []
+
+        # a waiting coroutine acquires the slot as soon as a worker thread releases it
+        threading.Timer(0.01, controller.release, kwargs={"num_tokens_reserved": 10, "num_tokens_used": 10}).start()
+        await asyncio.wait_for(controller.aacquire(num_tokens=10), timeout=5.0)
+
+    asyncio.run(run())
+    assert controller.num_in_flight == 1
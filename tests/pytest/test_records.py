@@ -1,3 +1,5 @@
+import pickle
+
 import pandas as pd
 import pytest
 
@@ -85,6 +87,40 @@ class TestDataRecord:
         assert 'test' in json_str
         assert '42' in json_str
 
+    def test_compact_record(self, sample_record):
+        """Test that field values are stored positionally and field types are shared with the schema"""
+        assert not hasattr(sample_record, "__dict__")
+        assert sample_record.get_field_type("name") is TestSchema.field_map()["name"]
+
+        # fields which are not in the schema are kept alongside the schema's fields
+        sample_record.extra = "extra"
+        assert sample_record.get_field_names() == ["name", "value", "extra"]
+        assert sample_record["extra"] == "extra"
+        assert dict(sample_record) == {"name": "test", "value": 42, "extra": "extra"}
+
+    def test_unset_field(self):
+        """Test that fields in the schema which have not been set are not part of the record"""
+        record = DataRecord(schema=TestSchema, source_idx=0)
+        record.value = 42
+        assert record.get_field_names() == ["value"]
+        assert record.to_dict() == {"value": 42}
+        with pytest.raises(AttributeError):
+            _ = record.name
+
+    def test_to_dict_converts_numpy_scalars(self, sample_df):
+        """Test that numpy values (e.g. from a DataFrame) are converted to native types"""
+        record = DataRecord(schema=TestSchema, source_idx=0)
+        record.name = "Alice"
+        record.value = sample_df["value"].to_numpy()[0]
+        record_dict = record.to_dict()
+        assert record_dict["value"] == 1 and type(record_dict["value"]) is int
+
+    def test_pickle(self, sample_record):
+        """Test that records survive a pickle round trip"""
+        record = pickle.loads(pickle.dumps(sample_record))
+        assert record == sample_record
+        assert record.id == sample_record.id
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -1,10 +1,18 @@
 import pytest
 
-from palimpzest.core.data.datareaders import MemoryReader
-from palimpzest.core.lib.schemas import Schema, StringField
-from palimpzest.query.operators.logical import BaseScan
+from palimpzest.constants import AggFunc
+from palimpzest.core.data.datareaders import DataReader, MemoryReader
+from palimpzest.core.elements.groupbysig import GroupBySig
+from palimpzest.core.lib.fields import Field, NumericField
+from palimpzest.core.lib.schemas import Number, Schema, StringField
+from palimpzest.query.operators.logical import Aggregate, BaseScan, GroupByAggregate
 from palimpzest.query.optimizer.primitives import LogicalExpression
-from palimpzest.query.optimizer.rules import BasicSubstitutionRule
+from palimpzest.query.optimizer.rules import (
+    AggregateRule,
+    BasicSubstitutionRule,
+    PrefetchingScanRule,
+    VectorizedAggregateRule,
+)
 
 
 @pytest.fixture
@@ -49,3 +57,91 @@ def test_substitute_methods(base_scan_op):
     assert physical_expr.generated_fields == logical_expr.generated_fields
     assert physical_expr.depends_on_field_names == logical_expr.depends_on_field_names
     assert physical_expr.group_id == logical_expr.group_id
+
+
+@pytest.mark.parametrize(
+    "group_by_fields, agg_funcs, agg_fields, expected_op_name",
+    [
+        (["region"], ["count", "sum", "average", "min", "max"], ["region", "amount", "amount", "amount", "amount"], "VectorizedApplyGroupByOp"),
+        (["notes"], ["count"], ["amount"], "ApplyGroupByOp"),
+        (["region"], ["sum"], ["region"], "ApplyGroupByOp"),
+        (["region"], ["approx_median"], ["amount"], "ApplyGroupByOp"),
+    ],
+)
+def test_groupby_rules(group_by_fields, agg_funcs, agg_fields, expected_op_name):
+    class Sale(Schema):
+        region = StringField(desc="The region of the sale")
+        amount = NumericField(desc="The amount of the sale")
+        notes = Field(desc="Notes about the sale")
+
+    group_by_sig = GroupBySig(group_by_fields=group_by_fields, agg_funcs=agg_funcs, agg_fields=agg_fields)
+    groupby_op = GroupByAggregate(group_by_sig, input_schema=Sale, output_schema=group_by_sig.output_schema())
+    logical_expr = LogicalExpression(
+        operator=groupby_op,
+        input_group_ids=[0],
+        input_fields=Sale.field_map(),
+        generated_fields={},
+        depends_on_field_names=set(group_by_fields + agg_fields),
+        group_id=1,
+    )
+
+    # exactly one of the rules implements the groupby
+    rules = [rule for rule in [BasicSubstitutionRule, VectorizedAggregateRule] if rule.matches_pattern(logical_expr)]
+    assert len(rules) == 1
+
+    physical_exprs = rules[0].substitute(logical_expr, verbose=False)
+    assert [expr.operator.op_name() for expr in physical_exprs] == [expected_op_name]
+
+
+@pytest.mark.parametrize(
+    "agg_func, expected_op_name",
+    [(AggFunc.COUNT, "CountAggregateOp"), (AggFunc.AVERAGE, "VectorizedAverageAggregateOp")],
+)
+def test_aggregate_rules(agg_func, expected_op_name):
+    logical_expr = LogicalExpression(
+        operator=Aggregate(agg_func, input_schema=Number, output_schema=Number),
+        input_group_ids=[0],
+        input_fields=Number.field_map(),
+        generated_fields={},
+        depends_on_field_names={"value"},
+        group_id=1,
+    )
+
+    rules = [rule for rule in [AggregateRule, VectorizedAggregateRule] if rule.matches_pattern(logical_expr)]
+    assert len(rules) == 1
+
+    physical_exprs = rules[0].substitute(logical_expr, verbose=False)
+    assert [expr.operator.op_name() for expr in physical_exprs] == [expected_op_name]
+
+
+class NumberFileReader(DataReader):
+    def __init__(self):
+        super().__init__(Number)
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, idx):
+        return {"value": idx}
+
+
+@pytest.mark.parametrize(
+    "datareader, expected_op_name",
+    [(MemoryReader(vals=[1, 2, 3]), "MarshalAndScanDataOp"), (NumberFileReader(), "PrefetchingScanDataOp")],
+    ids=["memory", "file"],
+)
+def test_scan_rules(datareader, expected_op_name):
+    logical_expr = LogicalExpression(
+        operator=BaseScan(datareader=datareader, output_schema=Number),
+        input_group_ids=[],
+        input_fields={},
+        generated_fields=Number.field_map(),
+        depends_on_field_names=set(),
+        group_id=1,
+    )
+
+    rules = [rule for rule in [BasicSubstitutionRule, PrefetchingScanRule] if rule.matches_pattern(logical_expr)]
+    assert len(rules) == 1
+
+    physical_exprs = rules[0].substitute(logical_expr, verbose=False, scan_prefetch_window=4, scan_io_workers=2)
+    assert [expr.operator.op_name() for expr in physical_exprs] == [expected_op_name]
@@ -1,7 +1,16 @@
-from palimpzest.core.data.datareaders import MemoryReader
+import threading
+import time
+
+import pytest
+
+from palimpzest.core.data.datareaders import DataReader, MemoryReader
 from palimpzest.core.lib.fields import Field
-from palimpzest.core.lib.schemas import Schema
-from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.core.lib.schemas import Number, Schema
+from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy
+from palimpzest.query.execution.single_threaded_execution_strategy import PipelinedSingleThreadExecutionStrategy
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.scan import MarshalAndScanDataOp, PrefetchingScanDataOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
 
 
 class List(Schema):
@@ -31,6 +40,149 @@ def test_marshal_and_scan_memory_source():
     assert stats.op_details["generated_fields"] == str(sorted(List.field_names()))
     assert stats.time_per_record >= 0.0  # Should be non-negative; sometimes the read executes so quickly the assertion fails with > 0.0
     assert stats.cost_per_record == 0.0
+    assert stats.io_blocked_time == stats.time_per_record
+
+
+class SlowReader(DataReader):
+    """A DataReader which takes `read_time` seconds to read each item and records the batches it reads."""
+    def __init__(self, num_items, read_time=0.0):
+        super().__init__(Number)
+        self.num_items = num_items
+        self.read_time = read_time
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.num_items
+
+    def __getitem__(self, idx):
+        time.sleep(self.read_time)
+        return {"value": idx}
+
+    def get_batch(self, indices):
+        with self.lock:
+            self.batches.append(indices)
+        return super().get_batch(indices)
+
+
+def test_prefetching_scan_reads_ahead():
+    datareader = SlowReader(20)
+    op = PrefetchingScanDataOp(output_schema=Number, datareader=datareader, prefetch_window=8, io_batch_size=4)
+
+    result = op(0)
+
+    # the window after the scanned item is read in batches
+    assert result.data_records[0].value == 0
+    assert sorted(datareader.batches) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert result.record_op_stats[0].op_name == "PrefetchingScanDataOp"
+    assert result.record_op_stats[0].io_blocked_time >= 0.0
+
+    # scanning in order reads each item once, and reading ahead stops at the end of the datareader
+    assert [op(idx).data_records[0].value for idx in range(1, 20)] == list(range(1, 20))
+    assert sorted(idx for batch in datareader.batches for idx in batch) == list(range(20))
+    assert op.io_pool is None
+
+    # scanning an item which is not being read ahead restarts reading ahead from that item
+    datareader.batches = []
+    assert op(13).data_records[0].value == 13
+    assert sorted(datareader.batches) == [[13, 14, 15, 16], [17, 18, 19]]
+    assert op(2).data_records[0].value == 2
+    assert [2, 3, 4, 5] in datareader.batches
+
+
+def test_prefetching_scan_without_window_reads_synchronously():
+    datareader = SlowReader(3)
+    op = PrefetchingScanDataOp(output_schema=Number, datareader=datareader, prefetch_window=0)
+
+    assert [op(idx).data_records[0].value for idx in range(3)] == [0, 1, 2]
+    assert datareader.batches == []
+    assert op.io_pool is None
+
+
+def test_prefetching_scan_limit_bounds_read_ahead():
+    datareader = SlowReader(20)
+    op = PrefetchingScanDataOp(output_schema=Number, datareader=datareader, prefetch_window=8, io_batch_size=4)
+
+    # the window is cut off at the bound, but the scanned item is always read
+    op.limit_prefetch(2)
+    assert op(0).data_records[0].value == 0
+    assert datareader.batches == [[0, 1, 2, 3]]
+    assert op(5).data_records[0].value == 5
+    assert datareader.batches == [[0, 1, 2, 3], [5, 6, 7, 8]]
+
+    # removing the bound reads the full window ahead again
+    op.limit_prefetch(None)
+    assert op(6).data_records[0].value == 6
+    assert sorted(datareader.batches) == [[0, 1, 2, 3], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 16]]
+    op.close()
+
+
+def test_prefetching_scan_close_releases_io_pool():
+    datareader = SlowReader(20)
+    op = PrefetchingScanDataOp(output_schema=Number, datareader=datareader, prefetch_window=8, io_batch_size=4)
+
+    assert op(0).data_records[0].value == 0
+    assert op.io_pool is not None
+
+    op.close()
+    assert op.io_pool is None
+    assert op.batches == {}
+
+    # the scan may still be called once it is closed
+    assert op(1).data_records[0].value == 1
+    op.close()
+    assert op.io_pool is None
+
+
+class ClosingScanOp(PrefetchingScanDataOp):
+    """A PrefetchingScanDataOp which records the bounds on its read-ahead and whether it was closed."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefetch_end_idxs = []
+        self.closed = False
+
+    def limit_prefetch(self, end_idx):
+        self.prefetch_end_idxs.append(end_idx)
+        super().limit_prefetch(end_idx)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def test_pipeline_scheduler_bounds_and_closes_scan_at_limit():
+    datareader = SlowReader(100)
+    scan_op = ClosingScanOp(output_schema=Number, datareader=datareader, prefetch_window=32, io_batch_size=4)
+    limit_op = LimitScanOp(limit=3, input_schema=Number, output_schema=Number)
+    plan = PhysicalPlan(operators=[scan_op, limit_op])
+
+    records, _ = PipelinedParallelExecutionStrategy().execute_plan(plan, plan_workers=2)
+
+    assert [record.value for record in records] == [0, 1, 2]
+    assert scan_op.closed
+    assert scan_op.io_pool is None
+
+    # the read-ahead never extends far past the records the limit needs
+    assert all(end_idx is not None and end_idx < 32 for end_idx in scan_op.prefetch_end_idxs)
+    assert max(idx for batch in datareader.batches for idx in batch) < 32
+
+
+@pytest.mark.parametrize("strategy_cls", [PipelinedSingleThreadExecutionStrategy, PipelinedParallelExecutionStrategy])
+def test_prefetching_scan_reports_io_blocked_time(strategy_cls):
+    scan_ops = [
+        op_cls(output_schema=Number, datareader=SlowReader(16, read_time=0.01))
+        for op_cls in [MarshalAndScanDataOp, PrefetchingScanDataOp]
+    ]
+
+    io_blocked_times = []
+    for scan_op in scan_ops:
+        records, plan_stats = strategy_cls().execute_plan(PhysicalPlan(operators=[scan_op]), plan_workers=2)
+        assert [record.value for record in records] == list(range(16))
+        io_blocked_times.append(plan_stats.operator_stats[scan_op.get_op_id()].total_io_blocked_time)
+
+    # the synchronous scan is blocked on every read, while reads overlap with each other when prefetching
+    assert io_blocked_times[0] >= 0.16
+    assert 0.0 < io_blocked_times[1] < io_blocked_times[0]
 
 # def test_marshal_and_scan_memory_source_multiple_records():
 #     # Test with numeric data
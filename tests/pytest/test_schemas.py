@@ -38,3 +38,33 @@ def test_schema_add_fields_with_existing_fields():
             "desc": "The color of the dog"
             # type key intentionally omitted
         }])
+
+def test_schema_field_table():
+    assert Dog.field_names() == ["breed", "is_good"]
+    assert Dog.field_names(unique=True, id="0") == ["Dog.0.breed", "Dog.0.is_good"]
+    assert Dog.field_desc_map() == {"breed": "The breed of the dog", "is_good": "Whether the dog is good"}
+
+    # callers may modify the returned field map without modifying the schema
+    field_map = Dog.field_map()
+    field_map["color"] = StringField(desc="The color of the dog")
+    assert Dog.field_names() == ["breed", "is_good"]
+
+def test_schema_field_table_is_rebuilt_when_fields_are_set():
+    schema = type("Parrot", (Schema,), {})
+    subschema = type("Macaw", (schema,), {})
+    assert schema.field_names() == [] and subschema.field_names() == []
+
+    schema.color = StringField(desc="The color of the parrot")
+    assert schema.field_names() == ["color"]
+    assert subschema.field_names() == ["color"]
+    assert schema.get_desc() != type("Parrot", (Schema,), {}).get_desc()
+
+def test_schema_union_and_project_are_memoized():
+    assert Dog.union(Cat) is Dog.union(Cat)
+    assert Dog.union(Cat, keep_duplicates=True) is not Dog.union(Cat)
+    assert Dog.project(["breed"]) is Dog.project(["breed"])
+    assert Dog.project(["breed"]).field_names() == ["breed"]
+
+    fields = [{"name": "color", "desc": "The color of the dog", "type": str}]
+    assert Dog.add_fields(fields) is Dog.add_fields(fields)
+    assert {Dog.add_fields(fields), Dog.add_fields(fields)} == {Dog.add_fields(fields)}
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.records import DataRecord, DataRecordSet
+from palimpzest.core.lib.fields import ListField, NumericField, StringField
+from palimpzest.core.lib.schemas import DefaultSchema, Schema
+from palimpzest.query.execution.parallel_execution_strategy import PipelinedParallelExecutionStrategy
+from palimpzest.query.execution.single_threaded_execution_strategy import PipelinedSingleThreadExecutionStrategy
+from palimpzest.query.execution.spill import SpillableRecordBuffer
+from palimpzest.query.operators.aggregate import AggregateOp
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.plan import PhysicalPlan
+
+pytest.importorskip("pyarrow", exc_type=ImportError)
+
+
+class Sale(Schema):
+    region = StringField(desc="The region of the sale")
+    amount = NumericField(desc="The amount of the sale")
+    tags = ListField(desc="The tags of the sale", element_type=StringField)
+
+
+def make_sale(idx):
+    record = DataRecord(Sale, source_idx=idx, parent_id=f"parent-{idx}")
+    record.region = ["north", "south", None][idx % 3]
+    record.amount = idx if idx % 2 == 0 else idx + 0.5
+    if idx % 4 != 0:
+        record.tags = [f"tag-{idx}", b"raw"]
+    return record
+
+
+def test_buffer_round_trips_spilled_records(tmp_path):
+    records = [make_sale(idx) for idx in range(10)]
+    records[3].passed_operator = False
+    buffer = SpillableRecordBuffer(spill_threshold_bytes=1, spill_dir=str(tmp_path), chunk_size=3)
+    for record in records:
+        buffer.append(record)
+
+    # every record was spilled (to its own segment) as soon as it was appended
+    assert len(buffer) == 10
+    assert buffer.num_spilled_records == 10
+    assert buffer.num_spilled_bytes > 0
+
+    restored = list(buffer)
+    for record, restored_record in zip(records, restored):
+        assert restored_record is not record
+        assert restored_record.schema is Sale
+        assert restored_record.id == record.id
+        assert restored_record.parent_id == record.parent_id
+        assert restored_record.passed_operator == record.passed_operator
+        assert restored_record.field_values == record.field_values
+
+    # unset fields remain unset, while fields which were set to None are restored as None
+    assert not hasattr(restored[0], "tags")
+    assert restored[2].region is None
+    assert buffer[4].field_values == records[4].field_values
+    assert buffer[-1] is records[-1]
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_buffer_streams_segments_in_chunks(tmp_path):
+    buffer = SpillableRecordBuffer(spill_threshold_bytes=50_000, spill_dir=str(tmp_path), chunk_size=16)
+    for idx in range(1000):
+        buffer.append(make_sale(idx))
+
+    assert 0 < buffer.num_spilled_records < 1000
+    assert len(buffer.segments) > 1
+    assert [record.source_idx for record in buffer] == list(range(1000))
+
+
+class DistinctValuesOp(AggregateOp):
+    """An aggregate which does not support partial aggregation, thus its inputs are buffered (and spilled)."""
+    def __call__(self, candidates):
+        parent_record = candidates[-1]
+        drs = []
+        for value in sorted({candidate.value for candidate in candidates}):
+            dr = DataRecord(DefaultSchema, source_idx=parent_record.source_idx, parent_id=parent_record.id)
+            dr.value = value
+            drs.append(dr)
+        return DataRecordSet(drs, [])
+
+
+@pytest.mark.parametrize("strategy_cls", [PipelinedSingleThreadExecutionStrategy, PipelinedParallelExecutionStrategy])
+def test_aggregate_with_spilled_inputs(tmp_path, strategy_cls):
+    values = list(range(200))
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=MemoryReader(values))
+    distinct_op = DistinctValuesOp(input_schema=DefaultSchema, output_schema=DefaultSchema)
+    plan = PhysicalPlan(operators=[scan_op, distinct_op])
+
+    strategy = strategy_cls(spill_threshold_bytes=4096, spill_dir=str(tmp_path))
+    output_records, plan_stats = strategy.execute_plan(plan, plan_workers=4)
+
+    assert [record.value for record in output_records] == values
+    op_stats = plan_stats.operator_stats[distinct_op.get_op_id()]
+    assert 0 < op_stats.num_spilled_records <= len(values)
+    assert op_stats.num_spilled_bytes > 0
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,41 @@
+import pickle
+
+from palimpzest.core.data.sqlite_lru_store import SqliteLRUStore
+
+
+def test_store_evicts_least_recently_used_entries_beyond_its_bounds(tmp_path):
+    store = SqliteLRUStore(str(tmp_path / "store.sqlite"), max_entries=3, max_bytes=10)
+    for key in ["a", "b", "c"]:
+        assert store._put_value(key, b"xx")
+    assert store._get_value("a", bytes) == b"xx"
+
+    # the entry bound evicts the least recently used entry
+    store._put_value("d", b"xx")
+    assert "b" not in store and len(store) == 3
+
+    # the byte bound evicts as many entries as needed, and values larger than the bound are not stored
+    store._put_value("e", b"x" * 8)
+    assert [key in store for key in ["a", "c", "d", "e"]] == [False, False, True, True]
+    assert (len(store), store.num_bytes) == (2, 10)
+    assert not store._put_value("f", b"x" * 11)
+    assert "f" not in store
+    store.close()
+
+    # the store's size is recovered when it is reopened
+    reopened_store = SqliteLRUStore(str(tmp_path / "store.sqlite"), max_entries=3, max_bytes=10)
+    assert (len(reopened_store), reopened_store.num_bytes) == (2, 10)
+    reopened_store.close()
+
+
+def test_store_counts_undecodable_values_as_misses(tmp_path):
+    store = SqliteLRUStore(str(tmp_path / "store.sqlite"))
+    store._put_value("a", b"not a pickle")
+
+    assert store._get_value("a", pickle.loads) is None
+    assert store._get_value("b", pickle.loads) is None
+    assert store._get_value("a", bytes) == b"not a pickle"
+    assert store.get_stats() == {"hits": 1, "misses": 2, "num_bytes": 12}
+
+    store.clear()
+    assert len(store) == 0 and store.get_stats() == {"hits": 0, "misses": 0, "num_bytes": 0}
+    store.close()
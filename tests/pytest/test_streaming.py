@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from palimpzest.core.data.datareaders import MemoryReader
+from palimpzest.core.elements.filters import Filter
+from palimpzest.core.lib.schemas import DefaultSchema
+from palimpzest.policy import MaxQuality
+from palimpzest.query.operators.filter import NonLLMFilter
+from palimpzest.query.operators.limit import LimitScanOp
+from palimpzest.query.operators.scan import MarshalAndScanDataOp
+from palimpzest.query.optimizer.cost_model import CostModel
+from palimpzest.query.optimizer.optimizer import Optimizer
+from palimpzest.query.optimizer.plan import PhysicalPlan
+from palimpzest.query.processor.config import QueryProcessorConfig
+from palimpzest.query.processor.streaming_processor import StreamingQueryProcessor
+
+
+class LoggingReader(MemoryReader):
+    """A MemoryReader which logs the indices of the records which it has read."""
+    def __init__(self, vals):
+        super().__init__(vals)
+        self.read_idxs = []
+
+    def __getitem__(self, idx):
+        self.read_idxs.append(idx)
+        return super().__getitem__(idx)
+
+
+def even_filter_op(slow_values=(), sleep_secs=0.0):
+    def is_even(record):
+        time.sleep(sleep_secs if record["value"] in slow_values else 0.0)
+        return record["value"] % 2 == 0
+
+    return NonLLMFilter(input_schema=DefaultSchema, output_schema=DefaultSchema, filter=Filter(filter_fn=is_even))
+
+
+def get_processor(reader, operators, **config_kwargs):
+    processor = StreamingQueryProcessor(
+        dataset=reader,
+        config=QueryProcessorConfig(processing_strategy="streaming", execution_strategy="pipelined_parallel", **config_kwargs),
+        optimizer=Optimizer(policy=MaxQuality(), cost_model=CostModel()),
+    )
+    scan_op = MarshalAndScanDataOp(output_schema=DefaultSchema, datareader=reader)
+    processor.set_plan(PhysicalPlan(operators=[scan_op, *operators]))
+    return processor
+
+
+def test_streaming_yields_results_before_scanning_datareader():
+    numbers = LoggingReader(list(range(1000)))
+    processor = get_processor(numbers, [even_filter_op()], max_workers=4, streaming_window=8)
+
+    collections = processor.execute()
+    first_collection = next(collections)
+
+    # the first results are yielded long before the datareader has been scanned
+    assert len(first_collection) > 0 and first_collection.data_records[0].value == 0
+    assert len(numbers.read_idxs) < 100
+    assert processor.plan_stats.time_to_first_result is not None
+
+    values = [record.value for record in first_collection] + [record.value for collection in collections for record in collection]
+    assert values == list(range(0, 1000, 2))
+    assert processor.plan_stats.total_plan_time >= processor.plan_stats.time_to_first_result
+    assert processor.plan_stats.to_json()["time_to_first_result"] == processor.plan_stats.time_to_first_result
+
+
+@pytest.mark.parametrize("ordered", [True, False], ids=["ordered", "unordered"])
+def test_streaming_output_order(ordered):
+    numbers = LoggingReader(list(range(20)))
+    processor = get_processor(numbers, [even_filter_op(slow_values=(0,), sleep_secs=0.5)], max_workers=4, streaming_ordered=ordered)
+
+    values = [record.value for collection in processor.execute() for record in collection]
+
+    # an unordered stream does not hold back the outputs of other records while the first one is being filtered
+    assert sorted(values) == list(range(0, 20, 2))
+    assert (values == list(range(0, 20, 2))) == ordered
+
+
+def test_streaming_window_bounds_records_in_flight():
+    numbers = LoggingReader(list(range(50)))
+    processor = get_processor(numbers, [even_filter_op(slow_values=(0,), sleep_secs=0.2)], max_workers=4, streaming_window=5)
+
+    collections = processor.execute()
+    first_collection = next(collections)
+
+    # the first record holds the window open, thus at most five records were scanned before it was yielded
+    assert numbers.read_idxs == list(range(5))
+    assert [record.value for record in first_collection] == [0, 2, 4]
+    assert len([record for collection in collections for record in collection]) == 22
+
+
+def test_streaming_with_limit_stops_scan():
+    numbers = LoggingReader(list(range(1000)))
+    limit_op = LimitScanOp(limit=3, input_schema=DefaultSchema, output_schema=DefaultSchema)
+    processor = get_processor(numbers, [even_filter_op(), limit_op], max_workers=4)
+
+    values = [record.value for collection in processor.execute() for record in collection]
+
+    assert len(values) == 3 and all(value % 2 == 0 for value in values)
+    assert len(numbers.read_idxs) < 100